@@ -16,6 +16,11 @@ Exchange Adapters Package
     adapter = create_adapter(config)
     adapter.connect()
     balance = adapter.get_balance()
+
+    # 异步版本：一个事件循环内并发提交整批订单
+    adapter = create_async_adapter(config)
+    await adapter.connect()
+    results = await adapter.place_orders([...])
 """
 from adapters.base_adapter import (
     BasePerpAdapter,
@@ -27,16 +32,21 @@ from adapters.base_adapter import (
     Balance,
     Order,
 )
+from adapters.async_base_adapter import AsyncBasePerpAdapter
 from adapters.factory import (
     create_adapter,
+    create_async_adapter,
     register_adapter,
+    register_async_adapter,
     get_available_exchanges,
 )
 
 __all__ = [
     # 基类和接口
     "BasePerpAdapter",
+    "AsyncBasePerpAdapter",
     "create_adapter",
+    "create_async_adapter",
     
     # 数据模型
     "Position",
@@ -51,5 +61,6 @@ __all__ = [
     
     # 工厂函数
     "register_adapter",
+    "register_async_adapter",
     "get_available_exchanges",
 ]
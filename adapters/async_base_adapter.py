@@ -0,0 +1,290 @@
+"""
+Async Base Adapter for Perpetual Exchange Integration
+
+asyncio 版本的适配器接口。接口与 BasePerpAdapter 一一对应，所有 I/O 方法均为
+协程，并额外提供有界并发的批量下单/撤单方法，便于一个事件循环内并发提交
+一个策略周期的全部请求。
+"""
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Optional, List, Awaitable, Callable, TypeVar, Union
+from decimal import Decimal
+
+from adapters.base_adapter import BasePerpAdapter, Balance, Position, Order, SymbolPrecision
+
+
+T = TypeVar("T")
+
+
+class AsyncBasePerpAdapter(ABC):
+    """
+    永续合约交易所异步适配器基类
+
+    数据模型（Order / Position / Balance）与同步适配器共用。
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        初始化适配器
+
+        Args:
+            config: 交易所配置字典，除同步适配器的字段外还支持：
+                - max_concurrency: 批量请求的最大并发数（默认 8）
+        """
+        self.config = config
+        self.exchange_name = config.get("exchange_name", "unknown")
+        self.max_concurrency = int(config.get("max_concurrency", 8))
+        self.symbol_precision: Dict[str, SymbolPrecision] = {}
+        for symbol, precision in (config.get("symbol_precision") or {}).items():
+            self.set_symbol_precision(symbol, precision["tick_size"], precision.get("lot_size", "1"))
+
+    # 交易对精度（与同步适配器相同）
+    set_symbol_precision = BasePerpAdapter.set_symbol_precision
+    get_symbol_precision = BasePerpAdapter.get_symbol_precision
+
+    @abstractmethod
+    async def connect(self) -> bool:
+        """连接到交易所并完成认证"""
+        pass
+
+    async def close(self):
+        """释放连接等资源（默认无操作）"""
+        pass
+
+    @abstractmethod
+    async def get_balance(self) -> Balance:
+        """查询账户余额"""
+        pass
+
+    @abstractmethod
+    async def get_positions(self, symbol: Optional[str] = None) -> List[Position]:
+        """查询持仓信息"""
+        pass
+
+    @abstractmethod
+    async def place_order(
+        self,
+        symbol: str,
+        side: str,
+        order_type: str,
+        quantity: Decimal,
+        price: Optional[Decimal] = None,
+        time_in_force: str = "gtc",
+        reduce_only: bool = False,
+        client_order_id: Optional[str] = None,
+        **kwargs
+    ) -> Order:
+        """下单，参数同 BasePerpAdapter.place_order"""
+        pass
+
+    @abstractmethod
+    async def cancel_order(
+        self,
+        order_id: Optional[str] = None,
+        symbol: Optional[str] = None,
+        client_order_id: Optional[str] = None,
+    ) -> bool:
+        """撤单"""
+        pass
+
+    @abstractmethod
+    async def cancel_all_orders(
+        self,
+        symbol: Optional[str] = None,
+    ) -> bool:
+        """撤销所有订单"""
+        pass
+
+    @abstractmethod
+    async def get_order(
+        self,
+        order_id: Optional[str] = None,
+        symbol: Optional[str] = None,
+        client_order_id: Optional[str] = None,
+    ) -> Optional[Order]:
+        """查询订单状态"""
+        pass
+
+    @abstractmethod
+    async def get_open_orders(
+        self,
+        symbol: Optional[str] = None,
+    ) -> List[Order]:
+        """查询所有未成交订单"""
+        pass
+
+    async def get_cached_open_orders(
+        self,
+        symbol: Optional[str] = None,
+    ) -> List[Order]:
+        """查询未成交订单（优先读取本地订单簿，默认直接调用 get_open_orders）"""
+        return await self.get_open_orders(symbol=symbol)
+
+    @abstractmethod
+    async def get_ticker(self, symbol: str) -> Dict[str, Any]:
+        """获取交易对的最新价格信息"""
+        pass
+
+    @abstractmethod
+    async def get_orderbook(
+        self,
+        symbol: str,
+        depth: int = 20,
+    ) -> Dict[str, Any]:
+        """获取订单簿"""
+        pass
+
+    async def gather_bounded(
+        self,
+        calls: List[Callable[[], Awaitable[T]]],
+        limit: Optional[int] = None,
+    ) -> List[Union[T, BaseException]]:
+        """
+        以有界并发执行一组协程工厂
+
+        Args:
+            calls: 无参协程工厂列表（每个返回一个 awaitable）
+            limit: 最大并发数，默认使用 max_concurrency
+
+        Returns:
+            与 calls 顺序一致的结果列表，失败项为对应的异常对象
+        """
+        semaphore = asyncio.Semaphore(limit or self.max_concurrency)
+
+        async def run(call: Callable[[], Awaitable[T]]) -> T:
+            async with semaphore:
+                return await call()
+
+        return await asyncio.gather(*(run(call) for call in calls), return_exceptions=True)
+
+    async def place_orders(
+        self,
+        orders: List[Dict[str, Any]],
+        limit: Optional[int] = None,
+    ) -> List[Union[Order, BaseException]]:
+        """
+        并发批量下单
+
+        Args:
+            orders: 下单参数字典列表，字段同 place_order 的关键字参数
+            limit: 最大并发数，默认使用 max_concurrency
+
+        Returns:
+            与 orders 顺序一致的结果列表，失败项为异常对象
+        """
+        return await self.gather_bounded(
+            [lambda params=params: self.place_order(**params) for params in orders],
+            limit=limit,
+        )
+
+    async def cancel_orders_by_ids(
+        self,
+        order_id_list: Optional[List[int]] = None,
+        cl_ord_id_list: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        批量撤单（默认实现：并发逐个撤单）
+
+        支持批量撤单接口的交易所应覆盖此方法。
+        """
+        calls = [
+            lambda order_id=order_id: self.cancel_order(order_id=str(order_id))
+            for order_id in order_id_list or []
+        ]
+        calls += [
+            lambda cl_ord_id=cl_ord_id: self.cancel_order(client_order_id=cl_ord_id)
+            for cl_ord_id in cl_ord_id_list or []
+        ]
+        results = await self.gather_bounded(calls)
+        return all(result is True for result in results)
+
+    async def place_limit_order(
+        self,
+        symbol: str,
+        side: str,
+        quantity: Decimal,
+        price: Decimal,
+        time_in_force: str = "gtc",
+        reduce_only: bool = False,
+        client_order_id: Optional[str] = None,
+        **kwargs
+    ) -> Order:
+        """下限价单（便捷方法）"""
+        return await self.place_order(
+            symbol=symbol,
+            side=side,
+            order_type="limit",
+            quantity=quantity,
+            price=price,
+            time_in_force=time_in_force,
+            reduce_only=reduce_only,
+            client_order_id=client_order_id,
+            **kwargs
+        )
+
+    async def place_market_order(
+        self,
+        symbol: str,
+        side: str,
+        quantity: Decimal,
+        reduce_only: bool = False,
+        client_order_id: Optional[str] = None,
+        **kwargs
+    ) -> Order:
+        """下市价单（便捷方法）"""
+        return await self.place_order(
+            symbol=symbol,
+            side=side,
+            order_type="market",
+            quantity=quantity,
+            price=None,
+            time_in_force="ioc",
+            reduce_only=reduce_only,
+            client_order_id=client_order_id,
+            **kwargs
+        )
+
+    async def get_position(self, symbol: str) -> Optional[Position]:
+        """获取单个交易对的持仓（便捷方法）"""
+        positions = await self.get_positions(symbol=symbol)
+        if positions:
+            return positions[0]
+        return None
+
+    async def close_position(
+        self,
+        symbol: str,
+        order_type: str = "market",
+        price: Optional[Decimal] = None,
+    ) -> Optional[Order]:
+        """平仓（便捷方法），逻辑同 BasePerpAdapter.close_position"""
+        position = await self.get_position(symbol)
+        if not position or position.size == Decimal("0"):
+            return None
+
+        # 确定平仓方向（与持仓相反）
+        if position.side in ["long", "buy"]:
+            close_side = "sell"
+        else:
+            close_side = "buy"
+
+        if order_type == "market":
+            return await self.place_market_order(
+                symbol=symbol,
+                side=close_side,
+                quantity=abs(position.size),
+                reduce_only=True,
+            )
+        if price is None:
+            raise ValueError("限价单必须指定价格")
+        return await self.place_limit_order(
+            symbol=symbol,
+            side=close_side,
+            quantity=abs(position.size),
+            price=price,
+            reduce_only=True,
+        )
+
+    def __repr__(self) -> str:
+        """字符串表示"""
+        return f"<{self.__class__.__name__}(exchange={self.exchange_name})>"
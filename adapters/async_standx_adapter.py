@@ -0,0 +1,356 @@
+"""
+StandX Exchange Async Adapter Implementation
+
+This module implements AsyncBasePerpAdapter for StandX exchange on top of
+AsyncStandXPerpHTTP (aiohttp).
+"""
+import asyncio
+import sys
+import time
+import os
+from typing import Dict, Any, Optional, List
+from decimal import Decimal
+
+# 添加项目路径
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+
+from adapters.async_base_adapter import AsyncBasePerpAdapter
+from adapters.base_adapter import Balance, Position, Order
+from adapters.order_cache import OpenOrderCache
+from adapters.standx_adapter import (
+    new_client_order_id,
+    normalize_side,
+    parse_balance,
+    parse_positions,
+    parse_open_orders_cached,
+    parse_ticker,
+    private_key_to_address,
+    sign_login_message,
+)
+from exchange.exchange_standx.standx_protocol.perps_auth import StandXAuth
+from exchange.exchange_standx.standx_protocol.async_perp_http import AsyncStandXPerpHTTP
+from exchange.exchange_standx.standx_protocol.http_pool import HTTPPoolConfig
+from ratelimit import create_rate_limiter
+
+
+class AsyncStandXAdapter(AsyncBasePerpAdapter):
+    """StandX 交易所异步适配器实现"""
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        初始化 StandX 异步适配器
+
+        Args:
+            config: 配置字典，字段同 StandXAdapter，另外支持：
+                - max_concurrency: 批量下单/撤单最大并发数（默认 8）
+                - http_session: 共享的 aiohttp.ClientSession（可选）
+                - server_clock: 共享的 ServerClock（可选，多账户共用一次对时）
+                - order_sync_interval: 本地订单簿对账间隔（秒，默认 30）
+                - stream: WebSocket 推送配置（可选），字段同 StandXAdapter
+                - signing_service: 共享的 SigningService（可选），请求签名放到签名进程池执行
+                - account_id: 在签名服务中的账户标识（默认使用钱包地址）
+                - rate_limiter: 共享的限流器（可选，多账户共用一个令牌桶），
+                  未提供时按 rate_limit 配置创建
+        """
+        super().__init__(config)
+        self.private_key = config.get("private_key")
+        if not self.private_key:
+            raise ValueError("配置中必须包含 private_key")
+
+        self.chain = config.get("chain", "bsc")
+        base_url = config.get("base_url", "https://perps.standx.com")
+
+        self.auth = StandXAuth(base_url=config.get("auth_url", "https://api.standx.com"))
+        self.http_client = AsyncStandXPerpHTTP(
+            base_url=base_url,
+            geo_url=config.get("geo_url", "https://geo.standx.com"),
+            pool_config=HTTPPoolConfig.from_dict(config.get("http")),
+            session=config.get("http_session"),
+            clock=config.get("server_clock"),
+            rate_limiter=config.get("rate_limiter") or create_rate_limiter(config.get("rate_limit"), "standx"),
+        )
+
+        self.wallet_address = private_key_to_address(self.private_key)
+        self.token: Optional[str] = None
+
+        signing_service = config.get("signing_service")
+        if signing_service is not None:
+            from adapters.signing_service import StandXPooledAuth
+            self.auth = StandXPooledAuth(
+                self.auth, signing_service, config.get("account_id") or self.wallet_address
+            )
+
+        self.order_cache = OpenOrderCache()
+        self.order_sync_interval = float(config.get("order_sync_interval", 30))
+
+        self.stream = None
+        self.stream_handler = None
+        self._stream_event = asyncio.Event()
+
+    def _require_token(self):
+        if not self.token:
+            raise Exception("未认证，请先调用 connect()")
+
+    async def connect(self) -> bool:
+        """连接到 StandX 并完成认证（登录流程走同步接口，放到线程池执行）"""
+        try:
+            login_response = await asyncio.to_thread(
+                self.auth.authenticate,
+                self.chain,
+                self.wallet_address,
+                lambda msg: sign_login_message(self.private_key, msg),
+            )
+            self.token = login_response.token
+            return True
+        except Exception as e:
+            raise Exception(f"StandX 认证失败: {e}")
+
+    async def close(self):
+        await self.stop_stream()
+        await self.http_client.close()
+
+    async def start_stream(self, symbols: Optional[List[str]] = None):
+        """
+        启动 WebSocket 推送（当前事件循环内的后台任务），行为同 StandXAdapter.start_stream
+
+        Returns:
+            StandXStreamHandler: 推送状态（持仓 / 余额快照）
+        """
+        self._require_token()
+        if self.stream is not None:
+            return self.stream_handler
+
+        from adapters.standx_stream import StandXStreamHandler
+        from exchange.exchange_standx.standx_protocol.perp_ws import StandXPerpWS
+
+        stream_config = self.config.get("stream") or {}
+        kwargs = {k: stream_config[k] for k in ("url", "heartbeat", "stale_timeout") if k in stream_config}
+        self.stream = StandXPerpWS(session=self.config.get("http_session"), **kwargs)
+        self.stream_handler = StandXStreamHandler(self.order_cache, self.symbol_precision)
+        self.stream_handler.add_listener(self._on_stream_event)
+        self.stream_handler.attach(self.stream)
+        await self.stream.authenticate(self.token)
+        for symbol in symbols or []:
+            await self.stream.subscribe("price", symbol)
+        self.stream.start()
+        return self.stream_handler
+
+    def _on_stream_event(self, event: str, payload: Any):
+        if event in ("fill", "position"):
+            self._stream_event.set()
+
+    async def wait_stream_event(self, timeout: float) -> bool:
+        """等待成交 / 持仓推送，最多 timeout 秒；True 表示被推送事件提前唤醒"""
+        try:
+            await asyncio.wait_for(self._stream_event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._stream_event.clear()
+
+    async def stop_stream(self):
+        """停止 WebSocket 推送"""
+        if self.stream is not None:
+            await self.stream.close()
+            self.stream = None
+
+    async def get_balance(self) -> Balance:
+        """查询账户余额（已启动推送且收到余额推送时直接返回推送快照）"""
+        self._require_token()
+        if self.stream_handler is not None:
+            balance = self.stream_handler.get_balance()
+            if balance is not None:
+                return balance
+        try:
+            return parse_balance(await self.http_client.query_balance(self.token))
+        except Exception as e:
+            raise Exception(f"查询余额失败: {e}")
+
+    async def get_positions(self, symbol: Optional[str] = None) -> List[Position]:
+        """查询持仓信息"""
+        self._require_token()
+        try:
+            positions_data = await self.http_client.query_positions(token=self.token, symbol=symbol)
+            return parse_positions(positions_data)
+        except Exception as e:
+            raise Exception(f"查询持仓失败: {e}")
+
+    async def get_position(self, symbol: str) -> Optional[Position]:
+        """获取单个交易对的持仓：已收到该交易对的持仓推送时直接返回推送快照，否则查询 REST"""
+        if self.stream_handler is not None and self.stream_handler.has_position_update(symbol):
+            return self.stream_handler.get_position(symbol)
+        return await super().get_position(symbol)
+
+    async def place_order(
+        self,
+        symbol: str,
+        side: str,
+        order_type: str,
+        quantity: Decimal,
+        price: Optional[Decimal] = None,
+        time_in_force: str = "gtc",
+        reduce_only: bool = False,
+        client_order_id: Optional[str] = None,
+        **kwargs
+    ) -> Order:
+        """下单"""
+        self._require_token()
+
+        if order_type == "limit" and price is None:
+            raise ValueError("限价单必须指定价格")
+
+        try:
+            side_str = normalize_side(side)
+            client_order_id = client_order_id or new_client_order_id()
+            response = await self.http_client.place_order(
+                token=self.token,
+                symbol=symbol,
+                side=side_str,
+                order_type=order_type,
+                qty=str(quantity),
+                price=str(price) if price else None,
+                time_in_force=time_in_force,
+                reduce_only=reduce_only,
+                cl_ord_id=client_order_id,
+                auth=self.auth,
+                **kwargs
+            )
+
+            if response.get("code") != 0:
+                raise Exception(f"下单失败: {response.get('message', '未知错误')}")
+
+            order = Order(
+                order_id=response.get("request_id", ""),
+                symbol=symbol,
+                side=side_str,
+                order_type=order_type,
+                quantity=quantity,
+                price=price,
+                status="pending",
+                time_in_force=time_in_force,
+                reduce_only=reduce_only,
+                client_order_id=client_order_id,
+            )
+            if order_type == "limit" and time_in_force != "ioc":
+                self.order_cache.on_placed(order)
+            return order
+        except Exception as e:
+            raise Exception(f"下单失败: {e}")
+
+    async def cancel_order(
+        self,
+        order_id: Optional[str] = None,
+        symbol: Optional[str] = None,
+        client_order_id: Optional[str] = None,
+    ) -> bool:
+        """撤单"""
+        if not order_id and not client_order_id:
+            raise ValueError("必须提供 order_id 或 client_order_id")
+
+        order_id_list = None
+        if order_id:
+            try:
+                order_id_list = [int(order_id)]
+            except ValueError:
+                raise ValueError(f"无效的订单ID: {order_id}")
+
+        return await self.cancel_orders_by_ids(
+            order_id_list=order_id_list,
+            cl_ord_id_list=[client_order_id] if client_order_id else None,
+        )
+
+    async def cancel_orders_by_ids(
+        self,
+        order_id_list: Optional[List[int]] = None,
+        cl_ord_id_list: Optional[List[str]] = None,
+    ) -> bool:
+        """批量撤单（StandX 原生批量接口，一次请求）"""
+        self._require_token()
+
+        if not order_id_list and not cl_ord_id_list:
+            raise ValueError("必须提供 order_id_list 或 cl_ord_id_list")
+
+        try:
+            await self.http_client.cancel_orders(
+                token=self.token,
+                order_id_list=order_id_list,
+                cl_ord_id_list=cl_ord_id_list,
+                auth=self.auth
+            )
+            self.order_cache.on_cancelled(order_id_list, cl_ord_id_list)
+            return True
+        except Exception as e:
+            raise Exception(f"批量撤单失败: {e}")
+
+    async def cancel_all_orders(
+        self,
+        symbol: Optional[str] = None,
+    ) -> bool:
+        """撤销所有订单"""
+        open_orders = await self.get_open_orders(symbol=symbol)
+
+        order_id_list = []
+        for order in open_orders:
+            try:
+                order_id_list.append(int(order.order_id))
+            except (ValueError, TypeError):
+                pass
+
+        if not order_id_list:
+            return True
+
+        return await self.cancel_orders_by_ids(order_id_list=order_id_list)
+
+    async def get_order(
+        self,
+        order_id: Optional[str] = None,
+        symbol: Optional[str] = None,
+        client_order_id: Optional[str] = None,
+    ) -> Optional[Order]:
+        """查询订单状态（与同步适配器一致，待实现）"""
+        raise NotImplementedError("StandX 订单查询功能待实现")
+
+    async def get_open_orders(
+        self,
+        symbol: Optional[str] = None,
+    ) -> List[Order]:
+        """查询所有未成交订单（REST 快照，同时与本地订单簿对账）"""
+        self._require_token()
+        try:
+            started_at = time.time()
+            orders_data = await self.http_client.query_open_orders(
+                token=self.token,
+                symbol=symbol,
+                limit=1200
+            )
+            orders, versions = parse_open_orders_cached(orders_data, self.order_cache, self.symbol_precision)
+            self.order_cache.reconcile(orders, started_at, symbol=symbol, versions=versions)
+            return orders
+        except Exception as e:
+            raise Exception(f"查询未成交订单失败: {e}")
+
+    async def get_cached_open_orders(
+        self,
+        symbol: Optional[str] = None,
+    ) -> List[Order]:
+        """从本地订单簿读取未成交订单，超过 order_sync_interval 时先对账"""
+        if self.order_cache.needs_sync(self.order_sync_interval):
+            return await self.get_open_orders(symbol=symbol)
+        return self.order_cache.get_open_orders(symbol)
+
+    async def get_ticker(self, symbol: str) -> Dict[str, Any]:
+        """获取交易对的最新价格信息"""
+        try:
+            return parse_ticker(await self.http_client.query_symbol_price(symbol), symbol)
+        except Exception as e:
+            raise Exception(f"获取价格失败: {e}")
+
+    async def get_orderbook(
+        self,
+        symbol: str,
+        depth: int = 20,
+    ) -> Dict[str, Any]:
+        """获取订单簿（StandX API 暂无公开订单簿接口）"""
+        raise NotImplementedError("StandX 订单簿查询功能待实现")
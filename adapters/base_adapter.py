@@ -6,8 +6,8 @@ perpetual futures exchanges. All exchange-specific adapters should inherit
 from BasePerpAdapter and implement the required methods.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
-from decimal import Decimal
+from typing import Dict, Any, Optional, List, Tuple
+from decimal import Decimal, InvalidOperation
 from enum import Enum
 
 
@@ -42,8 +42,161 @@ class OrderStatus(Enum):
     REJECTED = "rejected"
 
 
+# ---------- 定点数（整数 tick / lot） ----------
+
+EXACT = "exact"
+FLOOR = "floor"
+CEIL = "ceil"
+NEAREST = "nearest"
+
+
+def parse_fixed(value: Any) -> Tuple[int, int]:
+    """
+    数值 -> (整数尾数, 小数位数)，例如 "65000.55" -> (6500055, 2)
+
+    str / int 走纯整数解析，不构造 Decimal / float；其他类型经 Decimal(str(value)) 转换。
+    无法解析（空串、None、"+-5" 等）统一抛出 ValueError。
+    """
+    if type(value) is int:
+        return value, 0
+    if type(value) is str:
+        text = value.strip()
+        negative = text[:1] == "-"
+        whole, dot, frac = (text[1:] if text[:1] in "+-" else text).partition(".")
+        # 只允许一个符号位；"." / "+." 这类没有任何数字的输入交给下面的 Decimal 报错
+        if ((whole.isdigit() or (dot and not whole and frac))
+                and (not frac or frac.isdigit())):
+            mantissa = int((whole or "0") + frac)
+            return (-mantissa if negative else mantissa), len(frac)
+    if not isinstance(value, Decimal):
+        try:
+            value = Decimal(str(value))
+        except InvalidOperation:
+            raise ValueError(f"无效数值: {value!r}") from None
+    sign, digit_tuple, exponent = value.as_tuple()
+    if not isinstance(exponent, int):
+        raise ValueError(f"无效数值: {value}")
+    mantissa = int("".join(map(str, digit_tuple)) or "0")
+    if exponent > 0:
+        mantissa, exponent = mantissa * 10 ** exponent, 0
+    return (-mantissa if sign else mantissa), -exponent
+
+
+def to_units(value: Any, unit: Tuple[int, int], rounding: str = EXACT) -> int:
+    """
+    数值 -> 整数个 unit（unit 为 parse_fixed 的结果，例如 tick_size 0.01 -> (1, 2)）
+
+    rounding=EXACT 时数值必须是 unit 的整数倍，否则抛出 ValueError（保证无损）；
+    FLOOR / CEIL / NEAREST 用于对齐价格网格。
+    """
+    mantissa, decimals = parse_fixed(value)
+    unit_mantissa, unit_decimals = unit
+    if decimals > unit_decimals:
+        numerator, denominator = mantissa, unit_mantissa * 10 ** (decimals - unit_decimals)
+    else:
+        numerator, denominator = mantissa * 10 ** (unit_decimals - decimals), unit_mantissa
+    units, remainder = divmod(numerator, denominator)
+    if not remainder or rounding == FLOOR:
+        return units
+    if rounding == CEIL:
+        return units + 1
+    if rounding == NEAREST:
+        return units + 1 if remainder * 2 >= denominator else units
+    raise ValueError(f"{value} 不是 {from_units(1, unit)} 的整数倍")
+
+
+def from_units(units: int, unit: Tuple[int, int]) -> Decimal:
+    """整数个 unit -> Decimal（无损）"""
+    return Decimal(units * unit[0]).scaleb(-unit[1])
+
+
+class SymbolPrecision:
+    """
+    交易对精度：价格按 tick_size、数量按 lot_size 转换为整数
+
+    价格 65000.5、tick_size 0.1 -> 650005 ticks；数量 0.0123、lot_size 0.0001 -> 123 lots。
+    整数表示可直接作为网格 / 订单簿的 dict key 做差集，避免 Decimal / float 往返。
+    """
+    __slots__ = ("symbol", "tick_size", "lot_size", "_tick", "_lot")
+
+    def __init__(self, tick_size: Any, lot_size: Any = "1", symbol: Optional[str] = None):
+        self.symbol = symbol
+        self._tick = parse_fixed(str(tick_size) if isinstance(tick_size, float) else tick_size)
+        self._lot = parse_fixed(str(lot_size) if isinstance(lot_size, float) else lot_size)
+        if self._tick[0] <= 0 or self._lot[0] <= 0:
+            raise ValueError("tick_size / lot_size 必须大于 0")
+        self.tick_size = from_units(1, self._tick)
+        self.lot_size = from_units(1, self._lot)
+
+    def price_to_ticks(self, price: Any, rounding: str = EXACT) -> int:
+        return to_units(price, self._tick, rounding)
+
+    def ticks_to_price(self, ticks: int) -> Decimal:
+        return from_units(ticks, self._tick)
+
+    def size_to_lots(self, size: Any, rounding: str = EXACT) -> int:
+        return to_units(size, self._lot, rounding)
+
+    def lots_to_size(self, lots: int) -> Decimal:
+        return from_units(lots, self._lot)
+
+    def __repr__(self) -> str:
+        return f"SymbolPrecision({self.symbol}, tick={self.tick_size}, lot={self.lot_size})"
+
+
+# ---------- 数据模型 ----------
+
+class _DecimalField:
+    """
+    Decimal 字段：构造时保存原始值（交易所返回的 str / int / Decimal），
+    首次读取时才转换为 Decimal 并缓存，解析大量订单但只用到价格 key 时不产生 Decimal 对象
+
+    赋值时即校验：str 走 parse_fixed 的纯整数解析，其他类型直接转换为 Decimal，
+    非法数值在构造处抛出 ValueError，而不是推迟到首次读取
+    """
+    __slots__ = ("slot",)
+
+    def __init__(self, slot: str):
+        self.slot = slot
+
+    def __set_name__(self, owner, name):
+        self.slot = f"_{name}"
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = getattr(obj, self.slot)
+        if value is None or type(value) is Decimal:
+            return value
+        value = Decimal(value if isinstance(value, (str, int)) else str(value))
+        setattr(obj, self.slot, value)
+        return value
+
+    def __set__(self, obj, value):
+        if type(value) is str:
+            parse_fixed(value)
+        elif value is not None and type(value) is not Decimal and type(value) is not int:
+            try:
+                value = Decimal(str(value))
+            except InvalidOperation:
+                raise ValueError(f"无效数值: {value!r}") from None
+            if not value.is_finite():
+                raise ValueError(f"无效数值: {value}")
+        setattr(obj, self.slot, value)
+
+
 class Position:
     """持仓信息"""
+    __slots__ = (
+        "symbol", "side", "leverage", "margin_mode",
+        "_size", "_entry_price", "_mark_price", "_unrealized_pnl",
+    )
+
+    size = _DecimalField("_size")
+    entry_price = _DecimalField("_entry_price")
+    mark_price = _DecimalField("_mark_price")
+    unrealized_pnl = _DecimalField("_unrealized_pnl")
+
     def __init__(
         self,
         symbol: str,
@@ -80,6 +233,18 @@ class Position:
 
 class Balance:
     """账户余额信息"""
+    __slots__ = (
+        "_total_balance", "_available_balance", "_equity", "_unrealized_pnl",
+        "_margin_used", "_margin_available",
+    )
+
+    total_balance = _DecimalField("_total_balance")
+    available_balance = _DecimalField("_available_balance")
+    equity = _DecimalField("_equity")
+    unrealized_pnl = _DecimalField("_unrealized_pnl")
+    margin_used = _DecimalField("_margin_used")
+    margin_available = _DecimalField("_margin_available")
+
     def __init__(
         self,
         total_balance: Decimal,
@@ -109,7 +274,23 @@ class Balance:
 
 
 class Order:
-    """订单信息"""
+    """
+    订单信息
+
+    price / quantity / filled_quantity 可以直接传交易所返回的字符串，读取时才转换为 Decimal；
+    precision（SymbolPrecision，同一交易对的订单共享一个对象）已知时，
+    price_ticks / quantity_lots 直接从原始字符串得到整数表示。
+    """
+    __slots__ = (
+        "order_id", "symbol", "side", "order_type", "status", "time_in_force",
+        "reduce_only", "client_order_id", "created_at", "updated_at", "precision",
+        "_quantity", "_price", "_filled_quantity",
+    )
+
+    quantity = _DecimalField("_quantity")
+    price = _DecimalField("_price")
+    filled_quantity = _DecimalField("_filled_quantity")
+
     def __init__(
         self,
         order_id: str,
@@ -125,6 +306,7 @@ class Order:
         client_order_id: Optional[str] = None,
         created_at: Optional[int] = None,
         updated_at: Optional[int] = None,
+        precision: Optional[SymbolPrecision] = None,
     ):
         self.order_id = order_id
         self.symbol = symbol
@@ -139,6 +321,35 @@ class Order:
         self.client_order_id = client_order_id
         self.created_at = created_at
         self.updated_at = updated_at
+        self.precision = precision
+
+    @property
+    def raw_price(self) -> Any:
+        """价格原始值（str / Decimal / None），不触发 Decimal 转换"""
+        return self._price
+
+    @property
+    def price_ticks(self) -> Optional[int]:
+        """价格的整数 tick 表示（需要 precision）"""
+        if self._price is None:
+            return None
+        if self.precision is None:
+            raise ValueError(f"{self.symbol} 未设置 SymbolPrecision")
+        return self.precision.price_to_ticks(self._price)
+
+    @property
+    def quantity_lots(self) -> int:
+        """数量的整数 lot 表示（需要 precision）"""
+        if self.precision is None:
+            raise ValueError(f"{self.symbol} 未设置 SymbolPrecision")
+        return self.precision.size_to_lots(self._quantity)
+
+    @property
+    def filled_lots(self) -> int:
+        """已成交数量的整数 lot 表示（需要 precision）"""
+        if self.precision is None:
+            raise ValueError(f"{self.symbol} 未设置 SymbolPrecision")
+        return self.precision.size_to_lots(self._filled_quantity)
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -176,6 +387,27 @@ class BasePerpAdapter(ABC):
         """
         self.config = config
         self.exchange_name = config.get("exchange_name", "unknown")
+        # 交易对精度：symbol -> SymbolPrecision，配置格式 {"BTC-USD": {"tick_size": "0.01", "lot_size": "0.0001"}}
+        self.symbol_precision: Dict[str, SymbolPrecision] = {}
+        for symbol, precision in (config.get("symbol_precision") or {}).items():
+            self.set_symbol_precision(symbol, precision["tick_size"], precision.get("lot_size", "1"))
+
+    def set_symbol_precision(self, symbol: str, tick_size: Any, lot_size: Any = "1") -> SymbolPrecision:
+        """
+        设置交易对的价格 / 数量精度，之后解析的该交易对订单可直接取 price_ticks / quantity_lots
+
+        Args:
+            symbol: 交易对符号
+            tick_size: 最小价格变动，例如 "0.01"
+            lot_size: 最小数量变动，例如 "0.0001"
+        """
+        precision = SymbolPrecision(tick_size, lot_size, symbol=symbol)
+        self.symbol_precision[symbol] = precision
+        return precision
+
+    def get_symbol_precision(self, symbol: str) -> Optional[SymbolPrecision]:
+        """获取交易对精度，未设置时返回 None"""
+        return self.symbol_precision.get(symbol)
     
     @abstractmethod
     def connect(self) -> bool:
@@ -335,6 +567,18 @@ class BasePerpAdapter(ABC):
         """
         pass
     
+    def get_cached_open_orders(
+        self,
+        symbol: Optional[str] = None,
+    ) -> List[Order]:
+        """
+        查询未成交订单（优先读取适配器维护的本地订单簿）
+
+        默认直接调用 get_open_orders()；维护本地订单簿的适配器可覆盖此方法，
+        只在需要对账时才请求 REST 快照。
+        """
+        return self.get_open_orders(symbol=symbol)
+    
     @abstractmethod
     def get_ticker(self, symbol: str) -> Dict[str, Any]:
         """
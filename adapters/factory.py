@@ -2,19 +2,56 @@
 Adapter Factory
 
 This module provides a factory function to create exchange adapters based on configuration.
+
+适配器类按 "模块:类名" 注册，创建时才导入对应模块：
+只用 StandX 的进程不会加载 nado_protocol / web3，反之亦然。
 """
-from typing import Dict, Any, Type
+import importlib
+from typing import Dict, Any, Type, Union
 from adapters.base_adapter import BasePerpAdapter
-from adapters.standx_adapter import StandXAdapter
+from adapters.async_base_adapter import AsyncBasePerpAdapter
 
 
-# 注册所有可用的适配器
-_ADAPTER_REGISTRY: Dict[str, Type[BasePerpAdapter]] = {
-    "standx": StandXAdapter
+# 注册所有可用的适配器（值为类或 "模块:类名"，首次使用时导入）
+_ADAPTER_REGISTRY: Dict[str, Union[str, Type[BasePerpAdapter]]] = {
+    "standx": "adapters.standx_adapter:StandXAdapter",
+    "nado": "adapters.nado_adapter:NadoAdapter",
     # 未来可以添加更多交易所适配器
-    # "nado": NadoAdapter,
 }
 
+# 异步适配器注册表
+_ASYNC_ADAPTER_REGISTRY: Dict[str, Union[str, Type[AsyncBasePerpAdapter]]] = {
+    "standx": "adapters.async_standx_adapter:AsyncStandXAdapter"
+}
+
+
+def _load_adapter_class(registry: Dict[str, Any], exchange_name: str) -> type:
+    """解析注册表中的 "模块:类名"，导入后替换为类本身"""
+    adapter_class = registry[exchange_name]
+    if isinstance(adapter_class, str):
+        module_name, class_name = adapter_class.split(":")
+        adapter_class = getattr(importlib.import_module(module_name), class_name)
+        registry[exchange_name] = adapter_class
+    return adapter_class
+
+
+def _resolve_exchange_name(config: Dict[str, Any], registry: Dict[str, Any]) -> str:
+    exchange_name = config.get("exchange_name")
+    
+    if not exchange_name:
+        raise ValueError("配置中必须包含 'exchange_name' 字段")
+    
+    exchange_name = exchange_name.lower()
+    
+    if exchange_name not in registry:
+        available = ", ".join(registry.keys())
+        raise ValueError(
+            f"不支持的交易所: {exchange_name}. "
+            f"支持的交易所: {available}"
+        )
+    
+    return exchange_name
+
 
 def create_adapter(config: Dict[str, Any]) -> BasePerpAdapter:
     """
@@ -38,23 +75,37 @@ def create_adapter(config: Dict[str, Any]) -> BasePerpAdapter:
         >>> adapter = create_adapter(config)
         >>> adapter.connect()
     """
-    exchange_name = config.get("exchange_name")
+    exchange_name = _resolve_exchange_name(config, _ADAPTER_REGISTRY)
     
-    if not exchange_name:
-        raise ValueError("配置中必须包含 'exchange_name' 字段")
-    
-    exchange_name = exchange_name.lower()
-    
-    if exchange_name not in _ADAPTER_REGISTRY:
-        available = ", ".join(_ADAPTER_REGISTRY.keys())
-        raise ValueError(
-            f"不支持的交易所: {exchange_name}. "
-            f"支持的交易所: {available}"
-        )
+    try:
+        adapter_class = _load_adapter_class(_ADAPTER_REGISTRY, exchange_name)
+        return adapter_class(config)
+    except Exception as e:
+        raise ValueError(f"创建适配器失败: {e}")
+
+
+def create_async_adapter(config: Dict[str, Any]) -> AsyncBasePerpAdapter:
+    """
+    根据配置创建异步适配器实例
     
-    adapter_class = _ADAPTER_REGISTRY[exchange_name]
+    Args:
+        config: 配置字典，必须包含 "exchange_name" 字段
+        
+    Returns:
+        AsyncBasePerpAdapter: 异步适配器实例
+        
+    Raises:
+        ValueError: 如果交易所名称不支持或配置无效
+        
+    Example:
+        >>> adapter = create_async_adapter({"exchange_name": "standx", "private_key": "0x..."})
+        >>> await adapter.connect()
+        >>> await adapter.place_orders([{"symbol": "BTC-USD", "side": "buy", ...}, ...])
+    """
+    exchange_name = _resolve_exchange_name(config, _ASYNC_ADAPTER_REGISTRY)
     
     try:
+        adapter_class = _load_adapter_class(_ASYNC_ADAPTER_REGISTRY, exchange_name)
         return adapter_class(config)
     except Exception as e:
         raise ValueError(f"创建适配器失败: {e}")
@@ -80,6 +131,20 @@ def register_adapter(exchange_name: str, adapter_class: Type[BasePerpAdapter]):
     _ADAPTER_REGISTRY[exchange_name.lower()] = adapter_class
 
 
+def register_async_adapter(exchange_name: str, adapter_class: Type[AsyncBasePerpAdapter]):
+    """
+    注册新的异步适配器类
+    
+    Args:
+        exchange_name: 交易所名称（小写）
+        adapter_class: 适配器类，必须继承自 AsyncBasePerpAdapter
+    """
+    if not issubclass(adapter_class, AsyncBasePerpAdapter):
+        raise ValueError("适配器类必须继承自 AsyncBasePerpAdapter")
+    
+    _ASYNC_ADAPTER_REGISTRY[exchange_name.lower()] = adapter_class
+
+
 def get_available_exchanges() -> list:
     """
     获取所有可用的交易所列表
@@ -0,0 +1,741 @@
+"""
+Nado Exchange Adapter Implementation
+
+This module implements BasePerpAdapter for Nado exchange.
+
+除了 BasePerpAdapter 的单笔接口外，还提供网格重挂接口：
+把一次网格移动（撤单集合 + 下单集合）合并为最少的签名请求——
+cancel_and_place 在同一个请求里撤掉所有旧单并挂出第一张新单，
+剩余新单通过 place_orders 一次批量提交，整格移动只需一到两次往返。
+"""
+import os
+import sys
+import time
+from collections import Counter
+from decimal import Decimal
+from typing import Dict, Any, Optional, List, Tuple
+
+# 添加项目路径（nado_protocol 以顶层包形式导入）
+project_root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "exchange", "exchange_nado"))
+
+from adapters.base_adapter import BasePerpAdapter, Balance, Position, Order, SymbolPrecision, FLOOR
+from adapters.order_cache import OpenOrderCache
+
+from eth_account import Account
+from nado_protocol.engine_client import EngineClient, EngineClientOpts
+from nado_protocol.engine_client.types.execute import (
+    CancelAndPlaceParams,
+    CancelOrdersParams,
+    CancelProductOrdersParams,
+    OrderParams,
+    PlaceMarketOrderParams,
+    PlaceOrderParams,
+    PlaceOrdersParams,
+)
+from nado_protocol.utils.backend import NadoBackendURL
+from nado_protocol.utils.bytes32 import subaccount_to_bytes32, subaccount_to_hex
+from nado_protocol.utils.execute import MarketOrderParams
+from nado_protocol.utils.expiration import OrderType, get_expiration_timestamp
+from nado_protocol.utils.math import round_x18, to_x18
+from nado_protocol.utils.order import build_appendix
+from ratelimit import create_rate_limiter
+
+
+X18 = Decimal(10**18)
+
+ENGINE_URLS = {
+    "mainnet": NadoBackendURL.MAINNET_GATEWAY.value,
+    "testnet": NadoBackendURL.TESTNET_GATEWAY.value,
+    "devnet": NadoBackendURL.DEVNET_GATEWAY.value,
+}
+
+# 订单有效期 -> Nado appendix 订单类型
+TIME_IN_FORCE_MAP = {
+    "gtc": OrderType.DEFAULT,
+    "ioc": OrderType.IOC,
+    "fok": OrderType.FOK,
+    "post_only": OrderType.POST_ONLY,
+}
+
+# 网格重挂的请求类型
+CANCEL_ORDERS = "cancel_orders"
+CANCEL_AND_PLACE = "cancel_and_place"
+PLACE_ORDER = "place_order"
+PLACE_ORDERS = "place_orders"
+
+
+def from_x18(value: Any) -> Decimal:
+    """x18 定点整数 -> Decimal"""
+    return Decimal(int(value)) / X18
+
+
+def normalize_side(side: str) -> str:
+    """转换 side: long/short -> buy/sell"""
+    if side in ["long", "buy"]:
+        return "buy"
+    if side in ["short", "sell"]:
+        return "sell"
+    return side
+
+
+def response_digest(response: Any) -> Optional[str]:
+    """下单类执行回报中的订单摘要（没有则返回 None）"""
+    return getattr(response.data, "digest", None) if response.data is not None else None
+
+
+def parse_order(order_data: Any, symbol: str, precision: Optional[SymbolPrecision] = None) -> Order:
+    """将 OrderData 转换为 Order（order_id 为订单摘要）"""
+    amount = int(order_data.amount)
+    unfilled = int(order_data.unfilled_amount)
+    filled = abs(amount) - abs(unfilled)
+    return Order(
+        order_id=order_data.digest,
+        symbol=symbol,
+        side="buy" if amount > 0 else "sell",
+        order_type="limit",
+        quantity=from_x18(abs(amount)),
+        price=from_x18(order_data.price_x18),
+        filled_quantity=from_x18(filled),
+        status="partially_filled" if filled > 0 else "open",
+        created_at=int(order_data.placed_at) * 1000 if order_data.placed_at else None,
+        precision=precision,
+    )
+
+
+def order_key(
+    side: str,
+    price: Decimal,
+    quantity: Decimal,
+    precision: Optional[SymbolPrecision] = None
+) -> Tuple[str, Any, Any]:
+    """
+    网格档位键：方向 / 价格 / 剩余数量
+
+    precision 已知时价格 / 数量按交易对步长向下取整为整数 tick / lot（与 _order_params 下单时的取整一致，
+    目标价 100.123 与交易所上 100.12 的挂单视为同一档）；否则按 Decimal 归一化（'1.0' 与 '1' 视为同一档）
+    """
+    if precision is not None:
+        return (
+            normalize_side(side),
+            precision.price_to_ticks(price, FLOOR),
+            precision.size_to_lots(quantity, FLOOR),
+        )
+    return normalize_side(side), Decimal(str(price)).normalize(), Decimal(str(quantity)).normalize()
+
+
+def diff_grid(
+    open_orders: List[Order],
+    target_orders: List[Dict[str, Any]],
+    precision: Optional[SymbolPrecision] = None
+) -> Tuple[List[Order], List[Dict[str, Any]], List[Order]]:
+    """
+    对比当前挂单与目标网格
+
+    方向 / 价格 / 剩余数量一致的挂单保留，其余撤掉；目标中没有被现有挂单覆盖的档位需要新挂。
+
+    Args:
+        open_orders: 当前未成交订单
+        target_orders: 目标网格，每项至少包含 side / price / quantity
+        precision: 交易对精度，目标价格 / 数量先按步长取整再比较（不在步长上的网格不会每次全部重挂）
+
+    Returns:
+        (需要撤销的订单, 需要新挂的目标订单, 保留的订单)
+    """
+    wanted = Counter(order_key(o["side"], o["price"], o["quantity"], precision) for o in target_orders)
+    to_cancel, kept = [], []
+    for order in open_orders:
+        key = order_key(order.side, order.price, order.quantity - order.filled_quantity, precision)
+        if wanted[key] > 0:
+            wanted[key] -= 1
+            kept.append(order)
+        else:
+            to_cancel.append(order)
+    to_place = []
+    for target in target_orders:
+        key = order_key(target["side"], target["price"], target["quantity"], precision)
+        if wanted[key] > 0:
+            wanted[key] -= 1
+            to_place.append(target)
+    return to_cancel, to_place, kept
+
+
+def plan_requote(
+    cancel_ids: List[str],
+    new_orders: List[Any],
+    max_batch_orders: Optional[int] = None
+) -> List[Tuple[str, List[str], List[Any]]]:
+    """
+    把 (撤单集合, 下单集合) 拆成最少的执行请求
+
+    - 只撤单：一次 cancel_orders
+    - 有撤有挂：一次 cancel_and_place（撤全部旧单 + 挂第一张新单，原子执行），
+      其余新单一次 place_orders
+    - 只挂单：一次 place_orders（单张时 place_order）
+
+    Args:
+        cancel_ids: 需要撤销的订单摘要
+        new_orders: 需要新挂的订单
+        max_batch_orders: 单个 place_orders 请求的最大订单数（None 表示不拆分）
+
+    Returns:
+        [(请求类型, 撤单摘要列表, 下单列表), ...]，按执行顺序排列
+    """
+    steps: List[Tuple[str, List[str], List[Any]]] = []
+    remaining = list(new_orders)
+    if cancel_ids:
+        if remaining:
+            steps.append((CANCEL_AND_PLACE, list(cancel_ids), remaining[:1]))
+            remaining = remaining[1:]
+        else:
+            steps.append((CANCEL_ORDERS, list(cancel_ids), []))
+    size = max_batch_orders or len(remaining) or 1
+    for start in range(0, len(remaining), size):
+        batch = remaining[start:start + size]
+        steps.append((PLACE_ORDER if len(batch) == 1 else PLACE_ORDERS, [], batch))
+    return steps
+
+
+class NadoAdapter(BasePerpAdapter):
+    """Nado 交易所适配器实现"""
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        初始化 Nado 适配器
+
+        Args:
+            config: 配置字典，必须包含：
+                - exchange_name: "nado"
+                - private_key: 钱包私钥
+                - network: "mainnet" / "testnet" / "devnet"（可选，默认 mainnet）
+                - engine_url: 网关地址（可选，覆盖 network 对应的默认地址）
+                - subaccount_name: 子账户名（可选，默认 "default"）
+                - linked_signer_private_key: 已绑定的签名私钥（可选，用于代替主钱包签名）
+                - order_ttl: 限价单有效期（秒，默认 30 天）
+                - max_batch_orders: 单个 place_orders 请求的最大订单数（可选，默认不拆分）
+                - order_sync_interval: 本地订单簿与 REST 快照对账间隔（秒，默认 30）
+                - rate_limit: 接口限流配置（可选），字段见 ratelimit.factory
+                - rate_limiter: 共享的限流器实例（可选，优先于 rate_limit）
+        """
+        super().__init__(config)
+        self.private_key = config.get("private_key")
+        if not self.private_key:
+            raise ValueError("配置中必须包含 private_key")
+
+        network = config.get("network", "mainnet")
+        engine_url = config.get("engine_url") or ENGINE_URLS.get(network)
+        if not engine_url:
+            raise ValueError(f"不支持的 Nado 网络: {network}")
+
+        self.account = Account.from_key(self.private_key)
+        self.wallet_address = self.account.address
+        self.subaccount_name = config.get("subaccount_name", "default")
+        self.subaccount = subaccount_to_hex(self.wallet_address, self.subaccount_name)
+        self._sender = subaccount_to_bytes32(self.wallet_address, self.subaccount_name)
+
+        linked_key = config.get("linked_signer_private_key")
+        self.client = EngineClient(
+            EngineClientOpts(
+                url=engine_url,
+                signer=self.account,
+                linked_signer=Account.from_key(linked_key) if linked_key else None,
+                rate_limiter=config.get("rate_limiter") or create_rate_limiter(config.get("rate_limit"), "nado"),
+            )
+        )
+
+        self.order_ttl = int(config.get("order_ttl", 30 * 24 * 3600))
+        self.max_batch_orders = config.get("max_batch_orders")
+        # 交易对 -> {"product_id", "price_increment_x18", "size_increment", "min_size"}
+        self.markets: Dict[str, Dict[str, int]] = {}
+        self._product_symbols: Dict[int, str] = {}
+
+        # 本地未成交订单簿（order_id 为订单摘要，下单前即可在本地算出）
+        self.order_cache = OpenOrderCache()
+        self.order_sync_interval = float(config.get("order_sync_interval", 30))
+
+    def connect(self) -> bool:
+        """加载验签合约、链 ID 和永续合约交易对信息"""
+        try:
+            contracts = self.client.get_contracts()
+            self.client.endpoint_addr = contracts.endpoint_addr
+            self.client.chain_id = int(contracts.chain_id)
+            self.load_markets()
+            return True
+        except Exception as e:
+            raise Exception(f"Nado 连接失败: {e}")
+
+    def load_markets(self):
+        """加载永续合约交易对（交易对 -> 产品ID / 价格步长 / 数量步长）"""
+        symbols = self.client.get_symbols(product_type="perp").symbols
+        self.markets = {
+            symbol: {
+                "product_id": int(info.product_id),
+                "price_increment_x18": int(info.price_increment_x18),
+                "size_increment": int(info.size_increment),
+                "min_size": int(info.min_size),
+            }
+            for symbol, info in symbols.items()
+        }
+        self._product_symbols = {m["product_id"]: symbol for symbol, m in self.markets.items()}
+        for symbol, market in self.markets.items():
+            if market["price_increment_x18"] > 0 and market["size_increment"] > 0:
+                self.set_symbol_precision(
+                    symbol, from_x18(market["price_increment_x18"]), from_x18(market["size_increment"])
+                )
+
+    def _market(self, symbol: str) -> Dict[str, int]:
+        market = self.markets.get(symbol)
+        if market is None:
+            raise ValueError(f"未知交易对: {symbol}（请先调用 connect()）")
+        return market
+
+    def _symbol(self, product_id: int) -> str:
+        return self._product_symbols.get(product_id, str(product_id))
+
+    # ---------- 账户 ----------
+
+    def get_balance(self) -> Balance:
+        """
+        查询账户余额
+
+        total_balance 为报价资产（产品 0）余额，equity 为未加权健康度，
+        available_balance 为初始保证金健康度（可用于开新仓的部分）。
+        """
+        try:
+            info = self.client.get_subaccount_info(self.subaccount)
+            quote = next((b for b in info.spot_balances if b.product_id == 0), None)
+            initial, _, unweighted = (from_x18(h.health) for h in info.healths[:3])
+            unrealized_pnl = sum(
+                (p.unrealized_pnl for p in self._parse_positions(info)), Decimal("0")
+            )
+            return Balance(
+                total_balance=from_x18(quote.balance.amount) if quote else Decimal("0"),
+                available_balance=initial,
+                equity=unweighted,
+                unrealized_pnl=unrealized_pnl,
+                margin_used=unweighted - initial,
+                margin_available=initial,
+            )
+        except Exception as e:
+            raise Exception(f"查询余额失败: {e}")
+
+    def _parse_positions(self, info: Any, symbol: Optional[str] = None) -> List[Position]:
+        oracle_prices = {p.product_id: from_x18(p.oracle_price_x18) for p in info.perp_products}
+        positions = []
+        for balance in info.perp_balances:
+            amount = from_x18(balance.balance.amount)
+            if amount == 0:
+                continue
+            position_symbol = self._symbol(balance.product_id)
+            if symbol is not None and position_symbol != symbol:
+                continue
+            v_quote = from_x18(balance.balance.v_quote_balance)
+            mark_price = oracle_prices.get(balance.product_id, Decimal("0"))
+            positions.append(Position(
+                symbol=position_symbol,
+                size=abs(amount),
+                side="long" if amount > 0 else "short",
+                # v_quote_balance 含已结算资金费，入场价为近似值
+                entry_price=abs(v_quote / amount),
+                mark_price=mark_price,
+                unrealized_pnl=amount * mark_price + v_quote,
+            ))
+        return positions
+
+    def get_positions(self, symbol: Optional[str] = None) -> List[Position]:
+        """查询持仓信息"""
+        try:
+            info = self.client.get_subaccount_info(self.subaccount)
+            return self._parse_positions(info, symbol)
+        except Exception as e:
+            raise Exception(f"查询持仓失败: {e}")
+
+    # ---------- 下单 ----------
+
+    def _order_params(
+        self,
+        symbol: str,
+        side: str,
+        quantity: Decimal,
+        price: Decimal,
+        time_in_force: str = "gtc",
+        reduce_only: bool = False,
+        post_only: bool = False,
+    ) -> PlaceOrderParams:
+        """构造限价单参数（价格 / 数量按交易对步长向下取整，nonce 在本地生成以便提前算出摘要）"""
+        market = self._market(symbol)
+        amount = round_x18(to_x18(quantity), market["size_increment"])
+        if amount == 0:
+            raise ValueError(f"订单数量过小: {quantity}")
+        order_type = OrderType.POST_ONLY if post_only else TIME_IN_FORCE_MAP.get(time_in_force)
+        if order_type is None:
+            raise ValueError(f"不支持的订单有效期: {time_in_force}")
+        return PlaceOrderParams(
+            product_id=market["product_id"],
+            order=OrderParams(
+                sender=self._sender,
+                priceX18=round_x18(to_x18(price), market["price_increment_x18"]),
+                amount=amount if normalize_side(side) == "buy" else -amount,
+                expiration=get_expiration_timestamp(self.order_ttl),
+                nonce=self.client.order_nonce(),
+                appendix=build_appendix(order_type, reduce_only=reduce_only),
+            ),
+        )
+
+    def _new_order(
+        self,
+        symbol: str,
+        params: PlaceOrderParams,
+        time_in_force: str,
+        reduce_only: bool,
+        client_order_id: Optional[str],
+    ) -> Order:
+        order = params.order
+        return Order(
+            order_id=self.client.get_order_digest(order, params.product_id),
+            symbol=symbol,
+            side="buy" if order.amount > 0 else "sell",
+            order_type="limit",
+            quantity=from_x18(abs(order.amount)),
+            price=from_x18(order.priceX18),
+            status="open",
+            time_in_force=time_in_force,
+            reduce_only=reduce_only,
+            client_order_id=client_order_id,
+        )
+
+    def place_order(
+        self,
+        symbol: str,
+        side: str,
+        order_type: str,
+        quantity: Decimal,
+        price: Optional[Decimal] = None,
+        time_in_force: str = "gtc",
+        reduce_only: bool = False,
+        client_order_id: Optional[str] = None,
+        **kwargs
+    ) -> Order:
+        """
+        下单
+
+        kwargs:
+            post_only: 只做 maker（限价单）
+            slippage: 市价单允许滑点（默认 0.005）
+        """
+        if order_type == "limit" and price is None:
+            raise ValueError("限价单必须指定价格")
+
+        try:
+            side_str = normalize_side(side)
+            if order_type == "market":
+                return self._place_market_order(symbol, side_str, quantity, reduce_only, client_order_id, **kwargs)
+
+            params = self._order_params(
+                symbol, side_str, quantity, price, time_in_force, reduce_only, kwargs.get("post_only", False)
+            )
+            order = self._new_order(symbol, params, time_in_force, reduce_only, client_order_id)
+            response = self.client.place_order(params)
+            order.order_id = response_digest(response) or order.order_id
+            if time_in_force == "gtc":
+                self.order_cache.on_placed(order)
+            return order
+        except Exception as e:
+            raise Exception(f"下单失败: {e}")
+
+    def _place_market_order(
+        self,
+        symbol: str,
+        side: str,
+        quantity: Decimal,
+        reduce_only: bool,
+        client_order_id: Optional[str],
+        **kwargs
+    ) -> Order:
+        market = self._market(symbol)
+        amount = round_x18(to_x18(quantity), market["size_increment"])
+        response = self.client.place_market_order(
+            PlaceMarketOrderParams(
+                product_id=market["product_id"],
+                market_order=MarketOrderParams(
+                    sender=self._sender,
+                    amount=amount if side == "buy" else -amount,
+                ),
+                slippage=kwargs.get("slippage"),
+                reduce_only=reduce_only,
+            )
+        )
+        return Order(
+            order_id=response_digest(response) or "",
+            symbol=symbol,
+            side=side,
+            order_type="market",
+            quantity=from_x18(amount),
+            status="pending",
+            time_in_force="fok",
+            reduce_only=reduce_only,
+            client_order_id=client_order_id,
+        )
+
+    def cancel_order(
+        self,
+        order_id: Optional[str] = None,
+        symbol: Optional[str] = None,
+        client_order_id: Optional[str] = None,
+    ) -> bool:
+        """
+        撤单
+
+        Args:
+            order_id: 订单摘要
+            symbol: 交易对符号（本地订单簿中没有该订单时必填）
+            client_order_id: 客户端订单ID（仅能撤销本地订单簿中的订单）
+        """
+        if not order_id and not client_order_id:
+            raise ValueError("必须提供 order_id 或 client_order_id")
+
+        cached = self.order_cache.get(order_id=order_id, client_order_id=client_order_id)
+        order_id = order_id or (cached.order_id if cached else None)
+        symbol = symbol or (cached.symbol if cached else None)
+        if not order_id or not symbol:
+            raise ValueError("Nado 撤单需要订单摘要和交易对")
+
+        return self.cancel_orders_by_ids(symbol, [order_id])
+
+    def cancel_orders_by_ids(self, symbol: str, order_id_list: List[str]) -> bool:
+        """
+        批量撤单（一次签名请求）
+
+        Args:
+            symbol: 交易对符号
+            order_id_list: 订单摘要列表
+        """
+        if not order_id_list:
+            return True
+        try:
+            product_id = self._market(symbol)["product_id"]
+            self.client.cancel_orders(
+                CancelOrdersParams(
+                    sender=self._sender,
+                    productIds=[product_id] * len(order_id_list),
+                    digests=list(order_id_list),
+                )
+            )
+            self.order_cache.on_cancelled(order_id_list)
+            return True
+        except Exception as e:
+            raise Exception(f"批量撤单失败: {e}")
+
+    def cancel_all_orders(
+        self,
+        symbol: Optional[str] = None,
+    ) -> bool:
+        """撤销所有订单（cancel_product_orders，一次请求）"""
+        try:
+            symbols = [symbol] if symbol else list(self.markets)
+            self.client.cancel_product_orders(
+                CancelProductOrdersParams(
+                    sender=self._sender,
+                    productIds=[self._market(s)["product_id"] for s in symbols],
+                )
+            )
+            self.order_cache.on_cancelled(
+                [o.order_id for o in self.order_cache.get_open_orders(symbol)]
+            )
+            return True
+        except Exception as e:
+            raise Exception(f"批量撤单失败: {e}")
+
+    # ---------- 网格重挂 ----------
+
+    def cancel_and_place_orders(
+        self,
+        symbol: str,
+        cancel_order_ids: List[str],
+        new_orders: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        撤掉一组订单并挂出一组新订单，合并为最少的签名请求（见 plan_requote）
+
+        cancel_and_place 请求是原子的：撤单与第一张新单要么同时生效，要么都不生效；
+        后续 place_orders 中单张订单失败不影响其余订单，失败项记录在 failed 中。
+
+        Args:
+            symbol: 交易对符号
+            cancel_order_ids: 需要撤销的订单摘要
+            new_orders: 新订单列表，每项包含 side / price / quantity，
+                可选 time_in_force / reduce_only / post_only / client_order_id
+
+        Returns:
+            {"cancelled": [订单摘要], "placed": [Order], "failed": [{"order": ..., "error": ...}], "requests": 请求数}
+        """
+        prepared = []
+        for spec in new_orders:
+            time_in_force = spec.get("time_in_force", "gtc")
+            reduce_only = spec.get("reduce_only", False)
+            params = self._order_params(
+                symbol, spec["side"], spec["quantity"], spec["price"],
+                time_in_force, reduce_only, spec.get("post_only", False)
+            )
+            order = self._new_order(symbol, params, time_in_force, reduce_only, spec.get("client_order_id"))
+            prepared.append((params, order))
+
+        product_id = self._market(symbol)["product_id"]
+        result: Dict[str, Any] = {"cancelled": [], "placed": [], "failed": [], "requests": 0}
+        try:
+            for kind, cancel_ids, batch in plan_requote(cancel_order_ids, prepared, self.max_batch_orders):
+                if kind in (CANCEL_ORDERS, CANCEL_AND_PLACE):
+                    cancel = CancelOrdersParams(
+                        sender=self._sender,
+                        productIds=[product_id] * len(cancel_ids),
+                        digests=cancel_ids,
+                    )
+                    if kind == CANCEL_ORDERS:
+                        self.client.cancel_orders(cancel)
+                    else:
+                        response = self.client.cancel_and_place(
+                            CancelAndPlaceParams(cancel_orders=cancel, place_order=batch[0][0])
+                        )
+                        self._on_requote_placed(result, batch[0][1], response_digest(response))
+                    self.order_cache.on_cancelled(cancel_ids)
+                    result["cancelled"].extend(cancel_ids)
+                elif kind == PLACE_ORDER:
+                    response = self.client.place_order(batch[0][0])
+                    self._on_requote_placed(result, batch[0][1], response_digest(response))
+                else:
+                    response = self.client.place_orders(
+                        PlaceOrdersParams(orders=[params for params, _ in batch])
+                    )
+                    items = response.data.place_orders if response.data is not None else []
+                    for (_, order), item in zip(batch, items):
+                        if item.error:
+                            result["failed"].append({"order": order, "error": item.error})
+                        else:
+                            self._on_requote_placed(result, order, item.digest)
+                result["requests"] += 1
+        except Exception as e:
+            raise Exception(f"网格重挂失败（已完成 {result['requests']} 个请求）: {e}")
+        return result
+
+    def _on_requote_placed(self, result: Dict[str, Any], order: Order, digest: Optional[str] = None):
+        order.order_id = digest or order.order_id
+        if order.time_in_force == "gtc":
+            self.order_cache.on_placed(order)
+        result["placed"].append(order)
+
+    def requote_grid(self, symbol: str, target_orders: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        把当前挂单调整为目标网格
+
+        与本地订单簿（get_cached_open_orders）做差分：按交易对步长取整后价格 / 数量不变的档位保留，
+        其余撤单与新挂单通过 cancel_and_place_orders 合并提交。
+
+        Args:
+            symbol: 交易对符号
+            target_orders: 目标网格，每项包含 side / price / quantity（可选字段同 cancel_and_place_orders）
+
+        Returns:
+            cancel_and_place_orders 的结果，另含 "kept": 保留的订单
+        """
+        open_orders = self.get_cached_open_orders(symbol=symbol)
+        to_cancel, to_place, kept = diff_grid(open_orders, target_orders, self.get_symbol_precision(symbol))
+        result = self.cancel_and_place_orders(symbol, [o.order_id for o in to_cancel], to_place)
+        result["kept"] = kept
+        return result
+
+    # ---------- 查询 ----------
+
+    def get_order(
+        self,
+        order_id: Optional[str] = None,
+        symbol: Optional[str] = None,
+        client_order_id: Optional[str] = None,
+    ) -> Optional[Order]:
+        """查询订单状态（仅返回未成交订单；已成交 / 已撤销返回 None）"""
+        cached = self.order_cache.get(order_id=order_id, client_order_id=client_order_id)
+        order_id = order_id or (cached.order_id if cached else None)
+        symbol = symbol or (cached.symbol if cached else None)
+        if not order_id or not symbol:
+            return None
+        try:
+            order_data = self.client.get_order(self._market(symbol)["product_id"], order_id)
+        except Exception:
+            return None
+        order = parse_order(order_data, symbol, self.get_symbol_precision(symbol))
+        if cached is not None:
+            order.client_order_id = cached.client_order_id
+        return order
+
+    def get_open_orders(
+        self,
+        symbol: Optional[str] = None,
+    ) -> List[Order]:
+        """查询所有未成交订单（REST 快照，同时与本地订单簿对账）"""
+        try:
+            started_at = time.time()
+            symbols = [symbol] if symbol else list(self.markets)
+            data = self.client.get_subaccount_multi_products_open_orders(
+                [self._market(s)["product_id"] for s in symbols], self.subaccount
+            )
+            orders, versions = [], {}
+            for product_orders in data.product_orders:
+                product_symbol = self._symbol(product_orders.product_id)
+                for order_data in product_orders.orders:
+                    order = parse_order(order_data, product_symbol, self.get_symbol_precision(product_symbol))
+                    cached = self.order_cache.get(order_id=order.order_id)
+                    if cached is not None:
+                        order.client_order_id = cached.client_order_id
+                        order.time_in_force = cached.time_in_force
+                        order.reduce_only = cached.reduce_only
+                    orders.append(order)
+                    versions[order.order_id] = order_data.unfilled_amount
+            self.order_cache.reconcile(orders, started_at, symbol=symbol, versions=versions)
+            return orders
+        except Exception as e:
+            raise Exception(f"查询未成交订单失败: {e}")
+
+    def get_cached_open_orders(
+        self,
+        symbol: Optional[str] = None,
+    ) -> List[Order]:
+        """从本地订单簿读取未成交订单，距上次对账超过 order_sync_interval 时先拉取快照"""
+        if self.order_cache.needs_sync(self.order_sync_interval):
+            return self.get_open_orders(symbol=symbol)
+        return self.order_cache.get_open_orders(symbol)
+
+    def get_ticker(self, symbol: str) -> Dict[str, Any]:
+        """获取买一 / 卖一价格"""
+        try:
+            price = self.client.get_market_price(self._market(symbol)["product_id"])
+            bid = float(from_x18(price.bid_x18))
+            ask = float(from_x18(price.ask_x18))
+            return {
+                "symbol": symbol,
+                "bid_price": bid or None,
+                "ask_price": ask or None,
+                "mid_price": (bid + ask) / 2 if bid and ask else None,
+                "last_price": None,
+                "mark_price": None,
+                "index_price": None,
+                "timestamp": int(time.time() * 1000),
+            }
+        except Exception as e:
+            raise Exception(f"获取价格失败: {e}")
+
+    def get_orderbook(
+        self,
+        symbol: str,
+        depth: int = 20,
+    ) -> Dict[str, Any]:
+        """获取订单簿（bids / asks 为 [价格, 数量] 列表）"""
+        try:
+            book = self.client.get_market_liquidity(self._market(symbol)["product_id"], depth)
+            return {
+                "symbol": symbol,
+                "bids": [[float(from_x18(p)), float(from_x18(q))] for p, q in book.bids],
+                "asks": [[float(from_x18(p)), float(from_x18(q))] for p, q in book.asks],
+                "timestamp": int(time.time() * 1000),
+            }
+        except Exception as e:
+            raise Exception(f"获取订单簿失败: {e}")
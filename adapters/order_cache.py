@@ -0,0 +1,253 @@
+"""
+Open Order Cache
+本地未成交订单簿
+
+适配器在下单 / 撤单成功后直接更新本地订单簿，策略每个周期对内存做差分；
+完整的 REST 快照只用于周期性对账（reconcile）。
+
+订单以客户端订单ID为主键（下单回报通常拿不到交易所订单ID），
+对账时按客户端订单ID把交易所订单ID补全。
+"""
+import threading
+import time
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from adapters.base_adapter import Order, from_units, parse_fixed
+
+
+OPEN_STATUSES = ("pending", "open", "partially_filled")
+
+
+def _price_key(order: Order) -> Optional[Tuple[int, int]]:
+    """
+    价格档位 key：原始价格的定点表示 (尾数, 小数位)，去掉末尾的 0
+
+    直接解析 raw_price，不触发 Decimal 转换；"65000.50" 与 "65000.5" 落在同一档位，
+    不依赖 SymbolPrecision，不在 tick 网格上的价格也能索引
+    """
+    raw = order.raw_price
+    if raw is None:
+        return None
+    mantissa, decimals = parse_fixed(raw)
+    while decimals and mantissa % 10 == 0:
+        mantissa //= 10
+        decimals -= 1
+    return mantissa, decimals
+
+
+class OpenOrderCache:
+    """本地未成交订单簿（按订单ID / 客户端订单ID / 价格档位索引）"""
+
+    def __init__(self, grace_period: float = 3.0):
+        """
+        初始化订单簿
+
+        Args:
+            grace_period: 对账保护期（秒）。快照发出前 grace_period 秒内本地新下的单
+                即使不在快照中也保留；撤单后 grace_period 秒内快照中仍出现的单视为撤单在途，不重新加入
+        """
+        self.grace_period = grace_period
+        self._lock = threading.RLock()
+        self._orders: Dict[str, Order] = {}
+        self._versions: Dict[str, str] = {}
+        self._placed_at: Dict[str, float] = {}
+        self._by_order_id: Dict[str, str] = {}
+        self._by_client_id: Dict[str, str] = {}
+        self._levels: Dict[Tuple[str, str, Tuple[int, int]], Set[str]] = {}
+        self._level_of: Dict[str, Tuple[str, str, Tuple[int, int]]] = {}
+        self._cancelled: Dict[str, float] = {}
+        self.synced_at: Optional[float] = None
+
+    # ---------- 索引维护 ----------
+
+    @staticmethod
+    def _key(order: Order) -> str:
+        return f"c:{order.client_order_id}" if order.client_order_id else f"o:{order.order_id}"
+
+    def _find(self, order_id: Optional[str] = None, client_order_id: Optional[str] = None) -> Optional[str]:
+        if client_order_id and client_order_id in self._by_client_id:
+            return self._by_client_id[client_order_id]
+        if order_id and str(order_id) in self._by_order_id:
+            return self._by_order_id[str(order_id)]
+        return None
+
+    def _add(self, key: str, order: Order, version: Optional[str] = None):
+        self._remove(key)
+        self._orders[key] = order
+        if version is not None:
+            self._versions[key] = version
+        if order.order_id:
+            self._by_order_id[str(order.order_id)] = key
+        if order.client_order_id:
+            self._by_client_id[order.client_order_id] = key
+        price = _price_key(order)
+        if price is not None:
+            level = (order.symbol, order.side, price)
+            self._levels.setdefault(level, set()).add(key)
+            self._level_of[key] = level
+
+    def _remove(self, key: str) -> Optional[Order]:
+        order = self._orders.pop(key, None)
+        if order is None:
+            return None
+        self._versions.pop(key, None)
+        self._placed_at.pop(key, None)
+        if order.order_id and self._by_order_id.get(str(order.order_id)) == key:
+            del self._by_order_id[str(order.order_id)]
+        if order.client_order_id and self._by_client_id.get(order.client_order_id) == key:
+            del self._by_client_id[order.client_order_id]
+        level = self._level_of.pop(key, None)
+        keys = self._levels.get(level) if level is not None else None
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._levels[level]
+        return order
+
+    # ---------- 本地回报 ----------
+
+    def on_placed(self, order: Order):
+        """下单成功回报（order_id 可以为空，此时必须带 client_order_id）"""
+        if order.created_at is None:
+            order.created_at = int(time.time() * 1000)
+        with self._lock:
+            key = self._key(order)
+            self._add(key, order)
+            self._placed_at[key] = time.time()
+
+    def on_cancelled(
+        self,
+        order_ids: Optional[Iterable] = None,
+        client_order_ids: Optional[Iterable[str]] = None
+    ) -> int:
+        """撤单成功回报，返回移除的订单数"""
+        now = time.time()
+        removed = 0
+        with self._lock:
+            for order_id in order_ids or []:
+                self._cancelled[f"o:{order_id}"] = now
+                key = self._find(order_id=str(order_id))
+                if key is not None and self._remove(key) is not None:
+                    removed += 1
+            for client_order_id in client_order_ids or []:
+                self._cancelled[f"c:{client_order_id}"] = now
+                key = self._find(client_order_id=client_order_id)
+                if key is not None and self._remove(key) is not None:
+                    removed += 1
+        return removed
+
+    def apply(self, order: Order, version: Optional[str] = None):
+        """应用单条订单更新（例如推送），非未成交状态时移除"""
+        with self._lock:
+            key = self._find(order.order_id, order.client_order_id)
+            if order.status not in OPEN_STATUSES:
+                if key is not None:
+                    self._remove(key)
+                return
+            if key is not None:
+                placed_at = self._placed_at.get(key)
+                self._remove(key)
+                if placed_at is not None:
+                    self._placed_at[self._key(order)] = placed_at
+            self._add(self._key(order), order, version)
+
+    # ---------- 对账 ----------
+
+    def reconcile(
+        self,
+        orders: List[Order],
+        started_at: float,
+        symbol: Optional[str] = None,
+        versions: Optional[Dict[str, str]] = None
+    ) -> Dict[str, int]:
+        """
+        用 REST 快照对账
+
+        Args:
+            orders: 快照中的未成交订单
+            started_at: 发出快照请求的时间（time.time()）
+            symbol: 快照对应的交易对（None 表示全部交易对）
+            versions: 订单ID -> 版本标记（如 updated_at），供 version() 判断是否需要重新解析
+
+        Returns:
+            {"added": n, "removed": n, "updated": n}
+        """
+        versions = versions or {}
+        cutoff = started_at - self.grace_period
+        diff = {"added": 0, "removed": 0, "updated": 0}
+        with self._lock:
+            self._cancelled = {k: t for k, t in self._cancelled.items() if t >= cutoff}
+            seen: Set[str] = set()
+            for order in orders:
+                if (f"o:{order.order_id}" in self._cancelled
+                        or (order.client_order_id and f"c:{order.client_order_id}" in self._cancelled)):
+                    continue
+                key = self._find(order.order_id, order.client_order_id)
+                version = versions.get(str(order.order_id))
+                if key is None:
+                    diff["added"] += 1
+                elif self._versions.get(key) != version or self._orders[key] is not order:
+                    diff["updated"] += 1
+                if key is not None:
+                    self._remove(key)
+                new_key = self._key(order)
+                self._add(new_key, order, version)
+                seen.add(new_key)
+
+            for key, order in list(self._orders.items()):
+                if key in seen or (symbol is not None and order.symbol != symbol):
+                    continue
+                if self._placed_at.get(key, 0.0) >= cutoff:
+                    # 快照发出前刚下的单，可能尚未出现在快照中
+                    continue
+                self._remove(key)
+                diff["removed"] += 1
+            self.synced_at = time.time()
+        return diff
+
+    # ---------- 查询 ----------
+
+    def get(self, order_id: Optional[str] = None, client_order_id: Optional[str] = None) -> Optional[Order]:
+        with self._lock:
+            key = self._find(order_id, client_order_id)
+            return self._orders.get(key) if key is not None else None
+
+    def version(self, order_id: str) -> Optional[str]:
+        """对账时记录的版本标记"""
+        with self._lock:
+            key = self._by_order_id.get(str(order_id))
+            return self._versions.get(key) if key is not None else None
+
+    def get_open_orders(self, symbol: Optional[str] = None) -> List[Order]:
+        with self._lock:
+            return [o for o in self._orders.values() if symbol is None or o.symbol == symbol]
+
+    def price_levels(self, symbol: str, side: str) -> Dict[Decimal, List[Order]]:
+        """指定方向的价格档位 -> 该价位的订单"""
+        with self._lock:
+            return {
+                from_units(price[0], (1, price[1])): [self._orders[key] for key in keys]
+                for (sym, s, price), keys in self._levels.items()
+                if sym == symbol and s == side
+            }
+
+    def age(self) -> Optional[float]:
+        """距上次对账的秒数，从未对账返回 None"""
+        if self.synced_at is None:
+            return None
+        return time.time() - self.synced_at
+
+    def needs_sync(self, interval: float) -> bool:
+        age = self.age()
+        return age is None or age >= interval
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._orders):
+                self._remove(key)
+            self._cancelled.clear()
+            self.synced_at = None
+
+    def __len__(self) -> int:
+        return len(self._orders)
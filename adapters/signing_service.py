@@ -0,0 +1,359 @@
+"""
+Signing Service
+多进程批量签名服务
+
+ECDSA（GRVT / Nado 的 EIP-712 摘要）和 ed25519（StandX 请求签名）都是 CPU 密集且持有 GIL，
+一个进程同时给多个账户重新挂单时签名会串行在一个核上。
+
+SigningService 按账户把签名任务分片到多个单进程 worker：
+- 账户注册时分配到账户数最少的 worker，之后该账户的签名都在同一个 worker 上执行，
+  私钥只在该账户第一次提交到 worker 时随批次发送一次，之后 worker 使用缓存的私钥对象；
+- sign_many(account, messages) 一次提交一批消息（例如一整个网格的订单摘要）；
+- sign(account, message) 在同一轮事件循环内自动合并为一批，适合 gather 并发下单时逐单调用；
+- worker 进程意外退出（OOM、被信号杀掉）时重建该 worker 的进程池，私钥重新发送，失败的批次重试一次；
+- get_stats() 返回每个 worker 的签名数量与吞吐（按 worker 内实际签名耗时计算）。
+
+签名结果均为原始字节：
+    ed25519   -> 64 字节签名
+    secp256k1 -> 65 字节 r || s || v（v 为 27 / 28，与 eth_account 一致）
+"""
+import asyncio
+import base64
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+ED25519 = "ed25519"
+SECP256K1 = "secp256k1"
+SCHEMES = (ED25519, SECP256K1)
+
+
+# ---------- worker 进程 ----------
+
+_WORKER_KEYS: Dict[str, Any] = {}
+
+
+def _load_key(scheme: str, private_key: bytes):
+    if scheme == ED25519:
+        from cryptography.hazmat.primitives.asymmetric import ed25519
+        return ed25519.Ed25519PrivateKey.from_private_bytes(private_key)
+    if scheme == SECP256K1:
+        from eth_keys import keys
+        return keys.PrivateKey(private_key)
+    raise ValueError(f"不支持的签名算法: {scheme}")
+
+
+def sign_with_key(scheme: str, key: Any, message: bytes) -> bytes:
+    """用已加载的私钥对象签名（worker 内和本地回退共用）"""
+    if scheme == ED25519:
+        return key.sign(message)
+    v, r, s = key.sign_msg_hash(message).vrs
+    return r.to_bytes(32, "big") + s.to_bytes(32, "big") + bytes([v + 27])
+
+
+def _sign_batch(
+    account: str,
+    scheme: str,
+    private_key: Optional[bytes],
+    messages: Sequence[bytes]
+) -> Tuple[List[bytes], float, int]:
+    """
+    worker 入口：返回 (签名列表, 签名耗时秒, worker pid)
+
+    private_key 只在账户第一次提交到该 worker（或重新注册）时传入，之后为 None，使用缓存的私钥对象
+    """
+    if private_key is not None:
+        _WORKER_KEYS[account] = _load_key(scheme, private_key)
+    key = _WORKER_KEYS.get(account)
+    if key is None:
+        raise KeyError(f"worker 中没有账户私钥: {account}")
+    started = time.perf_counter()
+    signatures = [sign_with_key(scheme, key, message) for message in messages]
+    return signatures, time.perf_counter() - started, os.getpid()
+
+
+def _warmup() -> int:
+    return os.getpid()
+
+
+# ---------- 主进程 ----------
+
+class _Worker:
+    def __init__(self, index: int, mp_context):
+        self.index = index
+        self.mp_context = mp_context
+        self.executor = ProcessPoolExecutor(max_workers=1, mp_context=mp_context)
+        self.accounts = 0
+        self.pid: Optional[int] = None
+        self.batches = 0
+        self.messages = 0
+        self.busy = 0.0
+        self.restarts = 0
+        # 已把私钥发送到该 worker 的账户（worker 按提交顺序串行执行，之后的批次可以只发消息）
+        self.loaded: set = set()
+
+    def restart(self, broken: ProcessPoolExecutor):
+        """进程池损坏后重建（同一个损坏的进程池只重建一次），新进程中没有任何私钥"""
+        if self.executor is not broken:
+            return
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.executor = ProcessPoolExecutor(max_workers=1, mp_context=self.mp_context)
+        self.loaded.clear()
+        self.pid = None
+        self.restarts += 1
+
+    def record(self, count: int, elapsed: float, pid: int):
+        self.pid = pid
+        self.batches += 1
+        self.messages += count
+        self.busy += elapsed
+
+
+class _Account:
+    def __init__(self, scheme: str, private_key: bytes, worker: _Worker):
+        self.scheme = scheme
+        self.private_key = private_key
+        self.worker = worker
+        self.pending: List[Tuple[bytes, asyncio.Future]] = []
+
+
+class SigningService:
+    """按账户分片的多进程签名服务"""
+
+    def __init__(self, workers: Optional[int] = None, start_method: str = "spawn"):
+        """
+        初始化签名服务（worker 进程在首次使用时启动）
+
+        Args:
+            workers: worker 进程数，默认 CPU 核数 - 1（至少 1）
+            start_method: multiprocessing 启动方式，默认 spawn（避免 fork 带入事件循环 / 线程状态）
+        """
+        count = workers or max(1, (os.cpu_count() or 2) - 1)
+        context = multiprocessing.get_context(start_method)
+        self._workers = [_Worker(i, context) for i in range(count)]
+        self._accounts: Dict[str, _Account] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        # sign() 合并批次的 flush 任务，保留引用直到完成（事件循环只持有弱引用）
+        self._flush_tasks: set = set()
+
+    def register(self, account: str, scheme: str, private_key: bytes) -> int:
+        """
+        注册账户私钥，返回分配到的 worker 编号
+
+        Args:
+            account: 账户标识（同一个服务内唯一）
+            scheme: ED25519 或 SECP256K1
+            private_key: 32 字节私钥
+        """
+        if scheme not in SCHEMES:
+            raise ValueError(f"不支持的签名算法: {scheme}")
+        if isinstance(private_key, str):
+            private_key = bytes.fromhex(private_key[2:] if private_key.startswith("0x") else private_key)
+        if len(private_key) != 32:
+            raise ValueError("Private key must be 32 bytes")
+        with self._lock:
+            existing = self._accounts.get(account)
+            if existing is not None:
+                existing.worker.accounts -= 1
+            for w in self._workers:
+                w.loaded.discard(account)
+            worker = min(self._workers, key=lambda w: w.accounts)
+            worker.accounts += 1
+            self._accounts[account] = _Account(scheme, bytes(private_key), worker)
+            return worker.index
+
+    def _account(self, account: str) -> _Account:
+        if self._closed:
+            raise RuntimeError("SigningService 已关闭")
+        entry = self._accounts.get(account)
+        if entry is None:
+            raise KeyError(f"账户未注册签名服务: {account}")
+        return entry
+
+    def _submit(self, account: str, entry: _Account, messages: Sequence[bytes]) -> Tuple[ProcessPoolExecutor, Future]:
+        """
+        提交一个批次：私钥只随该账户在 worker 上的第一个批次发送，返回 (提交到的进程池, future)
+
+        标记与提交在同一把锁内完成，worker 按提交顺序执行，之后的批次一定在私钥加载之后。
+        """
+        with self._lock:
+            executor = entry.worker.executor
+            private_key = None if account in entry.worker.loaded else entry.private_key
+            try:
+                future = executor.submit(_sign_batch, account, entry.scheme, private_key, list(messages))
+            except BrokenProcessPool as e:
+                future = Future()
+                future.set_exception(e)
+            entry.worker.loaded.add(account)
+        return executor, future
+
+    def _batch_failed(self, account: str, entry: _Account, executor: ProcessPoolExecutor, error: Exception) -> bool:
+        """
+        批次失败后的处理，返回是否应重试
+
+        进程池损坏（worker 进程被杀）时重建进程池并重试；其他错误下首个批次的私钥可能没有加载，下次重新发送。
+        """
+        with self._lock:
+            if isinstance(error, BrokenProcessPool) and not self._closed:
+                entry.worker.restart(executor)
+                return True
+            entry.worker.loaded.discard(account)
+            return False
+
+    async def sign_many(self, account: str, messages: Sequence[bytes]) -> List[bytes]:
+        """在账户所在 worker 上批量签名，结果顺序与 messages 一致"""
+        if not messages:
+            return []
+        entry = self._account(account)
+        for attempt in range(2):
+            executor, future = self._submit(account, entry, messages)
+            try:
+                signatures, elapsed, pid = await asyncio.wrap_future(future)
+                break
+            except Exception as e:
+                if not self._batch_failed(account, entry, executor, e) or attempt:
+                    raise
+        entry.worker.record(len(messages), elapsed, pid)
+        return signatures
+
+    def sign_many_sync(self, account: str, messages: Sequence[bytes]) -> List[bytes]:
+        """同步版本的 sign_many（阻塞当前线程）"""
+        if not messages:
+            return []
+        entry = self._account(account)
+        for attempt in range(2):
+            executor, future = self._submit(account, entry, messages)
+            try:
+                signatures, elapsed, pid = future.result()
+                break
+            except Exception as e:
+                if not self._batch_failed(account, entry, executor, e) or attempt:
+                    raise
+        entry.worker.record(len(messages), elapsed, pid)
+        return signatures
+
+    async def sign(self, account: str, message: bytes) -> bytes:
+        """
+        签名单条消息
+
+        同一轮事件循环内对同一账户的多次调用合并为一次 sign_many，
+        gather 并发下单时每个请求单独 await 也只产生一次跨进程调用。
+        """
+        entry = self._account(account)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        entry.pending.append((message, future))
+        if len(entry.pending) == 1:
+            loop.call_soon(self._schedule_flush, account, entry)
+        return await future
+
+    def _schedule_flush(self, account: str, entry: _Account):
+        task = asyncio.ensure_future(self._flush(account, entry))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self, account: str, entry: _Account):
+        batch, entry.pending = entry.pending, []
+        try:
+            signatures = await self.sign_many(account, [message for message, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), signature in zip(batch, signatures):
+            if not future.done():
+                future.set_result(signature)
+
+    async def start(self):
+        """提前启动所有 worker 进程（否则首个签名请求会承担进程启动耗时）"""
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(*(loop.run_in_executor(w.executor, _warmup) for w in self._workers))
+        for worker, pid in zip(self._workers, pids):
+            worker.pid = pid
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """每个 worker 的账户数 / 批次数 / 签名数 / 签名耗时 / 吞吐（条每秒）/ 进程池重建次数"""
+        return [
+            {
+                "worker": w.index,
+                "pid": w.pid,
+                "accounts": w.accounts,
+                "batches": w.batches,
+                "messages": w.messages,
+                "busy": w.busy,
+                "rate": w.messages / w.busy if w.busy > 0 else None,
+                "restarts": w.restarts,
+            }
+            for w in self._workers
+        ]
+
+    def close(self):
+        self._closed = True
+        for worker in self._workers:
+            worker.executor.shutdown(wait=True, cancel_futures=True)
+
+
+# ---------- 交易所适配 ----------
+
+class StandXPooledAuth:
+    """
+    StandXAuth 包装：请求签名走 SigningService，其余方法（登录等）透传
+
+    AsyncStandXPerpHTTP 发现 sign_request_async 时会优先 await 它。
+    """
+
+    def __init__(self, auth, service: SigningService, account: str):
+        from cryptography.hazmat.primitives import serialization
+
+        self._auth = auth
+        self._service = service
+        self._account = account
+        private_bytes = auth._private_key.private_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PrivateFormat.Raw,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+        service.register(account, ED25519, private_bytes)
+
+    def __getattr__(self, name: str):
+        return getattr(self._auth, name)
+
+    def sign_request(self, payload: str, request_id: str, timestamp: int) -> Dict[str, str]:
+        return self._auth.sign_request(payload, request_id, timestamp)
+
+    async def sign_request_async(self, payload: str, request_id: str, timestamp: int) -> Dict[str, str]:
+        version = "v1"
+        message = f"{version},{request_id},{timestamp},{payload}".encode("utf-8")
+        signature = await self._service.sign(self._account, message)
+        return {
+            "x-request-sign-version": version,
+            "x-request-id": request_id,
+            "x-request-timestamp": str(timestamp),
+            "x-request-signature": base64.b64encode(signature).decode("utf-8"),
+        }
+
+
+async def sign_grvt_orders(service: SigningService, account: str, signer, orders: List[Any]) -> List[Any]:
+    """
+    用签名服务批量签名 GRVT 订单
+
+    Args:
+        signer: GrvtOrderSigner（负责计算摘要和回填签名字段，账户需以 SECP256K1 注册同一私钥）
+        orders: GrvtOrder / Order 列表，原地回填签名
+    """
+    digests = [signer.order_digest(order) for order in orders]
+    signatures = await service.sign_many(account, digests)
+    return [signer.apply_signature(order, signature) for order, signature in zip(orders, signatures)]
+
+
+async def sign_nado_digests(service: SigningService, account: str, digests: List[bytes]) -> List[str]:
+    """用签名服务批量签名 Nado EIP-712 摘要（get_eip712_digest 的结果），返回 0x 开头的十六进制签名"""
+    signatures = await service.sign_many(account, digests)
+    return [f"0x{signature.hex()}" for signature in signatures]
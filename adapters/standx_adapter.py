@@ -6,14 +6,19 @@ This module implements BasePerpAdapter for StandX exchange.
 import sys
 import os
 import time
-from typing import Dict, Any, Optional, List
+import uuid
+import asyncio
+import threading
+from typing import Dict, Any, Optional, List, Tuple
 from decimal import Decimal
+from datetime import datetime
 
 # 添加项目路径
 project_root = os.path.join(os.path.dirname(__file__), '..')
 sys.path.insert(0, project_root)
 
-from adapters.base_adapter import BasePerpAdapter, Balance, Position, Order
+from adapters.base_adapter import BasePerpAdapter, Balance, Position, Order, SymbolPrecision
+from adapters.order_cache import OpenOrderCache, OPEN_STATUSES
 
 # 导入 StandX 相关模块
 import sys
@@ -23,9 +28,203 @@ sys.path.insert(0, project_root)
 
 from exchange.exchange_standx.standx_protocol.perps_auth import StandXAuth
 from exchange.exchange_standx.standx_protocol.perp_http import StandXPerpHTTP
-from eth_account.messages import encode_defunct
-from eth_account import Account
-from web3 import Web3
+from exchange.exchange_standx.standx_protocol.http_pool import HTTPPoolConfig
+from ratelimit import create_rate_limiter
+
+
+# 订单状态映射
+ORDER_STATUS_MAP = {
+    "new": "open",
+    "pending": "pending",
+    "partially_filled": "partially_filled",
+    "filled": "filled",
+    "cancelled": "cancelled",
+    "rejected": "rejected"
+}
+
+
+def normalize_side(side: str) -> str:
+    """转换 side: long/short -> buy/sell"""
+    if side in ["long", "buy"]:
+        return "buy"
+    if side in ["short", "sell"]:
+        return "sell"
+    return side
+
+
+def parse_balance(balance_data: Dict[str, Any]) -> Balance:
+    """将 query_balance 响应转换为 Balance"""
+    return Balance(
+        total_balance=balance_data.get("balance", "0"),
+        available_balance=balance_data.get("cross_available", "0"),
+        equity=balance_data.get("equity", "0"),
+        unrealized_pnl=balance_data.get("upnl", "0"),
+        margin_used=balance_data.get("cross_margin") or None,
+        margin_available=balance_data.get("cross_available") or None,
+    )
+
+
+def parse_positions(positions_data: List[Dict[str, Any]]) -> List[Position]:
+    """将 query_positions 响应转换为 Position 列表（只保留 open 且数量非 0 的持仓）"""
+    positions = []
+    for pos_data in positions_data:
+        # 只处理状态为 "open" 的持仓
+        if pos_data.get("status") != "open":
+            continue
+        
+        qty = Decimal(str(pos_data.get("qty", "0")))
+        # 如果数量为 0，跳过
+        if qty == Decimal("0"):
+            continue
+        
+        # 根据数量正负判断方向
+        side = "long" if qty > 0 else "short"
+        
+        position = Position(
+            symbol=pos_data.get("symbol", ""),
+            size=abs(qty),  # 使用绝对值
+            side=side,
+            entry_price=pos_data.get("entry_price", "0"),
+            mark_price=pos_data.get("mark_price", "0"),
+            unrealized_pnl=pos_data.get("upnl", "0"),
+            leverage=int(pos_data.get("leverage", 1)) if pos_data.get("leverage") else None,
+            margin_mode=pos_data.get("margin_mode"),
+        )
+        positions.append(position)
+    
+    return positions
+
+
+def _parse_iso_ms(value: Optional[str]) -> Optional[int]:
+    """ISO 时间字符串 -> 毫秒时间戳"""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return int(dt.timestamp() * 1000)
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def parse_order(
+    order_data: Dict[str, Any],
+    precisions: Optional[Dict[str, SymbolPrecision]] = None
+) -> Order:
+    """
+    将单条订单数据转换为 Order
+
+    价格 / 数量保留接口返回的原始字符串，读取 order.price 等字段时才转换为 Decimal；
+    precisions 中有该交易对时，可直接取 order.price_ticks / order.quantity_lots。
+    """
+    status = ORDER_STATUS_MAP.get(order_data.get("status", "").lower(), "pending")
+    symbol = order_data.get("symbol", "")
+    return Order(
+        order_id=str(order_data.get("id", "")),
+        symbol=symbol,
+        side=order_data.get("side", "").lower(),
+        order_type=order_data.get("order_type", "").lower(),
+        quantity=order_data.get("qty", "0"),
+        price=order_data.get("price") or None,
+        filled_quantity=order_data.get("fill_qty", "0"),
+        status=status,
+        time_in_force=order_data.get("time_in_force", "gtc").lower(),
+        reduce_only=order_data.get("reduce_only", False),
+        client_order_id=order_data.get("cl_ord_id"),
+        created_at=_parse_iso_ms(order_data.get("created_at")),
+        updated_at=_parse_iso_ms(order_data.get("updated_at")),
+        precision=precisions.get(symbol) if precisions else None,
+    )
+
+
+def parse_open_orders(
+    orders_data: Dict[str, Any],
+    precisions: Optional[Dict[str, SymbolPrecision]] = None
+) -> List[Order]:
+    """将 query_open_orders 响应转换为未成交 Order 列表"""
+    orders = []
+    for order_data in orders_data.get("result", []):
+        order = parse_order(order_data, precisions)
+        # 只返回未成交的订单
+        if order.status not in ["open", "pending", "partially_filled"]:
+            continue
+        orders.append(order)
+    return orders
+
+
+def order_version(order_data: Dict[str, Any]) -> str:
+    """订单版本标记：状态 / 成交量 / 更新时间任一变化即视为有更新"""
+    return f"{order_data.get('status')}|{order_data.get('fill_qty')}|{order_data.get('updated_at')}"
+
+
+def parse_open_orders_cached(
+    orders_data: Dict[str, Any],
+    cache: OpenOrderCache,
+    precisions: Optional[Dict[str, SymbolPrecision]] = None
+) -> Tuple[List[Order], Dict[str, str]]:
+    """
+    解析 query_open_orders 响应，版本未变化的订单直接复用本地订单簿中的 Order，
+    不再重复解析 ISO 时间等字段
+
+    Returns:
+        (未成交订单列表, 订单ID -> 版本标记)
+    """
+    orders = []
+    versions = {}
+    for order_data in orders_data.get("result", []):
+        order_id = str(order_data.get("id", ""))
+        version = order_version(order_data)
+        order = cache.get(order_id=order_id) if cache.version(order_id) == version else None
+        if order is None:
+            order = parse_order(order_data, precisions)
+        if order.status not in OPEN_STATUSES:
+            continue
+        orders.append(order)
+        versions[order_id] = version
+    return orders, versions
+
+
+def new_client_order_id() -> str:
+    """生成客户端订单ID（下单回报不含交易所订单ID，本地订单簿以此为主键）"""
+    return uuid.uuid4().hex
+
+
+def parse_ticker(price_data: Dict[str, Any], symbol: str) -> Dict[str, Any]:
+    """将 query_symbol_price 响应转换为统一 ticker 字典"""
+    return {
+        "symbol": price_data.get("symbol", symbol),
+        "bid_price": float(price_data["spread_bid"]) if price_data.get("spread_bid") else None,
+        "ask_price": float(price_data["spread_ask"]) if price_data.get("spread_ask") else None,
+        "mid_price": float(price_data["mid_price"]) if price_data.get("mid_price") else None,
+        "last_price": float(price_data["last_price"]) if price_data.get("last_price") else None,
+        "mark_price": float(price_data["mark_price"]) if price_data.get("mark_price") else None,
+        "index_price": float(price_data["index_price"]) if price_data.get("index_price") else None,
+        "timestamp": int(time.time() * 1000),
+    }
+
+
+def _load_private_key(private_key: str):
+    # eth_keys 即可完成推导地址 / EIP-191 签名，避免导入 eth_account（其依赖 eth_keyfile -> py_ecc，导入约 0.5s）
+    from eth_keys import keys
+
+    if private_key.startswith('0x'):
+        private_key = private_key[2:]
+    return keys.PrivateKey(bytes.fromhex(private_key))
+
+
+def private_key_to_address(private_key: str) -> str:
+    """钱包私钥 -> 地址"""
+    return _load_private_key(private_key).public_key.to_checksum_address()
+
+
+def sign_login_message(private_key: str, message: str) -> str:
+    """EIP-191 签名登录消息（与 eth_account encode_defunct + sign_message 结果一致）"""
+    from eth_utils import keccak
+
+    data = message.encode("utf-8")
+    message_hash = keccak(b"\x19Ethereum Signed Message:\n" + str(len(data)).encode() + data)
+    v, r, s = _load_private_key(private_key).sign_msg_hash(message_hash).vrs
+    signature = r.to_bytes(32, "big") + s.to_bytes(32, "big") + bytes([v + 27])
+    return "0x" + signature.hex()
 
 
 class StandXAdapter(BasePerpAdapter):
@@ -41,6 +240,17 @@ class StandXAdapter(BasePerpAdapter):
                 - private_key: 钱包私钥
                 - chain: 链名称，如 "bsc" 或 "solana"
                 - base_url: API 基础 URL（可选，默认 https://perps.standx.com）
+                - auth_url: 登录接口 URL（可选，默认 https://api.standx.com）
+                - geo_url: 对时接口 URL（可选，默认 https://geo.standx.com）
+                - http: 连接池配置（可选），字段见 HTTPPoolConfig，例如
+                  pool_maxsize / keep_alive / default_timeout /
+                  endpoint_timeouts / max_retries
+                - order_sync_interval: 本地订单簿与 REST 快照对账间隔（秒，默认 30）
+                - stream: WebSocket 推送配置（可选），例如 {"url": ..., "heartbeat": 15}，
+                  调用 start_stream() 后生效
+                - rate_limit: 接口限流配置（可选），字段见 ratelimit.factory；
+                  配置 address 时通过 broker 与其他进程共享令牌桶
+                - rate_limiter: 共享的限流器实例（可选，优先于 rate_limit）
         """
         super().__init__(config)
         self.private_key = config.get("private_key")
@@ -51,29 +261,32 @@ class StandXAdapter(BasePerpAdapter):
         base_url = config.get("base_url", "https://perps.standx.com")
         
         # 初始化客户端
-        self.auth = StandXAuth()
-        self.http_client = StandXPerpHTTP(base_url=base_url)
+        self.auth = StandXAuth(base_url=config.get("auth_url", "https://api.standx.com"))
+        self.http_client = StandXPerpHTTP(
+            base_url=base_url,
+            geo_url=config.get("geo_url", "https://geo.standx.com"),
+            pool_config=HTTPPoolConfig.from_dict(config.get("http")),
+            rate_limiter=config.get("rate_limiter") or create_rate_limiter(config.get("rate_limit"), "standx"),
+        )
         
         # 获取钱包地址
-        if self.private_key.startswith('0x'):
-            private_key = self.private_key[2:]
-        else:
-            private_key = self.private_key
-        
-        account = Web3().eth.account.from_key(private_key)
-        self.wallet_address = account.address
+        self.wallet_address = private_key_to_address(self.private_key)
         self.token: Optional[str] = None
+
+        # 本地未成交订单簿
+        self.order_cache = OpenOrderCache()
+        self.order_sync_interval = float(config.get("order_sync_interval", 30))
+
+        # WebSocket 推送（start_stream() 后在后台线程运行）
+        self.stream = None
+        self.stream_handler = None
+        self._stream_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stream_thread: Optional[threading.Thread] = None
+        self._stream_event = threading.Event()
     
     def _sign_message(self, message: str) -> str:
         """签名消息"""
-        private_key = self.private_key
-        if private_key.startswith('0x'):
-            private_key = private_key[2:]
-        
-        account = Account.from_key(private_key)
-        message_encoded = encode_defunct(text=message)
-        signed = account.sign_message(message_encoded)
-        return "0x" + signed.signature.hex()
+        return sign_login_message(self.private_key, message)
     
     def connect(self) -> bool:
         """连接到 StandX 并完成认证"""
@@ -93,21 +306,18 @@ class StandXAdapter(BasePerpAdapter):
             raise Exception(f"StandX 认证失败: {e}")
     
     def get_balance(self) -> Balance:
-        """查询账户余额"""
+        """查询账户余额（已启动推送且收到余额推送时直接返回推送快照）"""
         if not self.token:
             raise Exception("未认证，请先调用 connect()")
         
+        if self.stream_handler is not None:
+            balance = self.stream_handler.get_balance()
+            if balance is not None:
+                return balance
+        
         try:
             balance_data = self.http_client.query_balance(self.token)
-            
-            return Balance(
-                total_balance=Decimal(str(balance_data.get("balance", "0"))),
-                available_balance=Decimal(str(balance_data.get("cross_available", "0"))),
-                equity=Decimal(str(balance_data.get("equity", "0"))),
-                unrealized_pnl=Decimal(str(balance_data.get("upnl", "0"))),
-                margin_used=Decimal(str(balance_data.get("cross_margin", "0"))) if balance_data.get("cross_margin") else None,
-                margin_available=Decimal(str(balance_data.get("cross_available", "0"))) if balance_data.get("cross_available") else None,
-            )
+            return parse_balance(balance_data)
         except Exception as e:
             raise Exception(f"查询余额失败: {e}")
     
@@ -129,37 +339,16 @@ class StandXAdapter(BasePerpAdapter):
                 token=self.token,
                 symbol=symbol
             )
-            
-            positions = []
-            for pos_data in positions_data:
-                # 只处理状态为 "open" 的持仓
-                if pos_data.get("status") != "open":
-                    continue
-                
-                qty = Decimal(str(pos_data.get("qty", "0")))
-                # 如果数量为 0，跳过
-                if qty == Decimal("0"):
-                    continue
-                
-                # 根据数量正负判断方向
-                side = "long" if qty > 0 else "short"
-                
-                position = Position(
-                    symbol=pos_data.get("symbol", ""),
-                    size=abs(qty),  # 使用绝对值
-                    side=side,
-                    entry_price=Decimal(str(pos_data.get("entry_price", "0"))),
-                    mark_price=Decimal(str(pos_data.get("mark_price", "0"))),
-                    unrealized_pnl=Decimal(str(pos_data.get("upnl", "0"))),
-                    leverage=int(pos_data.get("leverage", 1)) if pos_data.get("leverage") else None,
-                    margin_mode=pos_data.get("margin_mode"),
-                )
-                positions.append(position)
-            
-            return positions
+            return parse_positions(positions_data)
         except Exception as e:
             raise Exception(f"查询持仓失败: {e}")
     
+    def get_position(self, symbol: str) -> Optional[Position]:
+        """获取单个交易对的持仓：已收到该交易对的持仓推送时直接返回推送快照，否则查询 REST"""
+        if self.stream_handler is not None and self.stream_handler.has_position_update(symbol):
+            return self.stream_handler.get_position(symbol)
+        return super().get_position(symbol)
+    
     def place_order(
         self,
         symbol: str,
@@ -180,13 +369,8 @@ class StandXAdapter(BasePerpAdapter):
             raise ValueError("限价单必须指定价格")
         
         try:
-            # 转换 side: "long"/"short" -> "buy"/"sell"
-            if side in ["long", "buy"]:
-                side_str = "buy"
-            elif side in ["short", "sell"]:
-                side_str = "sell"
-            else:
-                side_str = side
+            side_str = normalize_side(side)
+            client_order_id = client_order_id or new_client_order_id()
             
             response = self.http_client.place_order(
                 token=self.token,
@@ -208,7 +392,7 @@ class StandXAdapter(BasePerpAdapter):
             # 构造订单对象
             order_id = response.get("request_id", "")
             
-            return Order(
+            order = Order(
                 order_id=order_id,
                 symbol=symbol,
                 side=side_str,
@@ -220,6 +404,10 @@ class StandXAdapter(BasePerpAdapter):
                 reduce_only=reduce_only,
                 client_order_id=client_order_id,
             )
+            if order_type == "limit" and time_in_force != "ioc":
+                # 挂单登记到本地订单簿（以客户端订单ID为主键，对账时补全交易所订单ID）
+                self.order_cache.on_placed(order)
+            return order
         except Exception as e:
             raise Exception(f"下单失败: {e}")
     
@@ -266,6 +454,7 @@ class StandXAdapter(BasePerpAdapter):
                 cl_ord_id_list=cl_ord_id_list,
                 auth=self.auth
             )
+            self.order_cache.on_cancelled(order_id_list, cl_ord_id_list)
             
             # API 返回空数组表示成功
             return True
@@ -315,6 +504,7 @@ class StandXAdapter(BasePerpAdapter):
                 order_id_list=order_id_list,
                 auth=self.auth
             )
+            self.order_cache.on_cancelled(order_id_list)
             
             return True
         except Exception as e:
@@ -348,6 +538,7 @@ class StandXAdapter(BasePerpAdapter):
                 cl_ord_id_list=cl_ord_id_list,
                 auth=self.auth
             )
+            self.order_cache.on_cancelled(order_id_list, cl_ord_id_list)
             return True
         except Exception as e:
             raise Exception(f"批量撤单失败: {e}")
@@ -371,7 +562,7 @@ class StandXAdapter(BasePerpAdapter):
         symbol: Optional[str] = None,
     ) -> List[Order]:
         """
-        查询所有未成交订单
+        查询所有未成交订单（REST 快照，同时与本地订单簿对账）
         
         Args:
             symbol: 交易对符号，如果为 None 则返回所有交易对的订单
@@ -383,68 +574,114 @@ class StandXAdapter(BasePerpAdapter):
             raise Exception("未认证，请先调用 connect()")
         
         try:
+            started_at = time.time()
             orders_data = self.http_client.query_open_orders(
                 token=self.token,
                 symbol=symbol,
                 limit=1200
             )
             
-            orders = []
-            for order_data in orders_data.get("result", []):
-                # 映射订单状态
-                status_map = {
-                    "new": "open",
-                    "pending": "pending",
-                    "partially_filled": "partially_filled",
-                    "filled": "filled",
-                    "cancelled": "cancelled",
-                    "rejected": "rejected"
-                }
-                status = status_map.get(order_data.get("status", "").lower(), "pending")
-                
-                # 只返回未成交的订单
-                if status not in ["open", "pending", "partially_filled"]:
-                    continue
-                
-                # 解析时间戳
-                created_at = None
-                updated_at = None
-                if order_data.get("created_at"):
-                    try:
-                        from datetime import datetime
-                        dt = datetime.fromisoformat(order_data["created_at"].replace("Z", "+00:00"))
-                        created_at = int(dt.timestamp() * 1000)
-                    except:
-                        pass
-                if order_data.get("updated_at"):
-                    try:
-                        from datetime import datetime
-                        dt = datetime.fromisoformat(order_data["updated_at"].replace("Z", "+00:00"))
-                        updated_at = int(dt.timestamp() * 1000)
-                    except:
-                        pass
-                
-                order = Order(
-                    order_id=str(order_data.get("id", "")),
-                    symbol=order_data.get("symbol", ""),
-                    side=order_data.get("side", "").lower(),
-                    order_type=order_data.get("order_type", "").lower(),
-                    quantity=Decimal(str(order_data.get("qty", "0"))),
-                    price=Decimal(str(order_data.get("price", "0"))) if order_data.get("price") else None,
-                    filled_quantity=Decimal(str(order_data.get("fill_qty", "0"))),
-                    status=status,
-                    time_in_force=order_data.get("time_in_force", "gtc").lower(),
-                    reduce_only=order_data.get("reduce_only", False),
-                    client_order_id=order_data.get("cl_ord_id"),
-                    created_at=created_at,
-                    updated_at=updated_at,
-                )
-                orders.append(order)
-            
+            orders, versions = parse_open_orders_cached(orders_data, self.order_cache, self.symbol_precision)
+            self.order_cache.reconcile(orders, started_at, symbol=symbol, versions=versions)
             return orders
         except Exception as e:
             raise Exception(f"查询未成交订单失败: {e}")
     
+    def get_cached_open_orders(
+        self,
+        symbol: Optional[str] = None,
+    ) -> List[Order]:
+        """
+        从本地订单簿读取未成交订单
+
+        本地订单簿由下单 / 撤单回报实时更新；距上次对账超过 order_sync_interval
+        时先拉取一次 REST 快照对账。成交只能通过对账发现，因此 order_sync_interval
+        决定了成交后补单的最大延迟。
+        """
+        if self.order_cache.needs_sync(self.order_sync_interval):
+            return self.get_open_orders(symbol=symbol)
+        return self.order_cache.get_open_orders(symbol)
+    
+    def start_stream(self, symbols: Optional[List[str]] = None):
+        """
+        启动 WebSocket 推送（后台线程运行独立事件循环）
+
+        订单推送实时更新本地订单簿，成交 / 持仓变化会唤醒 wait_stream_event()。
+        断线自动重连并重新认证、重新订阅。
+
+        Args:
+            symbols: 需要订阅价格推送的交易对（可选）
+
+        Returns:
+            StandXStreamHandler: 推送状态（持仓 / 余额快照）
+        """
+        if not self.token:
+            raise Exception("未认证，请先调用 connect()")
+        if self._stream_thread is not None:
+            return self.stream_handler
+
+        from adapters.standx_stream import StandXStreamHandler
+        from exchange.exchange_standx.standx_protocol.perp_ws import StandXPerpWS
+
+        stream_config = self.config.get("stream") or {}
+        self.stream_handler = StandXStreamHandler(self.order_cache, self.symbol_precision)
+        self.stream_handler.add_listener(self._on_stream_event)
+        self._stream_loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        async def stream_main():
+            kwargs = {k: stream_config[k] for k in ("url", "heartbeat", "stale_timeout") if k in stream_config}
+            self.stream = StandXPerpWS(**kwargs)
+            self.stream_handler.attach(self.stream)
+            await self.stream.authenticate(self.token)
+            for symbol in symbols or []:
+                await self.stream.subscribe("price", symbol)
+            ready.set()
+            await self.stream.start()
+
+        def runner():
+            asyncio.set_event_loop(self._stream_loop)
+            try:
+                self._stream_loop.run_until_complete(stream_main())
+            except asyncio.CancelledError:
+                pass
+            finally:
+                self._stream_loop.close()
+
+        self._stream_thread = threading.Thread(target=runner, name="standx-stream", daemon=True)
+        self._stream_thread.start()
+        ready.wait(timeout=5)
+        return self.stream_handler
+
+    def _on_stream_event(self, event: str, payload: Any):
+        if event in ("fill", "position"):
+            self._stream_event.set()
+
+    def wait_stream_event(self, timeout: float) -> bool:
+        """
+        等待成交 / 持仓推送，最多 timeout 秒（未启动推送时等同于 sleep）
+
+        Returns:
+            bool: True 表示被推送事件提前唤醒
+        """
+        woke = self._stream_event.wait(timeout)
+        self._stream_event.clear()
+        return woke
+
+    def stop_stream(self):
+        """停止 WebSocket 推送"""
+        if self._stream_thread is None:
+            return
+        if self.stream is not None and self._stream_loop is not None and self._stream_loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(self.stream.close(), self._stream_loop)
+            try:
+                future.result(timeout=5)
+            except Exception:
+                pass
+        self._stream_thread.join(timeout=5)
+        self._stream_thread = None
+        self.stream = None
+
     def get_ticker(self, symbol: str) -> Dict[str, Any]:
         """
         获取交易对的最新价格信息
@@ -457,17 +694,7 @@ class StandXAdapter(BasePerpAdapter):
         """
         try:
             price_data = self.http_client.query_symbol_price(symbol)
-            
-            return {
-                "symbol": price_data.get("symbol", symbol),
-                "bid_price": float(price_data["spread_bid"]) if price_data.get("spread_bid") else None,
-                "ask_price": float(price_data["spread_ask"]) if price_data.get("spread_ask") else None,
-                "mid_price": float(price_data["mid_price"]) if price_data.get("mid_price") else None,
-                "last_price": float(price_data["last_price"]) if price_data.get("last_price") else None,
-                "mark_price": float(price_data["mark_price"]) if price_data.get("mark_price") else None,
-                "index_price": float(price_data["index_price"]) if price_data.get("index_price") else None,
-                "timestamp": int(time.time() * 1000),
-            }
+            return parse_ticker(price_data, symbol)
         except Exception as e:
             raise Exception(f"获取价格失败: {e}")
     
@@ -0,0 +1,146 @@
+"""
+StandX Stream Handler
+StandX WebSocket 推送 -> 适配器状态
+
+订单推送直接更新适配器的本地订单簿（OpenOrderCache），持仓 / 余额推送
+保存为最新快照，适配器的 get_position / get_balance 优先读取快照、没有快照时回退到 REST；
+成交等事件通知监听方，策略可以在成交后立即执行下一轮，而不必等待下一个轮询周期。
+
+断线期间可能漏掉推送：快照只在收到它的那条连接仍然在线时有效，重连后回退到 REST，
+直到新连接上收到新的推送。
+
+推送 data 字段格式按与 REST 接口相同处理：
+    order    -> query_open_orders 的单条订单
+    position -> query_positions 的单条持仓
+    balance  -> query_balance 响应
+    price    -> query_symbol_price 响应
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from adapters.base_adapter import Balance, Order, Position, SymbolPrecision
+from adapters.order_cache import OpenOrderCache
+from adapters.standx_adapter import order_version, parse_balance, parse_order, parse_positions
+
+
+StreamListener = Callable[[str, Any], None]
+
+FILL_STATUSES = ("filled", "partially_filled")
+
+
+def _items(message: Dict[str, Any]) -> List[Dict[str, Any]]:
+    data = message.get("data")
+    if isinstance(data, list):
+        return data
+    return [data] if isinstance(data, dict) else []
+
+
+class StandXStreamHandler:
+    """把 StandX 用户流推送应用到本地订单簿 / 持仓 / 余额"""
+
+    def __init__(
+        self,
+        order_cache: OpenOrderCache,
+        precisions: Optional[Dict[str, SymbolPrecision]] = None
+    ):
+        self.order_cache = order_cache
+        self.precisions = precisions
+        self.positions: Dict[str, Optional[Position]] = {}
+        self.balance: Optional[Balance] = None
+        self.updated_at: Optional[float] = None
+        self._ws = None
+        # 快照 -> 收到时的连接序号（ws.connect_count）
+        self._position_epochs: Dict[str, int] = {}
+        self._balance_epoch: Optional[int] = None
+        self.fill_count = 0
+        self._listeners: List[StreamListener] = []
+        self._lock = threading.Lock()
+
+    def attach(self, ws):
+        """注册到 StandXPerpWS 的用户频道和价格频道"""
+        self._ws = ws
+        ws.on("order", self.on_order)
+        ws.on("position", self.on_position)
+        ws.on("balance", self.on_balance)
+        ws.on("price", self.on_price)
+
+    def add_listener(self, listener: StreamListener):
+        """
+        添加事件监听
+
+        Args:
+            listener: listener(event, payload)，event 为 "fill" / "order" / "position" / "balance" / "price"；
+                在推送所在线程 / 事件循环中调用，应尽快返回
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, event: str, payload: Any):
+        self.updated_at = time.time()
+        for listener in list(self._listeners):
+            try:
+                listener(event, payload)
+            except Exception:
+                pass
+
+    def on_order(self, message: Dict[str, Any]):
+        for order_data in _items(message):
+            order: Order = parse_order(order_data, self.precisions)
+            self.order_cache.apply(order, order_version(order_data))
+            if order.status in FILL_STATUSES:
+                self.fill_count += 1
+                self._notify("fill", order)
+            else:
+                self._notify("order", order)
+
+    def on_position(self, message: Dict[str, Any]):
+        for pos_data in _items(message):
+            symbol = pos_data.get("symbol", "")
+            parsed = parse_positions([pos_data])
+            with self._lock:
+                # 已平仓 / 数量为 0 时记为 None
+                self.positions[symbol] = parsed[0] if parsed else None
+                self._position_epochs[symbol] = self._epoch()
+            self._notify("position", self.positions[symbol])
+
+    def on_balance(self, message: Dict[str, Any]):
+        for balance_data in _items(message):
+            balance = parse_balance(balance_data)
+            with self._lock:
+                self.balance = balance
+                self._balance_epoch = self._epoch()
+            self._notify("balance", balance)
+
+    def on_price(self, message: Dict[str, Any]):
+        for price_data in _items(message):
+            price = price_data.get("mark_price") or price_data.get("mid_price") or price_data.get("last_price")
+            if price:
+                self._notify("price", float(price))
+
+    def _epoch(self) -> int:
+        return getattr(self._ws, "connect_count", 0)
+
+    def _is_live(self, epoch: Optional[int]) -> bool:
+        """快照是否来自当前在线的连接（未接入 ws 时只要收到过即有效）"""
+        if epoch is None:
+            return False
+        if self._ws is None:
+            return True
+        return self._ws.connected and epoch == self._ws.connect_count
+
+    def get_position(self, symbol: str) -> Optional[Position]:
+        """最近一次推送的持仓（无持仓或快照无效时返回 None，先用 has_position_update 判断）"""
+        with self._lock:
+            if not self._is_live(self._position_epochs.get(symbol)):
+                return None
+            return self.positions.get(symbol)
+
+    def has_position_update(self, symbol: str) -> bool:
+        """当前连接上是否收到过该交易对的持仓推送"""
+        with self._lock:
+            return self._is_live(self._position_epochs.get(symbol))
+
+    def get_balance(self) -> Optional[Balance]:
+        """当前连接上最近一次推送的余额，没有时返回 None（调用方应回退到 REST）"""
+        with self._lock:
+            return self.balance if self._is_live(self._balance_epoch) else None
@@ -0,0 +1,28 @@
+"""
+Backtest Module
+StandX 网格做市策略的行情回放回测
+
+    python -m backtest --klines data/BTC-USD_1m.json --price-step 10,20,30 --grid-count 5,10
+"""
+from backtest.matching import MatchingEngine, SimOrder, Fill
+from backtest.adapter import BacktestAdapter, SimClock
+from backtest.data import MarketReplay, load_klines, load_ticks, download_klines
+from backtest.engine import Backtester, BacktestResult, ReplayFeed, run_backtest, param_grid, sweep
+
+__all__ = [
+    "MatchingEngine",
+    "SimOrder",
+    "Fill",
+    "BacktestAdapter",
+    "SimClock",
+    "MarketReplay",
+    "load_klines",
+    "load_ticks",
+    "download_klines",
+    "Backtester",
+    "BacktestResult",
+    "ReplayFeed",
+    "run_backtest",
+    "param_grid",
+    "sweep",
+]
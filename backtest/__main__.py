@@ -0,0 +1,126 @@
+"""
+回测命令行
+
+用法:
+    # 下载最近 7 天的 1m K 线并回测 config.yaml 中的参数
+    python -m backtest --klines data/BTC-USD_1m.json --download_days 7
+
+    # 参数扫描（逗号分隔的取值做笛卡尔积，默认使用全部 CPU 核）
+    python -m backtest --klines data/BTC-USD_1m.json \\
+        --price_step 10,20,30 --grid_count 5,10 --price_spread 100,200 --adx_threshold 20,25 \\
+        --output sweep.csv
+"""
+import argparse
+import csv
+import os
+import time
+
+import yaml
+
+from backtest.data import MarketReplay, download_klines, load_klines, load_ticks
+from backtest.engine import SWEEP_PARAMS, param_grid, sweep
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CONFIG = os.path.join(ROOT, "strategys", "strategy_standx", "config.yaml")
+
+COLUMNS = [
+    "pnl", "gross_pnl", "fees", "maker_volume", "fills", "max_position", "max_drawdown",
+    "position", "orders_placed", "cycles", "errors", "cycles_per_sec",
+]
+
+
+def _values(text: str):
+    values = []
+    for item in text.split(","):
+        item = item.strip()
+        number = float(item)
+        values.append(int(number) if number.is_integer() and "." not in item else number)
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description="StandX 网格策略回放回测 / 参数扫描")
+    parser.add_argument("-c", "--config", type=str, default=DEFAULT_CONFIG, help="策略配置文件")
+    parser.add_argument("--klines", type=str, help="价格 K 线文件（.json 币安格式 / .csv）")
+    parser.add_argument("--ticks", type=str, help="逐笔价格 CSV（timestamp,price[,volume]），替代 --klines")
+    parser.add_argument("--adx_klines", type=str, help="计算 ADX 的 K 线文件，默认由 --klines 合成")
+    parser.add_argument("--interval", type=str, default="1m", help="--download_days 下载的 K 线周期")
+    parser.add_argument("--download_days", type=float, help="先从币安下载最近 N 天 K 线到 --klines")
+    parser.add_argument("--tick_size", type=str, default="0.01")
+    parser.add_argument("--lot_size", type=str, default="0.0001")
+    parser.add_argument("--queue_size", type=str, default="0", help="新挂单前面的排队量（币数量）")
+    parser.add_argument("--maker_fee", type=float, default=0.0)
+    parser.add_argument("--taker_fee", type=float, default=0.0005)
+    parser.add_argument("--cycle_interval", type=float, help="策略周期（秒），默认 grid.sleep_interval")
+    parser.add_argument("--max_errors", type=int, default=0,
+                        help="允许的策略周期异常次数，超过时该组合记为失败、不参与排名")
+    parser.add_argument("--processes", type=int, help="并行进程数，默认 CPU 核数")
+    parser.add_argument("--output", type=str, help="结果保存为 CSV")
+    parser.add_argument("--top", type=int, default=20, help="按 pnl 排序显示前 N 个组合")
+    for name in SWEEP_PARAMS:
+        parser.add_argument(f"--{name}", type=str, help=f"{name} 取值，逗号分隔")
+    args = parser.parse_args()
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    symbol = config["symbol"]
+
+    if args.download_days:
+        if not args.klines:
+            parser.error("--download_days 需要同时指定 --klines 保存路径")
+        end_ms = int(time.time() * 1000)
+        rows = download_klines(symbol, args.interval, end_ms - int(args.download_days * 86_400_000), end_ms, args.klines)
+        print(f"[BACKTEST] downloaded {len(rows)} {args.interval} klines -> {args.klines}")
+
+    adx_rows = load_klines(args.adx_klines) if args.adx_klines else None
+    if args.ticks:
+        market = MarketReplay.from_ticks(symbol, load_ticks(args.ticks), adx_rows)
+    elif args.klines:
+        market = MarketReplay.from_klines(symbol, load_klines(args.klines), adx_rows)
+    else:
+        parser.error("需要 --klines 或 --ticks")
+
+    grid = param_grid(**{
+        name: _values(getattr(args, name)) for name in SWEEP_PARAMS if getattr(args, name)
+    })
+    options = dict(
+        tick_size=args.tick_size,
+        lot_size=args.lot_size,
+        queue_size=args.queue_size,
+        maker_fee=args.maker_fee,
+        taker_fee=args.taker_fee,
+        cycle_interval=args.cycle_interval,
+        max_errors=args.max_errors,
+    )
+    print(f"[BACKTEST] {len(market)} price points, {len(grid)} parameter sets")
+    started = time.perf_counter()
+    results = sweep(config, market, grid, processes=args.processes, **options)
+    elapsed = time.perf_counter() - started
+
+    failed = [result for result in results if "error" in result]
+    ok = sorted((result for result in results if "error" not in result), key=lambda r: r["pnl"], reverse=True)
+    total_cycles = sum(result["cycles"] for result in ok)
+    print(f"[BACKTEST] {total_cycles} cycles in {elapsed:.1f}s ({total_cycles / elapsed:,.0f} cycles/s)")
+
+    names = list(grid[0])
+    header = names + COLUMNS
+    print(" | ".join(f"{name:>14}" for name in header))
+    for result in ok[:args.top]:
+        print(" | ".join(
+            f"{result[name]:>14.4f}" if isinstance(result[name], float) else f"{result[name]:>14}"
+            for name in header
+        ))
+    for result in failed:
+        print(f"[BACKTEST][FAIL] {result}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            fieldnames = list(dict.fromkeys(key for result in ok + failed for key in result))
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"[BACKTEST] results -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Backtest Adapter
+回测适配器：BasePerpAdapter 接口 + 模拟撮合引擎
+
+策略代码不需要任何修改：下单 / 撤单 / 查询挂单 / 持仓都由 MatchingEngine 在本地完成，
+时间取自回放时钟（SimClock），价格取自当前回放的价格点。
+"""
+from collections import Counter
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from adapters.base_adapter import (
+    BasePerpAdapter,
+    Balance,
+    Order,
+    Position,
+    NEAREST,
+    FLOOR,
+)
+from backtest.matching import BUY, SELL, MatchingEngine, SimOrder
+
+_STATUS = {"filled": "filled", "cancelled": "cancelled"}
+
+
+class SimClock:
+    """回放时钟（秒），替换策略模块的 time，time() 返回当前回放时间"""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+class BacktestAdapter(BasePerpAdapter):
+    """
+    回测适配器
+
+    配置:
+        symbol: 交易对
+        symbol_precision: {symbol: {"tick_size": "0.01", "lot_size": "0.0001"}}（默认 0.01 / 0.0001）
+        queue_size: 新挂单前面的排队量（币数量），默认 0
+        initial_balance: 初始余额，默认 10000
+    """
+
+    def __init__(self, config: Dict[str, Any], clock: Optional[SimClock] = None):
+        super().__init__(config)
+        self.symbol = config["symbol"]
+        self.precision = self.get_symbol_precision(self.symbol) or self.set_symbol_precision(
+            self.symbol, "0.01", "0.0001"
+        )
+        self.engine = MatchingEngine(
+            self.precision,
+            queue_lots=self.precision.size_to_lots(str(config.get("queue_size", 0)), FLOOR),
+        )
+        self.clock = clock or SimClock()
+        self.initial_balance = Decimal(str(config.get("initial_balance", 10000)))
+        self.price: Optional[float] = None
+        # 接口调用次数（对应实盘的请求数）
+        self.calls: Counter = Counter()
+        self.stream = None
+        self.stream_handler = None
+        self._orders: Dict[str, Order] = {}
+        # tick -> 价格字符串（与实盘适配器一样把原始字符串交给 Order，grid_price 走整数解析）
+        self._price_cache: Dict[int, str] = {}
+        self._next_id = 1
+
+    # ---------------- 回放
+
+    def on_price(self, price: str, prev_ticks: Optional[int], volume: float) -> int:
+        """推进到下一个价格点：撮合 [上一价格, 当前价格] 区间内的挂单，返回当前价格（tick）"""
+        ticks = self.precision.price_to_ticks(price, NEAREST)
+        self.price = float(price)
+        if prev_ticks is None:
+            self.engine.last_ticks = ticks
+            return ticks
+        volume_lots = self.precision.size_to_lots(str(volume), FLOOR) if volume else 0
+        self.engine.on_trade(
+            min(prev_ticks, ticks), max(prev_ticks, ticks), ticks, volume_lots,
+            int(self.clock.now * 1000),
+        )
+        return ticks
+
+    def _now_ms(self) -> int:
+        return int(self.clock.now * 1000)
+
+    def _raw_price(self, ticks: int) -> str:
+        price = self._price_cache.get(ticks)
+        if price is None:
+            price = self._price_cache[ticks] = str(self.precision.ticks_to_price(ticks))
+        return price
+
+    def _to_order(self, sim: SimOrder) -> Order:
+        order = self._orders.get(sim.order_id)
+        if order is None:
+            order = Order(
+                order_id=sim.order_id,
+                symbol=self.symbol,
+                side="buy" if sim.side == BUY else "sell",
+                order_type="limit" if sim.price_ticks is not None else "market",
+                quantity=self.precision.lots_to_size(sim.lots),
+                price=self._raw_price(sim.price_ticks) if sim.price_ticks is not None else None,
+                time_in_force="gtc",
+                reduce_only=sim.reduce_only,
+                client_order_id=sim.client_order_id,
+                created_at=sim.created_at,
+                precision=self.precision,
+            )
+            if sim.status == "open":
+                self._orders[sim.order_id] = order
+        if sim.filled_lots and order.filled_lots != sim.filled_lots:
+            order.filled_quantity = self.precision.lots_to_size(sim.filled_lots)
+            order.updated_at = self._now_ms()
+        if sim.status == "open":
+            order.status = "partially_filled" if sim.filled_lots else "open"
+        else:
+            order.status = _STATUS[sim.status]
+            self._orders.pop(sim.order_id, None)
+        return order
+
+    # ---------------- BasePerpAdapter
+
+    def connect(self) -> bool:
+        return True
+
+    def get_balance(self) -> Balance:
+        self.calls["get_balance"] += 1
+        pnl = Decimal(str(self.engine.units_to_quote(self.engine.pnl_units())))
+        equity = self.initial_balance + pnl
+        return Balance(
+            total_balance=equity,
+            available_balance=equity,
+            equity=equity,
+            unrealized_pnl=pnl,
+        )
+
+    def get_positions(self, symbol: Optional[str] = None) -> List[Position]:
+        self.calls["get_positions"] += 1
+        engine = self.engine
+        if engine.position == 0 or (symbol is not None and symbol != self.symbol):
+            return []
+        lots = abs(engine.position)
+        size = self.precision.lots_to_size(lots)
+        entry_price = self.precision.ticks_to_price(abs(engine.entry_cost)) / lots
+        mark_price = self.precision.ticks_to_price(engine.last_ticks)
+        return [
+            Position(
+                symbol=self.symbol,
+                size=size if engine.position > 0 else -size,
+                side="long" if engine.position > 0 else "short",
+                entry_price=entry_price,
+                mark_price=mark_price,
+                unrealized_pnl=(mark_price - entry_price) * (size if engine.position > 0 else -size),
+            )
+        ]
+
+    def place_order(
+        self,
+        symbol: str,
+        side: str,
+        order_type: str,
+        quantity: Decimal,
+        price: Optional[Decimal] = None,
+        time_in_force: str = "gtc",
+        reduce_only: bool = False,
+        client_order_id: Optional[str] = None,
+        **kwargs
+    ) -> Order:
+        self.calls["place_order"] += 1
+        try:
+            lots = self.precision.size_to_lots(quantity)
+            price_ticks = None if order_type == "market" else self.precision.price_to_ticks(price)
+        except Exception as e:
+            raise Exception(f"下单失败: {e}")
+        if lots <= 0:
+            raise Exception("下单失败: 数量必须大于 0")
+        order_id = str(self._next_id)
+        self._next_id += 1
+        sim = SimOrder(
+            order_id,
+            BUY if side in ("buy", "long") else SELL,
+            price_ticks,
+            lots,
+            reduce_only=reduce_only,
+            client_order_id=client_order_id,
+            created_at=self._now_ms(),
+        )
+        self.engine.add_order(sim, self._now_ms())
+        return self._to_order(sim)
+
+    def cancel_order(
+        self,
+        order_id: Optional[str] = None,
+        symbol: Optional[str] = None,
+        client_order_id: Optional[str] = None,
+    ) -> bool:
+        self.calls["cancel_order"] += 1
+        if order_id is None and client_order_id is not None:
+            order_id = self._find_by_client_id(client_order_id)
+        self._orders.pop(str(order_id), None)
+        return self.engine.cancel_order(str(order_id))
+
+    def cancel_orders_by_ids(
+        self,
+        order_id_list: Optional[List[int]] = None,
+        cl_ord_id_list: Optional[List[str]] = None,
+    ) -> bool:
+        """批量撤单（一次请求）"""
+        self.calls["cancel_orders_by_ids"] += 1
+        if not order_id_list and not cl_ord_id_list:
+            raise ValueError("必须提供 order_id_list 或 cl_ord_id_list")
+        order_ids = [str(order_id) for order_id in order_id_list or []]
+        order_ids += [self._find_by_client_id(cl_ord_id) for cl_ord_id in cl_ord_id_list or []]
+        for order_id in order_ids:
+            if order_id is not None:
+                self._orders.pop(order_id, None)
+                self.engine.cancel_order(order_id)
+        return True
+
+    def _find_by_client_id(self, client_order_id: str) -> Optional[str]:
+        for sim in self.engine.orders.values():
+            if sim.client_order_id == client_order_id:
+                return sim.order_id
+        return None
+
+    def cancel_all_orders(self, symbol: Optional[str] = None) -> bool:
+        self.calls["cancel_all_orders"] += 1
+        for order_id in list(self.engine.orders):
+            self.engine.cancel_order(order_id)
+        self._orders.clear()
+        return True
+
+    def get_order(
+        self,
+        order_id: Optional[str] = None,
+        symbol: Optional[str] = None,
+        client_order_id: Optional[str] = None,
+    ) -> Optional[Order]:
+        self.calls["get_order"] += 1
+        if order_id is None and client_order_id is not None:
+            order_id = self._find_by_client_id(client_order_id)
+        sim = self.engine.orders.get(str(order_id))
+        return self._to_order(sim) if sim is not None else None
+
+    def get_open_orders(self, symbol: Optional[str] = None) -> List[Order]:
+        self.calls["get_open_orders"] += 1
+        orders = [self._to_order(sim) for sim in self.engine.orders.values()]
+        # 已成交 / 撤销的订单不再保留
+        for order_id in [order_id for order_id in self._orders if order_id not in self.engine.orders]:
+            del self._orders[order_id]
+        return orders
+
+    def get_cached_open_orders(self, symbol: Optional[str] = None) -> List[Order]:
+        return self.get_open_orders(symbol)
+
+    def get_ticker(self, symbol: str) -> Dict[str, Any]:
+        self.calls["get_ticker"] += 1
+        return {
+            "symbol": symbol,
+            "bid_price": self.price,
+            "ask_price": self.price,
+            "mid_price": self.price,
+            "last_price": self.price,
+            "mark_price": self.price,
+            "index_price": self.price,
+            "timestamp": self._now_ms(),
+        }
+
+    def get_orderbook(self, symbol: str, depth: int = 20) -> Dict[str, Any]:
+        """模拟盘口只有自己的挂单"""
+        self.calls["get_orderbook"] += 1
+        engine = self.engine
+
+        def levels(book, reverse):
+            return [
+                [self._raw_price(price), str(self.precision.lots_to_size(sum(o.remaining_lots for o in book[price])))]
+                for price in sorted(book, reverse=reverse)[:depth]
+            ]
+
+        return {"symbol": symbol, "bids": levels(engine.bids, True), "asks": levels(engine.asks, False)}
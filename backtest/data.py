@@ -0,0 +1,237 @@
+"""
+Replay Data
+回测行情数据
+
+K 线行格式与 risk.kline_cache 相同（币安 /api/v3/klines）：
+    [open_time, open, high, low, close, volume, close_time, ...]
+KlineStore 的缓存文件（{symbol}_{interval}.json）可以直接作为回测数据；
+也可以用 download_klines 从币安下载一段历史，或用逐笔价格 CSV（timestamp,price[,volume]）。
+
+每根 K 线展开为 4 个价格点（开 -> 高/低 -> 低/高 -> 收，阴线先高后低、阳线先低后高），
+成交量平均分到 4 段。ADX 按 K 线收盘时刻生效（不使用未收盘 K 线，避免未来函数）。
+"""
+import csv
+import json
+import os
+from typing import Any, List, Optional, Sequence
+
+OPEN_TIME, OPEN, HIGH, LOW, CLOSE, VOLUME = range(6)
+
+
+def load_klines(path: str) -> List[List[Any]]:
+    """
+    读取 K 线文件：.json 为币安格式行列表；.csv 为 open_time,open,high,low,close,volume（可带表头）
+    """
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    rows = []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.reader(f):
+            if row and row[0].strip().lstrip("-").isdigit():
+                rows.append(row)
+    return rows
+
+
+def load_ticks(path: str) -> List[List[Any]]:
+    """
+    读取逐笔价格 CSV：timestamp,price[,volume]（可带表头）
+
+    timestamp 为秒或毫秒（小于 1e11 按秒处理）。
+    """
+    rows = []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.reader(f):
+            if not row:
+                continue
+            try:
+                timestamp = float(row[0])
+            except ValueError:
+                continue  # 表头
+            if timestamp < 1e11:
+                timestamp *= 1000
+            rows.append([int(timestamp), row[1], row[2] if len(row) > 2 else "0"])
+    return rows
+
+
+def resample_klines(rows: Sequence[Sequence[Any]], interval_ms: int) -> List[List[Any]]:
+    """把较小周期的 K 线合成为 interval_ms 周期（例如 1m -> 5m）"""
+    merged: List[List[Any]] = []
+    for row in rows:
+        open_time = int(row[OPEN_TIME]) // interval_ms * interval_ms
+        high, low, volume = float(row[HIGH]), float(row[LOW]), float(row[VOLUME])
+        if merged and merged[-1][OPEN_TIME] == open_time:
+            bar = merged[-1]
+            bar[HIGH] = max(bar[HIGH], high)
+            bar[LOW] = min(bar[LOW], low)
+            bar[CLOSE] = float(row[CLOSE])
+            bar[VOLUME] += volume
+        else:
+            merged.append([open_time, float(row[OPEN]), high, low, float(row[CLOSE]), volume])
+    return merged
+
+
+def adx_series(rows: Sequence[Sequence[Any]], interval_ms: int, period: int = 14):
+    """
+    每根 K 线收盘后的 ADX
+
+    Returns:
+        (times, values): times[i] 为第 i 根 K 线收盘时刻（毫秒），values[i] 为此时的 ADX（预热不足为 None）
+    """
+    from risk.streaming import StreamingADX
+
+    adx = StreamingADX(period)
+    times, values = [], []
+    for row in rows:
+        values.append(adx.update(row[HIGH], row[LOW], row[CLOSE]))
+        times.append(int(row[OPEN_TIME]) + interval_ms)
+    return times, values
+
+
+class MarketReplay:
+    """
+    回放行情：按时间排序的价格点（毫秒时间戳 / 价格字符串 / 成交量）及每个点生效的 ADX
+
+    只保存原始值，与参数无关，参数扫描时每个进程加载一次即可复用。
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        timestamps: List[int],
+        prices: List[str],
+        volumes: List[float],
+        adx: Optional[List[Optional[float]]] = None,
+    ):
+        if not timestamps:
+            raise ValueError("回放行情为空")
+        self.symbol = symbol
+        self.timestamps = timestamps
+        self.prices = prices
+        self.volumes = volumes
+        self.adx = adx
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def first_adx_index(self) -> Optional[int]:
+        """ADX 预热完成的第一个价格点，没有 ADX 时返回 None"""
+        if self.adx is None:
+            return None
+        for index, value in enumerate(self.adx):
+            if value is not None:
+                return index
+        return None
+
+    @classmethod
+    def from_klines(
+        cls,
+        symbol: str,
+        rows: Sequence[Sequence[Any]],
+        adx_rows: Optional[Sequence[Sequence[Any]]] = None,
+        adx_interval: str = "5m",
+        adx_period: int = 14,
+    ) -> "MarketReplay":
+        """
+        Args:
+            rows: 价格 K 线（从旧到新），周期越小回放越精细
+            adx_rows: 计算 ADX 的 K 线；默认由 rows 合成 adx_interval 周期
+            adx_interval: ADX 周期（与策略一致，默认 5m）
+        """
+        from risk.kline_cache import interval_to_ms
+
+        if not rows:
+            raise ValueError("K 线为空")
+        interval_ms = (
+            int(rows[1][OPEN_TIME]) - int(rows[0][OPEN_TIME])
+            if len(rows) > 1 else 60_000
+        )
+        timestamps, prices, volumes = [], [], []
+        quarter = interval_ms // 4
+        for row in rows:
+            open_time = int(row[OPEN_TIME])
+            o, h, l, c = str(row[OPEN]), str(row[HIGH]), str(row[LOW]), str(row[CLOSE])
+            path = (o, l, h, c) if float(c) >= float(o) else (o, h, l, c)
+            volume = float(row[VOLUME]) / 4
+            for k, price in enumerate(path):
+                timestamps.append(open_time + k * quarter)
+                prices.append(price)
+                volumes.append(volume)
+
+        adx_ms = interval_to_ms(adx_interval)
+        if adx_rows is None:
+            adx_rows = resample_klines(rows, adx_ms)
+        adx_times, adx_values = adx_series(adx_rows, adx_ms, adx_period)
+        return cls(symbol, timestamps, prices, volumes, _align(timestamps, adx_times, adx_values))
+
+    @classmethod
+    def from_ticks(
+        cls,
+        symbol: str,
+        rows: Sequence[Sequence[Any]],
+        adx_rows: Optional[Sequence[Sequence[Any]]] = None,
+        adx_interval: str = "5m",
+        adx_period: int = 14,
+    ) -> "MarketReplay":
+        """
+        Args:
+            rows: [timestamp_ms, price, volume] 行（从旧到新）
+            adx_rows: 计算 ADX 的 K 线，不提供时没有 ADX（策略启用风控时无法回测）
+        """
+        timestamps = [int(row[0]) for row in rows]
+        prices = [str(row[1]) for row in rows]
+        volumes = [float(row[2]) if len(row) > 2 else 0.0 for row in rows]
+        adx = None
+        if adx_rows is not None:
+            from risk.kline_cache import interval_to_ms
+
+            adx_times, adx_values = adx_series(adx_rows, interval_to_ms(adx_interval), adx_period)
+            adx = _align(timestamps, adx_times, adx_values)
+        return cls(symbol, timestamps, prices, volumes, adx)
+
+
+def _align(timestamps: List[int], times: List[int], values: List[Optional[float]]) -> List[Optional[float]]:
+    """每个价格点取该时刻已收盘的最新 ADX"""
+    aligned = []
+    current = None
+    j = 0
+    for timestamp in timestamps:
+        while j < len(times) and times[j] <= timestamp:
+            current = values[j]
+            j += 1
+        aligned.append(current)
+    return aligned
+
+
+def download_klines(
+    symbol: str,
+    interval: str,
+    start_ms: int,
+    end_ms: int,
+    path: Optional[str] = None,
+    source: Any = None,
+) -> List[List[Any]]:
+    """
+    从币安分页下载开盘时间在 [start_ms, end_ms) 内的 K 线，可选保存为 json（与 KlineStore 缓存格式相同）
+
+    Args:
+        source: K 线源（默认 risk.BinanceKlineSource）
+    """
+    if source is None:
+        from risk.kline_cache import BinanceKlineSource
+
+        source = BinanceKlineSource()
+    rows: List[List[Any]] = []
+    start = start_ms
+    while start < end_ms:
+        page = source.fetch(symbol, interval, 1000, start_time=start)
+        page = [row for row in page if int(row[OPEN_TIME]) < end_ms]
+        if not page:
+            break
+        rows.extend(page)
+        start = int(page[-1][OPEN_TIME]) + 1
+    if path:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(rows, f)
+    return rows
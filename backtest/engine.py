@@ -0,0 +1,316 @@
+"""
+Backtest Engine
+StandX 网格做市策略回放回测
+
+直接运行 strategys/strategy_standx/standx_mm_new.py 的 run_strategy_cycle（generate_grid_arrays /
+calculate_maker_cancel_orders / calculate_place_orders / place_maker_close_orders /
+calculate_dynamic_price_spread 与实盘完全相同），只替换三处外部依赖：
+- 适配器：BacktestAdapter（本地撮合，按排队位置成交）
+- 行情：ReplayFeed 作为策略的 MARKET_DATA_CLIENT，按回放进度提供价格 / ADX 快照
+- 时间：策略模块的 time 替换为回放时钟，持仓时长等逻辑按回放时间计算
+
+每个价格点先撮合，再按 cycle_interval（默认 grid.sleep_interval）执行策略周期。
+策略模块使用全局配置，同一进程内同一时间只能运行一个回测；参数扫描用多进程并行（sweep）。
+"""
+import copy
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from backtest.adapter import BacktestAdapter, SimClock
+from backtest.data import MarketReplay
+from market_data.snapshot import MarketSnapshot
+
+# 参数名 -> 配置路径
+SWEEP_PARAMS = {
+    "price_step": ("grid", "price_step"),
+    "grid_count": ("grid", "grid_count"),
+    "price_spread": ("grid", "price_spread"),
+    "order_quantity": ("grid", "order_quantity"),
+    "adx_threshold": ("risk", "adx_threshold"),
+}
+
+
+class ReplayFeed:
+    """回放行情源，接口与 MarketDataClient 相同（get_snapshot / add_listener）"""
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.price: Optional[float] = None
+        self.adx: Optional[float] = None
+
+    def get_snapshot(self, symbol: str, max_age: Optional[float] = None) -> Optional[MarketSnapshot]:
+        if symbol != self.symbol or self.price is None:
+            return None
+        # 快照总是回放的当前值：时间戳用真实时间，策略的新鲜度检查（time.time() - price_time）总能通过
+        now = time.time()
+        return MarketSnapshot(
+            symbol,
+            ticker={"mark_price": self.price},
+            price_time=now,
+            adx=self.adx,
+            adx_time=now if self.adx is not None else None,
+        )
+
+    def add_listener(self, callback):
+        pass
+
+
+class BacktestResult:
+    """回测结果（金额为报价货币）"""
+
+    def __init__(self, params: Dict[str, Any], **metrics):
+        self.params = params
+        self.metrics = metrics
+
+    def __getattr__(self, name):
+        try:
+            return self.metrics[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.params, **self.metrics}
+
+    def __repr__(self) -> str:
+        return (
+            f"<BacktestResult({self.params}, pnl={self.metrics['pnl']:.4f}, "
+            f"fills={self.metrics['fills']}, cycles={self.metrics['cycles']})>"
+        )
+
+
+def apply_params(config: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """把扫描参数写入策略配置（返回副本）；设置 adx_threshold 时同时启用风控"""
+    config = copy.deepcopy(config)
+    for name, value in params.items():
+        if name not in SWEEP_PARAMS:
+            raise ValueError(f"不支持的回测参数: {name}，支持: {', '.join(SWEEP_PARAMS)}")
+        section, key = SWEEP_PARAMS[name]
+        config.setdefault(section, {})[key] = value
+        if name == "adx_threshold":
+            config["risk"]["enable"] = True
+    return config
+
+
+class Backtester:
+    """
+    单次回测
+
+    Args:
+        config: 策略配置（与 config.yaml 结构相同，需要 symbol / grid / risk）
+        market: 回放行情
+        tick_size / lot_size: 交易对精度
+        queue_size: 新挂单前面的排队量（币数量），越大越难在触及挂单价时成交
+        maker_fee / taker_fee: 手续费率（负数为返佣）
+        cycle_interval: 策略周期间隔（秒），默认 grid.sleep_interval，0 表示每个价格点都执行
+        initial_balance: 初始余额
+        seed: 随机种子（策略里的随机撤单等）
+        max_errors: 允许的策略周期异常次数，超过时回测失败（RuntimeError），
+            避免周期异常的参数组合仍按盈亏参与排名
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        market: MarketReplay,
+        tick_size: Any = "0.01",
+        lot_size: Any = "0.0001",
+        queue_size: Any = 0,
+        maker_fee: float = 0.0,
+        taker_fee: float = 0.0005,
+        cycle_interval: Optional[float] = None,
+        initial_balance: float = 10000,
+        seed: int = 0,
+        max_errors: int = 0,
+    ):
+        self.config = config
+        self.market = market
+        self.symbol = config["symbol"]
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+        if cycle_interval is None:
+            cycle_interval = config["grid"].get("sleep_interval", 60)
+        self.cycle_interval = cycle_interval
+        self.seed = seed
+        self.max_errors = max_errors
+        self.adapter_config = {
+            "exchange_name": "backtest",
+            "symbol": self.symbol,
+            "symbol_precision": {self.symbol: {"tick_size": str(tick_size), "lot_size": str(lot_size)}},
+            "queue_size": queue_size,
+            "initial_balance": initial_balance,
+        }
+
+    def run(self, params: Optional[Dict[str, Any]] = None) -> BacktestResult:
+        """
+        运行回测
+
+        Raises:
+            ValueError: 启用风控但回放行情没有 ADX
+            RuntimeError: 策略周期异常次数超过 max_errors
+        """
+        from strategys.strategy_standx import standx_mm_new as strategy
+
+        config = self.config
+        risk_enabled = config.get("risk", {}).get("enable", False)
+        start = 0
+        if risk_enabled:
+            # 没有 ADX 时策略会回退到实时请求币安，回测从 ADX 预热完成处开始
+            start = self.market.first_adx_index()
+            if start is None:
+                raise ValueError("策略启用了 ADX 风控，但回放行情没有可用的 ADX（K 线不足或未提供）")
+
+        clock = SimClock(self.market.timestamps[start] / 1000)
+        adapter = BacktestAdapter(self.adapter_config, clock)
+        feed = ReplayFeed(self.symbol)
+        saved = {
+            name: getattr(strategy, name)
+            for name in ("time", "MARKET_DATA_CLIENT", "STANDX_CONFIG", "SYMBOL", "GRID_CONFIG", "RISK_CONFIG",
+                         "CANCEL_STALE_ORDERS_CONFIG", "MARKET_DATA_CONFIG", "SCHEDULER_CONFIG")
+        }
+        saved_position_state = dict(strategy.POSITION_STATE)
+        random_state = random.getstate()
+        try:
+            strategy.initialize_config({**config, "exchange": {"exchange_name": "backtest"}})
+            strategy.MARKET_DATA_CONFIG = {}
+            strategy.MARKET_DATA_CLIENT = feed
+            strategy.time = clock
+            strategy.POSITION_STATE.update(open_time=None, last_reduce_time=None)
+            random.seed(self.seed)
+            return self._replay(strategy, adapter, feed, clock, start, params or {})
+        finally:
+            for name, value in saved.items():
+                setattr(strategy, name, value)
+            strategy.POSITION_STATE.update(saved_position_state)
+            random.setstate(random_state)
+
+    def _replay(self, strategy, adapter, feed, clock, start, params) -> BacktestResult:
+        market = self.market
+        engine = adapter.engine
+        timestamps, prices, volumes = market.timestamps, market.prices, market.volumes
+        adx = market.adx if self.config.get("risk", {}).get("enable", False) else None
+        interval_ms = self.cycle_interval * 1000
+        run_cycle = strategy.run_strategy_cycle
+
+        cycles = errors = 0
+        next_cycle = timestamps[start]
+        prev_ticks = None
+        peak = max_drawdown = 0
+        started = time.perf_counter()
+        for i in range(start, len(timestamps)):
+            timestamp = timestamps[i]
+            clock.now = timestamp / 1000
+            prev_ticks = adapter.on_price(prices[i], prev_ticks, volumes[i])
+            if timestamp < next_cycle:
+                continue
+            next_cycle = timestamp + interval_ms
+            feed.price = adapter.price
+            if adx is not None:
+                feed.adx = adx[i]
+            try:
+                run_cycle(adapter)
+            except Exception as e:
+                errors += 1
+                if errors > self.max_errors:
+                    raise RuntimeError(
+                        f"策略周期异常 {errors} 次（第 {cycles + 1} 个周期，时间 {timestamp}）: "
+                        f"{type(e).__name__}: {e}"
+                    ) from e
+            cycles += 1
+
+            pnl = engine.pnl_units()
+            peak = max(peak, pnl)
+            max_drawdown = max(max_drawdown, peak - pnl)
+        elapsed = time.perf_counter() - started
+
+        to_quote = engine.units_to_quote
+        maker_volume = to_quote(engine.maker_notional)
+        taker_volume = to_quote(engine.taker_notional)
+        fees = maker_volume * self.maker_fee + taker_volume * self.taker_fee
+        gross = to_quote(engine.pnl_units())
+        return BacktestResult(
+            params,
+            pnl=gross - fees,
+            gross_pnl=gross,
+            fees=fees,
+            maker_volume=maker_volume,
+            taker_volume=taker_volume,
+            fills=engine.maker_fills + engine.taker_fills,
+            maker_fills=engine.maker_fills,
+            taker_fills=engine.taker_fills,
+            position=float(adapter.precision.lots_to_size(engine.position)),
+            max_position=float(adapter.precision.lots_to_size(engine.max_position)),
+            max_drawdown=to_quote(max_drawdown),
+            cycles=cycles,
+            errors=errors,
+            requests=sum(adapter.calls.values()),
+            orders_placed=adapter.calls["place_order"],
+            cancel_requests=adapter.calls["cancel_orders_by_ids"] + adapter.calls["cancel_order"],
+            seconds=elapsed,
+            cycles_per_sec=cycles / elapsed if elapsed else 0.0,
+        )
+
+
+def run_backtest(config: Dict[str, Any], market: MarketReplay, params: Optional[Dict[str, Any]] = None,
+                 **options) -> BacktestResult:
+    """用 params 覆盖配置后运行一次回测（options 见 Backtester）"""
+    params = params or {}
+    return Backtester(apply_params(config, params), market, **options).run(params)
+
+
+def param_grid(**values: Iterable[Any]) -> List[Dict[str, Any]]:
+    """参数网格：param_grid(price_step=[10, 20], grid_count=[5]) -> [{...}, {...}]"""
+    names = list(values)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(list(values[name]) for name in names))]
+
+
+# 参数扫描子进程的回放行情 / 配置（进程初始化时传入一次，不随每个任务序列化）
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(config: Dict[str, Any], market: MarketReplay, options: Dict[str, Any]):
+    _WORKER.update(config=config, market=market, options=options)
+
+
+def _run_worker(params: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        result = run_backtest(_WORKER["config"], _WORKER["market"], params, **_WORKER["options"])
+        return result.to_dict()
+    except Exception as e:
+        return {**params, "error": str(e)}
+
+
+def sweep(
+    config: Dict[str, Any],
+    market: MarketReplay,
+    grid: List[Dict[str, Any]],
+    processes: Optional[int] = None,
+    **options,
+) -> List[Dict[str, Any]]:
+    """
+    并行参数扫描
+
+    Args:
+        config: 基础策略配置
+        market: 回放行情（每个子进程接收一次）
+        grid: 参数组合列表（见 param_grid）
+        processes: 进程数，默认 CPU 核数；1 表示在当前进程顺序运行
+        options: 传给 Backtester 的其他参数
+
+    Returns:
+        List[dict]: 每个组合的参数 + 指标（失败的组合带 error 字段），顺序与 grid 相同
+    """
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(grid) == 1:
+        _init_worker(config, market, options)
+        return [_run_worker(params) for params in grid]
+    with ProcessPoolExecutor(
+        max_workers=min(processes, len(grid)),
+        initializer=_init_worker,
+        initargs=(config, market, options),
+    ) as executor:
+        chunksize = max(1, len(grid) // (processes * 4))
+        return list(executor.map(_run_worker, grid, chunksize=chunksize))
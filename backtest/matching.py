@@ -0,0 +1,251 @@
+"""
+Simulated Matching Engine
+模拟撮合引擎（按排队位置成交）
+
+单账户、单交易对，价格 / 数量全部用整数 tick / lot（SymbolPrecision）表示：
+- 限价单按价格档位排队；新挂单前面排着 queue_lots（该档位已有的挂单量，近似值），
+  同一档位自己的多笔挂单按时间先后排队
+- 行情从上一价格走到当前价格（on_trade 的 [low, high] 区间）：
+  价格穿过挂单价（买单 low < price / 卖单 high > price）时整单成交；
+  只触及挂单价时，成交量先消耗前面的排队量，剩余部分才成交给自己的挂单
+- 下单时可立即成交的限价单 / 市价单按当前价作为 taker 成交
+- reduce_only 订单成交量不超过反向持仓，没有可减仓位时撤销
+
+持仓按 cash / position 记账（整数 tick*lot），任意价格下的总盈亏 cash + position * price 精确无误差。
+"""
+from typing import Dict, List, Optional
+
+from adapters.base_adapter import SymbolPrecision
+
+BUY = 1
+SELL = -1
+
+
+class SimOrder:
+    """引擎内部订单"""
+    __slots__ = (
+        "order_id", "client_order_id", "side", "price_ticks", "lots", "filled_lots",
+        "queue_ahead", "reduce_only", "created_at", "status",
+    )
+
+    def __init__(
+        self,
+        order_id: str,
+        side: int,
+        price_ticks: Optional[int],
+        lots: int,
+        queue_ahead: int = 0,
+        reduce_only: bool = False,
+        client_order_id: Optional[str] = None,
+        created_at: Optional[int] = None,
+    ):
+        self.order_id = order_id
+        self.client_order_id = client_order_id
+        self.side = side
+        self.price_ticks = price_ticks
+        self.lots = lots
+        self.filled_lots = 0
+        self.queue_ahead = queue_ahead
+        self.reduce_only = reduce_only
+        self.created_at = created_at
+        self.status = "open"
+
+    @property
+    def remaining_lots(self) -> int:
+        return self.lots - self.filled_lots
+
+
+class Fill:
+    """一笔成交"""
+    __slots__ = ("order_id", "side", "price_ticks", "lots", "maker", "timestamp")
+
+    def __init__(self, order_id: str, side: int, price_ticks: int, lots: int, maker: bool, timestamp: int):
+        self.order_id = order_id
+        self.side = side
+        self.price_ticks = price_ticks
+        self.lots = lots
+        self.maker = maker
+        self.timestamp = timestamp
+
+
+class MatchingEngine:
+    """
+    单账户撮合 + 持仓记账
+
+    Args:
+        precision: 交易对精度（tick_size / lot_size）
+        queue_lots: 新挂单前面的排队量（lot），0 表示只要触及挂单价就可以成交
+    """
+
+    def __init__(self, precision: SymbolPrecision, queue_lots: int = 0):
+        self.precision = precision
+        self.queue_lots = queue_lots
+        # 价格档位 -> 按时间排序的挂单
+        self.bids: Dict[int, List[SimOrder]] = {}
+        self.asks: Dict[int, List[SimOrder]] = {}
+        self.orders: Dict[str, SimOrder] = {}
+        self.last_ticks: Optional[int] = None
+        self.fills: List[Fill] = []
+
+        # 记账（tick*lot）
+        self.position = 0
+        self.cash = 0
+        self.entry_cost = 0
+        self.maker_notional = 0
+        self.taker_notional = 0
+        self.maker_fills = 0
+        self.taker_fills = 0
+        self.max_position = 0
+
+    # ---------------- 订单
+
+    def open_orders(self) -> List[SimOrder]:
+        return list(self.orders.values())
+
+    def add_order(self, order: SimOrder, timestamp: int) -> SimOrder:
+        """
+        新订单：可立即成交的部分按当前价 taker 成交，限价单剩余部分挂单排队
+
+        Raises:
+            ValueError: 还没有行情价格时下单
+        """
+        if self.last_ticks is None:
+            raise ValueError("撮合引擎还没有行情价格")
+        marketable = order.price_ticks is None or (
+            order.price_ticks >= self.last_ticks if order.side == BUY else order.price_ticks <= self.last_ticks
+        )
+        if marketable:
+            self._fill(order, self.last_ticks, order.remaining_lots, False, timestamp)
+            if order.status == "open":
+                # 市价单 / reduce_only 剩余部分不挂单
+                order.status = "filled" if order.remaining_lots == 0 else "cancelled"
+            return order
+        if order.reduce_only and not self._reducible(order.side):
+            order.status = "cancelled"
+            return order
+
+        book = self.bids if order.side == BUY else self.asks
+        level = book.setdefault(order.price_ticks, [])
+        order.queue_ahead = self.queue_lots
+        level.append(order)
+        self.orders[order.order_id] = order
+        return order
+
+    def cancel_order(self, order_id: str) -> bool:
+        """撤单，订单不存在或已完成时返回 False"""
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return False
+        order.status = "cancelled"
+        self._remove_from_book(order)
+        return True
+
+    def _remove_from_book(self, order: SimOrder):
+        book = self.bids if order.side == BUY else self.asks
+        level = book.get(order.price_ticks)
+        if level is None:
+            return
+        level.remove(order)
+        if not level:
+            del book[order.price_ticks]
+
+    # ---------------- 行情
+
+    def on_trade(self, low: int, high: int, last: int, volume_lots: int, timestamp: int):
+        """
+        行情在 [low, high] 区间内成交 volume_lots，撮合受影响的挂单
+
+        Args:
+            low / high: 本段行情经过的最低 / 最高价（tick）
+            last: 本段结束时的价格（tick）
+            volume_lots: 本段行情的成交量（lot），用于消耗挂单前面的排队量
+            timestamp: 毫秒时间戳
+        """
+        self.last_ticks = last
+        if self.bids:
+            best_bid = max(self.bids)
+            if low <= best_bid:
+                for price in sorted((p for p in self.bids if p >= low), reverse=True):
+                    self._match_level(self.bids, price, through=low < price, volume=volume_lots, timestamp=timestamp)
+        if self.asks:
+            best_ask = min(self.asks)
+            if high >= best_ask:
+                for price in sorted(p for p in self.asks if p <= high):
+                    self._match_level(self.asks, price, through=high > price, volume=volume_lots, timestamp=timestamp)
+
+    def _match_level(self, book: Dict[int, List[SimOrder]], price: int, through: bool, volume: int, timestamp: int):
+        level = book[price]
+        # 只触及挂单价时，成交量按时间顺序先经过每笔挂单前面的外部排队量；
+        # 每笔挂单的 queue_ahead 都包含排在更早挂单前面的那部分，已成交给自己更早挂单的量要扣除
+        own_filled = 0
+        for order in list(level):
+            if through:
+                lots = order.remaining_lots
+            else:
+                available = volume - own_filled
+                if available <= 0:
+                    break
+                consumed = min(order.queue_ahead, available)
+                order.queue_ahead -= consumed
+                lots = min(order.remaining_lots, available - consumed)
+                own_filled += lots
+            if lots > 0:
+                self._fill(order, price, lots, True, timestamp)
+            if order.status != "open":
+                level.remove(order)
+                self.orders.pop(order.order_id, None)
+        if not level:
+            del book[price]
+
+    # ---------------- 记账
+
+    def _reducible(self, side: int) -> int:
+        """side 方向的订单最多可减仓的数量（lot）"""
+        if self.position * side < 0:
+            return abs(self.position)
+        return 0
+
+    def _fill(self, order: SimOrder, price: int, lots: int, maker: bool, timestamp: int):
+        if order.reduce_only:
+            lots = min(lots, self._reducible(order.side))
+            if lots <= 0:
+                order.status = "cancelled"
+                return
+        order.filled_lots += lots
+        if order.remaining_lots == 0:
+            order.status = "filled"
+
+        side = order.side
+        position = self.position
+        if position == 0 or (position > 0) == (side > 0):
+            self.entry_cost += side * lots * price
+        else:
+            closed = min(lots, abs(position))
+            self.entry_cost -= self.entry_cost * closed // abs(position)
+            if lots > closed:
+                self.entry_cost = side * (lots - closed) * price
+        self.position = position + side * lots
+        self.cash -= side * lots * price
+        self.max_position = max(self.max_position, abs(self.position))
+
+        notional = lots * price
+        if maker:
+            self.maker_notional += notional
+            self.maker_fills += 1
+        else:
+            self.taker_notional += notional
+            self.taker_fills += 1
+        self.fills.append(Fill(order.order_id, side, price, lots, maker, timestamp))
+
+        if order.reduce_only and order.remaining_lots and not self._reducible(side):
+            # 仓位已平完，reduce_only 剩余部分撤销
+            order.status = "cancelled"
+
+    def pnl_units(self, price: Optional[int] = None) -> int:
+        """按 price（默认最新价）计算的总盈亏（tick*lot，未扣手续费）"""
+        price = self.last_ticks if price is None else price
+        return self.cash + self.position * (price or 0)
+
+    def units_to_quote(self, units: int) -> float:
+        """tick*lot -> 报价货币"""
+        return float(units * self.precision.tick_size * self.precision.lot_size)
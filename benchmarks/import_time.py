@@ -0,0 +1,132 @@
+"""
+Import-time regression suite
+策略进程冷启动导入耗时预算
+
+每个目标在全新的解释器里用 `python -X importtime -c "import ..."` 导入，
+取多次运行的中位数（只统计目标本身引入的模块，不含解释器启动的 site 等），并检查：
+- 导入耗时不超过预算（毫秒）；
+- 不应在导入阶段加载的重依赖（web3 / eth_account / aiohttp / numpy ...）没有被加载。
+任一目标超预算或加载了禁止的模块时退出码为 1，可直接用于 CI。
+
+用法:
+    python -m benchmarks.import_time [--repeat 5] [--scale 1.5] [--top 10]
+
+    --scale: 预算倍数（较慢的机器 / CI 上放宽）
+    --top:   同时列出每个目标自身耗时最大的模块，便于定位回归
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 名称 -> (导入的模块, 预算毫秒, 禁止在导入阶段加载的模块)
+TARGETS: Dict[str, Tuple[List[str], float, List[str]]] = {
+    "adapters": (
+        ["adapters"],
+        150,
+        ["web3", "eth_account", "nado_protocol", "aiohttp", "numpy", "pandas", "talib"],
+    ),
+    "risk": (["risk"], 20, ["numpy", "requests"]),
+    "ratelimit": (["ratelimit"], 20, ["asyncio", "requests", "aiohttp", "exchange.exchange_standx"]),
+    "standx_strategy": (
+        # standx_mm_new.py 启动时的导入 + 创建 StandX 适配器
+        ["yaml", "adapters", "risk", "market_data", "strategys.scheduler", "adapters.standx_adapter"],
+        400,
+        ["web3", "eth_account", "nado_protocol", "aiohttp", "numpy", "pandas", "talib"],
+    ),
+    "standx_async": (
+        ["adapters", "adapters.async_standx_adapter"],
+        600,
+        ["web3", "eth_account", "nado_protocol", "numpy", "pandas"],
+    ),
+    "nado": (
+        ["adapters", "adapters.nado_adapter"],
+        1500,
+        ["web3", "numpy", "pandas", "exchange.exchange_standx"],
+    ),
+}
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """解析 -X importtime 输出 -> [(模块, 层级, 自身微秒, 累计微秒)]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name_field = line[len("import time:"):].split("|")
+        name = name_field.strip()
+        depth = (len(name_field) - len(name_field.lstrip()) - 1) // 2
+        rows.append((name, depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def _importtime(statement: str) -> List[Tuple[str, int, int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"导入失败: {statement}\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def measure(modules: List[str], repeat: int, baseline: set) -> Tuple[float, set, List[Tuple[str, int]]]:
+    """返回 (中位数毫秒, 加载的模块集合, 最后一次运行自身耗时最大的模块)"""
+    statement = "; ".join(f"import {module}" for module in modules)
+    totals = []
+    rows: List[Tuple[str, int, int, int]] = []
+    for _ in range(repeat):
+        rows = _importtime(statement)
+        totals.append(
+            sum(cumulative for name, depth, _, cumulative in rows if depth == 0 and name not in baseline)
+        )
+    loaded = {name for name, *_ in rows}
+    heaviest = sorted(
+        ((name, self_us) for name, _, self_us, _ in rows if name not in baseline),
+        key=lambda row: row[1],
+        reverse=True,
+    )
+    return statistics.median(totals) / 1000, loaded, heaviest
+
+
+def _forbidden(loaded: set, forbidden: List[str]) -> List[str]:
+    return sorted(
+        prefix for prefix in forbidden
+        if any(name == prefix or name.startswith(prefix + ".") for name in loaded)
+    )
+
+
+def run(repeat: int = 5, scale: float = 1.0, top: int = 0, targets: List[str] = None) -> bool:
+    baseline = {name for name, *_ in _importtime("pass")}
+    ok = True
+    for name, (modules, budget, forbidden) in TARGETS.items():
+        if targets and name not in targets:
+            continue
+        elapsed, loaded, heaviest = measure(modules, repeat, baseline)
+        budget *= scale
+        bad = _forbidden(loaded, forbidden)
+        passed = elapsed <= budget and not bad
+        ok = ok and passed
+        print(
+            f"{'OK  ' if passed else 'FAIL'} {name:<16} {elapsed:>8.1f} ms / 预算 {budget:>6.0f} ms"
+            + (f" | 加载了禁止的模块: {', '.join(bad)}" if bad else "")
+        )
+        for module, self_us in heaviest[:top]:
+            print(f"       {self_us / 1000:>8.1f} ms  {module}")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="策略进程冷启动导入耗时预算")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--top", type=int, default=0)
+    parser.add_argument("targets", nargs="*", help=f"只测部分目标: {', '.join(TARGETS)}")
+    args = parser.parse_args()
+    sys.exit(0 if run(args.repeat, args.scale, args.top, args.targets) else 1)
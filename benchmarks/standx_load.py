@@ -0,0 +1,198 @@
+"""
+StandX end-to-end load benchmark
+多账户策略对本地模拟器的端到端压测
+
+启动 `python -m simulator` 子进程（或使用 --url 指定已运行的模拟器），生成 N 个随机钱包私钥，
+用 standx_mm_multi.run_accounts（真实的异步适配器 / 签名 / 共享连接池 / 共享行情）跑 --duration 秒，
+然后汇总：
+- 客户端：每个账户的周期数 / 周期错误、各接口请求数 / 错误数 / 平均和最大延迟（客户端测得）；
+- 服务端：模拟器的每接口请求数、注入的错误 / 超时 / 限流次数、订单 / 撤单 / 成交总数。
+
+用法:
+    # 100 个账户，1 秒周期，模拟器默认延迟 lognormal:20,0.5，运行 60 秒
+    python -m benchmarks.standx_load --accounts 100 --duration 60
+
+    # 300 个账户分到 3 个客户端进程，注入 1% 错误并按账户限流 20 次/秒
+    python -m benchmarks.standx_load --accounts 300 --processes 3 --error_rate 0.01 --rate_limit 20
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import secrets
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+import yaml
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CONFIG = os.path.join(ROOT, "strategys", "strategy_standx", "config.yaml")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_simulator(args) -> Tuple[subprocess.Popen, str]:
+    """启动模拟器子进程，等待其开始监听，返回 (进程, URL)"""
+    port = _free_port()
+    command = [sys.executable, "-m", "simulator", "--port", str(port), "--latency", args.latency]
+    if args.sim_config:
+        command += ["-c", args.sim_config]
+    for name in ("error_rate", "timeout_rate", "reject_rate", "rate_limit", "rate_burst"):
+        value = getattr(args, name)
+        if value is not None:
+            command += [f"--{name}", str(value)]
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    for line in process.stdout:
+        if line.startswith("[SIM] listening on "):
+            return process, line[len("[SIM] listening on "):].strip()
+    raise RuntimeError(f"模拟器启动失败，退出码 {process.wait()}")
+
+
+def build_strategy_config(args, url: str) -> Dict[str, Any]:
+    with open(args.config, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    config["exchange"].update(base_url=url, auth_url=url, geo_url=url)
+    config["exchange"]["stream"] = {"enable": False}
+    # 风控的 ADX 需要访问币安，压测只测交易所接口
+    config.setdefault("risk", {})["enable"] = False
+    config["grid"]["sleep_interval"] = args.sleep_interval
+    if args.grid_count is not None:
+        config["grid"]["grid_count"] = args.grid_count
+    return config
+
+
+def _merge_latency(total: Dict[str, Dict[str, float]], stats: Dict[str, Dict[str, Any]]):
+    """合并 LatencyRecorder.snapshot()（avg_ms）或已合并的统计（total_ms）"""
+    for endpoint, row in stats.items():
+        merged = total.setdefault(endpoint, {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+        merged["count"] += row["count"]
+        merged["errors"] += row["errors"]
+        merged["total_ms"] += row["total_ms"] if "total_ms" in row else row["avg_ms"] * row["count"]
+        merged["max_ms"] = max(merged["max_ms"], row["max_ms"])
+
+
+async def _run_shard(accounts: Dict[str, str], config: Dict[str, Any], duration: float, log_dir: str):
+    from strategys.strategy_standx.standx_mm_multi import run_accounts
+
+    stop_event = asyncio.Event()
+    asyncio.get_running_loop().call_later(duration, stop_event.set)
+    runners = await run_accounts(accounts, config, log_dir, stop_event=stop_event)
+    latency: Dict[str, Dict[str, float]] = {}
+    for runner in runners:
+        _merge_latency(latency, runner.adapter.http_client.get_latency_stats())
+    return {
+        "accounts": len(runners),
+        "cycles": sum(runner.cycles for runner in runners),
+        "cycle_errors": sum(runner.errors for runner in runners),
+        "idle_accounts": sum(1 for runner in runners if runner.cycles == 0),
+        "latency": latency,
+    }
+
+
+def _shard_main(accounts, config, duration, log_dir, queue):
+    try:
+        queue.put(asyncio.run(_run_shard(accounts, config, duration, log_dir)))
+    except Exception as e:
+        queue.put({"error": repr(e)})
+
+
+def run_load(
+    accounts: Dict[str, str],
+    config: Dict[str, Any],
+    duration: float,
+    processes: int = 1,
+    log_dir: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """把账户分到 processes 个客户端进程运行 duration 秒，返回每个进程的统计"""
+    from strategys.strategy_standx.standx_mm_multi import shard_accounts
+
+    log_dir = log_dir or tempfile.mkdtemp(prefix="standx_load_")
+    queue = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=_shard_main, args=(shard, config, duration, log_dir, queue))
+        for shard in shard_accounts(accounts, processes)
+    ]
+    for worker in workers:
+        worker.start()
+    # 结果先出队再 join，避免子进程阻塞在写队列上
+    results = [queue.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    return results
+
+
+def report(results: List[Dict[str, Any]], server: Dict[str, Any], elapsed: float):
+    failed = [result for result in results if "error" in result]
+    results = [result for result in results if "error" not in result]
+    cycles = sum(result["cycles"] for result in results)
+    accounts = sum(result["accounts"] for result in results)
+    print(
+        f"[LOAD] accounts={accounts} cycles={cycles} ({cycles / elapsed:,.1f}/s) "
+        f"cycle_errors={sum(result['cycle_errors'] for result in results)} "
+        f"idle_accounts={sum(result['idle_accounts'] for result in results)} elapsed={elapsed:.1f}s"
+    )
+    latency: Dict[str, Dict[str, float]] = {}
+    for result in results:
+        _merge_latency(latency, result["latency"])
+    print(f"{'endpoint':<20} {'requests':>9} {'errors':>7} {'avg_ms':>8} {'max_ms':>9}")
+    for endpoint, row in sorted(latency.items()):
+        avg = row["total_ms"] / row["count"] if row["count"] else 0.0
+        print(f"{endpoint:<20} {row['count']:>9} {row['errors']:>7} {avg:>8.2f} {row['max_ms']:>9.2f}")
+    endpoints = server.pop("endpoints", {})
+    print(f"[SIM] {json.dumps(server, ensure_ascii=False)}")
+    for endpoint, row in sorted(endpoints.items()):
+        print(f"[SIM] {endpoint:<20} {json.dumps(row, ensure_ascii=False)}")
+    for result in failed:
+        print(f"[LOAD][FAIL] {result['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="StandX 多账户端到端压测（本地模拟器）")
+    parser.add_argument("--accounts", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=60, help="压测时长（秒）")
+    parser.add_argument("--processes", type=int, default=1, help="客户端进程数")
+    parser.add_argument("--sleep_interval", type=float, default=1, help="策略周期（秒）")
+    parser.add_argument("--grid_count", type=int)
+    parser.add_argument("-c", "--config", type=str, default=DEFAULT_CONFIG, help="策略配置文件")
+    parser.add_argument("--url", type=str, help="使用已运行的模拟器，不启动子进程")
+    parser.add_argument("--sim_config", type=str, help="模拟器配置文件")
+    parser.add_argument("--latency", type=str, default="lognormal:20,0.5", help="模拟器默认延迟分布")
+    parser.add_argument("--error_rate", type=float)
+    parser.add_argument("--timeout_rate", type=float)
+    parser.add_argument("--reject_rate", type=float)
+    parser.add_argument("--rate_limit", type=float)
+    parser.add_argument("--rate_burst", type=float)
+    parser.add_argument("--log_dir", type=str, help="账户日志目录，默认临时目录")
+    args = parser.parse_args()
+
+    process = None
+    url = args.url
+    if url is None:
+        process, url = start_simulator(args)
+    try:
+        config = build_strategy_config(args, url)
+        accounts = {f"load{i}": "0x" + secrets.token_hex(32) for i in range(args.accounts)}
+        requests.post(f"{url}/sim/reset_stats", timeout=5)
+        print(f"[LOAD] {args.accounts} accounts x {args.duration:g}s against {url}", flush=True)
+        started = time.perf_counter()
+        results = run_load(accounts, config, args.duration, args.processes, args.log_dir)
+        elapsed = time.perf_counter() - started
+        report(results, requests.get(f"{url}/sim/stats", timeout=5).json(), elapsed)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""
+Strategy-cycle benchmark suite
+StandX 网格策略热路径基准（与保存的基线比较，检查性能回归）
+
+用例（全部运行在 MockPerpAdapter 上，不访问网络）:
+- grid_diff[N]:       generate_grid_arrays + calculate_maker_cancel_orders + calculate_place_orders，
+                      grid_count = N（price_step 1，当前挂单与目标网格错开一半）
+- pending_orders[N]:  get_pending_orders_arrays 读取 N 笔挂单（与实盘适配器一样保留原始价格字符串）
+- cycle_steady[N]:    完整 run_strategy_cycle，价格不变、不撤单也不下单的稳态周期。网格第 i 档距现价
+                      price_spread + i * price_step，calculate_maker_cancel_orders 撤掉距离超过
+                      price_spread + 2 * price_step 的挂单，所以只有 grid_count <= 3 的网格在价格不变时保持不动
+- cycle_churn[N]:     完整 run_strategy_cycle，价格每周期来回移动，触发撤单 / 补单
+
+MockPerpAdapter 记录每个接口的调用次数，并按每个接口的模拟延迟累计“网络耗时”（不真正 sleep），
+除 CPU 耗时外同时报告每次操作的请求数和模拟网络耗时。请求数是确定的，与基线不一致即视为回归。
+
+用法:
+    python -m benchmarks.strategy_cycle --save         # 记录基线到 benchmarks/baselines/strategy_cycle.json（5 遍取最慢）
+    python -m benchmarks.strategy_cycle                # 与基线比较，任一用例超出容差或请求数变化时退出码 1
+    python -m benchmarks.strategy_cycle --tolerance 0.25 --scale 2 grid_diff
+
+    --rounds:    每个用例的轮数（默认 15），以各轮的中位数与基线的中位数比较
+    --tolerance: 允许比基线慢的比例（默认 0.5；共享机器上单轮耗时的 min 可差 1.5 倍以上，中位数稳定得多）
+    --scale:     基线倍数（较慢的机器 / CI 上放宽，与 import_time 的 --scale 相同）
+    --passes:    --save 时整套用例运行的遍数（默认 5，间隔 1 秒），每个用例保存中位数最慢的一遍：
+                 共享机器的速度随时间变化，只跑一遍可能恰好记录在快的时段，之后在同一份代码上也会报回归
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from collections import Counter
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backtest.adapter import BacktestAdapter, SimClock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(ROOT, "benchmarks", "baselines", "strategy_cycle.json")
+
+SYMBOL = "BTC-USD"
+PRICE = 100000
+
+# 每个接口的模拟延迟（毫秒），接近 perps.standx.com 的实测中位数
+LATENCY_MS = {
+    "get_ticker": 10.0,
+    "get_balance": 15.0,
+    "get_positions": 15.0,
+    "get_open_orders": 20.0,
+    "get_order": 15.0,
+    "place_order": 30.0,
+    "cancel_order": 25.0,
+    "cancel_orders_by_ids": 25.0,
+    "cancel_all_orders": 25.0,
+}
+
+
+class MockPerpAdapter(BacktestAdapter):
+    """
+    基准用适配器：BacktestAdapter 的本地撮合 + 调用计数 + 模拟延迟
+
+    get_cached_open_orders 与实盘适配器一样读取本地订单簿，不计为请求；
+    set_price 只改变行情价格，不撮合已有挂单（保证每轮迭代的状态可重复）。
+    """
+
+    def __init__(self, latency_ms: Optional[Dict[str, float]] = None, tick_size: str = "0.01",
+                 lot_size: str = "0.0001"):
+        super().__init__(
+            {
+                "exchange_name": "mock",
+                "symbol": SYMBOL,
+                "symbol_precision": {SYMBOL: {"tick_size": tick_size, "lot_size": lot_size}},
+            },
+            SimClock(time.time()),
+        )
+        self.latency_ms = {**LATENCY_MS, **(latency_ms or {})}
+
+    def set_price(self, price: Any):
+        ticks = self.on_price(str(price), None, 0)
+        self.engine.last_ticks = ticks
+
+    def get_cached_open_orders(self, symbol: Optional[str] = None):
+        return [self._to_order(sim) for sim in self.engine.orders.values()]
+
+    def simulated_ms(self, calls: Optional[Counter] = None) -> float:
+        """calls（默认全部调用）对应的模拟网络耗时（毫秒，串行累计）"""
+        calls = self.calls if calls is None else calls
+        return sum(count * self.latency_ms.get(name, 0.0) for name, count in calls.items())
+
+
+def _strategy(grid_count: int, price_step: int = 1, price_spread: int = 10):
+    """按用例参数初始化策略模块的全局配置（关闭风控 / 共享行情）"""
+    from strategys.strategy_standx import standx_mm_new as strategy
+
+    strategy.initialize_config({
+        "exchange": {"exchange_name": "mock"},
+        "symbol": SYMBOL,
+        "grid": {
+            "price_step": price_step,
+            "grid_count": grid_count,
+            "price_spread": price_spread,
+            "order_quantity": 0.0001,
+            "sleep_interval": 1,
+        },
+        "risk": {"enable": False},
+    })
+    strategy.MARKET_DATA_CONFIG = {}
+    strategy.MARKET_DATA_CLIENT = None
+    strategy.POSITION_STATE.update(open_time=None, last_reduce_time=None)
+    return strategy
+
+
+# ---------------- 用例：setup(size) -> (每次调用执行一次操作的函数, 适配器或 None)
+
+def grid_diff(size: int):
+    strategy = _strategy(size)
+    price_step, price_spread = 1, 10
+    long_grid, short_grid = strategy.generate_grid_arrays(PRICE, price_step, size, price_spread)
+    # 当前挂单：目标网格整体偏移半个网格
+    shift = max(1, size // 2)
+    long_pending = [price - shift for price in long_grid]
+    short_pending = [price + shift for price in short_grid]
+
+    def op():
+        target_long, target_short = strategy.generate_grid_arrays(PRICE, price_step, size, price_spread)
+        strategy.calculate_maker_cancel_orders(long_pending, short_pending, PRICE, price_spread, price_step)
+        strategy.calculate_place_orders(target_long, target_short, long_pending, short_pending)
+
+    return op, None
+
+
+def pending_orders(size: int):
+    strategy = _strategy(10)
+    adapter = MockPerpAdapter()
+    adapter.set_price(PRICE)
+    quantity = Decimal("0.0001")
+    for i in range(size):
+        side, price = ("buy", PRICE - 1 - i // 2) if i % 2 == 0 else ("sell", PRICE + 1 + i // 2)
+        adapter.place_order(SYMBOL, side, "limit", quantity, Decimal(price))
+
+    def op():
+        strategy.get_pending_orders_arrays(adapter, SYMBOL)
+
+    return op, adapter
+
+
+def cycle_steady(size: int):
+    strategy = _strategy(size)
+    adapter = MockPerpAdapter()
+    adapter.set_price(PRICE)
+    strategy.run_strategy_cycle(adapter)
+    before = Counter(adapter.calls)
+    strategy.run_strategy_cycle(adapter)
+    changes = [call for call in adapter.calls - before if call.startswith(("place_", "cancel_"))]
+    if changes:
+        raise ValueError(f"cycle_steady[{size}] 的网格超出撤单距离，价格不变时仍有 {changes}")
+
+    def op():
+        strategy.run_strategy_cycle(adapter)
+
+    return op, adapter
+
+
+def cycle_churn(size: int):
+    strategy = _strategy(size)
+    adapter = MockPerpAdapter()
+    prices = [PRICE, PRICE + 50]
+    state = {"i": 0}
+    for price in prices:
+        adapter.set_price(price)
+        strategy.run_strategy_cycle(adapter)
+
+    def op():
+        state["i"] += 1
+        adapter.set_price(prices[state["i"] % 2])
+        strategy.run_strategy_cycle(adapter)
+
+    return op, adapter
+
+
+# 用例名 -> (setup, size, 每轮操作次数)
+CASES: Dict[str, Tuple[Callable[[int], Tuple[Callable[[], None], Optional[MockPerpAdapter]]], int, int]] = {
+    "grid_diff[10]": (grid_diff, 10, 2000),
+    "grid_diff[100]": (grid_diff, 100, 500),
+    "grid_diff[1000]": (grid_diff, 1000, 50),
+    "pending_orders[1200]": (pending_orders, 1200, 20),
+    "cycle_steady[3]": (cycle_steady, 3, 500),
+    "cycle_churn[5]": (cycle_churn, 5, 200),
+    "cycle_churn[200]": (cycle_churn, 200, 10),
+}
+
+
+def measure(name: str, rounds: int = 15) -> Dict[str, Any]:
+    """
+    运行一个用例：rounds 轮，每轮执行固定次数操作
+
+    Returns:
+        {"min_us", "median_us"（每次操作的 CPU 耗时）, "calls"（每次操作的各接口请求数）,
+         "simulated_ms"（每次操作的模拟网络耗时）}
+    """
+    setup, size, number = CASES[name]
+    op, adapter = setup(size)
+    op()  # 预热
+    before = Counter(adapter.calls) if adapter is not None else Counter()
+    first_round = before
+    samples = []
+    # 与 pytest-benchmark 的 --benchmark-disable-gc 相同：计时期间关闭 GC，减少抖动
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            started = time.perf_counter()
+            for _ in range(number):
+                op()
+            samples.append((time.perf_counter() - started) / number * 1e6)
+            if len(samples) == 1 and adapter is not None:
+                first_round = Counter(adapter.calls)
+    finally:
+        gc.enable()
+    result: Dict[str, Any] = {
+        "min_us": round(min(samples), 3),
+        "median_us": round(statistics.median(samples), 3),
+        "calls": {},
+        "simulated_ms": 0.0,
+    }
+    if adapter is not None:
+        # 请求数只统计第一轮（固定 number 次操作），与 --rounds 无关，保证可与基线逐项比较
+        calls = first_round
+        calls.subtract(before)
+        result["calls"] = {call: round(count / number, 3) for call, count in sorted(calls.items()) if count}
+        result["simulated_ms"] = round(adapter.simulated_ms(calls) / number, 3)
+    return result
+
+
+def load_baseline(path: str = BASELINE_FILE) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(results: Dict[str, Dict[str, Any]], path: str = BASELINE_FILE):
+    """保存基线（已有基线中未运行的用例保留）"""
+    baseline = load_baseline(path)
+    baseline.setdefault("cases", {}).update(results)
+    baseline["machine"] = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "saved_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.write("\n")
+
+
+def compare(result: Dict[str, Any], base: Optional[Dict[str, Any]], tolerance: float, scale: float) -> List[str]:
+    """与基线比较，返回回归说明（空列表表示通过）"""
+    if base is None:
+        return []
+    problems = []
+    limit = base["median_us"] * scale * (1 + tolerance)
+    if result["median_us"] > limit:
+        problems.append(
+            f"中位数 {result['median_us']:.1f} us > 基线 {base['median_us']:.1f} us x {scale * (1 + tolerance):.2f}"
+        )
+    if result["calls"] != base.get("calls", {}):
+        problems.append(f"请求数 {result['calls']} != 基线 {base.get('calls', {})}")
+    return problems
+
+
+def run(
+    targets: Optional[List[str]] = None,
+    rounds: int = 15,
+    tolerance: float = 0.5,
+    scale: float = 1.0,
+    save: bool = False,
+    path: str = BASELINE_FILE,
+    passes: int = 5,
+) -> bool:
+    baseline = load_baseline(path).get("cases", {})
+    names = [name for name in CASES if not targets or any(name.startswith(target) for target in targets)]
+    results: Dict[str, Dict[str, Any]] = {}
+    for i in range(passes if save else 1):
+        if i:
+            time.sleep(1)
+        for name in names:
+            result = measure(name, rounds)
+            if name not in results or result["median_us"] > results[name]["median_us"]:
+                results[name] = result
+    ok = True
+    print(f"{'case':<22} {'min_us':>10} {'median_us':>10} {'baseline':>10} {'reqs/op':>8} {'sim_ms/op':>10}")
+    for name in names:
+        result = results[name]
+        base = baseline.get(name)
+        problems = [] if save else compare(result, base, tolerance, scale)
+        ok = ok and not problems
+        print(
+            f"{name:<22} {result['min_us']:>10.1f} {result['median_us']:>10.1f} "
+            f"{base['median_us'] if base else float('nan'):>10.1f} "
+            f"{sum(result['calls'].values()):>8.2f} {result['simulated_ms']:>10.1f}"
+            + ("" if not problems else "  FAIL " + "; ".join(problems))
+        )
+    if save:
+        save_baseline(results, path)
+        print(f"[BASELINE] saved {len(results)} cases -> {path}")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="StandX 网格策略热路径基准")
+    parser.add_argument("--rounds", type=int, default=15)
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--save", action="store_true", help="把本次结果保存为基线")
+    parser.add_argument("--passes", type=int, default=5, help="--save 时运行的遍数，每个用例保存最慢的一遍")
+    parser.add_argument("--baseline", type=str, default=BASELINE_FILE, help="基线文件")
+    parser.add_argument("targets", nargs="*", help=f"只运行名称以此开头的用例: {', '.join(CASES)}")
+    args = parser.parse_args()
+    sys.exit(0 if run(args.targets, args.rounds, args.tolerance, args.scale, args.save, args.baseline, args.passes) else 1)
@@ -0,0 +1,151 @@
+"""
+Replay benchmark: GRVT local order book update throughput.
+
+Replays `book.d` messages (a synthetic random-walk stream, or a JSON-lines file of
+recorded WS messages) through `GrvtOrderBook`, querying best bid / ask and
+microprice after every update like a quoting loop would, and compares the result
+with a dict-of-levels book that sorts on every query.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.orderbook_replay [--updates N] [--file F]
+"""
+
+import argparse
+import json
+import random
+import time
+
+from pysdk.grvt_orderbook import GrvtOrderBook
+
+INSTRUMENT = "BTC_USDT_Perp"
+TICK = 0.1
+
+
+def _level(price: float, size: float) -> dict:
+    return {"price": f"{price:.1f}", "size": f"{size:.3f}", "num_orders": 1}
+
+
+def synthetic_messages(updates: int, depth: int = 200, seed: int = 0) -> list[dict]:
+    """Snapshot followed by `updates` deltas of a random-walking book."""
+    rng = random.Random(seed)
+    mid = 60000.0
+    bids = {round(mid - TICK * (i + 1), 1): rng.uniform(0.01, 5) for i in range(depth)}
+    asks = {round(mid + TICK * (i + 1), 1): rng.uniform(0.01, 5) for i in range(depth)}
+    messages = [
+        {
+            "stream": "v1.book.d",
+            "selector": f"{INSTRUMENT}@100",
+            "sequence_number": "0",
+            "feed": {
+                "event_time": "0",
+                "instrument": INSTRUMENT,
+                "bids": [_level(p, s) for p, s in bids.items()],
+                "asks": [_level(p, s) for p, s in asks.items()],
+            },
+        }
+    ]
+    for seq in range(1, updates + 1):
+        mid += rng.choice((-TICK, 0.0, 0.0, TICK))
+        changed_bids, changed_asks = [], []
+        for _ in range(rng.randint(1, 6)):
+            offset = int(rng.expovariate(0.2)) + 1
+            is_bid = rng.random() < 0.5
+            side, changed = (bids, changed_bids) if is_bid else (asks, changed_asks)
+            price = round(mid - TICK * offset if is_bid else mid + TICK * offset, 1)
+            size = 0.0 if price in side and rng.random() < 0.3 else rng.uniform(0.01, 5)
+            if size:
+                side[price] = size
+            else:
+                side.pop(price, None)
+            changed.append(_level(price, size))
+        # drop levels crossed by the mid move
+        for price in [p for p in bids if p >= mid]:
+            del bids[price]
+            changed_bids.append(_level(price, 0.0))
+        for price in [p for p in asks if p <= mid]:
+            del asks[price]
+            changed_asks.append(_level(price, 0.0))
+        messages.append(
+            {
+                "stream": "v1.book.d",
+                "selector": f"{INSTRUMENT}@100",
+                "sequence_number": str(seq),
+                "prev_sequence_number": str(seq - 1),
+                "feed": {
+                    "event_time": str(seq * 100_000_000),
+                    "instrument": INSTRUMENT,
+                    "bids": changed_bids,
+                    "asks": changed_asks,
+                },
+            }
+        )
+    return messages
+
+
+class DictOrderBook:
+    """Reference book: price -> size dicts, sorted on every query."""
+
+    def __init__(self):
+        self.bids: dict[float, float] = {}
+        self.asks: dict[float, float] = {}
+
+    def on_message(self, message: dict) -> None:
+        feed = message["feed"]
+        if int(message["sequence_number"]) == 0:
+            self.bids.clear()
+            self.asks.clear()
+        for side, levels in ((self.bids, feed["bids"]), (self.asks, feed["asks"])):
+            for level in levels:
+                price, size = float(level["price"]), float(level["size"])
+                if size:
+                    side[price] = size
+                else:
+                    side.pop(price, None)
+
+    def microprice(self) -> float | None:
+        if not self.bids or not self.asks:
+            return None
+        bid = sorted(self.bids.items(), reverse=True)[0]
+        ask = sorted(self.asks.items())[0]
+        return (bid[0] * ask[1] + ask[0] * bid[1]) / (bid[1] + ask[1])
+
+
+def _replay(book, messages: list[dict]) -> float:
+    start = time.perf_counter()
+    for message in messages:
+        book.on_message(message)
+        book.microprice()
+    return len(messages) / (time.perf_counter() - start)
+
+
+def run(updates: int = 50000, file: str | None = None):
+    if file:
+        with open(file) as f:
+            messages = [json.loads(line) for line in f if line.strip()]
+    else:
+        messages = synthetic_messages(updates)
+
+    book, reference = GrvtOrderBook(INSTRUMENT), DictOrderBook()
+    for message in messages:
+        book.on_message(message)
+        reference.on_message(message)
+    assert abs(book.microprice() - reference.microprice()) < 1e-6, "microprice mismatch"
+
+    fast = _replay(GrvtOrderBook(INSTRUMENT), messages)
+    slow = _replay(DictOrderBook(), messages)
+    print(
+        f"messages: {len(messages)} | levels: {len(book.bids)} bids /"
+        f" {len(book.asks)} asks | gaps: {book.gaps}"
+    )
+    print(
+        f"GrvtOrderBook {fast:>10,.0f} updates/s | dict book {slow:>10,.0f} updates/s"
+        f" | x{fast / slow:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--updates", type=int, default=50000)
+    parser.add_argument("--file", help="JSON lines of recorded book.d WS messages")
+    args = parser.parse_args()
+    run(args.updates, args.file)
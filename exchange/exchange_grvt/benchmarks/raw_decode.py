@@ -0,0 +1,117 @@
+"""
+Benchmark: decoding GRVT raw API responses into `grvt_raw_types` dataclasses.
+
+Compares `dacite.from_dict(..., Config(cast=[Enum]))` with the compiled decoders
+in `grvt_raw_decoder` (plain and `slots=True`) on fill history, order history and
+order book responses, reporting decode time and the memory retained by the decoded
+objects (tracemalloc). Payloads are synthetic unless a recorded JSON response is given.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.raw_decode [--rows 1000]
+    PYTHONPATH=src python -m benchmarks.raw_decode --file fills.json \\
+        --type ApiFillHistoryResponse
+"""
+
+import argparse
+import dataclasses
+import json
+import random
+import time
+import tracemalloc
+import typing
+from collections.abc import Callable
+from enum import Enum
+from types import UnionType
+
+from dacite import Config, from_dict as dacite_from_dict
+
+from pysdk import grvt_raw_types as types
+from pysdk.grvt_raw_decoder import from_dict
+
+
+def _sample(hint, rng: random.Random, rows: int):
+    origin = typing.get_origin(hint)
+    if origin is typing.Union or origin is UnionType:
+        hint = next(arg for arg in typing.get_args(hint) if arg is not type(None))
+        origin = typing.get_origin(hint)
+    if origin is list:
+        (item,) = typing.get_args(hint)
+        return [_sample(item, rng, 2) for _ in range(rows)]
+    if dataclasses.is_dataclass(hint):
+        hints = typing.get_type_hints(hint)
+        return {
+            field.name: _sample(hints[field.name], rng, rows)
+            for field in dataclasses.fields(hint)
+        }
+    if isinstance(hint, type) and issubclass(hint, Enum):
+        return rng.choice(list(hint)).value
+    if hint is bool:
+        return rng.random() < 0.5
+    if hint is int:
+        return rng.randrange(1, 10**6)
+    return f"{rng.uniform(0, 100000):.6f}"
+
+
+def synthetic_payloads(rows: int) -> list[tuple[type, dict]]:
+    rng = random.Random(0)
+    return [
+        (cls, _sample(cls, rng, rows))
+        for cls in (
+            types.ApiFillHistoryResponse,
+            types.ApiOrderHistoryResponse,
+            types.ApiOrderbookLevelsResponse,
+        )
+    ]
+
+
+def _seconds(decode: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decode()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _retained(decode: Callable[[], object]) -> int:
+    tracemalloc.start()
+    result = decode()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def run(rows: int = 1000, file: str | None = None, type_name: str | None = None):
+    if file:
+        with open(file) as f:
+            payloads = [(getattr(types, type_name), json.load(f))]
+    else:
+        payloads = synthetic_payloads(rows)
+    config = Config(cast=[Enum])
+    for cls, payload in payloads:
+        decoders = {
+            "dacite": lambda: dacite_from_dict(cls, payload, config),
+            "compiled": lambda: from_dict(cls, payload),
+            "slots": lambda: from_dict(cls, payload, slots=True),
+        }
+        reference = decoders["dacite"]()
+        assert decoders["compiled"]() == reference, "decoded objects differ"
+        seconds = {name: _seconds(decode, 5) for name, decode in decoders.items()}
+        memory = {name: _retained(decode) for name, decode in decoders.items()}
+        print(f"{cls.__name__}:")
+        for name in decoders:
+            print(
+                f"  {name:>8}: {seconds[name] * 1000:>8.2f} ms"
+                f" (x{seconds['dacite'] / seconds[name]:>5.1f})"
+                f" | {memory[name] / 1024:>8.0f} KiB retained"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--file", help="recorded JSON response (the `result` envelope)")
+    parser.add_argument("--type", dest="type_name", help="grvt_raw_types response class")
+    args = parser.parse_args()
+    run(args.rows, args.file, args.type_name)
@@ -92,6 +92,8 @@ class GrvtCcxt(GrvtCcxtBase):
         self.refresh_cookie()
         payload_json = json.dumps(payload, cls=EnumEncoder)
         self.logger.info(f"{FN} {payload=}\n{payload_json=}")
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire(path.rsplit("/", 1)[-1])
         return_value = self._session.post(path, data=payload_json, timeout=5)
         return_text: str = ""
         try:
@@ -122,6 +124,7 @@ class GrvtCcxt(GrvtCcxtBase):
             private_key=self._private_key,
             env=self.env,
             instruments=self.markets,
+            signer=self.get_order_signer(),
         )
         path = get_grvt_endpoint(self.env, "CREATE_ORDER")
         self.logger.info(f"{FN} {path=} {order_payload=}")
@@ -539,6 +542,7 @@ class GrvtCcxt(GrvtCcxtBase):
                 str(i.get("instrument", "")): i for i in instruments if i.get("instrument")
             }
             self.logger.info(f"load_markets: loaded {len(self.markets)} markets.")
+            self.get_order_signer()
         else:
             self.logger.warning("load_markets: No markets found.")
         return self.markets
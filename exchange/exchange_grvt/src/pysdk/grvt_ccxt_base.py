@@ -23,6 +23,7 @@ from .grvt_ccxt_types import (
     ccxt_interval_to_grvt_candlestick_interval,
 )
 from .grvt_ccxt_utils import get_kuq_from_symbol, sign_derisk_mm_ratio_request
+from .grvt_order_signer import GrvtOrderSigner
 
 # COOKIE_REFRESH_INTERVAL_SECS = 60 * 60  # 30 minutes
 
@@ -53,11 +54,14 @@ class GrvtCcxtBase:
         self._trading_account_id: str | None = parameters.get("trading_account_id")
         self._private_key: str = str(parameters.get("private_key", ""))
         self._api_key: str = str(parameters.get("api_key", ""))
+        # optional shared limiter, see GrvtApiConfig.rate_limiter
+        self._rate_limiter: Any = parameters.get("rate_limiter")
         self._order_book_ccxt_format: bool = order_book_ccxt_format
 
         self._path_return_value_map: dict = {}
         self._cookie: dict | None = None
         self.markets: dict = {}
+        self._order_signer: GrvtOrderSigner | None = None
         self._clsname: str = type(self).__name__
         self.logger.info(f"GrvtCcxtBase: {self.env=}, {self._trading_account_id=}")
 
@@ -93,6 +97,24 @@ class GrvtCcxtBase:
         """Returns the trading account id."""
         return self._trading_account_id or ""
 
+    def get_order_signer(self) -> GrvtOrderSigner | None:
+        """
+        Returns the cached order signer, (re)loading instrument encodings whenever
+        `self.markets` was replaced (e.g. by `load_markets`).
+        None if no private key is configured.
+        """
+        if not self._private_key:
+            return None
+        if self._order_signer is None:
+            try:
+                self._order_signer = GrvtOrderSigner(self._private_key, env=self.env)
+            except Exception as err:
+                self.logger.warning(f"{self._clsname} get_order_signer: invalid private key {err=}")
+                return None
+        if not self._order_signer.is_loaded_from(self.markets):
+            self._order_signer.load_instruments(self.markets)
+        return self._order_signer
+
     def is_order_book_ccxt_format(self) -> bool:
         """Returns True if order book should be returned in CCXT format."""
         return self._order_book_ccxt_format
@@ -109,6 +109,8 @@ class GrvtCcxtPro(GrvtCcxtBase):
         await self.refresh_cookie()
         payload_json = json.dumps(payload, cls=EnumEncoder)
         self.logger.info(f"{FN} {payload=}\n{payload_json=}")
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire_async(path.rsplit("/", 1)[-1])
         return_text: str = ""
         async with self._session.post(
             url=path,
@@ -148,6 +150,7 @@ class GrvtCcxtPro(GrvtCcxtBase):
             private_key=self._private_key,
             env=self.env,
             instruments=self.markets,
+            signer=self.get_order_signer(),
         )
         path = get_grvt_endpoint(self.env, "CREATE_ORDER")
         self.logger.info(f"{FN} {path=} {order_payload=}")
@@ -571,6 +574,7 @@ class GrvtCcxtPro(GrvtCcxtBase):
         if instruments:
             self.markets = {i.get("instrument"): i for i in instruments}
             self.logger.info(f"load_markets: loaded {len(self.markets)} markets.")
+            self.get_order_signer()
         else:
             self.logger.warning("load_markets: No markets found.")
         return self.markets
@@ -331,14 +331,14 @@ class GrvtOrder:
 def get_signable_message(
     order: GrvtOrder, env: GrvtEnv, instruments: dict[str, dict]
 ) -> bytes | None:
-    FN = f"get_signable_message {order=}"
+    FN = "get_signable_message"
     size_multiplier = BTC_ETH_SIZE_MULTIPLIER
     PRICE_MULTIPLIER = 1_000_000_000
     legs = []
     for leg in order.legs:
         instrument = instruments.get(leg.instrument)
         if not instrument or not isinstance(instrument, dict):
-            logging.error(f"{FN}: {leg.instrument=} not found in {instruments=}")
+            logging.error(f"{FN}: {leg.instrument=} not found in instruments ({len(instruments)} loaded)")
             return None
         if "base_decimals" not in instrument:
             logging.error(f"{FN}: no 'base_decimals' in {instrument=}")
@@ -366,21 +366,32 @@ def get_signable_message(
         "expiration": order.signature.expiration,
     }
     domain_data: dict[str, str | int]= get_EIP712_domain_data(env)
-    logging.info(f"{FN} {domain_data=}\n{EIP712_ORDER_MESSAGE_TYPE=}\n{message_data=}")
+    logging.debug("%s %s domain_data=%s message_data=%s", FN, order.metadata, domain_data, message_data)
     return encode_typed_data(domain_data, EIP712_ORDER_MESSAGE_TYPE, message_data)
 
 
 def get_order_payload(
-    order: GrvtOrder, private_key: str, env: GrvtEnv, instruments: dict[str, dict]
+    order: GrvtOrder,
+    private_key: str,
+    env: GrvtEnv,
+    instruments: dict[str, dict],
+    signer: Any = None,
 ) -> dict:
-    signable_message = get_signable_message(order, env, instruments)
-    if signable_message is None:
-        raise ValueError("Failed to create signable message")
-    signed_message = Account.sign_message(signable_message, private_key)
-    order.signature.s = "0x" + signed_message.s.to_bytes(32, byteorder="big").hex()
-    order.signature.r = "0x" + signed_message.r.to_bytes(32, byteorder="big").hex()
-    order.signature.v = signed_message.v
-    order.signature.signer = Account.from_key(private_key).address
+    """
+    Sign `order` and build the create_order payload.
+    signer: optional `GrvtOrderSigner` (fast path with cached domain / instrument encodings).
+    """
+    if signer is not None:
+        signer.sign(order)
+    else:
+        signable_message = get_signable_message(order, env, instruments)
+        if signable_message is None:
+            raise ValueError("Failed to create signable message")
+        signed_message = Account.sign_message(signable_message, private_key)
+        order.signature.s = "0x" + signed_message.s.to_bytes(32, byteorder="big").hex()
+        order.signature.r = "0x" + signed_message.r.to_bytes(32, byteorder="big").hex()
+        order.signature.v = signed_message.v
+        order.signature.signer = Account.from_key(private_key).address
 
     return {
         "order": {
@@ -419,8 +430,9 @@ def get_order_rpc_payload(
     env: GrvtEnv,
     instruments: dict[str, dict],
     version: str = "v1",
+    signer: Any = None,
 ) -> dict:
-    order_payload = get_order_payload(order, private_key, env, instruments)
+    order_payload = get_order_payload(order, private_key, env, instruments, signer)
     return {
         "jsonrpc": "2.0",
         "method": f"{version}/create_order",
@@ -33,6 +33,8 @@ from .grvt_ccxt_types import (
     Num,
 )
 from .grvt_ccxt_utils import get_order_rpc_payload
+from .grvt_orderbook import GrvtOrderBook
+from .grvt_ws_dispatch import DEFAULT_QUEUE_SIZE, StreamDispatcher
 
 WS_READ_TIMEOUT = 5
 
@@ -44,6 +46,10 @@ class GrvtCcxtWS(GrvtCcxtPro):
     Args:
         env: GrvtCcxtPro (DEV, TESTNET, PROD)
         parameters: dict with trading_account_id, private_key, api_key etc
+            Feed dispatch options:
+            `ws_queue_size` (int): pending messages per stream, default 1000.
+            `ws_queue_policies` (dict): stream -> overflow policy overrides,
+                see `grvt_ws_dispatch`.
 
     Examples:
         >>> from grvt_api_pro import GrvtCcxtPro
@@ -70,7 +76,15 @@ class GrvtCcxtWS(GrvtCcxtPro):
         self.subscribed_streams: dict[GrvtWSEndpointType, dict] = {}
         self.api_url: dict[GrvtWSEndpointType, str] = {}
         self._last_message: dict[str, dict] = {}
+        self.order_books: dict[str, GrvtOrderBook] = {}
+        self._order_book_resyncs: dict[str, asyncio.Task] = {}
         self._request_id = 0
+        self.dispatcher = StreamDispatcher(
+            loop,
+            self.logger,
+            maxsize=parameters.get("ws_queue_size", DEFAULT_QUEUE_SIZE),
+            policies=parameters.get("ws_queue_policies"),
+        )
         self.endpoint_types = [
             GrvtWSEndpointType.MARKET_DATA,
             GrvtWSEndpointType.TRADE_DATA,
@@ -95,6 +109,14 @@ class GrvtCcxtWS(GrvtCcxtPro):
     async def __aexit__(self):
         for grvt_endpoint_type in self.endpoint_types:
             await self._close_connection(grvt_endpoint_type)
+        await self.dispatcher.close()
+
+    def get_dispatch_stats(self) -> dict:
+        """
+        JSON decode latency and per-stream queue depth / processed / dropped /
+        conflated counters of the feed dispatcher.
+        """
+        return self.dispatcher.stats()
 
     def force_reconnect(self) -> None:
         self.force_reconnect_flag = True
@@ -281,15 +303,16 @@ class GrvtCcxtWS(GrvtCcxtPro):
 
     async def _read_messages(self, grvt_endpoint_type: GrvtWSEndpointType):
         FN = f"{self._clsname} _read_messages {grvt_endpoint_type.value}"
+        dispatcher = self.dispatcher
         while True:
             if self.is_connection_open(grvt_endpoint_type):
                 try:
-                    self.logger.debug(f"{FN} waiting for message")
                     response = await asyncio.wait_for(
                         self.ws[grvt_endpoint_type].recv(), timeout=WS_READ_TIMEOUT
                     )
-                    message = json.loads(response)
-                    self.logger.debug(f"{FN} received {message=}")
+                    message = dispatcher.decode(response)
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug(f"{FN} received {message=}")
                     self._check_susbcribed_stream(grvt_endpoint_type, message)
                     if "feed" in message:
                         stream_subscribed: str | None = message.get("stream")
@@ -305,11 +328,17 @@ class GrvtCcxtWS(GrvtCcxtPro):
                                 .get(selector, None)
                             )
                             if callback:
-                                await callback(message)
                                 stream: str = self.get_non_versioned_stream(
                                     stream_subscribed
                                 )
                                 self._last_message[stream] = message
+                                await dispatcher.dispatch(
+                                    f"{grvt_endpoint_type.value}/{stream}",
+                                    stream,
+                                    selector,
+                                    callback,
+                                    message,
+                                )
                             else:
                                 self.logger.warning(
                                     f"{FN} No callback for {stream_subscribed=}/{selector=}"
@@ -330,7 +359,10 @@ class GrvtCcxtWS(GrvtCcxtPro):
                         'book_size': ['0.001'], 'traded_size': ['0.0'], 'update_time': '1728918862633971628'}}}, 
                         'id': 2}
                     """
-                        self.logger.debug(f"{FN} jsonrpc result:{message.get('result')}")
+                        if self.logger.isEnabledFor(logging.DEBUG):
+                            self.logger.debug(
+                                f"{FN} jsonrpc result:{message.get('result')}"
+                            )
                     else:
                         self.logger.info(f"{FN} Non-actionable message:{message}")
                 except (
@@ -492,6 +524,63 @@ class GrvtCcxtWS(GrvtCcxtPro):
         await self._unsubscribe_to_stream(ws_end_point_type, versioned_stream, selector)
         await asyncio.sleep(5)  # wait for unsubscribe to complete
         await self._subscribe_to_stream(ws_end_point_type, versioned_stream, selector)
+
+    async def subscribe_order_book(
+        self,
+        symbol: str,
+        rate: int = 100,
+        callback: Callable | None = None,
+    ) -> GrvtOrderBook:
+        """
+        Maintain a local L2 order book for `symbol` from the `book.d` delta feed.
+        The book is available right away via `get_order_book(symbol)` and is filled
+        once the initial snapshot arrives.
+        On a sequence gap the book is cleared and the stream is re-subscribed
+        in a separate task to receive a fresh snapshot.
+        Args:
+            symbol: instrument name, e.g. `BTC_USDT_Perp`.
+            rate: delta feed rate in ms (50, 100, 500 or 1000).
+            callback: optional coroutine `(GrvtOrderBook, dict) -> None` called after
+                each message is applied to the book.
+        """
+        book = self.order_books.get(symbol)
+        if book is None:
+            book = self.order_books[symbol] = GrvtOrderBook(symbol)
+        params = {"instrument": symbol, "rate": rate}
+
+        async def on_book_message(message: dict) -> None:
+            if not book.on_message(message):
+                self._resync_order_book(symbol, on_book_message, params)
+            if callback and book.is_synced:
+                await callback(book, message)
+
+        await self.subscribe("book.d", on_book_message, params=params)
+        return book
+
+    def _resync_order_book(self, symbol: str, callback: Callable, params: dict) -> None:
+        FN = f"{self._clsname} _resync_order_book {symbol=}"
+        if symbol in self._order_book_resyncs:
+            return
+        self.logger.warning(f"{FN} sequence gap, re-subscribing for a new snapshot")
+        task = self._loop.create_task(
+            self.re_subscribe_stream("book.d", callback, params=params)
+        )
+        self._order_book_resyncs[symbol] = task
+        task.add_done_callback(lambda t: self._on_resync_done(symbol, t))
+
+    def _on_resync_done(self, symbol: str, task: asyncio.Task) -> None:
+        # Keep the reference until the task finishes, then allow the next resync
+        # even if re_subscribe_stream failed or returned early.
+        if self._order_book_resyncs.get(symbol) is task:
+            del self._order_book_resyncs[symbol]
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error(
+                f"{self._clsname} _resync_order_book {symbol=} failed: {task.exception()}"
+            )
+
+    def get_order_book(self, symbol: str) -> GrvtOrderBook | None:
+        """Local order book maintained by `subscribe_order_book`, None if not subscribed."""
+        return self.order_books.get(symbol)
         
 
     def get_versioned_stream(self, stream: str) -> str:
@@ -631,7 +720,9 @@ class GrvtCcxtWS(GrvtCcxtPro):
             symbol, order_type, side, amount, price, params
         )
         self.logger.info(f"{FN} {order=}")
-        payload = get_order_rpc_payload(order, self._private_key, self.env, self.markets)
+        payload = get_order_rpc_payload(
+            order, self._private_key, self.env, self.markets, signer=self.get_order_signer()
+        )
         self._request_id += 1
         payload["id"] = self._request_id
         self.logger.info(f"{FN} {payload=}")
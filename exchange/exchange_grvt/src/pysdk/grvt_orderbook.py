@@ -0,0 +1,275 @@
+"""
+Local L2 order book maintained from the GRVT `book.d` delta feed.
+
+The delta feed publishes a full snapshot on subscription (sequence number `0`) and then
+only the levels that changed (`size = 0` removes a level). `GrvtOrderBook` applies those
+messages into two array-backed sorted sides:
+
+- each side keeps parallel price (integer, 9 decimals) / size lists sorted so the
+  best level is always the last element: best bid / best ask / mid / microprice are O(1),
+  size-at-price is an O(log n) bisect, and level updates near the top of book are
+  cheap list tail operations.
+- sequence numbers are checked on every delta. Duplicates / stale messages are ignored;
+  a gap marks the book as out of sync and it is cleared until the next snapshot
+  (`GrvtCcxtWS.subscribe_order_book` resubscribes automatically to get one).
+"""
+
+from bisect import bisect_left
+from collections.abc import Iterable
+
+from .grvt_order_signer import scale_decimal
+
+PRICE_DECIMALS = 9
+_PRICE_SCALE = 10**PRICE_DECIMALS
+
+
+class BookSide:
+    """
+    One side of the book as sorted parallel arrays, best level last.
+
+    Bids are stored with key `price`, asks with key `-price`, so that in both cases
+    the keys are ascending and the best level is at the end of the arrays.
+    """
+
+    __slots__ = ("is_bid", "_keys", "_sizes")
+
+    def __init__(self, is_bid: bool):
+        self.is_bid = is_bid
+        self._keys: list[int] = []
+        self._sizes: list[float] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._sizes.clear()
+
+    def update(self, price: int, size: float) -> None:
+        """Set the size at `price` (integer, 9 decimals); size 0 removes the level."""
+        key = price if self.is_bid else -price
+        keys = self._keys
+        n = len(keys)
+        # fast path: top of book
+        if n and keys[-1] == key:
+            index = n - 1
+        else:
+            index = bisect_left(keys, key)
+        if index < n and keys[index] == key:
+            if size:
+                self._sizes[index] = size
+            else:
+                del keys[index]
+                del self._sizes[index]
+        elif size:
+            keys.insert(index, key)
+            self._sizes.insert(index, size)
+
+    def load(self, levels: Iterable[tuple[int, float]]) -> None:
+        """Replace all levels (snapshot)."""
+        pairs = sorted(
+            (price if self.is_bid else -price, size) for price, size in levels if size
+        )
+        self._keys = [key for key, _ in pairs]
+        self._sizes = [size for _, size in pairs]
+
+    def best(self) -> tuple[int, float] | None:
+        """Best (price, size), or None if the side is empty."""
+        if not self._keys:
+            return None
+        key = self._keys[-1]
+        return (key if self.is_bid else -key), self._sizes[-1]
+
+    def size_at(self, price: int) -> float:
+        key = price if self.is_bid else -price
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return self._sizes[index]
+        return 0.0
+
+    def levels(self, limit: int | None = None) -> list[tuple[int, float]]:
+        """Levels from best to worst as (price, size), at most `limit` of them."""
+        keys, sizes = self._keys, self._sizes
+        start = 0 if limit is None else max(len(keys) - limit, 0)
+        sign = 1 if self.is_bid else -1
+        return [(sign * keys[i], sizes[i]) for i in range(len(keys) - 1, start - 1, -1)]
+
+    def volume(self, limit: int) -> float:
+        """Total size of the best `limit` levels."""
+        return sum(self._sizes[-limit:]) if limit > 0 else 0.0
+
+
+def _parse_levels(levels: list[dict]) -> list[tuple[int, float]]:
+    return [
+        (scale_decimal(level["price"], PRICE_DECIMALS), float(level["size"]))
+        for level in levels
+    ]
+
+
+class GrvtOrderBook:
+    """
+    L2 order book for one instrument, fed with `book.d` (or `book.s`) messages.
+
+    Prices are returned as floats, sizes in base asset units.
+
+    Args:
+        instrument: Instrument name, e.g. `BTC_USDT_Perp`.
+    """
+
+    def __init__(self, instrument: str):
+        self.instrument = instrument
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self.sequence_number: int | None = None
+        self.event_time: int = 0
+        self.is_synced: bool = False
+        self.snapshots: int = 0
+        self.updates: int = 0
+        self.duplicates: int = 0
+        self.gaps: int = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"GrvtOrderBook({self.instrument} bid={self.best_bid()} ask={self.best_ask()}"
+            f" seq={self.sequence_number} synced={self.is_synced})"
+        )
+
+    # ---------------- updates
+
+    def on_message(self, message: dict) -> bool:
+        """
+        Apply a WS feed message (`{"sequence_number", "prev_sequence_number", "feed"}`).
+
+        Returns:
+            False if a sequence gap was detected (the book is cleared and must be
+            resnapshotted), True otherwise.
+        """
+        feed = message["feed"]
+        sequence_number = int(message.get("sequence_number") or 0)
+        if sequence_number == 0:
+            self.apply_snapshot(feed, sequence_number)
+            return True
+        prev = message.get("prev_sequence_number")
+        return self.apply_delta(
+            feed, sequence_number, int(prev) if prev not in (None, "") else None
+        )
+
+    def apply_snapshot(self, feed: dict, sequence_number: int = 0) -> None:
+        """Replace the book with a full snapshot."""
+        self.bids.load(_parse_levels(feed.get("bids", [])))
+        self.asks.load(_parse_levels(feed.get("asks", [])))
+        self.sequence_number = sequence_number
+        self.event_time = int(feed.get("event_time") or 0)
+        self.is_synced = True
+        self.snapshots += 1
+
+    def apply_delta(
+        self, feed: dict, sequence_number: int, prev_sequence_number: int | None = None
+    ) -> bool:
+        """
+        Apply changed levels.
+
+        The delta must directly follow the last applied message: its
+        `prev_sequence_number` (when provided) must equal the last sequence number,
+        otherwise the sequence number must be the last one + 1. Messages at or below
+        the last sequence number are duplicates and are ignored.
+
+        Returns:
+            False on a sequence gap (the book is cleared until the next snapshot).
+        """
+        if not self.is_synced or self.sequence_number is None:
+            # waiting for a snapshot
+            return True
+        last = self.sequence_number
+        if sequence_number <= last:
+            self.duplicates += 1
+            return True
+        if prev_sequence_number:
+            in_sequence = prev_sequence_number == last
+        else:
+            in_sequence = sequence_number == last + 1
+        if not in_sequence:
+            self.gaps += 1
+            self.reset()
+            return False
+        update_bids = self.bids.update
+        for level in feed.get("bids", ()):
+            update_bids(
+                scale_decimal(level["price"], PRICE_DECIMALS), float(level["size"])
+            )
+        update_asks = self.asks.update
+        for level in feed.get("asks", ()):
+            update_asks(
+                scale_decimal(level["price"], PRICE_DECIMALS), float(level["size"])
+            )
+        self.sequence_number = sequence_number
+        self.event_time = int(feed.get("event_time") or self.event_time)
+        self.updates += 1
+        return True
+
+    def reset(self) -> None:
+        """Clear the book and wait for the next snapshot."""
+        self.bids.clear()
+        self.asks.clear()
+        self.sequence_number = None
+        self.is_synced = False
+
+    # ---------------- queries
+
+    def best_bid(self) -> tuple[float, float] | None:
+        """Best bid as (price, size)."""
+        best = self.bids.best()
+        return (best[0] / _PRICE_SCALE, best[1]) if best else None
+
+    def best_ask(self) -> tuple[float, float] | None:
+        """Best ask as (price, size)."""
+        best = self.asks.best()
+        return (best[0] / _PRICE_SCALE, best[1]) if best else None
+
+    def mid_price(self) -> float | None:
+        bid, ask = self.bids.best(), self.asks.best()
+        if not bid or not ask:
+            return None
+        return (bid[0] + ask[0]) / 2 / _PRICE_SCALE
+
+    def spread(self) -> float | None:
+        bid, ask = self.bids.best(), self.asks.best()
+        if not bid or not ask:
+            return None
+        return (ask[0] - bid[0]) / _PRICE_SCALE
+
+    def microprice(self) -> float | None:
+        """
+        Top-of-book size-weighted price:
+        (bid * ask_size + ask * bid_size) / (bid_size + ask_size).
+        """
+        bid, ask = self.bids.best(), self.asks.best()
+        if not bid or not ask:
+            return None
+        bid_price, bid_size = bid
+        ask_price, ask_size = ask
+        total = bid_size + ask_size
+        if not total:
+            return (bid_price + ask_price) / 2 / _PRICE_SCALE
+        return (bid_price * ask_size + ask_price * bid_size) / total / _PRICE_SCALE
+
+    def size_at(self, price: float | str, side: str) -> float:
+        """Resting size at `price` on `side` ("bid"/"buy" or "ask"/"sell")."""
+        book_side = self.bids if side in ("bid", "bids", "buy") else self.asks
+        return book_side.size_at(scale_decimal(str(price), PRICE_DECIMALS))
+
+    def imbalance(self, levels: int = 1) -> float | None:
+        """(bid volume - ask volume) / total volume over the best `levels` per side."""
+        bid_volume, ask_volume = self.bids.volume(levels), self.asks.volume(levels)
+        total = bid_volume + ask_volume
+        return (bid_volume - ask_volume) / total if total else None
+
+    def to_ccxt(self, limit: int | None = None) -> dict:
+        """Order book in the ccxt `fetch_order_book` layout."""
+        return {
+            "symbol": self.instrument,
+            "bids": [[p / _PRICE_SCALE, s] for p, s in self.bids.levels(limit)],
+            "asks": [[p / _PRICE_SCALE, s] for p, s in self.asks.levels(limit)],
+            "timestamp": self.event_time // 1_000_000 if self.event_time else None,
+            "nonce": self.sequence_number,
+        }
@@ -22,6 +22,11 @@ class GrvtApiConfig:
     private_key: str | None
     api_key: str | None
     logger: logging.Logger | None
+    # decode responses into `__slots__` copies of the grvt_raw_types dataclasses
+    decode_slots: bool = False
+    # optional shared limiter; each request calls `acquire(endpoint)` before it is
+    # sent, `endpoint` being the last path segment (create_order, cancel_order, ...)
+    rate_limiter: Any = None
 
 
 @dataclass
@@ -50,6 +55,7 @@ class GrvtRawBase:
         self.env: GrvtEnvConfig = get_env_config(config.env)
         self.logger: logging.Logger = config.logger or logging.getLogger(__name__)
         self._cookie: GrvtCookie | None = None
+        self._decode_slots: bool = config.decode_slots
         if self.config.private_key is not None:
             self.account: Account = Account.from_key(self.config.private_key)
 
@@ -150,6 +156,8 @@ class GrvtRawSyncBase(GrvtRawBase):
         req_json = json.dumps(req, cls=DataclassJSONEncoder)
         resp_json: Any = {}
 
+        if self.config.rate_limiter is not None:
+            self.config.rate_limiter.acquire(path.rsplit("/", 1)[-1])
         self.logger.debug(f"{FN} {req_json=}")
         resp: requests.Response = self._session.post(path, data=req_json, timeout=5)
         try:
@@ -242,6 +250,8 @@ class GrvtRawAsyncBase(GrvtRawBase):
         req_json = json.dumps(req, cls=DataclassJSONEncoder)
         resp_json: Any = {}
 
+        if self.config.rate_limiter is not None:
+            await self.config.rate_limiter.acquire_async(path.rsplit("/", 1)[-1])
         self.logger.debug(f"{FN} {req_json=}")
         resp: aiohttp.ClientResponse = await self._session.post(
             path, data=req_json, timeout=5
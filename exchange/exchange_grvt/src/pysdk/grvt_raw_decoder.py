@@ -0,0 +1,172 @@
+"""
+Compiled dict -> dataclass decoders for `grvt_raw_types`.
+
+`dacite.from_dict(cls, data, Config(cast=[Enum]))` resolves type hints and walks
+every field reflectively on each call. `from_dict` here produces the same
+instances, but generates (once per dataclass, on first use) a plain Python function
+that reads the keys and builds the instance directly:
+
+- nested dataclasses call their own compiled decoder,
+- `list[X]` fields become list comprehensions,
+- `Enum` fields are cast with `EnumCls(value)`,
+- `X | None` fields and fields with defaults use `data.get(key, default)`.
+
+Primitive values are passed through without `dacite`'s type checks. If the
+compiled decoder fails (missing key, invalid enum value ...) the payload is decoded
+again with `dacite`, so errors are the same `dacite` exceptions as before.
+
+With `slots=True` instances are built from `slotted(cls)` copies of the dataclasses
+(`@dataclass(slots=True)`, same fields), which use less memory for large
+fill / order history responses. Slotted instances are not instances of the
+original classes.
+"""
+
+import dataclasses
+import types
+import typing
+from collections.abc import Callable
+from enum import Enum
+from typing import Any, TypeVar
+
+import dacite
+
+T = TypeVar("T")
+
+_DACITE_CONFIG = dacite.Config(cast=[Enum])
+_decoders: dict[tuple[type, bool], Callable[[dict], Any]] = {}
+_slotted: dict[type, type] = {}
+
+
+def slotted(cls: type) -> type:
+    """`@dataclass(slots=True)` copy of dataclass `cls` (cached)."""
+    slotted_cls = _slotted.get(cls)
+    if slotted_cls is None:
+        namespace: dict[str, Any] = {
+            "__annotations__": dict(cls.__annotations__),
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+            "__doc__": cls.__doc__,
+        }
+        for field in dataclasses.fields(cls):
+            if field.default is not dataclasses.MISSING:
+                namespace[field.name] = field.default
+            elif field.default_factory is not dataclasses.MISSING:
+                namespace[field.name] = dataclasses.field(
+                    default_factory=field.default_factory
+                )
+        slotted_cls = type(cls.__name__, (), namespace)
+        slotted_cls = _slotted[cls] = dataclasses.dataclass(slots=True)(slotted_cls)
+    return slotted_cls
+
+
+def _optional_arg(hint: Any) -> Any:
+    """X for `X | None` / `Optional[X]`, None otherwise."""
+    origin = typing.get_origin(hint)
+    if origin is typing.Union or origin is types.UnionType:
+        args = [arg for arg in typing.get_args(hint) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+        raise TypeError(f"Unsupported union {hint}")
+    return None
+
+
+class _Compiler:
+    def __init__(self, slots: bool):
+        self.slots = slots
+        self.namespace: dict[str, Any] = {"_fallback": _fallback}
+        self._names: dict[type, str] = {}
+
+    def _bind(self, obj: Any, prefix: str) -> str:
+        name = f"{prefix}{len(self.namespace)}"
+        self.namespace[name] = obj
+        return name
+
+    def decoder_name(self, cls: type) -> str:
+        name = self._names.get(cls)
+        if name is None:
+            # register before compiling so recursive types resolve to the same name
+            name = self._names[cls] = f"_decode_{cls.__name__}_{len(self._names)}"
+            self.namespace[name] = self._compile(cls, name)
+        return name
+
+    def value(self, hint: Any, var: str, depth: int) -> str:
+        """Expression converting the (not None) value in `var` to `hint`."""
+        inner = _optional_arg(hint)
+        if inner is not None:
+            return f"(None if {var} is None else {self.value(inner, var, depth)})"
+        if typing.get_origin(hint) is list:
+            (item_hint,) = typing.get_args(hint) or (Any,)
+            item = f"_v{depth}"
+            item_expr = self.value(item_hint, item, depth + 1)
+            if item_expr == item:
+                return f"list({var})"
+            return f"[{item_expr} for {item} in {var}]"
+        if isinstance(hint, type):
+            if dataclasses.is_dataclass(hint):
+                return f"{self.decoder_name(hint)}({var})"
+            if issubclass(hint, Enum):
+                return f"{self._bind(hint, '_enum')}({var})"
+        return var
+
+    def _compile(self, cls: type, name: str) -> Callable[[dict], Any]:
+        hints = typing.get_type_hints(cls)
+        target = slotted(cls) if self.slots else cls
+        lines = [f"def {name}(data):", "    try:"]
+        arguments = []
+        for index, field in enumerate(dataclasses.fields(cls)):
+            if not field.init:
+                continue
+            hint = hints[field.name]
+            key = repr(field.name)
+            if field.default is not dataclasses.MISSING:
+                default = self._bind(field.default, "_default")
+                source = f"data.get({key}, {default})"
+            elif field.default_factory is not dataclasses.MISSING:
+                factory = self._bind(field.default_factory, "_factory")
+                source = f"(data[{key}] if {key} in data else {factory}())"
+            elif _optional_arg(hint) is not None:
+                source = f"data.get({key})"
+            else:
+                source = f"data[{key}]"
+            var = f"_f{index}"
+            expr = self.value(hint, var, 0)
+            if expr == var:
+                arguments.append(f"{field.name}={source}")
+            else:
+                lines.append(f"        {var} = {source}")
+                arguments.append(f"{field.name}={expr}")
+        lines.append(f"        return {self._bind(target, '_cls')}(")
+        lines.extend(f"            {argument}," for argument in arguments)
+        lines.append("        )")
+        lines.append("    except Exception:")
+        lines.append(f"        return _fallback({name}_cls, data)")
+        self.namespace[f"{name}_cls"] = target
+        source_code = "\n".join(lines)
+        code = compile(source_code, f"<grvt_raw_decoder {cls.__name__}>", "exec")
+        exec(code, self.namespace)  # noqa: S102
+        decoder = self.namespace[name]
+        decoder.__source__ = source_code
+        return decoder
+
+
+def _fallback(cls: type, data: Any) -> Any:
+    return dacite.from_dict(cls, data, _DACITE_CONFIG)
+
+
+_compilers = {False: _Compiler(slots=False), True: _Compiler(slots=True)}
+
+
+def get_decoder(cls: type[T], slots: bool = False) -> Callable[[dict], T]:
+    """Compiled decoder `dict -> cls` (built on first use, then cached)."""
+    decoder = _decoders.get((cls, slots))
+    if decoder is None:
+        compiler = _compilers[slots]
+        decoder = compiler.namespace[compiler.decoder_name(cls)]
+        _decoders[(cls, slots)] = decoder
+    return decoder
+
+
+def from_dict(cls: type[T], data: dict, slots: bool = False) -> T:
+    """Drop-in replacement for `dacite.from_dict(cls, data, Config(cast=[Enum]))`."""
+    decoder = _decoders.get((cls, slots)) or get_decoder(cls, slots)
+    return decoder(data)
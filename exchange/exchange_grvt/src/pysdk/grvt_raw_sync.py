@@ -1,9 +1,6 @@
-from enum import Enum
-
-from dacite import Config, from_dict
-
 from . import grvt_raw_types as types
 from .grvt_raw_base import GrvtApiConfig, GrvtError, GrvtRawSyncBase
+from .grvt_raw_decoder import from_dict
 
 # mypy: disable-error-code="no-any-return"
 
@@ -20,7 +17,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(False, self.md_rpc + "/full/v1/instrument", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiGetInstrumentResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiGetInstrumentResponse, resp, self._decode_slots)
 
     def get_all_instruments_v1(
         self, req: types.ApiGetAllInstrumentsRequest
@@ -28,7 +25,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(False, self.md_rpc + "/full/v1/all_instruments", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiGetAllInstrumentsResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiGetAllInstrumentsResponse, resp, self._decode_slots)
 
     def get_filtered_instruments_v1(
         self, req: types.ApiGetFilteredInstrumentsRequest
@@ -37,7 +34,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         if resp.get("code"):
             return GrvtError(**resp)
         return from_dict(
-            types.ApiGetFilteredInstrumentsResponse, resp, Config(cast=[Enum])
+            types.ApiGetFilteredInstrumentsResponse, resp, self._decode_slots
         )
 
     def get_currency_v1(
@@ -46,7 +43,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(False, self.md_rpc + "/full/v1/currency", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiGetCurrencyResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiGetCurrencyResponse, resp, self._decode_slots)
 
     def mini_ticker_v1(
         self, req: types.ApiMiniTickerRequest
@@ -54,7 +51,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(False, self.md_rpc + "/full/v1/mini", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiMiniTickerResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiMiniTickerResponse, resp, self._decode_slots)
 
     def ticker_v1(
         self, req: types.ApiTickerRequest
@@ -62,7 +59,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(False, self.md_rpc + "/full/v1/ticker", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiTickerResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiTickerResponse, resp, self._decode_slots)
 
     def orderbook_levels_v1(
         self, req: types.ApiOrderbookLevelsRequest
@@ -70,13 +67,13 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(False, self.md_rpc + "/full/v1/book", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiOrderbookLevelsResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiOrderbookLevelsResponse, resp, self._decode_slots)
 
     def trade_v1(self, req: types.ApiTradeRequest) -> types.ApiTradeResponse | GrvtError:
         resp = self._post(False, self.md_rpc + "/full/v1/trade", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiTradeResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiTradeResponse, resp, self._decode_slots)
 
     def trade_history_v1(
         self, req: types.ApiTradeHistoryRequest
@@ -84,7 +81,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(False, self.md_rpc + "/full/v1/trade_history", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiTradeHistoryResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiTradeHistoryResponse, resp, self._decode_slots)
 
     def candlestick_v1(
         self, req: types.ApiCandlestickRequest
@@ -92,7 +89,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(False, self.md_rpc + "/full/v1/kline", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiCandlestickResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiCandlestickResponse, resp, self._decode_slots)
 
     def funding_rate_v1(
         self, req: types.ApiFundingRateRequest
@@ -100,7 +97,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(False, self.md_rpc + "/full/v1/funding", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiFundingRateResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiFundingRateResponse, resp, self._decode_slots)
 
     def create_order_v1(
         self, req: types.ApiCreateOrderRequest
@@ -108,7 +105,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/create_order", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiCreateOrderResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiCreateOrderResponse, resp, self._decode_slots)
 
     def cancel_order_v1(
         self, req: types.ApiCancelOrderRequest
@@ -116,7 +113,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/cancel_order", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.AckResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.AckResponse, resp, self._decode_slots)
 
     def cancel_all_orders_v1(
         self, req: types.ApiCancelAllOrdersRequest
@@ -124,7 +121,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/cancel_all_orders", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.AckResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.AckResponse, resp, self._decode_slots)
 
     def get_order_v1(
         self, req: types.ApiGetOrderRequest
@@ -132,7 +129,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/order", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiGetOrderResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiGetOrderResponse, resp, self._decode_slots)
 
     def open_orders_v1(
         self, req: types.ApiOpenOrdersRequest
@@ -140,7 +137,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/open_orders", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiOpenOrdersResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiOpenOrdersResponse, resp, self._decode_slots)
 
     def order_history_v1(
         self, req: types.ApiOrderHistoryRequest
@@ -148,7 +145,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/order_history", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiOrderHistoryResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiOrderHistoryResponse, resp, self._decode_slots)
 
     def cancel_on_disconnect_v1(
         self, req: types.ApiCancelOnDisconnectRequest
@@ -156,7 +153,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/cancel_on_disconnect", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.AckResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.AckResponse, resp, self._decode_slots)
 
     def fill_history_v1(
         self, req: types.ApiFillHistoryRequest
@@ -164,7 +161,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/fill_history", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiFillHistoryResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiFillHistoryResponse, resp, self._decode_slots)
 
     def positions_v1(
         self, req: types.ApiPositionsRequest
@@ -172,7 +169,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/positions", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiPositionsResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiPositionsResponse, resp, self._decode_slots)
 
     def funding_payment_history_v1(
         self, req: types.ApiFundingPaymentHistoryRequest
@@ -181,7 +178,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         if resp.get("code"):
             return GrvtError(**resp)
         return from_dict(
-            types.ApiFundingPaymentHistoryResponse, resp, Config(cast=[Enum])
+            types.ApiFundingPaymentHistoryResponse, resp, self._decode_slots
         )
 
     def deposit_history_v1(
@@ -190,7 +187,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/deposit_history", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiDepositHistoryResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiDepositHistoryResponse, resp, self._decode_slots)
 
     def transfer_v1(
         self, req: types.ApiTransferRequest
@@ -198,7 +195,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/transfer", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiTransferResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiTransferResponse, resp, self._decode_slots)
 
     def transfer_history_v1(
         self, req: types.ApiTransferHistoryRequest
@@ -206,7 +203,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/transfer_history", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiTransferHistoryResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiTransferHistoryResponse, resp, self._decode_slots)
 
     def withdrawal_v1(
         self, req: types.ApiWithdrawalRequest
@@ -214,7 +211,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/withdrawal", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.AckResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.AckResponse, resp, self._decode_slots)
 
     def withdrawal_history_v1(
         self, req: types.ApiWithdrawalHistoryRequest
@@ -222,7 +219,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/withdrawal_history", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiWithdrawalHistoryResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiWithdrawalHistoryResponse, resp, self._decode_slots)
 
     def sub_account_summary_v1(
         self, req: types.ApiSubAccountSummaryRequest
@@ -230,7 +227,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/account_summary", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiSubAccountSummaryResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiSubAccountSummaryResponse, resp, self._decode_slots)
 
     def sub_account_history_v1(
         self, req: types.ApiSubAccountHistoryRequest
@@ -238,7 +235,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/account_history", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiSubAccountHistoryResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiSubAccountHistoryResponse, resp, self._decode_slots)
 
     def aggregated_account_summary_v1(
         self, req: types.EmptyRequest
@@ -247,7 +244,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         if resp.get("code"):
             return GrvtError(**resp)
         return from_dict(
-            types.ApiAggregatedAccountSummaryResponse, resp, Config(cast=[Enum])
+            types.ApiAggregatedAccountSummaryResponse, resp, self._decode_slots
         )
 
     def funding_account_summary_v1(
@@ -257,7 +254,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         if resp.get("code"):
             return GrvtError(**resp)
         return from_dict(
-            types.ApiFundingAccountSummaryResponse, resp, Config(cast=[Enum])
+            types.ApiFundingAccountSummaryResponse, resp, self._decode_slots
         )
 
     def set_derisk_mm_ratio_v1(
@@ -267,7 +264,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         if resp.get("code"):
             return GrvtError(**resp)
         return from_dict(
-            types.ApiSetDeriskToMaintenanceMarginRatioResponse, resp, Config(cast=[Enum])
+            types.ApiSetDeriskToMaintenanceMarginRatioResponse, resp, self._decode_slots
         )
 
     def get_all_initial_leverage_v1(
@@ -277,7 +274,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         if resp.get("code"):
             return GrvtError(**resp)
         return from_dict(
-            types.ApiGetAllInitialLeverageResponse, resp, Config(cast=[Enum])
+            types.ApiGetAllInitialLeverageResponse, resp, self._decode_slots
         )
 
     def set_initial_leverage_v1(
@@ -286,7 +283,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/set_initial_leverage", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiSetInitialLeverageResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiSetInitialLeverageResponse, resp, self._decode_slots)
 
     def vault_burn_tokens_v1(
         self, req: types.ApiVaultBurnTokensRequest
@@ -294,7 +291,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/vault_burn_tokens", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.AckResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.AckResponse, resp, self._decode_slots)
 
     def vault_invest_v1(
         self, req: types.ApiVaultInvestRequest
@@ -302,7 +299,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/vault_invest", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.AckResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.AckResponse, resp, self._decode_slots)
 
     def vault_investor_summary_v1(
         self, req: types.ApiVaultInvestorSummaryRequest
@@ -310,7 +307,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/vault_investor_summary", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.ApiVaultInvestorSummaryResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.ApiVaultInvestorSummaryResponse, resp, self._decode_slots)
 
     def vault_redeem_v1(
         self, req: types.ApiVaultRedeemRequest
@@ -318,7 +315,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/vault_redeem", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.AckResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.AckResponse, resp, self._decode_slots)
 
     def vault_redeem_cancel_v1(
         self, req: types.ApiVaultRedeemCancelRequest
@@ -326,7 +323,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         resp = self._post(True, self.td_rpc + "/full/v1/vault_redeem_cancel", req)
         if resp.get("code"):
             return GrvtError(**resp)
-        return from_dict(types.AckResponse, resp, Config(cast=[Enum]))
+        return from_dict(types.AckResponse, resp, self._decode_slots)
 
     def vault_redemption_queue_v1(
         self, req: types.ApiVaultViewRedemptionQueueRequest
@@ -335,7 +332,7 @@ class GrvtRawSync(GrvtRawSyncBase):
         if resp.get("code"):
             return GrvtError(**resp)
         return from_dict(
-            types.ApiVaultViewRedemptionQueueResponse, resp, Config(cast=[Enum])
+            types.ApiVaultViewRedemptionQueueResponse, resp, self._decode_slots
         )
 
     def query_vault_manager_investor_history_v1(
@@ -347,5 +344,5 @@ class GrvtRawSync(GrvtRawSyncBase):
         if resp.get("code"):
             return GrvtError(**resp)
         return from_dict(
-            types.ApiQueryVaultManagerInvestorHistoryResponse, resp, Config(cast=[Enum])
+            types.ApiQueryVaultManagerInvestorHistoryResponse, resp, self._decode_slots
         )
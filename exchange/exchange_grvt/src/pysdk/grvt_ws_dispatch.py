@@ -0,0 +1,247 @@
+"""
+Non-blocking dispatch of GRVT WebSocket feed messages.
+
+`GrvtCcxtWS` reads every endpoint in a single task. Awaiting user callbacks in that
+task means one slow callback stalls the socket and backs up every other stream.
+`StreamDispatcher` decouples the two: the reader decodes a frame and enqueues it
+on a bounded per-stream `StreamQueue`, and one consumer task per stream awaits the
+callbacks in arrival order.
+
+When a consumer falls behind, each stream follows its overflow policy:
+
+- `CONFLATE` (snapshot feeds: `*.s`, `candle`): at most one pending message per
+  selector, a newer tick replaces the stale one.
+- `DROP_OLDEST` (delta / public trade feeds: `*.d`, `trade`): the oldest pending
+  message is dropped. Book deltas carry sequence numbers, so a local
+  `GrvtOrderBook` detects the gap and resnapshots.
+- `BLOCK` (private feeds: orders, fills, positions, transfers ...): nothing is
+  dropped, the reader waits for the consumer.
+
+`json_loads` uses `orjson` when it is installed (`pip install grvt-pysdk[fast]`)
+and falls back to the standard library.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+
+try:
+    import orjson
+
+    json_loads: Callable[[str | bytes], object] = orjson.loads
+    JSON_BACKEND = "orjson"
+except ImportError:  # pragma: no cover - optional dependency
+    json_loads = json.loads
+    JSON_BACKEND = "json"
+
+CONFLATE = "conflate"
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+POLICIES = (CONFLATE, DROP_OLDEST, BLOCK)
+
+DEFAULT_QUEUE_SIZE = 1000
+
+
+def default_policy(stream: str) -> str:
+    """Overflow policy for a (versioned or non-versioned) stream name."""
+    if stream.endswith((".s", "candle")):
+        return CONFLATE
+    if stream.endswith((".d", "trade")):
+        return DROP_OLDEST
+    return BLOCK
+
+
+class StreamQueue:
+    """
+    Bounded FIFO of `(callback, message)` entries for one stream.
+
+    Args:
+        name: Stream name (for stats / logs).
+        policy: `CONFLATE`, `DROP_OLDEST` or `BLOCK`.
+        maxsize: Maximum number of pending entries.
+    """
+
+    def __init__(self, name: str, policy: str, maxsize: int = DEFAULT_QUEUE_SIZE):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown overflow policy {policy}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        self.name = name
+        self.policy = policy
+        self.maxsize = maxsize
+        # CONFLATE: the deque holds selectors and `_latest` the pending entry per selector
+        self._entries: deque = deque()
+        self._latest: dict[str, tuple[Callable, dict]] = {}
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self.received = 0
+        self.processed = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.max_depth = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put_nowait(self, selector: str, callback: Callable, message: dict) -> bool:
+        """
+        Enqueue a message without waiting.
+
+        Returns:
+            False if the queue is full and the policy is `BLOCK` (use `put`).
+        """
+        entries = self._entries
+        if self.policy == CONFLATE:
+            if selector in self._latest:
+                self._latest[selector] = (callback, message)
+                self.received += 1
+                self.conflated += 1
+                return True
+            if len(entries) >= self.maxsize:
+                self._latest.pop(entries.popleft(), None)
+                self.dropped += 1
+            entries.append(selector)
+            self._latest[selector] = (callback, message)
+        elif len(entries) >= self.maxsize:
+            if self.policy == BLOCK:
+                self._not_full.clear()
+                return False
+            entries.popleft()
+            self.dropped += 1
+            entries.append((callback, message))
+        else:
+            entries.append((callback, message))
+        self.received += 1
+        if len(entries) > self.max_depth:
+            self.max_depth = len(entries)
+        self._not_empty.set()
+        return True
+
+    async def put(self, selector: str, callback: Callable, message: dict) -> None:
+        """Enqueue a message, waiting for space if the policy is `BLOCK`."""
+        while not self.put_nowait(selector, callback, message):
+            await self._not_full.wait()
+
+    async def get(self) -> tuple[Callable, dict]:
+        """Wait for and pop the oldest pending entry."""
+        while not self._entries:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        entry = self._entries.popleft()
+        if self.policy == CONFLATE:
+            entry = self._latest.pop(entry)
+        if not self._not_full.is_set():
+            self._not_full.set()
+        return entry
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy,
+            "depth": len(self._entries),
+            "max_depth": self.max_depth,
+            "received": self.received,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "conflated": self.conflated,
+        }
+
+
+class StreamDispatcher:
+    """
+    Per-stream queues and consumer tasks.
+
+    Args:
+        loop: Event loop the consumer tasks run on.
+        logger: Logger for callback errors and drops.
+        maxsize: Default queue size per stream.
+        policies: Optional stream name -> policy overrides (non-versioned names,
+            e.g. `{"book.d": BLOCK}`).
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        logger: logging.Logger,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+        policies: dict[str, str] | None = None,
+    ):
+        self._loop = loop
+        self.logger = logger
+        self.maxsize = maxsize
+        self.policies = dict(policies or {})
+        self.queues: dict[str, StreamQueue] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.decoded = 0
+        self.decode_seconds = 0.0
+        self.max_decode_seconds = 0.0
+
+    def decode(self, frame: str | bytes) -> dict:
+        """Decode a WS frame with the fastest available JSON backend, timing it."""
+        started = time.perf_counter()
+        message = json_loads(frame)
+        elapsed = time.perf_counter() - started
+        self.decoded += 1
+        self.decode_seconds += elapsed
+        if elapsed > self.max_decode_seconds:
+            self.max_decode_seconds = elapsed
+        return message
+
+    def _policy(self, stream: str) -> str:
+        for name, policy in self.policies.items():
+            if stream == name or stream.endswith(f".{name}"):
+                return policy
+        return default_policy(stream)
+
+    def queue(self, key: str, stream: str) -> StreamQueue:
+        """Queue (and consumer task) for `key`, created on first use."""
+        queue = self.queues.get(key)
+        if queue is None:
+            queue = StreamQueue(key, self._policy(stream), self.maxsize)
+            self.queues[key] = queue
+            self._tasks[key] = self._loop.create_task(self._consume(queue))
+        return queue
+
+    async def dispatch(
+        self, key: str, stream: str, selector: str, callback: Callable, message: dict
+    ) -> None:
+        """Hand a message to the stream's consumer; only waits for `BLOCK` streams."""
+        queue = self.queue(key, stream)
+        if not queue.put_nowait(selector, callback, message):
+            self.logger.warning(
+                f"StreamDispatcher {key} queue full ({queue.maxsize}), waiting"
+            )
+            await queue.put(selector, callback, message)
+
+    async def _consume(self, queue: StreamQueue) -> None:
+        while True:
+            callback, message = await queue.get()
+            try:
+                await callback(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.logger.exception(f"StreamDispatcher {queue.name} callback failed")
+            queue.processed += 1
+
+    def stats(self) -> dict:
+        """Decode latency and per-stream queue depth / drop counters."""
+        return {
+            "json_backend": JSON_BACKEND,
+            "decoded": self.decoded,
+            "avg_decode_us": (
+                self.decode_seconds / self.decoded * 1e6 if self.decoded else None
+            ),
+            "max_decode_us": self.max_decode_seconds * 1e6,
+            "streams": {key: queue.stats() for key, queue in self.queues.items()},
+        }
+
+    async def close(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+        self.queues.clear()
@@ -0,0 +1,185 @@
+import copy
+import random
+from decimal import Decimal
+
+import pytest
+
+from pysdk.grvt_ccxt_env import GrvtEnv as CcxtGrvtEnv
+from pysdk.grvt_ccxt_utils import get_grvt_order, get_order_payload
+from pysdk.grvt_order_signer import GrvtOrderSigner, scale_decimal
+from pysdk.grvt_raw_env import GrvtEnv
+from pysdk.grvt_raw_types import (
+    Instrument,
+    InstrumentSettlementPeriod,
+    Kind,
+    Order,
+    OrderLeg,
+    OrderMetadata,
+    Signature,
+    TimeInForce,
+)
+
+SUB_ACCOUNT_ID = "8289849667772468"
+EXPIRY = 1730800479321350000
+NONCE = 828700936
+
+INSTRUMENTS = {
+    "BTC_USDT_Perp": Instrument(
+        instrument="BTC_USDT_Perp",
+        instrument_hash="0x030501",
+        base="BTC",
+        quote="USDT",
+        kind=Kind.PERPETUAL,
+        venues=[],
+        settlement_period=InstrumentSettlementPeriod.DAILY,
+        tick_size="0.00000001",
+        min_size="0.00000001",
+        create_time="123",
+        base_decimals=9,
+        quote_decimals=9,
+        max_position_size="1000000",
+    )
+}
+
+
+def _raw_order(size: str, limit_price: str) -> Order:
+    return Order(
+        metadata=OrderMetadata(client_order_id="1", create_time="1730800479321350000"),
+        sub_account_id=SUB_ACCOUNT_ID,
+        time_in_force=TimeInForce.GOOD_TILL_TIME,
+        post_only=False,
+        is_market=False,
+        reduce_only=False,
+        legs=[
+            OrderLeg(
+                instrument="BTC_USDT_Perp",
+                size=size,
+                limit_price=limit_price,
+                is_buying_asset=False,
+            )
+        ],
+        signature=Signature(signer="", r="", s="", v=0, expiration=EXPIRY, nonce=NONCE),
+    )
+
+
+# vectors from test_grvt_raw_signing.py
+@pytest.mark.parametrize(
+    "size, limit_price, want_r, want_s, want_v",
+    [
+        (
+            "1.013",
+            "68900.5",
+            "0xb00512d986a718b15136a8ba23de1c1ec84bbdb9958629cbbe4909bae620bb04",
+            "0x79f706de61c68cc14d7734594b5d8689df2b2a7b25951f9a3f61d799f4327ffc",
+            28,
+        ),
+        (
+            "1.123123123",
+            "68900.777123479",
+            "0x365ec79d299c8bcd5f2acff89faf741a90ca02a4b8a6b1b1a5d4f3d16130f9f0",
+            "0x465129bca7855f008ea5bc22fe3ee630e4a8e3b9b99c1745631deef29957048a",
+            28,
+        ),
+        (
+            "1.1231231239",
+            "68900.7771234799",
+            "0x365ec79d299c8bcd5f2acff89faf741a90ca02a4b8a6b1b1a5d4f3d16130f9f0",
+            "0x465129bca7855f008ea5bc22fe3ee630e4a8e3b9b99c1745631deef29957048a",
+            28,
+        ),
+    ],
+)
+def test_signer_matches_raw_signing_vectors(size, limit_price, want_r, want_s, want_v):
+    signer = GrvtOrderSigner(
+        "f7934647276a6e1fa0af3f4467b4b8ddaf45d25a7368fa1a295eef49a446819d",
+        env=GrvtEnv.TESTNET,
+        instruments=INSTRUMENTS,
+    )
+    signed = signer.sign(_raw_order(size, limit_price))
+    assert signed.signature.r == want_r
+    assert signed.signature.s == want_s
+    assert signed.signature.v == want_v
+    assert signed.signature.signer == signer.address
+
+
+# vectors from test_grvt_raw_signing_intermediate_steps.py
+@pytest.mark.parametrize(
+    "size, limit_price, message_hash, r, s",
+    [
+        (
+            "1.013",
+            "68900.5",
+            "03cb7ca7b353969ab2c00ff92fd472f81f59a84d28fa1aa39128176f21062982",
+            14615867946748605809126568669694142791729730263440553623296112010401671344650,
+            41758084966111141828834491248882149351523023670747687501271185591898818786045,
+        ),
+        (
+            "1.1231231234",
+            "68900.7771234794",
+            "2d0a437f7d64523386974c2a729d69604f8e2a7f0684b7de923845d8b175ab69",
+            30067953785684815030293507105225786115862149795459199007947867478230986262090,
+            23299979093064779986156565292425191814752388247725004533191995996670719399433,
+        ),
+    ],
+)
+def test_signer_matches_intermediate_step_vectors(size, limit_price, message_hash, r, s):
+    signer = GrvtOrderSigner(
+        "c0663ca94684aead40c41a1cb3a94b68a24296e87245be3a186e882a29a15ee0",
+        chain_id=326,
+        instruments=INSTRUMENTS,
+    )
+    order = _raw_order(size, limit_price)
+    assert signer.order_digest(order).hex() == message_hash
+    signed = signer.sign(order)
+    assert signed.signature.r == "0x" + r.to_bytes(32, byteorder="big").hex()
+    assert signed.signature.s == "0x" + s.to_bytes(32, byteorder="big").hex()
+    assert signed.signature.signer == "0xee2060eECaC18beC7F8F670D751801294911E445"
+
+
+def test_sign_many_matches_ccxt_payload_signing():
+    private_key = "f7934647276a6e1fa0af3f4467b4b8ddaf45d25a7368fa1a295eef49a446819d"
+    markets = {
+        "BTC_USDT_Perp": {"instrument_hash": "0x030501", "base_decimals": 9},
+        "ETH_USDT_Perp": {"instrument_hash": "0x030401", "base_decimals": 9},
+    }
+    signer = GrvtOrderSigner(private_key, env=CcxtGrvtEnv.TESTNET, instruments=markets)
+    rng = random.Random(3)
+    orders = [
+        get_grvt_order(
+            SUB_ACCOUNT_ID,
+            rng.choice(list(markets)),
+            "limit",
+            rng.choice(["buy", "sell"]),
+            Decimal(rng.randrange(1, 10**6)) / Decimal(10 ** rng.randrange(0, 12)),
+            str(round(rng.uniform(1, 1e5), rng.randrange(0, 12))),
+            params={
+                "post_only": rng.random() < 0.5,
+                "reduce_only": rng.random() < 0.5,
+                "time_in_force": rng.choice(["GOOD_TILL_TIME", "IMMEDIATE_OR_CANCEL"]),
+            },
+        )
+        for _ in range(50)
+    ]
+    expected = copy.deepcopy(orders)
+    for order in expected:
+        get_order_payload(order, private_key, CcxtGrvtEnv.TESTNET, markets)
+
+    signed = signer.sign_many(orders)
+    assert [o.signature for o in signed] == [o.signature for o in expected]
+
+
+def test_signer_requires_loaded_instrument():
+    signer = GrvtOrderSigner(
+        "f7934647276a6e1fa0af3f4467b4b8ddaf45d25a7368fa1a295eef49a446819d",
+        env=GrvtEnv.TESTNET,
+    )
+    with pytest.raises(ValueError):
+        signer.sign(_raw_order("1", "1"))
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["1.013", "-0.5", ".5", "5.", "0", "1.1231231239", "1e-3", Decimal("1E+2"), Decimal("1E-9"), 7],
+)
+def test_scale_decimal_matches_decimal(value):
+    assert scale_decimal(value, 9) == int(Decimal(value) * Decimal(10**9))
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+
+import pytest
+
+from pysdk.grvt_ccxt_ws import GrvtCcxtWS
+from pysdk.grvt_orderbook import GrvtOrderBook
+
+
+def _message(seq, bids=(), asks=(), prev=None):
+    message = {
+        "stream": "v1.book.d",
+        "selector": "BTC_USDT_Perp@100",
+        "sequence_number": str(seq),
+        "feed": {
+            "event_time": "1700000000000000000",
+            "instrument": "BTC_USDT_Perp",
+            "bids": [{"price": p, "size": s, "num_orders": 1} for p, s in bids],
+            "asks": [{"price": p, "size": s, "num_orders": 1} for p, s in asks],
+        },
+    }
+    if prev is not None:
+        message["prev_sequence_number"] = str(prev)
+    return message
+
+
+@pytest.fixture
+def book():
+    book = GrvtOrderBook("BTC_USDT_Perp")
+    book.on_message(
+        _message(
+            0,
+            bids=[("99.5", "1.0"), ("100.0", "2.0"), ("99.0", "3.0")],
+            asks=[("101.0", "1.0"), ("100.5", "6.0"), ("102.0", "0.5")],
+        )
+    )
+    return book
+
+
+def test_snapshot(book):
+    assert book.is_synced
+    assert book.best_bid() == (100.0, 2.0)
+    assert book.best_ask() == (100.5, 6.0)
+    assert book.mid_price() == 100.25
+    assert book.spread() == 0.5
+    assert book.microprice() == pytest.approx((100.0 * 6.0 + 100.5 * 2.0) / 8.0)
+    assert book.size_at("99.5", "buy") == 1.0
+    assert book.size_at(101, "sell") == 1.0
+    assert book.size_at("101.5", "sell") == 0.0
+    ccxt = book.to_ccxt(limit=2)
+    assert ccxt["bids"] == [[100.0, 2.0], [99.5, 1.0]]
+    assert ccxt["asks"] == [[100.5, 6.0], [101.0, 1.0]]
+    assert ccxt["nonce"] == 0
+
+
+def test_delta_updates_inserts_and_removes_levels(book):
+    delta = _message(
+        1, bids=[("100.0", "0"), ("100.2", "0.7")], asks=[("100.5", "0.0")], prev=0
+    )
+    assert book.on_message(delta)
+    assert book.best_bid() == (100.2, 0.7)
+    assert book.best_ask() == (101.0, 1.0)
+    assert book.size_at("100.0", "bid") == 0.0
+    assert book.on_message(_message(2, asks=[("100.7", "4.0")]))
+    assert book.best_ask() == (100.7, 4.0)
+    assert [level[0] for level in book.to_ccxt()["asks"]] == [100.7, 101.0, 102.0]
+    assert book.sequence_number == 2
+    assert book.updates == 2
+
+
+def test_duplicate_delta_is_ignored(book):
+    assert book.on_message(_message(1, bids=[("100.1", "1.0")], prev=0))
+    assert book.on_message(_message(1, bids=[("100.1", "9.0")], prev=0))
+    assert book.size_at("100.1", "bid") == 1.0
+    assert book.duplicates == 1
+
+
+def test_gap_resets_until_next_snapshot(book):
+    assert not book.on_message(_message(3, bids=[("100.1", "1.0")], prev=2))
+    assert not book.is_synced
+    assert book.gaps == 1
+    assert book.best_bid() is None and book.microprice() is None
+    # deltas are dropped while waiting for a snapshot
+    assert book.on_message(_message(4, bids=[("100.1", "1.0")], prev=3))
+    assert book.best_bid() is None
+    assert book.on_message(_message(0, bids=[("99.0", "1.0")], asks=[("99.5", "1.0")]))
+    assert book.is_synced
+    assert book.best_bid() == (99.0, 1.0)
+    assert book.snapshots == 2
+
+
+def test_gap_without_prev_sequence_number(book):
+    assert not book.on_message(_message(2, bids=[("100.1", "1.0")]))
+    assert book.gaps == 1
+
+
+def test_imbalance(book):
+    assert book.imbalance(1) == pytest.approx((2.0 - 6.0) / 8.0)
+    assert book.imbalance(3) == pytest.approx((6.0 - 7.5) / 13.5)
+
+
+class _ResyncWS(GrvtCcxtWS):
+    """GrvtCcxtWS without a connection: records (re-)subscriptions."""
+
+    def __init__(self, loop, fail_resubscribe: bool):
+        self._loop = loop
+        self._clsname = "GrvtCcxtWS"
+        self.logger = logging.getLogger(__name__)
+        self.order_books = {}
+        self._order_book_resyncs = {}
+        self._session = None
+        self.fail_resubscribe = fail_resubscribe
+        self.callback = None
+        self.resubscribes = 0
+
+    async def subscribe(self, stream, callback, ws_end_point_type=None, params={}):
+        self.callback = callback
+
+    async def re_subscribe_stream(
+        self, stream, callback, ws_end_point_type=None, params={}
+    ):
+        self.resubscribes += 1
+        await asyncio.sleep(0)
+        if self.fail_resubscribe:
+            raise ConnectionError("socket closed")
+
+
+@pytest.mark.parametrize("fail_resubscribe", [False, True])
+def test_order_book_resync_task_is_tracked_and_released(fail_resubscribe):
+    async def run():
+        ws = _ResyncWS(asyncio.get_running_loop(), fail_resubscribe)
+        await ws.subscribe_order_book("BTC_USDT_Perp")
+        await ws.callback(_message(0, bids=[("100.0", "1.0")]))
+        await ws.callback(_message(3, prev=2))
+        await ws.callback(_message(5, prev=4))
+        # one resync in flight per symbol, and a reference to its task is kept
+        task = ws._order_book_resyncs["BTC_USDT_Perp"]
+        assert ws.resubscribes <= 1
+        await asyncio.gather(task, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert ws.resubscribes == 1
+        # released even when re_subscribe_stream raised: the next gap resyncs again
+        assert ws._order_book_resyncs == {}
+        await ws.callback(_message(0, bids=[("100.0", "1.0")]))
+        await ws.callback(_message(9, prev=8))
+        await asyncio.gather(*ws._order_book_resyncs.values(), return_exceptions=True)
+        assert ws.resubscribes == 2
+
+    asyncio.run(run())
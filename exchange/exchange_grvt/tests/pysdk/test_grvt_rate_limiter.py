@@ -0,0 +1,61 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from pysdk import grvt_raw_types
+from pysdk.grvt_raw_async import GrvtRawAsync
+from pysdk.grvt_raw_base import GrvtApiConfig
+from pysdk.grvt_raw_env import GrvtEnv
+from pysdk.grvt_raw_sync import GrvtRawSync
+
+
+class RecordingLimiter:
+    def __init__(self) -> None:
+        self.endpoints: list[str] = []
+
+    def acquire(self, endpoint: str) -> float:
+        self.endpoints.append(endpoint)
+        return 0.0
+
+    async def acquire_async(self, endpoint: str) -> float:
+        return self.acquire(endpoint)
+
+
+def get_config(limiter: RecordingLimiter) -> GrvtApiConfig:
+    return GrvtApiConfig(
+        env=GrvtEnv.TESTNET,
+        trading_account_id=None,
+        private_key=None,
+        api_key=None,
+        logger=None,
+        rate_limiter=limiter,
+    )
+
+
+def test_sync_post_acquires_endpoint() -> None:
+    limiter = RecordingLimiter()
+    api = GrvtRawSync(config=get_config(limiter))
+    api._session = MagicMock()
+    api._session.post.return_value.json.return_value = {"result": []}
+
+    api.get_all_instruments_v1(grvt_raw_types.ApiGetAllInstrumentsRequest())
+
+    assert limiter.endpoints == ["all_instruments"]
+    assert api._session.post.call_count == 1
+
+
+def test_async_post_acquires_endpoint() -> None:
+    async def run() -> None:
+        limiter = RecordingLimiter()
+        api = GrvtRawAsync(config=get_config(limiter))
+        await api._session.close()
+        response = MagicMock()
+        response.text = AsyncMock(return_value='{"result": []}')
+        api._session = MagicMock()
+        api._session.post = AsyncMock(return_value=response)
+
+        await api.get_all_instruments_v1(grvt_raw_types.ApiGetAllInstrumentsRequest())
+
+        assert limiter.endpoints == ["all_instruments"]
+        assert api._session.post.await_count == 1
+
+    asyncio.run(run())
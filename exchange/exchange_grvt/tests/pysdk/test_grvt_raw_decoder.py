@@ -0,0 +1,108 @@
+import dataclasses
+from enum import Enum
+
+import pytest
+from dacite import Config
+from dacite import from_dict as dacite_from_dict
+
+from pysdk import grvt_raw_types as types
+from pysdk.grvt_raw_decoder import from_dict, get_decoder, slotted
+
+ORDER = {
+    "sub_account_id": "8289849667772468",
+    "is_market": False,
+    "time_in_force": "GOOD_TILL_TIME",
+    "post_only": True,
+    "reduce_only": False,
+    "legs": [
+        {
+            "instrument": "BTC_USDT_Perp",
+            "size": "0.01",
+            "limit_price": "65000.5",
+            "is_buying_asset": True,
+        }
+    ],
+    "signature": {
+        "signer": "0x2989e3783e2ae05f9a1538dd411a22a4cd9554ad",
+        "r": "0x01",
+        "s": "0x02",
+        "v": 28,
+        "expiration": "1730800479321350000",
+        "nonce": 828700936,
+    },
+    "metadata": {"client_order_id": "23042", "create_time": "1728918862633971628"},
+    "state": {
+        "status": "OPEN",
+        "reject_reason": "UNSPECIFIED",
+        "book_size": ["0.01"],
+        "traded_size": ["0.0"],
+        "update_time": "1728918862633971628",
+        "avg_fill_price": ["0.0"],
+    },
+    "order_id": "0x1234",
+    "unknown_field": "ignored",
+}
+
+BOOK = {
+    "result": {
+        "event_time": "1728918862633971628",
+        "instrument": "BTC_USDT_Perp",
+        "bids": [{"price": "65000.0", "size": "1.5", "num_orders": 3}],
+        "asks": [{"price": "65000.5", "size": "0.2", "num_orders": 1}],
+    }
+}
+
+
+def _dacite(cls, data):
+    return dacite_from_dict(cls, data, Config(cast=[Enum]))
+
+
+@pytest.mark.parametrize(
+    "cls,data",
+    [
+        (types.ApiOrderHistoryResponse, {"result": [ORDER, ORDER], "next": ""}),
+        (types.ApiOrderbookLevelsResponse, BOOK),
+        (types.ApiGetAllInstrumentsRequest, {"is_active": True}),
+    ],
+)
+def test_matches_dacite(cls, data):
+    decoded = from_dict(cls, data)
+    assert decoded == _dacite(cls, data)
+    assert type(decoded) is cls
+
+
+def test_enums_nested_and_optional_fields():
+    order = from_dict(types.Order, ORDER)
+    assert order.time_in_force is types.TimeInForce.GOOD_TILL_TIME
+    assert order.state.status is types.OrderStatus.OPEN
+    assert isinstance(order.legs[0], types.OrderLeg)
+    assert order.metadata.trigger is None
+
+
+def test_slots_variant():
+    cls = types.ApiOrderHistoryResponse
+    data = {"result": [ORDER], "next": "abc"}
+    decoded = from_dict(cls, data, slots=True)
+    assert type(decoded) is slotted(cls)
+    assert not hasattr(decoded, "__dict__")
+    assert not hasattr(decoded.result[0].legs[0], "__dict__")
+    assert dataclasses.asdict(decoded) == dataclasses.asdict(_dacite(cls, data))
+
+
+def test_decoder_is_cached():
+    assert get_decoder(types.Order) is get_decoder(types.Order)
+    assert get_decoder(types.Order) is not get_decoder(types.Order, slots=True)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {k: v for k, v in ORDER.items() if k != "legs"},
+        {**ORDER, "time_in_force": "NOT_A_TIF"},
+    ],
+)
+def test_errors_match_dacite(data):
+    with pytest.raises(Exception) as expected:
+        _dacite(types.Order, data)
+    with pytest.raises(type(expected.value)):
+        from_dict(types.Order, data)
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+
+import pytest
+
+from pysdk.grvt_ws_dispatch import (
+    BLOCK,
+    CONFLATE,
+    DROP_OLDEST,
+    StreamDispatcher,
+    StreamQueue,
+    default_policy,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _noop(message: dict) -> None:
+    pass
+
+
+def _drain(queue: StreamQueue) -> list[dict]:
+    async def drain():
+        return [(await queue.get())[1] for _ in range(len(queue))]
+
+    return asyncio.run(drain())
+
+
+def test_default_policy():
+    assert default_policy("v1.mini.s") == CONFLATE
+    assert default_policy("book.s") == CONFLATE
+    assert default_policy("v1.book.d") == DROP_OLDEST
+    assert default_policy("v1.trade") == DROP_OLDEST
+    assert default_policy("v1.fill") == BLOCK
+    assert default_policy("order") == BLOCK
+
+
+def test_conflate_keeps_latest_per_selector():
+    queue = StreamQueue("mini.s", CONFLATE, maxsize=10)
+    for seq in range(3):
+        queue.put_nowait("BTC", _noop, {"selector": "BTC", "seq": seq})
+    queue.put_nowait("ETH", _noop, {"selector": "ETH", "seq": 0})
+    assert len(queue) == 2
+    assert _drain(queue) == [{"selector": "BTC", "seq": 2}, {"selector": "ETH", "seq": 0}]
+    assert queue.conflated == 2
+    assert queue.received == 4
+
+
+def test_drop_oldest_when_full():
+    queue = StreamQueue("book.d", DROP_OLDEST, maxsize=2)
+    for seq in range(5):
+        assert queue.put_nowait("BTC", _noop, {"seq": seq})
+    assert [m["seq"] for m in _drain(queue)] == [3, 4]
+    assert queue.dropped == 3
+    assert queue.max_depth == 2
+
+
+def test_block_waits_for_consumer():
+    async def run():
+        queue = StreamQueue("fill", BLOCK, maxsize=1)
+        assert queue.put_nowait("acc", _noop, {"seq": 0})
+        assert not queue.put_nowait("acc", _noop, {"seq": 1})
+        put = asyncio.ensure_future(queue.put("acc", _noop, {"seq": 1}))
+        await asyncio.sleep(0)
+        assert not put.done()
+        assert (await queue.get())[1] == {"seq": 0}
+        await put
+        assert (await queue.get())[1] == {"seq": 1}
+        assert queue.dropped == 0
+
+    asyncio.run(run())
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        StreamQueue("x", "latest")
+
+
+def test_dispatcher_slow_callback_does_not_block_reader():
+    async def run():
+        dispatcher = StreamDispatcher(asyncio.get_running_loop(), logger, maxsize=4)
+        received = []
+        release = asyncio.Event()
+
+        async def slow(message):
+            await release.wait()
+            received.append(message["seq"])
+
+        for seq in range(10):
+            frame = f'{{"stream": "v1.book.d", "seq": {seq}}}'
+            message = dispatcher.decode(frame)
+            await dispatcher.dispatch("mdg/book.d", "book.d", "BTC@100", slow, message)
+            if seq == 0:
+                await asyncio.sleep(0)  # consumer picks up the first message
+        # the reader never waited; the consumer holds one message, 4 are pending
+        stats = dispatcher.stats()
+        assert stats["decoded"] == 10
+        assert stats["streams"]["mdg/book.d"]["depth"] == 4
+        assert stats["streams"]["mdg/book.d"]["dropped"] == 5
+        release.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert received == [0, 6, 7, 8, 9]
+        assert dispatcher.stats()["streams"]["mdg/book.d"]["processed"] == 5
+        await dispatcher.close()
+
+    asyncio.run(run())
+
+
+def test_dispatcher_policy_override_and_callback_errors():
+    async def run():
+        dispatcher = StreamDispatcher(
+            asyncio.get_running_loop(), logger, policies={"book.d": BLOCK}
+        )
+        received = []
+
+        async def failing(message):
+            received.append(message)
+            raise RuntimeError("boom")
+
+        await dispatcher.dispatch("mdg/book.d", "book.d", "BTC@100", failing, {"seq": 1})
+        await dispatcher.dispatch("mdg/book.d", "book.d", "BTC@100", failing, {"seq": 2})
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert dispatcher.queues["mdg/book.d"].policy == BLOCK
+        assert len(received) == 2
+        await dispatcher.close()
+
+    asyncio.run(run())
@@ -0,0 +1,102 @@
+"""
+Micro-benchmark: Nado order signing throughput.
+
+Compares the generic typed-data path (`build_eip712_typed_data` +
+`sign_eip712_typed_data`) with the precompiled hasher (`sign_nado_execute`)
+on the same orders, checks both produce identical signatures, and reports
+orders/sec for hashing (digest only) and signing.
+
+Usage:
+    python -m benchmarks.eip712_signing [--orders 2000]
+"""
+import argparse
+import random
+import time
+import warnings
+from typing import Callable
+
+from eth_account import Account
+
+from nado_protocol.contracts.eip712.hasher import get_eip712_digest, sign_nado_execute
+from nado_protocol.contracts.eip712.sign import (
+    build_eip712_typed_data,
+    get_eip712_typed_data_digest,
+    sign_eip712_typed_data,
+)
+from nado_protocol.contracts.types import NadoTxType
+from nado_protocol.utils.bytes32 import subaccount_to_bytes32
+from nado_protocol.utils.order import gen_order_verifying_contract
+
+CHAIN_ID = 57073
+PRIVATE_KEY = "0x45917429615b8a68cd372c96f63092f3d672a0bc60202b188670354b89c43ae3"
+
+
+def _orders(count: int, sender: bytes) -> list[tuple[str, dict]]:
+    rng = random.Random(0)
+    return [
+        (
+            gen_order_verifying_contract(rng.randrange(1, 20)),
+            {
+                "sender": sender,
+                "priceX18": rng.randrange(10**21, 10**23),
+                "amount": rng.choice([-1, 1]) * rng.randrange(10**15, 10**18),
+                "expiration": rng.randrange(2**32, 2**62),
+                "nonce": rng.randrange(0, 2**64),
+                "appendix": 1,
+            },
+        )
+        for _ in range(count)
+    ]
+
+
+def _rate(fn: Callable[[str, dict], object], orders: list[tuple[str, dict]]) -> float:
+    start = time.perf_counter()
+    for verifying_contract, msg in orders:
+        fn(verifying_contract, msg)
+    return len(orders) / (time.perf_counter() - start)
+
+
+def run(count: int = 2000):
+    warnings.simplefilter("ignore", DeprecationWarning)
+    signer = Account.from_key(PRIVATE_KEY)
+    orders = _orders(count, subaccount_to_bytes32(signer.address, "default"))
+    tx = NadoTxType.PLACE_ORDER
+
+    def generic_digest(verifying_contract, msg):
+        return get_eip712_typed_data_digest(
+            build_eip712_typed_data(tx, msg, verifying_contract, CHAIN_ID)
+        )
+
+    def fast_digest(verifying_contract, msg):
+        return get_eip712_digest(tx, msg, verifying_contract, CHAIN_ID)
+
+    def generic_sign(verifying_contract, msg):
+        return sign_eip712_typed_data(
+            build_eip712_typed_data(tx, msg, verifying_contract, CHAIN_ID), signer
+        )
+
+    def fast_sign(verifying_contract, msg):
+        return sign_nado_execute(tx, msg, verifying_contract, CHAIN_ID, signer)
+
+    for verifying_contract, msg in orders[:200]:
+        assert generic_sign(verifying_contract, msg) == fast_sign(
+            verifying_contract, msg
+        ), "signature mismatch"
+
+    print(f"orders: {count} (signatures verified identical on 200)")
+    for label, before, after in (
+        ("digest", generic_digest, fast_digest),
+        ("sign", generic_sign, fast_sign),
+    ):
+        before_rate = _rate(before, orders)
+        after_rate = _rate(after, orders)
+        print(
+            f"{label:>6}: generic {before_rate:>10,.0f} orders/s | "
+            f"precompiled {after_rate:>10,.0f} orders/s | x{after_rate / before_rate:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=2000)
+    run(parser.parse_args().orders)
@@ -0,0 +1,169 @@
+"""
+Micro-benchmark: margin summaries for many subaccounts.
+
+Compares `MarginManager.calculate_account_summary` called per subaccount with
+`BatchMarginEngine` on the same engine `SubaccountInfoData`, checks the margin
+usage / leverage / portfolio value results agree, and reports subaccounts/sec for
+the vectorised pass alone, for loading the arrays plus the pass, and for full
+`AccountSummary` materialisation.
+
+Usage:
+    python -m benchmarks.margin_batch [--subaccounts 500] [--products 20]
+"""
+
+import argparse
+import random
+import time
+
+from nado_protocol.engine_client.types.query import SubaccountInfoData
+from nado_protocol.utils.batch_margin import BatchMarginEngine
+from nado_protocol.utils.margin_manager import MarginManager
+
+X18 = 10**18
+
+
+def _product(product_id: int, is_perp: bool, rng: random.Random) -> dict:
+    long_initial = X18 if product_id == 0 else rng.choice([80, 90, 95]) * X18 // 100
+    long_maint = (X18 + long_initial) // 2
+    product = {
+        "product_id": product_id,
+        "oracle_price_x18": str(
+            X18 if product_id == 0 else rng.randrange(1, 10**7) * X18 // 100
+        ),
+        "risk": {
+            "long_weight_initial_x18": str(long_initial),
+            "short_weight_initial_x18": str(2 * X18 - long_initial),
+            "long_weight_maintenance_x18": str(long_maint),
+            "short_weight_maintenance_x18": str(2 * X18 - long_maint),
+            "price_x18": "0",
+        },
+        "book_info": {
+            "size_increment": "1",
+            "price_increment_x18": "1",
+            "min_size": "1",
+            "collected_fees": "0",
+        },
+        "state": {
+            "cumulative_funding_long_x18": "0",
+            "cumulative_funding_short_x18": "0",
+            "available_settle": "0",
+            "open_interest": "0",
+        },
+    }
+    if not is_perp:
+        product["config"] = {
+            key: "0"
+            for key in (
+                "token",
+                "interest_inflection_util_x18",
+                "interest_floor_x18",
+                "interest_small_cap_x18",
+                "interest_large_cap_x18",
+                "withdraw_fee_x18",
+                "min_deposit_rate_x18",
+            )
+        }
+        product["state"] = {
+            "cumulative_deposits_multiplier_x18": str(X18),
+            "cumulative_borrows_multiplier_x18": str(X18),
+            "total_deposits_normalized": "0",
+            "total_borrows_normalized": "0",
+        }
+    return product
+
+
+def _subaccount_infos(count: int, products: int) -> list[SubaccountInfoData]:
+    rng = random.Random(0)
+    spot_ids = [0] + [2 * i + 1 for i in range(products // 4)]
+    perp_ids = [2 * i + 2 for i in range(products - len(spot_ids))]
+    spot_products = [_product(pid, False, rng) for pid in spot_ids]
+    perp_products = [_product(pid, True, rng) for pid in perp_ids]
+    infos = []
+    for index in range(count):
+        health = str(rng.randrange(10**21, 10**24))
+        infos.append(
+            SubaccountInfoData.parse_obj(
+                {
+                    "subaccount": f"0x{index:064x}",
+                    "exists": True,
+                    "healths": [{"assets": "0", "liabilities": "0", "health": health}]
+                    * 3,
+                    "health_contributions": [],
+                    "spot_count": len(spot_ids),
+                    "perp_count": len(perp_ids),
+                    "spot_balances": [
+                        {
+                            "product_id": pid,
+                            "balance": {
+                                "amount": str(rng.randrange(-(10**21), 10**23))
+                            },
+                        }
+                        for pid in spot_ids
+                    ],
+                    "perp_balances": [
+                        {
+                            "product_id": pid,
+                            "balance": {
+                                "amount": str(rng.randrange(-(10**21), 10**21)),
+                                "v_quote_balance": str(
+                                    rng.randrange(-(10**22), 10**22)
+                                ),
+                                "last_cumulative_funding_x18": "0",
+                            },
+                        }
+                        for pid in perp_ids
+                    ],
+                    "spot_products": spot_products,
+                    "perp_products": perp_products,
+                    "pre_state": None,
+                }
+            )
+        )
+    return infos
+
+
+def run(subaccounts: int = 500, products: int = 20):
+    infos = _subaccount_infos(subaccounts, products)
+
+    start = time.perf_counter()
+    exact = [MarginManager(info).calculate_account_summary() for info in infos]
+    decimal_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine = BatchMarginEngine.from_subaccount_infos(infos)
+    load_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    result = engine.calculate()
+    calculate_seconds = time.perf_counter() - start
+    vector_seconds = load_seconds + calculate_seconds
+
+    start = time.perf_counter()
+    summaries = result.summaries()
+    summary_seconds = vector_seconds + time.perf_counter() - start
+
+    for info, summary in zip(infos, exact):
+        batch = summaries[info.subaccount]
+        for field in ("margin_usage_fraction", "account_leverage", "portfolio_value"):
+            expected = float(getattr(summary, field))
+            actual = float(getattr(batch, field))
+            assert abs(actual - expected) <= 1e-9 * max(1.0, abs(expected)), field
+
+    print(f"subaccounts: {subaccounts} x {products} products (results verified)")
+    for label, seconds in (
+        ("MarginManager (Decimal)", decimal_seconds),
+        ("BatchMarginEngine calculate", calculate_seconds),
+        ("BatchMarginEngine load+calc", vector_seconds),
+        ("BatchMarginEngine summaries", summary_seconds),
+    ):
+        print(
+            f"{label:>28}: {subaccounts / seconds:>10,.0f} subaccounts/s"
+            f" | x{decimal_seconds / seconds:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--subaccounts", type=int, default=500)
+    parser.add_argument("--products", type=int, default=20)
+    args = parser.parse_args()
+    run(args.subaccounts, args.products)
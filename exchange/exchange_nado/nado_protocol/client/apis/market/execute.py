@@ -8,6 +8,7 @@ from nado_protocol.engine_client.types.execute import (
     MintNlpParams,
     PlaceMarketOrderParams,
     PlaceOrderParams,
+    PlaceOrdersParams,
 )
 from nado_protocol.client.apis.base import NadoBaseAPI
 from nado_protocol.trigger_client.types.execute import (
@@ -78,6 +79,21 @@ class MarketExecuteAPI(NadoBaseAPI):
         """
         return self.context.engine_client.place_order(params)
 
+    def place_orders(self, params: PlaceOrdersParams) -> ExecuteResponse:
+        """
+        Places multiple orders through the engine in a single request.
+
+        Args:
+            params (PlaceOrdersParams): Parameters required to place the orders.
+
+        Returns:
+            ExecuteResponse: The response from the engine execution, with one result per order.
+
+        Raises:
+            Exception: If there is an error during the execution or the response status is not "success".
+        """
+        return self.context.engine_client.place_orders(params)
+
     def place_market_order(self, params: PlaceMarketOrderParams) -> ExecuteResponse:
         """
         Places a market order through the engine.
@@ -1,11 +1,8 @@
+from __future__ import annotations
+
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from pydantic import BaseModel
-from web3 import Web3
-from web3.types import TxParams
-from web3.contract import Contract
-from web3.contract.contract import ContractFunction
-from eth_account.signers.local import LocalAccount
 from nado_protocol.contracts.loader import load_abi
 from nado_protocol.contracts.types import DepositCollateralParams, NadoAbiName
 from nado_protocol.utils.bytes32 import (
@@ -17,6 +14,24 @@ from nado_protocol.utils.bytes32 import (
 from nado_protocol.utils.exceptions import InvalidProductId
 from nado_protocol.contracts.types import *
 
+if TYPE_CHECKING:
+    from web3 import Web3
+    from web3.types import TxParams
+    from web3.contract import Contract
+    from web3.contract.contract import ContractFunction
+    from eth_account.signers.local import LocalAccount
+
+
+def __getattr__(name: str):
+    # web3 is only needed for on-chain calls; importing it lazily keeps
+    # `nado_protocol.contracts.types` (used by every engine client) cheap.
+    if name == "Web3":
+        from web3 import Web3
+
+        globals()["Web3"] = Web3
+        return Web3
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class NadoContractsContext(BaseModel):
     """
@@ -81,7 +96,8 @@ class NadoContracts:
             contracts_context (NadoContractsContext): The Nado contracts context, holding the relevant addresses.
         """
         self.network = contracts_context.network
-        self.w3 = Web3(Web3.HTTPProvider(node_url))
+        web3 = globals().get("Web3") or __getattr__("Web3")
+        self.w3 = web3(web3.HTTPProvider(node_url))
 
         self.contracts_context = NadoContractsContext.parse_obj(contracts_context)
         self.querier: Contract = self.w3.eth.contract(
@@ -1,5 +1,6 @@
 from nado_protocol.contracts.eip712.domain import *
 from nado_protocol.contracts.eip712.sign import *
+from nado_protocol.contracts.eip712.hasher import *
 from nado_protocol.contracts.eip712.types import *
 
 
@@ -9,6 +10,12 @@ __all__ = [
     "build_eip712_typed_data",
     "get_eip712_typed_data_digest",
     "sign_eip712_typed_data",
+    "NadoStructHasher",
+    "get_struct_hasher",
+    "get_domain_separator",
+    "get_eip712_digest",
+    "sign_eip712_digest",
+    "sign_nado_execute",
     "get_nado_eip712_type",
     "EIP712Domain",
     "EIP712Types",
@@ -0,0 +1,247 @@
+from functools import lru_cache
+from typing import Callable
+
+from eth_account._utils.structured_data.hashing import (
+    hash_domain,
+    hash_message,
+    hash_struct_type,
+)
+from eth_account.signers.local import LocalAccount
+from eth_utils.crypto import keccak
+from hexbytes import HexBytes
+from nado_protocol.contracts.eip712.domain import (
+    get_eip712_domain_type,
+    get_nado_eip712_domain,
+)
+from nado_protocol.contracts.eip712.types import get_nado_eip712_type
+from nado_protocol.contracts.types import NadoTxType
+
+_WORD = 32
+_UINT256 = 1 << 256
+
+FieldEncoder = Callable[[object], bytes]
+
+
+class _Unsupported(Exception):
+    """Raised by a field encoder when a value needs the generic EIP-712 encoder."""
+
+
+def _uint_encoder(bits: int) -> FieldEncoder:
+    bound = 1 << bits
+
+    def encode(value) -> bytes:
+        if type(value) is not int or not 0 <= value < bound:
+            raise _Unsupported
+        return value.to_bytes(_WORD, "big")
+
+    return encode
+
+
+def _int_encoder(bits: int) -> FieldEncoder:
+    bound = 1 << (bits - 1)
+
+    def encode(value) -> bytes:
+        if type(value) is not int or not -bound <= value < bound:
+            raise _Unsupported
+        return (value % _UINT256).to_bytes(_WORD, "big")
+
+    return encode
+
+
+def _encode_bytes32(value) -> bytes:
+    if not isinstance(value, (bytes, bytearray)) or len(value) > _WORD:
+        raise _Unsupported
+    return bytes(value).ljust(_WORD, b"\x00")
+
+
+def _encode_bool(value) -> bytes:
+    if type(value) is not bool:
+        raise _Unsupported
+    return (b"\x00" * 31) + (b"\x01" if value else b"\x00")
+
+
+def _array_encoder(item: FieldEncoder) -> FieldEncoder:
+    def encode(value) -> bytes:
+        if not isinstance(value, (list, tuple)):
+            raise _Unsupported
+        return keccak(b"".join(item(v) for v in value))
+
+    return encode
+
+
+def _field_encoder(field_type: str) -> FieldEncoder:
+    if field_type.endswith("[]"):
+        return _array_encoder(_field_encoder(field_type[:-2]))
+    if field_type == "bytes32":
+        return _encode_bytes32
+    if field_type == "bool":
+        return _encode_bool
+    if field_type.startswith("uint"):
+        return _uint_encoder(int(field_type[4:]))
+    if field_type.startswith("int"):
+        return _int_encoder(int(field_type[3:]))
+    raise ValueError(f"Unsupported EIP-712 field type: {field_type}")
+
+
+class NadoStructHasher:
+    """
+    Precompiled EIP-712 struct hasher for a single Nado tx type.
+
+    The type hash and one encoder per field are built once; hashing a message
+    then only packs its integer / bytes32 fields into 32-byte words, without
+    building typed data dicts or going through the generic encoder.
+
+    Attributes:
+        tx (NadoTxType): The Nado tx type this hasher encodes.
+
+        primary_type (str): The EIP-712 primary type, e.g. "Order".
+
+        type_hash (bytes): keccak256 of the encoded type string.
+    """
+
+    def __init__(self, tx: NadoTxType):
+        eip712_type = get_nado_eip712_type(tx)
+        self.tx = tx
+        self.primary_type = list(eip712_type.keys())[0]
+        self._types = {"EIP712Domain": get_eip712_domain_type(), **eip712_type}
+        self._fields = [
+            (field["name"], _field_encoder(field["type"]))
+            for field in eip712_type[self.primary_type]
+        ]
+        self.type_hash = hash_struct_type(self.primary_type, self._types)
+
+    def hash_struct(self, msg: dict) -> bytes:
+        """
+        Computes `hashStruct(msg)` as defined by EIP-712.
+
+        Args:
+            msg (dict): The message being signed; extra keys are ignored.
+
+        Returns:
+            bytes: The 32-byte struct hash.
+        """
+        try:
+            return keccak(
+                self.type_hash
+                + b"".join(encode(msg[name]) for name, encode in self._fields)
+            )
+        except (_Unsupported, KeyError, TypeError):
+            return self._hash_struct_generic(msg)
+
+    def _hash_struct_generic(self, msg: dict) -> bytes:
+        # values the fast path does not handle (e.g. numeric strings) go through
+        # eth_account so the result and errors match `encode_structured_data`.
+        return hash_message(
+            {"types": self._types, "primaryType": self.primary_type, "message": msg}
+        )
+
+
+@lru_cache(maxsize=None)
+def get_struct_hasher(tx: NadoTxType) -> NadoStructHasher:
+    """
+    Returns the cached struct hasher for a Nado tx type.
+
+    Args:
+        tx (NadoTxType): The Nado tx type.
+
+    Returns:
+        NadoStructHasher: The hasher for `tx`.
+    """
+    return NadoStructHasher(tx)
+
+
+@lru_cache(maxsize=1024)
+def get_domain_separator(verifying_contract: str, chain_id: int) -> bytes:
+    """
+    Returns the cached EIP-712 domain separator for Nado.
+
+    Args:
+        verifying_contract (str): The contract that will verify the signature.
+
+        chain_id (int): The chain ID of the originating network.
+
+    Returns:
+        bytes: The 32-byte domain separator.
+    """
+    return hash_domain(
+        {
+            "types": {"EIP712Domain": get_eip712_domain_type()},
+            "domain": get_nado_eip712_domain(verifying_contract, chain_id).dict(),
+        }
+    )
+
+
+def get_eip712_digest(
+    tx: NadoTxType, msg: dict, verifying_contract: str, chain_id: int
+) -> bytes:
+    """
+    Computes the EIP-712 signing digest for a Nado execute.
+
+    Byte-identical to hashing `build_eip712_typed_data(tx, msg, verifying_contract, chain_id)`
+    with `get_eip712_typed_data_digest`.
+
+    Args:
+        tx (NadoTxType): The Nado tx type being signed.
+
+        msg (dict): The message being signed.
+
+        verifying_contract (str): The contract that will verify the signature.
+
+        chain_id (int): The chain ID of the originating network.
+
+    Returns:
+        bytes: The 32-byte digest.
+    """
+    return keccak(
+        b"\x19\x01"
+        + get_domain_separator(verifying_contract, chain_id)
+        + get_struct_hasher(tx).hash_struct(msg)
+    )
+
+
+def sign_eip712_digest(digest: bytes, signer: LocalAccount) -> str:
+    """
+    Signs a precomputed EIP-712 digest.
+
+    Produces the same signature as `sign_eip712_typed_data` on the equivalent typed data.
+
+    Args:
+        digest (bytes): The 32-byte digest from `get_eip712_digest`.
+
+        signer (LocalAccount): The local Ethereum account to sign the digest.
+
+    Returns:
+        str: The hexadecimal representation of the signature.
+    """
+    v, r, s = signer._key_obj.sign_msg_hash(digest).vrs
+    signature = r.to_bytes(_WORD, "big") + s.to_bytes(_WORD, "big") + bytes([v + 27])
+    return HexBytes(signature).hex()
+
+
+def sign_nado_execute(
+    tx: NadoTxType,
+    msg: dict,
+    verifying_contract: str,
+    chain_id: int,
+    signer: LocalAccount,
+) -> str:
+    """
+    Signs a Nado execute through the precompiled hashing path.
+
+    Args:
+        tx (NadoTxType): The Nado tx type being signed.
+
+        msg (dict): The message being signed.
+
+        verifying_contract (str): The contract that will verify the signature.
+
+        chain_id (int): The chain ID of the originating network.
+
+        signer (LocalAccount): The local Ethereum account to sign the data.
+
+    Returns:
+        str: The hexadecimal representation of the signature.
+    """
+    return sign_eip712_digest(
+        get_eip712_digest(tx, msg, verifying_contract, chain_id), signer
+    )
@@ -20,6 +20,7 @@ from nado_protocol.engine_client.types.execute import (
     OrderParams,
     PlaceMarketOrderParams,
     PlaceOrderParams,
+    PlaceOrdersParams,
     WithdrawCollateralParams,
     to_execute_request,
 )
@@ -60,6 +61,7 @@ class EngineExecuteClient(NadoBaseExecute):
         self._opts: EngineClientOpts = EngineClientOpts.parse_obj(opts)
         self.url: str = self._opts.url
         self.session = requests.Session()
+        self.rate_limiter = self._opts.rate_limiter
 
     def tx_nonce(self, sender: str) -> int:
         """
@@ -114,7 +116,11 @@ class EngineExecuteClient(NadoBaseExecute):
             BadStatusCodeException: If the server response status code is not 200.
             ExecuteFailedException: If there's an error in the execution or the response status is not "success".
         """
-        res = self.session.post(f"{self.url}/execute", json=req.dict())
+        payload = req.dict()
+        if self.rate_limiter is not None:
+            # the payload has a single key: the execute type (place_order, cancel_orders, ...)
+            self.rate_limiter.acquire(next(iter(payload)))
+        res = self.session.post(f"{self.url}/execute", json=payload)
         if res.status_code != 200:
             raise BadStatusCodeException(res.text)
         try:
@@ -143,11 +149,30 @@ class EngineExecuteClient(NadoBaseExecute):
         Returns:
             ExecuteResponse: Response of the execution, including status and potential error message.
         """
+        return self.execute(self._prepare_place_order(params))
+
+    def _prepare_place_order(self, params: PlaceOrderParams) -> PlaceOrderParams:
         params = PlaceOrderParams.parse_obj(params)
         params.order = self.prepare_execute_params(params.order, True)
         params.signature = params.signature or self._sign(
             NadoExecuteType.PLACE_ORDER, params.order.dict(), params.product_id
         )
+        return params
+
+    def place_orders(self, params: PlaceOrdersParams) -> ExecuteResponse:
+        """
+        Execute a place orders operation, submitting multiple orders in a single request.
+
+        Args:
+            params (PlaceOrdersParams): Parameters required for placing the orders.
+            Each order is signed individually (unless already signed) before the batch is sent.
+
+        Returns:
+            ExecuteResponse: Response of the execution. `data.place_orders` holds one item per order,
+            in request order, with either the order digest or the error for that order.
+        """
+        params = PlaceOrdersParams.parse_obj(params)
+        params.orders = [self._prepare_place_order(order) for order in params.orders]
         return self.execute(params)
 
     def place_market_order(self, params: PlaceMarketOrderParams) -> ExecuteResponse:
@@ -245,13 +270,7 @@ class EngineExecuteClient(NadoBaseExecute):
         cancel_orders.signature = cancel_orders.signature or self._sign(
             NadoExecuteType.CANCEL_ORDERS, cancel_orders.dict()
         )
-        place_order: PlaceOrderParams = PlaceOrderParams.parse_obj(params.place_order)
-        place_order.order = self.prepare_execute_params(place_order.order, True)
-        place_order.signature = place_order.signature or self._sign(
-            NadoExecuteType.PLACE_ORDER,
-            place_order.order.dict(),
-            place_order.product_id,
-        )
+        place_order = self._prepare_place_order(params.place_order)
         return self.execute(
             CancelAndPlaceParams(cancel_orders=cancel_orders, place_order=place_order)
         )
@@ -77,6 +77,7 @@ class EngineQueryClient:
         self.url: str = self._opts.url
         self.url_v2: str = self.url.replace("/v1", "") + "/v2"
         self.session = requests.Session()  # type: ignore
+        self.rate_limiter = self._opts.rate_limiter
 
     def query(self, req: QueryRequest) -> QueryResponse:
         """
@@ -92,6 +93,8 @@ class EngineQueryClient:
             BadStatusCodeException: If the response status code is not 200.
             QueryFailedException: If the query status is not "success".
         """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(req.type)
         res = self.session.post(f"{self.url}/query", json=req.dict())
         if res.status_code != 200:
             raise BadStatusCodeException(res.text)
@@ -104,6 +107,8 @@ class EngineQueryClient:
         return query_res
 
     def _query_v2(self, url):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire("query_v2")
         res = self.session.get(url)
         if res.status_code != 200:
             raise Exception(res.text)
@@ -116,6 +121,8 @@ class EngineQueryClient:
         Returns:
             ProductSymbolsData: Symbols for all available products.
         """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire("symbols")
         res = self.session.get(f"{self.url}/symbols?")
         if res.status_code != 200:
             raise BadStatusCodeException(res.text)
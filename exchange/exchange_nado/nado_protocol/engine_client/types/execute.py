@@ -101,6 +101,11 @@ class CancelOrdersParams(BaseParamsSigned):
     digests: list[Digest]
     nonce: Optional[int]
 
+    class Config:
+        # keep already-parsed bytes32 digests as bytes when params are re-parsed
+        # (otherwise digests that happen to be valid utf-8 are coerced to `str`)
+        smart_union = True
+
     @validator("digests")
     def serialize_digests(cls, v: list[Digest]) -> list[bytes]:
         return [hex_to_bytes32(digest) for digest in v]
@@ -0,0 +1,533 @@
+"""
+Auto-paginating iterators over the indexer's history queries.
+
+`get_subaccount_historical_orders`, `get_matches`, `get_events` and
+`get_interest_and_funding_payments` return one page per call. The iterators here
+walk the pagination cursor automatically:
+
+- orders / matches / events are returned newest first and paginated with `idx`
+  (`submission_idx`, inclusive upper bound). Items of the oldest submission in a
+  full page are dropped and re-requested as the start of the next page, so a
+  transaction that produced several items is never split or duplicated across pages.
+  A submission with more items than the page size is re-requested with a doubled
+  limit until it fits, then paging continues at the normal size.
+- interest / funding payments are paginated with `max_idx` / `next_idx`.
+
+While the caller consumes a page, the request for the next page is already in
+flight (one background thread, or the default executor for the async iterators).
+
+With `raw=True` pages are yielded as the decoded JSON dicts, skipping pydantic
+validation of every item; this is what `export_history` uses to stream multi-month
+histories to CSV / Parquet with memory bounded by one page (plus one Parquet row
+group).
+"""
+
+import asyncio
+import csv
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterator,
+    Optional,
+    Union,
+)
+
+from nado_protocol.indexer_client.types.query import (
+    IndexerEventsData,
+    IndexerEventsParams,
+    IndexerEventsRawLimit,
+    IndexerEventsTxsLimit,
+    IndexerHistoricalOrdersData,
+    IndexerInterestAndFundingData,
+    IndexerInterestAndFundingParams,
+    IndexerMatchesData,
+    IndexerMatchesParams,
+    IndexerSubaccountHistoricalOrdersParams,
+    to_indexer_request,
+)
+
+if TYPE_CHECKING:
+    from nado_protocol.indexer_client.query import IndexerQueryClient
+
+PAGE_SIZE = 100
+
+PaginatedParams = Union[
+    IndexerSubaccountHistoricalOrdersParams,
+    IndexerMatchesParams,
+    IndexerEventsParams,
+    IndexerInterestAndFundingParams,
+]
+
+
+class _SubmissionCursor:
+    """Pagination by `idx` (submission_idx) for orders / matches / events."""
+
+    def __init__(self, params, items_key: str, data_type: type, page_size: int):
+        self.params = params.copy()
+        self.items_key = items_key
+        self.data_type = data_type
+        if isinstance(params, IndexerEventsParams):
+            if self.params.limit is None:
+                self.params.limit = IndexerEventsRawLimit(raw=page_size)
+            self.by_txs = isinstance(self.params.limit, IndexerEventsTxsLimit)
+            self.page_size = (
+                self.params.limit.txs if self.by_txs else self.params.limit.raw
+            )
+        else:
+            self.by_txs = False
+            if self.params.limit is None:
+                self.params.limit = page_size
+            self.page_size = self.params.limit
+        # limit of the page in flight; raised while a submission does not fit a page
+        self.limit = self.page_size
+
+    def _with_limit(self, params, limit: int):
+        if isinstance(params, IndexerEventsParams):
+            params.limit = IndexerEventsRawLimit(raw=limit)
+        else:
+            params.limit = limit
+        return params
+
+    def advance(self, page: dict) -> tuple[Optional[dict], Optional[Any]]:
+        """
+        (page to yield, params of the next page or None when done); the page is
+        None when it has to be re-requested with a larger limit.
+        """
+        items = page.get(self.items_key) or []
+        counted = page.get("txs") if self.by_txs else items
+        if not items or len(counted or []) < self.limit:
+            return page, None
+        oldest = int(items[-1]["submission_idx"])
+        next_params = self.params.copy()
+        if self.by_txs:
+            # whole transactions per page: nothing to trim
+            next_params.idx = oldest - 1
+            return page, next_params
+        kept = [item for item in items if int(item["submission_idx"]) > oldest]
+        if not kept:
+            # a single submission larger than the page: re-request it whole
+            self.limit *= 2
+            next_params.idx = oldest
+            return None, self._with_limit(next_params, self.limit)
+        self.limit = self.page_size
+        trimmed = dict(page)
+        trimmed[self.items_key] = kept
+        if "txs" in page:
+            trimmed["txs"] = [
+                tx for tx in page["txs"] if int(tx["submission_idx"]) > oldest
+            ]
+        next_params.idx = oldest
+        return trimmed, next_params
+
+
+class _PaymentsCursor:
+    """Pagination by `max_idx` / `next_idx` for interest and funding payments."""
+
+    items_key = None
+    data_type = IndexerInterestAndFundingData
+
+    def __init__(self, params: IndexerInterestAndFundingParams, page_size: int):
+        self.params = params.copy()
+        self.page_size = params.limit or page_size
+
+    def advance(self, page: dict) -> tuple[dict, Optional[Any]]:
+        full = max(
+            len(page.get("interest_payments") or []),
+            len(page.get("funding_payments") or []),
+        )
+        next_idx = page.get("next_idx")
+        if full < self.page_size or next_idx in (None, ""):
+            return page, None
+        if self.params.max_idx is not None and int(next_idx) >= int(
+            self.params.max_idx
+        ):
+            return page, None
+        next_params = self.params.copy()
+        next_params.max_idx = next_idx
+        return page, next_params
+
+
+def _cursor(params: PaginatedParams, page_size: int):
+    if isinstance(params, IndexerSubaccountHistoricalOrdersParams):
+        return _SubmissionCursor(
+            params, "orders", IndexerHistoricalOrdersData, page_size
+        )
+    if isinstance(params, IndexerMatchesParams):
+        return _SubmissionCursor(params, "matches", IndexerMatchesData, page_size)
+    if isinstance(params, IndexerEventsParams):
+        return _SubmissionCursor(params, "events", IndexerEventsData, page_size)
+    if isinstance(params, IndexerInterestAndFundingParams):
+        return _PaymentsCursor(params, page_size)
+    raise ValueError(f"Pagination is not supported for {type(params).__name__}")
+
+
+def _fetch_raw(client: "IndexerQueryClient", params) -> dict:
+    return client._query_raw(to_indexer_request(params))
+
+
+def iter_pages(
+    client: "IndexerQueryClient",
+    params: PaginatedParams,
+    *,
+    page_size: int = PAGE_SIZE,
+    max_pages: Optional[int] = None,
+    raw: bool = False,
+    prefetch: bool = True,
+) -> Iterator[Any]:
+    """
+    Iterates over all pages of a paginated indexer query.
+
+    Args:
+        client: Indexer client.
+        params: Orders / matches / events / interest-and-funding params; `idx` /
+            `max_idx` set the starting point, `limit` (or `page_size`) the page size.
+        page_size: Page size when `params.limit` is not set.
+        max_pages: Stop after this many pages.
+        raw: Yield the decoded JSON dicts instead of the `Indexer*Data` models.
+        prefetch: Request the next page while the current one is consumed.
+
+    Yields:
+        One `Indexer*Data` model (or dict) per page.
+    """
+    cursor = _cursor(params, page_size)
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    next_params: Optional[Any] = cursor.params
+    pending = executor.submit(_fetch_raw, client, next_params) if executor else None
+    pages = 0
+    try:
+        while next_params is not None:
+            page = pending.result() if pending else _fetch_raw(client, next_params)
+            page, next_params = cursor.advance(page)
+            if page is None:
+                pending = (
+                    executor.submit(_fetch_raw, client, next_params)
+                    if executor
+                    else None
+                )
+                continue
+            pages += 1
+            if max_pages is not None and pages >= max_pages:
+                next_params = None
+            pending = (
+                executor.submit(_fetch_raw, client, next_params)
+                if executor and next_params is not None
+                else None
+            )
+            yield page if raw else cursor.data_type.parse_obj(page)
+    finally:
+        if pending is not None:
+            pending.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+async def aiter_pages(
+    client: "IndexerQueryClient",
+    params: PaginatedParams,
+    *,
+    page_size: int = PAGE_SIZE,
+    max_pages: Optional[int] = None,
+    raw: bool = False,
+    prefetch: bool = True,
+) -> AsyncIterator[Any]:
+    """Async version of `iter_pages`; requests run in the loop's default executor."""
+    loop = asyncio.get_running_loop()
+    cursor = _cursor(params, page_size)
+    next_params: Optional[Any] = cursor.params
+
+    def fetch(params):
+        return loop.run_in_executor(None, _fetch_raw, client, params)
+
+    pending = fetch(next_params)
+    pages = 0
+    try:
+        while next_params is not None:
+            page, next_params = cursor.advance(await pending)
+            pending = None
+            if page is None:
+                pending = fetch(next_params)
+                continue
+            pages += 1
+            if max_pages is not None and pages >= max_pages:
+                next_params = None
+            if prefetch and next_params is not None:
+                pending = fetch(next_params)
+            yield page if raw else cursor.data_type.parse_obj(page)
+            if pending is None and next_params is not None:
+                pending = fetch(next_params)
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+_ITEMS_KEYS = {
+    IndexerSubaccountHistoricalOrdersParams: "orders",
+    IndexerMatchesParams: "matches",
+    IndexerEventsParams: "events",
+}
+
+
+def _page_items(page: Any, params: PaginatedParams) -> Iterator[Any]:
+    get = page.get if isinstance(page, dict) else lambda key: getattr(page, key)
+    if isinstance(params, IndexerInterestAndFundingParams):
+        for payment_type in ("interest", "funding"):
+            for payment in get(f"{payment_type}_payments") or []:
+                yield payment_type, payment
+        return
+    for params_type, items_key in _ITEMS_KEYS.items():
+        if isinstance(params, params_type):
+            yield from get(items_key) or []
+
+
+def iter_items(
+    client: "IndexerQueryClient", params: PaginatedParams, **kwargs
+) -> Iterator[Any]:
+    """
+    Iterates over the items of all pages (see `iter_pages` for the options).
+
+    Yields orders / matches / events, or `(payment_type, payment)` tuples with
+    `payment_type` "interest" or "funding" for interest and funding payments.
+    """
+    for page in iter_pages(client, params, **kwargs):
+        yield from _page_items(page, params)
+
+
+async def aiter_items(
+    client: "IndexerQueryClient", params: PaginatedParams, **kwargs
+) -> AsyncIterator[Any]:
+    """Async version of `iter_items`."""
+    async for page in aiter_pages(client, params, **kwargs):
+        for item in _page_items(page, params):
+            yield item
+
+
+# ---------------- columnar export
+
+# column name -> (type, getter on the raw item dict)
+Column = tuple[str, str, Callable[[dict], Any]]
+
+
+def _balance(event: dict, key: str) -> dict:
+    balance = event.get(key) or {}
+    return (balance.get("perp") or balance.get("spot") or {}).get("balance") or {}
+
+
+ORDER_COLUMNS: list[Column] = [
+    ("submission_idx", "int", lambda o: o["submission_idx"]),
+    ("timestamp", "int", lambda o: o.get("timestamp")),
+    ("digest", "str", lambda o: o["digest"]),
+    ("subaccount", "str", lambda o: o["subaccount"]),
+    ("product_id", "int", lambda o: o["product_id"]),
+    ("isolated", "bool", lambda o: o["isolated"]),
+    ("amount", "str", lambda o: o["amount"]),
+    ("price_x18", "str", lambda o: o["price_x18"]),
+    ("base_filled", "str", lambda o: o["base_filled"]),
+    ("quote_filled", "str", lambda o: o["quote_filled"]),
+    ("fee", "str", lambda o: o["fee"]),
+    ("expiration", "str", lambda o: o["expiration"]),
+    ("nonce", "str", lambda o: o["nonce"]),
+]
+
+MATCH_COLUMNS: list[Column] = [
+    ("submission_idx", "int", lambda m: m["submission_idx"]),
+    ("timestamp", "int", lambda m: m.get("timestamp")),
+    ("digest", "str", lambda m: m["digest"]),
+    ("subaccount", "str", lambda m: m["order"]["sender"]),
+    ("product_id", "int", lambda m: m.get("product_id")),
+    ("isolated", "bool", lambda m: m["isolated"]),
+    ("amount", "str", lambda m: m["order"]["amount"]),
+    ("price_x18", "str", lambda m: m["order"]["priceX18"]),
+    ("base_filled", "str", lambda m: m["base_filled"]),
+    ("quote_filled", "str", lambda m: m["quote_filled"]),
+    ("fee", "str", lambda m: m["fee"]),
+    ("cumulative_base_filled", "str", lambda m: m["cumulative_base_filled"]),
+    ("cumulative_quote_filled", "str", lambda m: m["cumulative_quote_filled"]),
+    ("cumulative_fee", "str", lambda m: m["cumulative_fee"]),
+]
+
+EVENT_COLUMNS: list[Column] = [
+    ("submission_idx", "int", lambda e: e["submission_idx"]),
+    ("timestamp", "int", lambda e: e.get("timestamp")),
+    ("subaccount", "str", lambda e: e["subaccount"]),
+    ("product_id", "int", lambda e: e["product_id"]),
+    ("event_type", "str", lambda e: e["event_type"]),
+    ("isolated", "bool", lambda e: e["isolated"]),
+    ("pre_amount", "str", lambda e: _balance(e, "pre_balance").get("amount")),
+    ("post_amount", "str", lambda e: _balance(e, "post_balance").get("amount")),
+    (
+        "post_v_quote_balance",
+        "str",
+        lambda e: _balance(e, "post_balance").get("v_quote_balance"),
+    ),
+    ("net_entry_unrealized", "str", lambda e: e["net_entry_unrealized"]),
+    ("net_entry_cumulative", "str", lambda e: e["net_entry_cumulative"]),
+    ("net_funding_cumulative", "str", lambda e: e["net_funding_cumulative"]),
+    ("net_interest_cumulative", "str", lambda e: e["net_interest_cumulative"]),
+    ("quote_volume_cumulative", "str", lambda e: e["quote_volume_cumulative"]),
+]
+
+PAYMENT_COLUMNS: list[Column] = [
+    ("payment_type", "str", lambda p: p["payment_type"]),
+    ("idx", "int", lambda p: p["idx"]),
+    ("timestamp", "int", lambda p: p["timestamp"]),
+    ("product_id", "int", lambda p: p["product_id"]),
+    ("amount", "str", lambda p: p["amount"]),
+    ("balance_amount", "str", lambda p: p["balance_amount"]),
+    ("rate_x18", "str", lambda p: p["rate_x18"]),
+    ("oracle_price_x18", "str", lambda p: p["oracle_price_x18"]),
+]
+
+
+def _columns_and_rows(params: PaginatedParams):
+    """(columns, page -> raw item dicts) for a params type."""
+    if isinstance(params, IndexerInterestAndFundingParams):
+
+        def payments(page: dict) -> list[dict]:
+            return [
+                {**payment, "payment_type": payment_type}
+                for payment_type in ("interest", "funding")
+                for payment in page.get(f"{payment_type}_payments") or []
+            ]
+
+        return PAYMENT_COLUMNS, payments
+    if isinstance(params, IndexerMatchesParams):
+
+        def matches(page: dict) -> list[dict]:
+            # product id is only on the match_orders transaction
+            products = {
+                tx["submission_idx"]: tx["tx"]["match_orders"]["product_id"]
+                for tx in page.get("txs") or []
+                if isinstance(tx.get("tx"), dict) and "match_orders" in tx["tx"]
+            }
+            return [
+                {**match, "product_id": products.get(match["submission_idx"])}
+                for match in page.get("matches") or []
+            ]
+
+        return MATCH_COLUMNS, matches
+    if isinstance(params, IndexerEventsParams):
+        return EVENT_COLUMNS, lambda page: page.get("events") or []
+    if isinstance(params, IndexerSubaccountHistoricalOrdersParams):
+        return ORDER_COLUMNS, lambda page: page.get("orders") or []
+    raise ValueError(f"Export is not supported for {type(params).__name__}")
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, bool):
+        return int(value)
+    return "" if value is None else value
+
+
+class _CsvWriter:
+    def __init__(self, path: str, columns: list[Column]):
+        opener = gzip.open if path.endswith(".gz") else open
+        self._file = opener(path, "wt", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([name for name, _, _ in columns])
+
+    def write(self, columns: list[Column], rows: list[dict]) -> None:
+        getters = [getter for _, _, getter in columns]
+        self._writer.writerows(
+            [_csv_value(getter(row)) for getter in getters] for row in rows
+        )
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path: str, columns: list[Column], row_group_size: int):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "Parquet export requires pyarrow (pip install pyarrow); "
+                "use a .csv / .csv.gz path otherwise"
+            ) from e
+        self._pa = pa
+        types = {"int": pa.int64(), "str": pa.string(), "bool": pa.bool_()}
+        self._schema = pa.schema([(name, types[kind]) for name, kind, _ in columns])
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._row_group_size = row_group_size
+        self._buffer: list[list] = [[] for _ in columns]
+        self._buffered = 0
+
+    def write(self, columns: list[Column], rows: list[dict]) -> None:
+        for values, (_, kind, getter) in zip(self._buffer, columns):
+            if kind == "int":
+                values.extend(
+                    None if (v := getter(row)) in (None, "") else int(v) for row in rows
+                )
+            else:
+                values.extend(getter(row) for row in rows)
+        self._buffered += len(rows)
+        if self._buffered >= self._row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._buffered:
+            self._writer.write_table(
+                self._pa.Table.from_arrays(
+                    [
+                        self._pa.array(values, type=field.type)
+                        for values, field in zip(self._buffer, self._schema)
+                    ],
+                    schema=self._schema,
+                )
+            )
+            self._buffer = [[] for _ in self._buffer]
+            self._buffered = 0
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+def export_history(
+    client: "IndexerQueryClient",
+    params: PaginatedParams,
+    path: str,
+    *,
+    file_format: Optional[str] = None,
+    row_group_size: int = 50_000,
+    **kwargs,
+) -> int:
+    """
+    Streams every page of a paginated query to a columnar file.
+
+    x18 amounts / prices are written as integer strings (lossless); indexes,
+    timestamps and product ids as integers.
+
+    Args:
+        client: Indexer client.
+        params: Orders / matches / events / interest-and-funding params.
+        path: Output file; `.parquet` (requires pyarrow), `.csv` or `.csv.gz`.
+        file_format: "parquet" or "csv"; inferred from `path` when omitted.
+        row_group_size: Rows buffered per Parquet row group.
+        kwargs: Passed to `iter_pages` (`page_size`, `max_pages`, `prefetch`).
+
+    Returns:
+        Number of rows written.
+    """
+    columns, page_rows = _columns_and_rows(params)
+    file_format = file_format or ("parquet" if path.endswith(".parquet") else "csv")
+    if file_format == "parquet":
+        writer: Any = _ParquetWriter(path, columns, row_group_size)
+    elif file_format == "csv":
+        writer = _CsvWriter(path, columns)
+    else:
+        raise ValueError(f"Unsupported export format {file_format}")
+    count = 0
+    try:
+        for page in iter_pages(client, params, raw=True, **kwargs):
+            rows = page_rows(page)
+            writer.write(columns, rows)
+            count += len(rows)
+    finally:
+        writer.close()
+    return count
@@ -1,8 +1,15 @@
-from typing import Optional, Union
+from typing import AsyncIterator, Iterator, Optional, Union
 import requests
 from functools import singledispatchmethod
+from nado_protocol.indexer_client import paginate
 from nado_protocol.indexer_client.types import IndexerClientOpts
-from nado_protocol.indexer_client.types.models import MarketType
+from nado_protocol.indexer_client.types.models import (
+    IndexerEvent,
+    IndexerHistoricalOrder,
+    IndexerMatch,
+    IndexerPayment,
+    MarketType,
+)
 from nado_protocol.indexer_client.types.query import (
     IndexerCandlesticksParams,
     IndexerCandlesticksData,
@@ -72,6 +79,7 @@ class IndexerQueryClient:
         self.url = self._opts.url
         self.url_v2: str = self.url.replace("/v1", "") + "/v2"
         self.session = requests.Session()
+        self.rate_limiter = self._opts.rate_limiter
 
     @singledispatchmethod
     def query(self, params: Union[IndexerParams, IndexerRequest]) -> IndexerResponse:
@@ -98,7 +106,7 @@ class IndexerQueryClient:
         return self._query(NadoBaseModel.parse_obj(req))  # type: ignore
 
     def _query(self, req: IndexerRequest) -> IndexerResponse:
-        res = self.session.post(self.url, json=req.dict())
+        res = self._post(req)
         if res.status_code != 200:
             raise Exception(res.text)
         try:
@@ -107,7 +115,25 @@ class IndexerQueryClient:
             raise Exception(res.text)
         return indexer_res
 
+    def _query_raw(self, req: IndexerRequest) -> dict:
+        """Like `_query`, but returns the decoded JSON without model validation."""
+        res = self._post(req)
+        if res.status_code != 200:
+            raise Exception(res.text)
+        try:
+            return res.json()
+        except Exception:
+            raise Exception(res.text)
+
+    def _post(self, req: IndexerRequest):
+        payload = req.dict()
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(next(iter(payload)))
+        return self.session.post(self.url, json=payload)
+
     def _query_v2(self, url):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire("query_v2")
         res = self.session.get(url)
         if res.status_code != 200:
             raise Exception(res.text)
@@ -385,3 +411,85 @@ class IndexerQueryClient:
             self.query(IndexerAccountSnapshotsParams.parse_obj(params)).data,
             IndexerAccountSnapshotsData,
         )
+
+    def iter_subaccount_historical_orders(
+        self, params: IndexerSubaccountHistoricalOrdersParams, **kwargs
+    ) -> Iterator[IndexerHistoricalOrder]:
+        """
+        Iterates over all historical orders matching `params`, newest first,
+        fetching pages on demand (see `paginate.iter_pages` for the options).
+        """
+        return paginate.iter_items(
+            self, IndexerSubaccountHistoricalOrdersParams.parse_obj(params), **kwargs
+        )
+
+    def iter_matches(
+        self, params: IndexerMatchesParams, **kwargs
+    ) -> Iterator[IndexerMatch]:
+        """Iterates over all matches matching `params`, newest first."""
+        return paginate.iter_items(
+            self, IndexerMatchesParams.parse_obj(params), **kwargs
+        )
+
+    def iter_events(
+        self, params: IndexerEventsParams, **kwargs
+    ) -> Iterator[IndexerEvent]:
+        """Iterates over all events matching `params`, newest first."""
+        return paginate.iter_items(
+            self, IndexerEventsParams.parse_obj(params), **kwargs
+        )
+
+    def iter_interest_and_funding_payments(
+        self, params: IndexerInterestAndFundingParams, **kwargs
+    ) -> Iterator[tuple[str, IndexerPayment]]:
+        """
+        Iterates over all interest and funding payments as
+        `(payment_type, payment)` tuples, `payment_type` being "interest" or "funding".
+        """
+        return paginate.iter_items(
+            self, IndexerInterestAndFundingParams.parse_obj(params), **kwargs
+        )
+
+    def aiter_subaccount_historical_orders(
+        self, params: IndexerSubaccountHistoricalOrdersParams, **kwargs
+    ) -> AsyncIterator[IndexerHistoricalOrder]:
+        """Async version of `iter_subaccount_historical_orders`."""
+        return paginate.aiter_items(
+            self, IndexerSubaccountHistoricalOrdersParams.parse_obj(params), **kwargs
+        )
+
+    def aiter_matches(
+        self, params: IndexerMatchesParams, **kwargs
+    ) -> AsyncIterator[IndexerMatch]:
+        """Async version of `iter_matches`."""
+        return paginate.aiter_items(
+            self, IndexerMatchesParams.parse_obj(params), **kwargs
+        )
+
+    def aiter_events(
+        self, params: IndexerEventsParams, **kwargs
+    ) -> AsyncIterator[IndexerEvent]:
+        """Async version of `iter_events`."""
+        return paginate.aiter_items(
+            self, IndexerEventsParams.parse_obj(params), **kwargs
+        )
+
+    def aiter_interest_and_funding_payments(
+        self, params: IndexerInterestAndFundingParams, **kwargs
+    ) -> AsyncIterator[tuple[str, IndexerPayment]]:
+        """Async version of `iter_interest_and_funding_payments`."""
+        return paginate.aiter_items(
+            self, IndexerInterestAndFundingParams.parse_obj(params), **kwargs
+        )
+
+    def export_history(
+        self, params: paginate.PaginatedParams, path: str, **kwargs
+    ) -> int:
+        """
+        Streams the full history of a paginated query (orders, matches, events or
+        interest and funding payments) to a `.parquet`, `.csv` or `.csv.gz` file.
+
+        Returns:
+            int: Number of rows written.
+        """
+        return paginate.export_history(self, params, path, **kwargs)
@@ -1,3 +1,4 @@
+from typing import Any, Optional
 from pydantic import BaseModel, AnyUrl, validator
 from nado_protocol.indexer_client.types.models import *
 from nado_protocol.indexer_client.types.query import *
@@ -6,9 +7,15 @@ from nado_protocol.indexer_client.types.query import *
 class IndexerClientOpts(BaseModel):
     """
     Model representing the options for the Indexer Client
+
+    Attributes:
+        url (AnyUrl): The URL of the indexer service.
+        rate_limiter (Optional[Any]): An optional limiter shared between clients / processes (e.g. `ratelimit.RateLimiter`).
+            Every request first waits for `rate_limiter.acquire(endpoint)`.
     """
 
     url: AnyUrl
+    rate_limiter: Optional[Any] = None
 
     @validator("url")
     def clean_url(cls, v: AnyUrl) -> str:
@@ -1,7 +1,7 @@
 from nado_protocol.utils.enum import StrEnum
 from eth_account import Account
 from eth_account.signers.local import LocalAccount
-from typing import Optional, Union
+from typing import Any, Optional, Union
 from pydantic import BaseModel, AnyUrl, validator, root_validator
 
 
@@ -39,6 +39,8 @@ class NadoClientOpts(BaseModel):
         linked_signer (Optional[Signer]): An optional signer linked the main subaccount to perform executes on it's behalf.
         chain_id (Optional[int]): An optional network chain ID.
         endpoint_addr (Optional[str]): Nado's endpoint address used for verifying executes.
+        rate_limiter (Optional[Any]): An optional limiter shared between clients / processes (e.g. `ratelimit.RateLimiter`).
+            Every request first waits for `rate_limiter.acquire(endpoint)`.
 
     Notes:
         - The class also includes several methods for validating and sanitizing the input values.
@@ -50,6 +52,7 @@ class NadoClientOpts(BaseModel):
     linked_signer: Optional[Signer] = None
     chain_id: Optional[int] = None
     endpoint_addr: Optional[str] = None
+    rate_limiter: Optional[Any] = None
 
     class Config:
         arbitrary_types_allowed = True
@@ -0,0 +1,601 @@
+"""
+Batch Margin Engine - vectorised margin summaries for many subaccounts.
+
+`MarginManager` computes one subaccount at a time with Decimal loops and issues
+separate engine / indexer requests per subaccount. `BatchMarginEngine` lays the
+balances of all subaccounts out in NumPy arrays (one row per subaccount, one
+column per product id) and computes health, margin usage, leverage and
+per-position metrics for every subaccount in a single vectorised pass.
+
+Data sources:
+- `from_client`: one `get_multi_subaccount_snapshots` indexer call for all
+  subaccounts. Snapshot events carry the post-balance and the product (oracle
+  price, risk weights), so no engine request is needed; healths are computed
+  from balances (Health = sum(amount * oracle_price * weight) + v_quote_balance).
+- `from_subaccount_infos`: engine `SubaccountInfoData` already fetched by the
+  caller; the engine-reported healths are used, as in `MarginManager`.
+
+Values are float64 (x18 integers divided by 1e18): about 15 significant digits,
+which is enough for monitoring and risk checks. Use `MarginManager` where exact
+Decimal results are required. `summary()` converts a row back into the same
+`AccountSummary` model `MarginManager.calculate_account_summary` returns.
+
+Requires numpy (``pip install nado-protocol[margin]``).
+"""
+
+from decimal import Decimal
+from time import time
+from typing import Optional, TYPE_CHECKING
+
+from nado_protocol.engine_client.types.models import IsolatedPosition
+from nado_protocol.engine_client.types.query import SubaccountInfoData
+from nado_protocol.indexer_client.types.models import IndexerEvent
+from nado_protocol.indexer_client.types.query import IndexerAccountSnapshotsParams
+from nado_protocol.utils.margin_manager import (
+    AccountSummary,
+    BalanceWithProduct,
+    CrossPositionMetrics,
+    IsolatedPositionMetrics,
+)
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - optional dependency
+    raise ImportError(
+        "BatchMarginEngine requires numpy: pip install nado-protocol[margin]"
+    ) from e
+
+if TYPE_CHECKING:
+    from nado_protocol.client import NadoClient
+
+
+QUOTE_PRODUCT_ID = 0
+
+# Row layout of the balance table built by the loaders:
+# (row, product_id, is_perp, amount, v_quote, oracle_price,
+#  long_weight_initial, long_weight_maintenance,
+#  short_weight_initial, short_weight_maintenance)   -- x18 strings
+_X18_COLUMNS = 7
+
+
+def _x18_array(values: list) -> "np.ndarray":
+    """x18 fixed-point integers (str or int) -> float64 array."""
+    return np.array(values, dtype=np.float64) / 1e18
+
+
+def _to_decimal(value: float) -> Decimal:
+    return Decimal(repr(float(value)))
+
+
+def _balance_row(row: int, balance, product, is_perp: bool) -> tuple:
+    risk = product.risk
+    return (
+        row,
+        balance.product_id,
+        is_perp,
+        balance.balance.amount,
+        balance.balance.v_quote_balance if is_perp else "0",
+        product.oracle_price_x18,
+        risk.long_weight_initial_x18,
+        risk.long_weight_maintenance_x18,
+        risk.short_weight_initial_x18,
+        risk.short_weight_maintenance_x18,
+    )
+
+
+def _event_product(event: IndexerEvent):
+    """(product, balance, is_perp) of an indexer snapshot event."""
+    perp = getattr(event.product, "perp", None)
+    if perp is not None:
+        return perp, event.post_balance.perp, True
+    return event.product.spot, event.post_balance.spot, False
+
+
+class BatchMarginResult:
+    """
+    Vectorised margin metrics for all subaccounts of a `BatchMarginEngine`.
+
+    Per-subaccount arrays have shape (S,), per-position arrays (S, P) with one
+    column per entry of `product_ids`, isolated position arrays (N,) with the owning
+    row in `iso_row`.
+    """
+
+    def __init__(self, engine: "BatchMarginEngine", **arrays: "np.ndarray"):
+        self.engine = engine
+        for name, array in arrays.items():
+            setattr(self, name, array)
+
+    def index(self, subaccount: str) -> int:
+        return self.engine.subaccounts.index(subaccount)
+
+    def summary(self, subaccount: str) -> AccountSummary:
+        """`AccountSummary` of one subaccount (same model as `MarginManager`)."""
+        engine = self.engine
+        row = self.index(subaccount)
+        product_ids = engine.product_ids
+        present = engine.present[row]
+        amount = engine.amount[row]
+        price = engine.oracle_price[row]
+        lwi = engine.long_weight_initial[row]
+        lwm = engine.long_weight_maintenance[row]
+        swi = engine.short_weight_initial[row]
+        swm = engine.short_weight_maintenance[row]
+
+        cross_positions = [
+            CrossPositionMetrics(
+                product_id=int(product_ids[col]),
+                symbol=f"Product_{product_ids[col]}",
+                position_size=_to_decimal(amount[col]),
+                notional_value=_to_decimal(self.notional_value[row, col]),
+                est_pnl=(
+                    None
+                    if np.isnan(self.est_pnl[row, col])
+                    else _to_decimal(self.est_pnl[row, col])
+                ),
+                unsettled=_to_decimal(self.unsettled[row, col]),
+                margin_used=_to_decimal(self.position_margin_used[row, col]),
+                initial_health=_to_decimal(self.position_initial_health[row, col]),
+                maintenance_health=_to_decimal(
+                    self.position_maintenance_health[row, col]
+                ),
+                long_weight_initial=_to_decimal(lwi[col]),
+                long_weight_maintenance=_to_decimal(lwm[col]),
+                short_weight_initial=_to_decimal(swi[col]),
+                short_weight_maintenance=_to_decimal(swm[col]),
+            )
+            for col in np.flatnonzero(self.cross_mask[row])
+        ]
+        spot_positions = [
+            BalanceWithProduct(
+                product_id=int(product_ids[col]),
+                amount=_to_decimal(amount[col]),
+                oracle_price=_to_decimal(price[col]),
+                long_weight_initial=_to_decimal(lwi[col]),
+                long_weight_maintenance=_to_decimal(lwm[col]),
+                short_weight_initial=_to_decimal(swi[col]),
+                short_weight_maintenance=_to_decimal(swm[col]),
+                balance_type="spot",
+            )
+            for col in np.flatnonzero(present & ~engine.is_perp)
+        ]
+        isolated_positions = [
+            IsolatedPositionMetrics(
+                product_id=int(engine.iso_product_id[i]),
+                symbol=f"Product_{engine.iso_product_id[i]}",
+                position_size=_to_decimal(engine.iso_base_amount[i]),
+                notional_value=_to_decimal(self.iso_notional_value[i]),
+                net_margin=_to_decimal(self.iso_net_margin[i]),
+                leverage=_to_decimal(self.iso_leverage[i]),
+                initial_health=_to_decimal(engine.iso_initial_health[i]),
+                maintenance_health=_to_decimal(engine.iso_maintenance_health[i]),
+            )
+            for i in np.flatnonzero(engine.iso_row == row)
+        ]
+        return AccountSummary(
+            initial_health=_to_decimal(self.initial_health[row]),
+            maintenance_health=_to_decimal(self.maintenance_health[row]),
+            unweighted_health=_to_decimal(self.unweighted_health[row]),
+            margin_usage_fraction=_to_decimal(self.margin_usage_fraction[row]),
+            maint_margin_usage_fraction=_to_decimal(
+                self.maint_margin_usage_fraction[row]
+            ),
+            funds_available=_to_decimal(self.funds_available[row]),
+            funds_until_liquidation=_to_decimal(self.funds_until_liquidation[row]),
+            portfolio_value=_to_decimal(self.portfolio_value[row]),
+            account_leverage=_to_decimal(self.account_leverage[row]),
+            cross_positions=cross_positions,
+            isolated_positions=isolated_positions,
+            spot_positions=spot_positions,
+            total_spot_deposits=_to_decimal(self.total_spot_deposits[row]),
+            total_spot_borrows=_to_decimal(self.total_spot_borrows[row]),
+        )
+
+    def summaries(self) -> dict[str, AccountSummary]:
+        """`AccountSummary` for every subaccount."""
+        return {
+            subaccount: self.summary(subaccount)
+            for subaccount in self.engine.subaccounts
+        }
+
+
+class BatchMarginEngine:
+    """
+    Margin calculator for many subaccounts at once.
+
+    Args:
+        subaccounts: Subaccount hex ids, one row each.
+        balance_rows: Balance table rows (see `_balance_row`).
+        healths: Optional engine-reported (initial, maintenance, unweighted) healths
+            as x18 values, shape (S, 3). Computed from balances when omitted.
+        isolated_rows: Isolated positions as (row, product_id, base_amount,
+            base_v_quote, base_oracle_price, long_weight_initial,
+            long_weight_maintenance, short_weight_initial, short_weight_maintenance,
+            quote_amount, initial_health, maintenance_health) tuples; health values
+            may be None to compute them from the balances.
+        net_entry_rows: (row, product_id, net_entry_unrealized_x18) from indexer
+            events; the first entry per (row, product) is used for Est. PnL.
+        has_indexer_events: Rows that have indexer events (Est. PnL is None for
+            the others, as in `MarginManager`).
+    """
+
+    def __init__(
+        self,
+        subaccounts: list[str],
+        balance_rows: list[tuple],
+        healths: Optional[list[list]] = None,
+        isolated_rows: Optional[list[tuple]] = None,
+        net_entry_rows: Optional[list[tuple]] = None,
+        has_indexer_events: Optional[list[bool]] = None,
+    ):
+        self.subaccounts = list(subaccounts)
+        n_rows = len(self.subaccounts)
+
+        rows = np.array([r[0] for r in balance_rows], dtype=np.int64)
+        pids = np.array([r[1] for r in balance_rows], dtype=np.int64)
+        self.product_ids, cols = np.unique(pids, return_inverse=True)
+        n_cols = len(self.product_ids)
+        self.is_perp = np.zeros(n_cols, dtype=bool)
+        self.is_perp[cols] = [r[2] for r in balance_rows]
+
+        balances = _x18_array([r[3:5] for r in balance_rows]).reshape(-1, 2)
+        # oracle price / risk weights repeat across subaccounts: parse each distinct
+        # product once
+        product_index: dict[tuple, int] = {}
+        product_of_row = [
+            product_index.setdefault(r[5:], len(product_index)) for r in balance_rows
+        ]
+        products = _x18_array(list(product_index)).reshape(-1, 5)
+        x18 = np.hstack([balances, products[product_of_row]])
+        self.present = np.zeros((n_rows, n_cols), dtype=bool)
+        self.present[rows, cols] = True
+        tables = []
+        for column in range(_X18_COLUMNS):
+            table = np.zeros((n_rows, n_cols))
+            table[rows, cols] = x18[:, column]
+            tables.append(table)
+        (
+            self.amount,
+            self.v_quote_balance,
+            self.oracle_price,
+            self.long_weight_initial,
+            self.long_weight_maintenance,
+            self.short_weight_initial,
+            self.short_weight_maintenance,
+        ) = tables
+
+        self.reported_healths = (
+            _x18_array(healths).reshape(n_rows, 3) if healths is not None else None
+        )
+
+        self.net_entry = np.full((n_rows, n_cols), np.nan)
+        col_of = {int(pid): col for col, pid in enumerate(self.product_ids)}
+        for row, product_id, net_entry in reversed(net_entry_rows or []):
+            col = col_of.get(product_id)
+            if col is not None:
+                self.net_entry[row, col] = int(net_entry) / 1e18
+        self.has_indexer_events = np.array(
+            has_indexer_events or [False] * n_rows, dtype=bool
+        )
+
+        iso = isolated_rows or []
+        self.iso_row = np.array([r[0] for r in iso], dtype=np.int64)
+        self.iso_product_id = np.array([r[1] for r in iso], dtype=np.int64)
+        iso_x18 = _x18_array([r[2:10] for r in iso]).reshape(len(iso), 8)
+        (
+            self.iso_base_amount,
+            self.iso_base_v_quote,
+            self.iso_base_price,
+            iso_lwi,
+            iso_lwm,
+            iso_swi,
+            iso_swm,
+            self.iso_quote_amount,
+        ) = iso_x18.T
+        base_value = self.iso_base_amount * self.iso_base_price
+        long = self.iso_base_amount >= 0
+        computed_initial = (
+            self.iso_quote_amount
+            + base_value * np.where(long, iso_lwi, iso_swi)
+            + self.iso_base_v_quote
+        )
+        computed_maintenance = (
+            self.iso_quote_amount
+            + base_value * np.where(long, iso_lwm, iso_swm)
+            + self.iso_base_v_quote
+        )
+        self.iso_initial_health = np.array(
+            [
+                computed_initial[i] if r[10] is None else int(r[10]) / 1e18
+                for i, r in enumerate(iso)
+            ],
+            dtype=np.float64,
+        )
+        self.iso_maintenance_health = np.array(
+            [
+                computed_maintenance[i] if r[11] is None else int(r[11]) / 1e18
+                for i, r in enumerate(iso)
+            ],
+            dtype=np.float64,
+        )
+
+    # ---------------- loaders
+
+    @classmethod
+    def from_subaccount_infos(
+        cls,
+        subaccount_infos: list[SubaccountInfoData],
+        isolated_positions: Optional[dict[str, list[IsolatedPosition]]] = None,
+        indexer_events: Optional[dict[str, list[IndexerEvent]]] = None,
+    ) -> "BatchMarginEngine":
+        """
+        Build from engine subaccount infos (engine-reported healths are used).
+
+        Args:
+            subaccount_infos: `get_subaccount_info` responses.
+            isolated_positions: Optional subaccount -> isolated positions.
+            indexer_events: Optional subaccount -> indexer snapshot events (Est. PnL).
+        """
+        isolated_positions = isolated_positions or {}
+        indexer_events = indexer_events or {}
+        subaccounts: list[str] = []
+        balance_rows: list[tuple] = []
+        healths: list[list] = []
+        isolated_rows: list[tuple] = []
+        net_entry_rows: list[tuple] = []
+        has_events: list[bool] = []
+        for row, info in enumerate(subaccount_infos):
+            subaccounts.append(info.subaccount)
+            healths.append([health.health for health in info.healths[:3]])
+            for balance, product in zip(info.spot_balances, info.spot_products):
+                balance_rows.append(_balance_row(row, balance, product, False))
+            for balance, product in zip(info.perp_balances, info.perp_products):
+                balance_rows.append(_balance_row(row, balance, product, True))
+            for iso_pos in isolated_positions.get(info.subaccount, []):
+                isolated_rows.append(cls._isolated_row(row, iso_pos))
+            events = indexer_events.get(info.subaccount) or []
+            has_events.append(bool(events))
+            net_entry_rows.extend(cls._net_entry_rows(row, events))
+        return cls(
+            subaccounts,
+            balance_rows,
+            healths=healths,
+            isolated_rows=isolated_rows,
+            net_entry_rows=net_entry_rows,
+            has_indexer_events=has_events,
+        )
+
+    @classmethod
+    def from_snapshots(
+        cls, snapshots: dict[str, dict[str, list[IndexerEvent]]]
+    ) -> "BatchMarginEngine":
+        """
+        Build from indexer account snapshots (`IndexerAccountSnapshotsData.snapshots`).
+
+        The latest snapshot of each subaccount is used. Cross balances are the
+        non-isolated events; isolated events are grouped by `isolated_product_id`
+        into (base perp, quote) positions. Healths are computed from balances.
+        """
+        subaccounts: list[str] = []
+        balance_rows: list[tuple] = []
+        isolated_rows: list[tuple] = []
+        net_entry_rows: list[tuple] = []
+        has_events: list[bool] = []
+        for row, (subaccount, by_timestamp) in enumerate(snapshots.items()):
+            subaccounts.append(subaccount)
+            events = (
+                list(by_timestamp[max(by_timestamp, key=int)] or [])
+                if by_timestamp
+                else []
+            )
+            has_events.append(bool(events))
+            isolated: dict[int, dict[bool, tuple]] = {}
+            for event in events:
+                product, balance, is_perp = _event_product(event)
+                if event.isolated:
+                    isolated.setdefault(event.isolated_product_id, {})[is_perp] = (
+                        product,
+                        balance,
+                    )
+                else:
+                    balance_rows.append(_balance_row(row, balance, product, is_perp))
+            for product_id, legs in isolated.items():
+                if True not in legs:
+                    continue
+                base_product, base_balance = legs[True]
+                quote_amount = legs[False][1].balance.amount if False in legs else "0"
+                isolated_rows.append(
+                    cls._isolated_row_from_balances(
+                        row, base_balance, base_product, quote_amount, None
+                    )
+                )
+            net_entry_rows.extend(cls._net_entry_rows(row, events))
+        return cls(
+            subaccounts,
+            balance_rows,
+            isolated_rows=isolated_rows,
+            net_entry_rows=net_entry_rows,
+            has_indexer_events=has_events,
+        )
+
+    @classmethod
+    def from_client(
+        cls,
+        client: "NadoClient",
+        subaccounts: list[str],
+        *,
+        snapshot_timestamp: Optional[int] = None,
+        snapshot_active_only: bool = True,
+    ) -> "BatchMarginEngine":
+        """
+        Fetch the latest snapshots of all `subaccounts` with a single
+        `get_multi_subaccount_snapshots` call.
+
+        Args:
+            client: Configured Nado client with indexer connectivity.
+            subaccounts: Subaccount hex ids (bytes32).
+            snapshot_timestamp: Epoch seconds to request. Defaults to now.
+            snapshot_active_only: Only return live balances (indexer ``active`` filter).
+        """
+        response = client.context.indexer_client.get_multi_subaccount_snapshots(
+            IndexerAccountSnapshotsParams(
+                subaccounts=subaccounts,
+                timestamps=[snapshot_timestamp or int(time())],
+                isolated=None,
+                active=snapshot_active_only,
+            )
+        )
+        snapshots = response.snapshots or {}
+        return cls.from_snapshots(
+            {subaccount: snapshots.get(subaccount) or {} for subaccount in subaccounts}
+        )
+
+    @staticmethod
+    def _isolated_row_from_balances(
+        row: int, base_balance, base_product, quote_amount, healths
+    ) -> tuple:
+        """Isolated row; `healths=None` computes the healths from the balances."""
+        if healths is None:
+            initial_health = maintenance_health = None
+        else:
+            initial_health = healths[0].health if healths else "0"
+            maintenance_health = healths[1].health if len(healths) > 1 else "0"
+        risk = base_product.risk
+        return (
+            row,
+            base_balance.product_id,
+            base_balance.balance.amount,
+            base_balance.balance.v_quote_balance,
+            base_product.oracle_price_x18,
+            risk.long_weight_initial_x18,
+            risk.long_weight_maintenance_x18,
+            risk.short_weight_initial_x18,
+            risk.short_weight_maintenance_x18,
+            quote_amount,
+            initial_health,
+            maintenance_health,
+        )
+
+    @classmethod
+    def _isolated_row(cls, row: int, iso_pos: IsolatedPosition) -> tuple:
+        return cls._isolated_row_from_balances(
+            row,
+            iso_pos.base_balance,
+            iso_pos.base_product,
+            iso_pos.quote_balance.balance.amount,
+            iso_pos.healths,
+        )
+
+    @staticmethod
+    def _net_entry_rows(row: int, events: list[IndexerEvent]) -> list[tuple]:
+        rows = []
+        for event in events:
+            if event.isolated or event.product_id == QUOTE_PRODUCT_ID:
+                continue
+            try:
+                rows.append((row, event.product_id, int(event.net_entry_unrealized)))
+            except (TypeError, ValueError):
+                continue
+        return rows
+
+    # ---------------- calculation
+
+    def calculate(self) -> BatchMarginResult:
+        """Compute margin metrics for all subaccounts in one vectorised pass."""
+        amount, price, v_quote = self.amount, self.oracle_price, self.v_quote_balance
+        is_perp = self.is_perp
+        is_spot = ~is_perp
+
+        value = amount * price
+        long = amount >= 0
+        weight_initial = np.where(
+            long, self.long_weight_initial, self.short_weight_initial
+        )
+        weight_maintenance = np.where(
+            long, self.long_weight_maintenance, self.short_weight_maintenance
+        )
+        position_initial_health = value * weight_initial
+        position_maintenance_health = value * weight_maintenance
+
+        if self.reported_healths is not None:
+            initial_health, maintenance_health, unweighted_health = (
+                self.reported_healths.T
+            )
+        else:
+            initial_health = (position_initial_health + v_quote).sum(axis=1)
+            maintenance_health = (position_maintenance_health + v_quote).sum(axis=1)
+            unweighted_health = (value + v_quote).sum(axis=1)
+
+        has_borrows_or_perps = (
+            (is_spot & (amount < 0)) | (is_perp & (amount != 0))
+        ).any(axis=1)
+        active = has_borrows_or_perps & (unweighted_health != 0)
+        safe_unweighted = np.where(active, unweighted_health, 1.0)
+
+        def usage(health: "np.ndarray") -> "np.ndarray":
+            fraction = np.minimum((unweighted_health - health) / safe_unweighted, 1.0)
+            return np.where(active, np.where(health < 0, 1.0, fraction), 0.0)
+
+        # leverage: |value| of every non-quote product that has health weight
+        zero_health = (self.long_weight_initial == 0) & (self.short_weight_initial == 2)
+        leverage_mask = (
+            self.present & (self.product_ids != QUOTE_PRODUCT_ID) & ~zero_health
+        )
+        leverage_numerator = np.where(leverage_mask, np.abs(value), 0.0).sum(axis=1)
+        account_leverage = np.where(active, leverage_numerator / safe_unweighted, 0.0)
+
+        spot_value = np.where(self.present & is_spot, value, 0.0)
+        total_spot_deposits = np.where(spot_value > 0, spot_value, 0.0).sum(axis=1)
+        total_spot_borrows = np.where(spot_value < 0, -spot_value, 0.0).sum(axis=1)
+
+        cross_mask = self.present & is_perp & (amount != 0)
+        notional_value = np.abs(value)
+        position_margin_used = (
+            np.abs(amount) * price * np.abs(1 - self.long_weight_initial)
+        )
+        unsettled = value + v_quote
+        est_pnl = np.where(
+            self.has_indexer_events[:, None], value - self.net_entry, np.nan
+        )
+
+        iso_value = self.iso_base_amount * self.iso_base_price
+        iso_notional_value = np.abs(iso_value)
+        iso_net_margin = self.iso_quote_amount + iso_value + self.iso_base_v_quote
+        iso_leverage = np.divide(
+            iso_notional_value,
+            iso_net_margin,
+            out=np.zeros_like(iso_net_margin),
+            where=iso_net_margin != 0,
+        )
+        total_iso_net_margin = np.bincount(
+            self.iso_row, weights=iso_net_margin, minlength=len(self.subaccounts)
+        )
+
+        return BatchMarginResult(
+            self,
+            initial_health=initial_health,
+            maintenance_health=maintenance_health,
+            unweighted_health=unweighted_health,
+            margin_usage_fraction=usage(initial_health),
+            maint_margin_usage_fraction=usage(maintenance_health),
+            funds_available=np.maximum(initial_health, 0.0),
+            funds_until_liquidation=np.maximum(maintenance_health, 0.0),
+            portfolio_value=unweighted_health + total_iso_net_margin,
+            account_leverage=account_leverage,
+            total_spot_deposits=total_spot_deposits,
+            total_spot_borrows=total_spot_borrows,
+            cross_mask=cross_mask,
+            notional_value=notional_value,
+            position_margin_used=position_margin_used,
+            position_initial_health=position_initial_health,
+            position_maintenance_health=position_maintenance_health,
+            unsettled=unsettled,
+            est_pnl=est_pnl,
+            iso_notional_value=iso_notional_value,
+            iso_net_margin=iso_net_margin,
+            iso_leverage=iso_leverage,
+            total_iso_net_margin=total_iso_net_margin,
+        )
+
+    def calculate_account_summaries(self) -> dict[str, AccountSummary]:
+        """`MarginManager.calculate_account_summary` for every subaccount."""
+        return self.calculate().summaries()
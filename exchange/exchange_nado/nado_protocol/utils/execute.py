@@ -1,12 +1,10 @@
 from abc import abstractmethod
-from copy import deepcopy
 from typing import Optional, Type, Union
 from eth_account.signers.local import LocalAccount
 from pydantic import validator
-from nado_protocol.contracts.eip712.sign import (
-    build_eip712_typed_data,
-    get_eip712_typed_data_digest,
-    sign_eip712_typed_data,
+from nado_protocol.contracts.eip712.hasher import (
+    get_eip712_digest,
+    sign_nado_execute,
 )
 from nado_protocol.contracts.types import NadoExecuteType
 from nado_protocol.utils.backend import NadoClientOpts
@@ -241,8 +239,17 @@ class NadoBaseExecute:
 
         Returns:
             Type[BaseParams]: A copy of the original parameters with owner and nonce injected if needed.
+
+        Note:
+            Only `sender` and `nonce` are modified, so the copy is shallow apart from
+            a `SubaccountParams` sender (whose owner may be filled in).
         """
-        params = deepcopy(params)
+        update = (
+            {"sender": params.sender.copy()}
+            if isinstance(params.sender, SubaccountParams)
+            else None
+        )
+        params = params.copy(update=update)
         params = self._inject_owner_if_needed(params)
         params = self._inject_nonce_if_needed(params, use_order_nonce)
         return params
@@ -307,8 +314,8 @@ class NadoBaseExecute:
         Returns:
             str: The digest computed from the provided parameters.
         """
-        return get_eip712_typed_data_digest(
-            build_eip712_typed_data(execute, msg, verifying_contract, chain_id)
+        return (
+            f"0x{get_eip712_digest(execute, msg, verifying_contract, chain_id).hex()}"
         )
 
     def sign(
@@ -336,11 +343,7 @@ class NadoBaseExecute:
         Returns:
             str: The generated EIP-712 signature.
         """
-        typed_data = build_eip712_typed_data(execute, msg, verifying_contract, chain_id)
-        return sign_eip712_typed_data(
-            typed_data=typed_data,
-            signer=signer,
-        )
+        return sign_nado_execute(execute, msg, verifying_contract, chain_id, signer)
 
     def get_order_digest(self, order: OrderParams, product_id: int) -> str:
         """
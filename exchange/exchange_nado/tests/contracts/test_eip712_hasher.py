@@ -0,0 +1,111 @@
+import random
+
+from eth_account import Account
+from nado_protocol.contracts.eip712.hasher import (
+    get_domain_separator,
+    get_eip712_digest,
+    get_struct_hasher,
+    sign_nado_execute,
+)
+from nado_protocol.contracts.eip712.sign import (
+    build_eip712_typed_data,
+    get_eip712_typed_data_digest,
+    sign_eip712_typed_data,
+)
+from nado_protocol.contracts.types import NadoTxType
+from nado_protocol.utils.bytes32 import hex_to_bytes32
+from nado_protocol.utils.order import build_appendix
+from nado_protocol.utils.expiration import OrderType
+
+
+def _assert_same_signature(tx, msg, verifying_contract, chain_id, signer):
+    typed_data = build_eip712_typed_data(tx, msg, verifying_contract, chain_id)
+    assert (
+        f"0x{get_eip712_digest(tx, msg, verifying_contract, chain_id).hex()}"
+        == get_eip712_typed_data_digest(typed_data)
+    )
+    assert sign_nado_execute(
+        tx, msg, verifying_contract, chain_id, signer
+    ) == sign_eip712_typed_data(typed_data, signer)
+
+
+def test_hasher_matches_generic_signing(
+    chain_id: int,
+    endpoint_addr: str,
+    order_verifying_contracts: list[str],
+    private_keys: list[str],
+    order_params: dict,
+    cancellation_params: dict,
+    cancellation_products_params: dict,
+    withdraw_collateral_params: dict,
+    liquidate_subaccount_params: dict,
+    mint_nlp_params: dict,
+    burn_nlp_params: dict,
+    link_signer_params: dict,
+    authenticate_stream_params: dict,
+    list_trigger_orders_params: dict,
+):
+    to_sign = [
+        (NadoTxType.PLACE_ORDER, order_verifying_contracts[1], order_params),
+        (NadoTxType.CANCEL_ORDERS, endpoint_addr, cancellation_params),
+        (NadoTxType.CANCEL_PRODUCT_ORDERS, endpoint_addr, cancellation_products_params),
+        (NadoTxType.WITHDRAW_COLLATERAL, endpoint_addr, withdraw_collateral_params),
+        (NadoTxType.LIQUIDATE_SUBACCOUNT, endpoint_addr, liquidate_subaccount_params),
+        (NadoTxType.MINT_NLP, endpoint_addr, mint_nlp_params),
+        (NadoTxType.BURN_NLP, endpoint_addr, burn_nlp_params),
+        (NadoTxType.LINK_SIGNER, endpoint_addr, link_signer_params),
+        (NadoTxType.AUTHENTICATE_STREAM, endpoint_addr, authenticate_stream_params),
+        (NadoTxType.LIST_TRIGGER_ORDERS, endpoint_addr, list_trigger_orders_params),
+    ]
+    signer = Account.from_key(private_keys[0])
+
+    for tx, verifying_contract, msg in to_sign:
+        _assert_same_signature(tx, msg, verifying_contract, chain_id, signer)
+
+
+def test_hasher_matches_generic_signing_for_random_orders(
+    chain_id: int, senders: list[str], private_keys: list[str]
+):
+    rng = random.Random(7)
+    signer = Account.from_key(private_keys[1])
+    sender = hex_to_bytes32(senders[0])
+
+    for product_id in range(1, 30):
+        msg = {
+            "sender": sender,
+            "priceX18": rng.randrange(1, 10**24),
+            "amount": rng.randrange(-(2**127), 2**127),
+            "expiration": rng.randrange(0, 2**64),
+            "nonce": rng.randrange(0, 2**64),
+            "appendix": build_appendix(
+                rng.choice(list(OrderType)), reduce_only=rng.random() < 0.5
+            ),
+        }
+        verifying_contract = f"0x{product_id:040x}"
+        _assert_same_signature(
+            NadoTxType.PLACE_ORDER, msg, verifying_contract, chain_id, signer
+        )
+
+    cancellation = {
+        "sender": sender,
+        "productIds": [1, 2, 3],
+        "digests": [rng.randbytes(32) for _ in range(3)],
+        "nonce": 5,
+    }
+    _assert_same_signature(
+        NadoTxType.CANCEL_ORDERS, cancellation, f"0x{0:040x}", chain_id, signer
+    )
+    empty = {"sender": sender, "productIds": [], "nonce": 1}
+    _assert_same_signature(
+        NadoTxType.CANCEL_PRODUCT_ORDERS, empty, f"0x{0:040x}", chain_id, signer
+    )
+
+
+def test_hasher_caches_domain_and_type(chain_id: int, endpoint_addr: str):
+    assert get_struct_hasher(NadoTxType.PLACE_ORDER) is get_struct_hasher(
+        NadoTxType.PLACE_ORDER
+    )
+    get_domain_separator(endpoint_addr, chain_id)
+    hits = get_domain_separator.cache_info().hits
+    get_domain_separator(endpoint_addr, chain_id)
+    assert get_domain_separator.cache_info().hits == hits + 1
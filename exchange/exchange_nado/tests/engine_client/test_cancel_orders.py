@@ -39,3 +39,12 @@ def test_cancel_orders_params(senders: list[str]):
             "signature": params_from_dict.signature,
         }
     }
+
+
+def test_cancel_orders_params_reparse_keeps_bytes_digests(senders: list[str]):
+    # bytes digests that are valid utf-8 must not be coerced to `str` on re-parse
+    digests = [f"0x{1:064x}", f"0x{'41' * 32}"]
+    params = CancelOrdersParams(sender=senders[0], productIds=[1, 2], digests=digests)
+    assert CancelOrdersParams.parse_obj(params).digests == [
+        hex_to_bytes32(digest) for digest in digests
+    ]
@@ -0,0 +1,83 @@
+from unittest.mock import MagicMock
+
+from nado_protocol.contracts.eip712.sign import (
+    build_eip712_typed_data,
+    sign_eip712_typed_data,
+)
+from nado_protocol.contracts.types import NadoExecuteType
+from nado_protocol.engine_client import EngineClient
+from nado_protocol.engine_client.types.execute import (
+    OrderParams,
+    PlaceOrderParams,
+    PlaceOrdersParams,
+    PlaceOrdersRequest,
+)
+from nado_protocol.utils.bytes32 import hex_to_bytes32
+from nado_protocol.utils.order import gen_order_verifying_contract
+from nado_protocol.utils.subaccount import SubaccountParams
+
+
+def _order(price: int, amount: int) -> OrderParams:
+    return OrderParams(
+        sender=SubaccountParams(subaccount_name="default"),
+        priceX18=price,
+        amount=amount,
+        expiration=1000,
+        nonce=1000,
+        appendix=0,
+    )
+
+
+def test_place_orders_execute_success(
+    engine_client: EngineClient, mock_post: MagicMock, senders: list[str]
+):
+    params = PlaceOrdersParams(
+        orders=[
+            PlaceOrderParams(product_id=2, order=_order(1000, 10)),
+            PlaceOrderParams(product_id=2, order=_order(1001, -10)),
+            PlaceOrderParams(product_id=4, order=_order(1002, 10)),
+        ],
+        stop_on_failure=False,
+    )
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "status": "success",
+        "data": {
+            "place_orders": [
+                {"digest": "0x1", "error": None},
+                {"digest": None, "error": "price out of range"},
+                {"digest": "0x3", "error": None},
+            ]
+        },
+    }
+    mock_post.return_value = mock_response
+
+    res = engine_client.place_orders(params)
+
+    assert mock_post.call_count == 1
+    sent = mock_post.call_args.kwargs["json"]
+    assert list(sent) == ["place_orders"]
+    assert sent["place_orders"]["stop_on_failure"] is False
+
+    req = PlaceOrdersRequest(**res.req)
+    for placed, original in zip(req.place_orders.orders, params.orders):
+        order = original.order.copy(deep=True)
+        order.sender = hex_to_bytes32(senders[0])
+        expected_signature = sign_eip712_typed_data(
+            typed_data=build_eip712_typed_data(
+                NadoExecuteType.PLACE_ORDER,
+                order.dict(),
+                gen_order_verifying_contract(original.product_id),
+                engine_client.chain_id,
+            ),
+            signer=engine_client._opts.linked_signer,
+        )
+        assert placed.signature == expected_signature
+        assert placed.order.sender.lower() == senders[0].lower()
+
+    assert [item.digest for item in res.data.place_orders] == ["0x1", None, "0x3"]
+    assert res.data.place_orders[1].error == "price out of range"
+    # the caller's params are left untouched
+    assert all(o.signature is None for o in params.orders)
@@ -0,0 +1,60 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from nado_protocol.engine_client import EngineClient
+from nado_protocol.engine_client.types.execute import (
+    CancelOrdersParams,
+    CancelOrdersRequest,
+)
+from nado_protocol.engine_client.types.query import QueryStatusParams
+from nado_protocol.utils.exceptions import BadStatusCodeException
+
+
+class RecordingLimiter:
+    def __init__(self):
+        self.endpoints: list[str] = []
+
+    def acquire(self, endpoint: str) -> float:
+        self.endpoints.append(endpoint)
+        return 0.0
+
+
+def test_rate_limiter_is_shared_and_keyed_by_request_type(
+    mock_post: MagicMock,
+    mock_get: MagicMock,
+    url: str,
+    senders: list[str],
+):
+    limiter = RecordingLimiter()
+    engine_client = EngineClient(opts={"url": url, "rate_limiter": limiter})
+    assert engine_client.rate_limiter is limiter
+    assert engine_client._querier.rate_limiter is limiter
+
+    mock_response = MagicMock()
+    mock_response.status_code = 500
+    mock_post.return_value = mock_response
+    mock_get.return_value = mock_response
+
+    params = CancelOrdersParams(
+        sender=senders[0],
+        productIds=[1],
+        digests=["0x51ba8762bc5f77957a4e896dba34e17b553b872c618ffb83dba54878796f2821"],
+        nonce=1,
+        signature="0x00",
+    )
+    with pytest.raises(BadStatusCodeException):
+        engine_client.execute(CancelOrdersRequest(cancel_orders=params))
+    with pytest.raises(BadStatusCodeException):
+        engine_client.query(QueryStatusParams())
+    with pytest.raises(BadStatusCodeException):
+        engine_client.get_product_symbols()
+
+    # each request takes its token before it is sent
+    assert limiter.endpoints == ["cancel_orders", "status", "symbols"]
+    assert mock_post.call_count == 2
+
+
+def test_no_rate_limiter_by_default(url: str):
+    engine_client = EngineClient(opts={"url": url})
+    assert engine_client.rate_limiter is None
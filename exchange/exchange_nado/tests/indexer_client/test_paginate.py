@@ -0,0 +1,275 @@
+import asyncio
+import csv
+import gzip
+from unittest.mock import MagicMock
+
+import pytest
+
+from nado_protocol.indexer_client import IndexerClient
+from nado_protocol.indexer_client.paginate import iter_pages
+from nado_protocol.indexer_client.types.models import IndexerHistoricalOrder
+from nado_protocol.indexer_client.types.query import (
+    IndexerInterestAndFundingParams,
+    IndexerMatchesParams,
+    IndexerSubaccountHistoricalOrdersParams,
+)
+
+
+def _order(submission_idx: int, n: int) -> dict:
+    return {
+        "submission_idx": str(submission_idx),
+        "timestamp": str(1700000000 + submission_idx),
+        "digest": f"0x{submission_idx:04x}{n:02x}",
+        "base_filled": "0",
+        "quote_filled": "0",
+        "fee": "0",
+        "subaccount": "xxx",
+        "product_id": 2,
+        "amount": str(10**18),
+        "price_x18": str(100 * 10**18),
+        "expiration": "0",
+        "nonce": str(n),
+        "isolated": False,
+    }
+
+
+def _match(submission_idx: int, n: int) -> dict:
+    return {
+        "submission_idx": str(submission_idx),
+        "timestamp": None,
+        "digest": f"0x{submission_idx:04x}{n:02x}",
+        "base_filled": str(10**18),
+        "quote_filled": str(-100 * 10**18),
+        "fee": "1",
+        "order": {
+            "sender": "xxx",
+            "priceX18": str(100 * 10**18),
+            "amount": str(10**18),
+            "expiration": "0",
+            "nonce": str(n),
+        },
+        "cumulative_fee": "1",
+        "cumulative_base_filled": str(10**18),
+        "cumulative_quote_filled": str(-100 * 10**18),
+        "isolated": False,
+    }
+
+
+def _match_tx(submission_idx: int) -> dict:
+    signed = {
+        "order": {
+            "sender": "xxx",
+            "priceX18": "1",
+            "amount": "1",
+            "expiration": "0",
+            "nonce": "0",
+        },
+        "signature": "0x",
+    }
+    return {
+        "submission_idx": str(submission_idx),
+        "timestamp": None,
+        "tx": {
+            "match_orders": {
+                "product_id": 4,
+                "amm": False,
+                "taker": signed,
+                "maker": signed,
+            }
+        },
+    }
+
+
+def _payment(idx: int) -> dict:
+    return {
+        "product_id": 2,
+        "idx": str(idx),
+        "timestamp": str(1700000000 + idx),
+        "amount": "1",
+        "balance_amount": "2",
+        "rate_x18": "3",
+        "oracle_price_x18": "4",
+    }
+
+
+def _fake_indexer(mock_post: MagicMock, submissions: list[int]) -> list[dict]:
+    """
+    Serves orders / matches newest first like the indexer: `idx` is an inclusive
+    upper bound on submission_idx and `limit` caps the number of items.
+    Submission `s` produced `submissions[s - 1]` items.
+    """
+    items = [
+        (idx, n)
+        for idx in range(len(submissions), 0, -1)
+        for n in range(submissions[idx - 1])
+    ]
+    requests = []
+
+    def post(url, json):
+        requests.append(json)
+        ((kind, query),) = json.items()
+        page = [
+            (idx, n)
+            for idx, n in items
+            if query.get("idx") is None or idx <= int(query["idx"])
+        ][: query["limit"]]
+        response = MagicMock()
+        response.status_code = 200
+        if kind == "orders":
+            response.json.return_value = {"orders": [_order(*i) for i in page]}
+        else:
+            response.json.return_value = {
+                "matches": [_match(*i) for i in page],
+                "txs": [
+                    _match_tx(idx) for idx in sorted({i for i, _ in page}, reverse=True)
+                ],
+            }
+        return response
+
+    mock_post.side_effect = post
+    return requests
+
+
+def test_iter_orders_does_not_split_submissions(mock_post: MagicMock, url: str):
+    indexer_client = IndexerClient({"url": url})
+    submissions = [1, 2, 1, 3, 1, 1, 2, 1, 1, 1]
+    requests = _fake_indexer(mock_post, submissions)
+
+    orders = list(
+        indexer_client.iter_subaccount_historical_orders(
+            IndexerSubaccountHistoricalOrdersParams(subaccounts=["xxx"], limit=4)
+        )
+    )
+
+    assert all(isinstance(order, IndexerHistoricalOrder) for order in orders)
+    assert [(int(o.submission_idx), int(o.nonce)) for o in orders] == [
+        (idx, n) for idx in range(10, 0, -1) for n in range(submissions[idx - 1])
+    ]
+    # every page after the first restarts at the submission it cut off
+    assert [r["orders"].get("idx") for r in requests] == [None, 7, 5, 4, 3, 1]
+
+
+def test_iter_pages_submission_larger_than_page(mock_post: MagicMock, url: str):
+    indexer_client = IndexerClient({"url": url})
+    requests = _fake_indexer(mock_post, [1, 3])
+
+    pages = list(
+        iter_pages(
+            indexer_client,
+            IndexerSubaccountHistoricalOrdersParams(subaccounts=["xxx"], limit=2),
+            raw=True,
+            prefetch=False,
+        )
+    )
+
+    # submission 2 does not fit a page: re-requested whole with a doubled limit
+    assert [[o["submission_idx"] for o in page["orders"]] for page in pages] == [
+        ["2", "2", "2"],
+        ["1"],
+    ]
+    assert [(r["orders"].get("idx"), r["orders"]["limit"]) for r in requests] == [
+        (None, 2),
+        (2, 4),
+        (1, 2),
+    ]
+
+
+def test_iter_pages_max_pages(mock_post: MagicMock, url: str):
+    indexer_client = IndexerClient({"url": url})
+    requests = _fake_indexer(mock_post, [1] * 10)
+
+    pages = list(
+        iter_pages(
+            indexer_client,
+            IndexerMatchesParams(subaccounts=["xxx"], limit=3),
+            max_pages=2,
+        )
+    )
+
+    assert len(pages) == 2
+    assert len(requests) == 2
+
+
+def test_iter_interest_and_funding_payments(mock_post: MagicMock, url: str):
+    indexer_client = IndexerClient({"url": url})
+    requests = []
+
+    def post(url, json):
+        requests.append(json)
+        max_idx = int(json["interest_and_funding"].get("max_idx") or 10)
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {
+            "interest_payments": [_payment(i) for i in range(max_idx, 0, -2)][:2],
+            "funding_payments": [_payment(i) for i in range(max_idx - 1, 0, -2)][:2],
+            "next_idx": str(max(max_idx - 4, 0)),
+        }
+        return response
+
+    mock_post.side_effect = post
+
+    payments = list(
+        indexer_client.iter_interest_and_funding_payments(
+            IndexerInterestAndFundingParams(
+                subaccount="xxx", product_ids=[2], max_idx=None, limit=2
+            )
+        )
+    )
+
+    assert sorted(int(p.idx) for _, p in payments) == list(range(1, 11))
+    assert {t for t, p in payments if int(p.idx) % 2 == 0} == {"interest"}
+    assert [r["interest_and_funding"].get("max_idx") for r in requests] == [
+        None,
+        "6",
+        "2",
+    ]
+
+
+def test_aiter_matches(mock_post: MagicMock, url: str):
+    indexer_client = IndexerClient({"url": url})
+    _fake_indexer(mock_post, [2, 1, 1, 2, 1])
+
+    async def collect():
+        return [
+            int(match.submission_idx)
+            async for match in indexer_client.aiter_matches(
+                IndexerMatchesParams(subaccounts=["xxx"], limit=3)
+            )
+        ]
+
+    assert asyncio.run(collect()) == [5, 4, 4, 3, 2, 1, 1]
+
+
+def test_export_matches_csv(mock_post: MagicMock, url: str, tmp_path):
+    indexer_client = IndexerClient({"url": url})
+    _fake_indexer(mock_post, [1, 2, 1, 1])
+    path = str(tmp_path / "matches.csv.gz")
+
+    count = indexer_client.export_history(
+        IndexerMatchesParams(subaccounts=["xxx"], limit=2), path
+    )
+
+    with gzip.open(path, "rt", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert count == len(rows) == 5
+    assert [row["submission_idx"] for row in rows] == ["4", "3", "2", "2", "1"]
+    assert rows[0]["product_id"] == "4"
+    assert rows[0]["price_x18"] == str(100 * 10**18)
+    assert rows[0]["isolated"] == "0"
+
+
+def test_export_parquet(mock_post: MagicMock, url: str, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    indexer_client = IndexerClient({"url": url})
+    _fake_indexer(mock_post, [1, 2, 1, 1])
+    path = str(tmp_path / "orders.parquet")
+
+    count = indexer_client.export_history(
+        IndexerSubaccountHistoricalOrdersParams(subaccounts=["xxx"], limit=2),
+        path,
+        row_group_size=2,
+    )
+
+    table = pq.read_table(path)
+    assert count == table.num_rows == 5
+    assert table.column("submission_idx").to_pylist() == [4, 3, 2, 2, 1]
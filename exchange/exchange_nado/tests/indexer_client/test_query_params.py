@@ -174,3 +174,26 @@ def test_indexer_base_params():
     params_with_submission_idx = IndexerBaseParams(submission_idx=100)
 
     assert params_with_idx == params_with_submission_idx
+
+
+def test_indexer_rate_limiter_keyed_by_query_type(
+    mock_post: MagicMock,
+    url: str,
+):
+    endpoints = []
+    limiter = MagicMock()
+    limiter.acquire.side_effect = endpoints.append
+    indexer_client = IndexerClient({"url": url, "rate_limiter": limiter})
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"orders": []}
+    mock_post.return_value = mock_response
+    indexer_client.get_subaccount_historical_orders(
+        IndexerSubaccountHistoricalOrdersParams(subaccounts=["xxx"])
+    )
+
+    mock_response.json.return_value = {"matches": [], "txs": []}
+    indexer_client.get_matches(IndexerMatchesParams(subaccounts=["xxx"]))
+
+    assert endpoints == ["orders", "matches"]
@@ -0,0 +1,378 @@
+import random
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from nado_protocol.engine_client.types.models import IsolatedPosition
+from nado_protocol.engine_client.types.query import SubaccountInfoData
+from nado_protocol.indexer_client.types.models import IndexerEvent
+from nado_protocol.indexer_client.types.query import IndexerAccountSnapshotsData
+from nado_protocol.utils.batch_margin import BatchMarginEngine
+from nado_protocol.utils.margin_manager import AccountSummary, MarginManager
+
+X18 = 10**18
+SPOT_IDS = [0, 1, 3, 5]
+PERP_IDS = [2, 4, 6, 8, 10]
+
+
+def _risk(product_id: int, rng: random.Random) -> dict:
+    if product_id == 0:
+        return {
+            "long_weight_initial_x18": str(X18),
+            "short_weight_initial_x18": str(X18),
+            "long_weight_maintenance_x18": str(X18),
+            "short_weight_maintenance_x18": str(X18),
+            "price_x18": str(X18),
+        }
+    if product_id == 5:
+        # zero health product (excluded from leverage)
+        return {
+            "long_weight_initial_x18": "0",
+            "short_weight_initial_x18": str(2 * X18),
+            "long_weight_maintenance_x18": "0",
+            "short_weight_maintenance_x18": str(2 * X18),
+            "price_x18": str(X18),
+        }
+    long_initial = rng.choice([80, 90, 95]) * X18 // 100
+    return {
+        "long_weight_initial_x18": str(long_initial),
+        "short_weight_initial_x18": str(2 * X18 - long_initial),
+        "long_weight_maintenance_x18": str((X18 + long_initial) // 2),
+        "short_weight_maintenance_x18": str(2 * X18 - (X18 + long_initial) // 2),
+        "price_x18": "0",
+    }
+
+
+def _product(product_id: int, is_perp: bool, rng: random.Random) -> dict:
+    price = X18 if product_id == 0 else rng.randrange(1, 100_000) * X18 // 100
+    product = {
+        "product_id": product_id,
+        "oracle_price_x18": str(price),
+        "risk": _risk(product_id, rng),
+        "book_info": {
+            "size_increment": "1",
+            "price_increment_x18": "1",
+            "min_size": "1",
+            "collected_fees": "0",
+        },
+    }
+    if is_perp:
+        product["state"] = {
+            "cumulative_funding_long_x18": "0",
+            "cumulative_funding_short_x18": "0",
+            "available_settle": "0",
+            "open_interest": "0",
+        }
+    else:
+        product["config"] = {
+            "token": "0x0",
+            "interest_inflection_util_x18": "0",
+            "interest_floor_x18": "0",
+            "interest_small_cap_x18": "0",
+            "interest_large_cap_x18": "0",
+            "withdraw_fee_x18": "0",
+            "min_deposit_rate_x18": "0",
+        }
+        product["state"] = {
+            "cumulative_deposits_multiplier_x18": str(X18),
+            "cumulative_borrows_multiplier_x18": str(X18),
+            "total_deposits_normalized": "0",
+            "total_borrows_normalized": "0",
+        }
+    return product
+
+
+def _amount(rng: random.Random) -> int:
+    return rng.choice([0, 1, -1]) * rng.randrange(1, 10**22)
+
+
+def _health(balances: list[tuple[dict, dict]], weight: str) -> int:
+    """Exact x18 health: sum(amount * price * weight) + v_quote."""
+    total = Decimal(0)
+    for balance, product in balances:
+        amount = int(balance["balance"]["amount"])
+        side = "long" if amount >= 0 else "short"
+        weight_x18 = (
+            X18
+            if weight == "unweighted"
+            else int(product["risk"][f"{side}_weight_{weight}_x18"])
+        )
+        price = int(product["oracle_price_x18"])
+        total += Decimal(amount) * price * weight_x18 / X18 / X18
+        total += int(balance["balance"].get("v_quote_balance", 0))
+    return int(total)
+
+
+def _healths(balances: list[tuple[dict, dict]]) -> list[dict]:
+    return [
+        {"assets": "0", "liabilities": "0", "health": str(_health(balances, weight))}
+        for weight in ("initial", "maintenance", "unweighted")
+    ]
+
+
+def _subaccount(index: int, rng: random.Random) -> dict:
+    spots = [
+        (
+            {
+                "product_id": pid,
+                "balance": {
+                    "amount": str(
+                        rng.randrange(0, 10**25) if pid == 0 else _amount(rng) or X18
+                    )
+                },
+            },
+            _product(pid, False, rng),
+        )
+        for pid in SPOT_IDS
+    ]
+    perps = [
+        (
+            {
+                "product_id": pid,
+                "balance": {
+                    "amount": str(_amount(rng)),
+                    "v_quote_balance": str(rng.randrange(-(10**22), 10**22)),
+                    "last_cumulative_funding_x18": "0",
+                },
+            },
+            _product(pid, True, rng),
+        )
+        for pid in PERP_IDS
+    ]
+    return {
+        "subaccount": f"0x{index:064x}",
+        "exists": True,
+        "healths": _healths(spots + perps),
+        "health_contributions": [],
+        "spot_count": len(spots),
+        "perp_count": len(perps),
+        "spot_balances": [balance for balance, _ in spots],
+        "perp_balances": [balance for balance, _ in perps],
+        "spot_products": [product for _, product in spots],
+        "perp_products": [product for _, product in perps],
+        "pre_state": None,
+    }
+
+
+def _isolated(subaccount: str, product_id: int, rng: random.Random) -> dict:
+    base = {
+        "product_id": product_id,
+        "balance": {
+            "amount": str(_amount(rng) or X18),
+            "v_quote_balance": str(rng.randrange(-(10**21), 10**21)),
+            "last_cumulative_funding_x18": "0",
+        },
+    }
+    quote = {"product_id": 0, "balance": {"amount": str(rng.randrange(0, 10**22))}}
+    base_product = _product(product_id, True, rng)
+    return {
+        "subaccount": subaccount,
+        "quote_balance": quote,
+        "base_balance": base,
+        "quote_product": _product(0, False, rng),
+        "base_product": base_product,
+        "healths": _healths([(quote, _product(0, False, rng)), (base, base_product)]),
+        "quote_healths": [],
+        "base_healths": [],
+    }
+
+
+def _event(subaccount: str, balance: dict, product: dict, is_perp: bool, **kw) -> dict:
+    key = "perp" if is_perp else "spot"
+    return {
+        "submission_idx": "1",
+        "timestamp": "1700000000",
+        "subaccount": subaccount,
+        "product_id": balance["product_id"],
+        "event_type": "match_orders",
+        "product": {key: product},
+        "pre_balance": {key: balance},
+        "post_balance": {key: balance},
+        "isolated": kw.get("isolated", False),
+        "isolated_product_id": kw.get("isolated_product_id"),
+        "net_interest_unrealized": "0",
+        "net_interest_cumulative": "0",
+        "net_funding_unrealized": "0",
+        "net_funding_cumulative": "0",
+        "net_entry_unrealized": kw.get("net_entry", "0"),
+        "net_entry_cumulative": "0",
+        "quote_volume_cumulative": "0",
+    }
+
+
+@pytest.fixture
+def accounts():
+    rng = random.Random(7)
+    infos, isolated, events = [], {}, {}
+    for index in range(12):
+        info = _subaccount(index, rng)
+        subaccount = info["subaccount"]
+        infos.append(info)
+        isolated[subaccount] = [
+            _isolated(subaccount, pid, rng) for pid in rng.sample(PERP_IDS, index % 3)
+        ]
+        balances = list(zip(info["spot_balances"], info["spot_products"]))
+        perps = list(zip(info["perp_balances"], info["perp_products"]))
+        events[subaccount] = (
+            [_event(subaccount, b, p, False) for b, p in balances]
+            + [
+                _event(
+                    subaccount,
+                    b,
+                    p,
+                    True,
+                    net_entry=str(rng.randrange(-(10**22), 10**22)),
+                )
+                for b, p in perps
+            ]
+            if index % 4
+            else []
+        )
+    return infos, isolated, events
+
+
+def _assert_close(actual: Decimal, expected: Decimal, field: str):
+    assert float(actual) == pytest.approx(float(expected), rel=1e-9, abs=1e-9), field
+
+
+def _assert_summary_parity(batch: AccountSummary, exact: AccountSummary):
+    for field, value in exact.dict().items():
+        if isinstance(value, Decimal):
+            _assert_close(getattr(batch, field), value, field)
+
+    assert len(batch.cross_positions) == len(exact.cross_positions)
+    exact_cross = {p.product_id: p for p in exact.cross_positions}
+    for position in batch.cross_positions:
+        expected = exact_cross[position.product_id]
+        assert position.symbol == expected.symbol
+        for field, value in expected.dict().items():
+            if isinstance(value, Decimal):
+                _assert_close(getattr(position, field), value, field)
+            elif field == "est_pnl":
+                assert position.est_pnl is None
+
+    assert sorted(p.product_id for p in batch.spot_positions) == sorted(
+        p.product_id for p in exact.spot_positions
+    )
+    exact_iso = {p.product_id: p for p in exact.isolated_positions}
+    assert len(batch.isolated_positions) == len(exact_iso)
+    for position in batch.isolated_positions:
+        for field, value in exact_iso[position.product_id].dict().items():
+            if isinstance(value, Decimal):
+                _assert_close(getattr(position, field), value, field)
+
+
+def test_batch_margin_parity_with_margin_manager(accounts):
+    infos, isolated, events = accounts
+    subaccount_infos = [SubaccountInfoData.parse_obj(info) for info in infos]
+    isolated_positions = {
+        sub: [IsolatedPosition.parse_obj(p) for p in positions]
+        for sub, positions in isolated.items()
+    }
+    indexer_events = {
+        sub: [IndexerEvent.parse_obj(e) for e in sub_events]
+        for sub, sub_events in events.items()
+    }
+
+    summaries = BatchMarginEngine.from_subaccount_infos(
+        subaccount_infos, isolated_positions, indexer_events
+    ).calculate_account_summaries()
+
+    assert list(summaries) == [info.subaccount for info in subaccount_infos]
+    for info in subaccount_infos:
+        exact = MarginManager(
+            info,
+            isolated_positions[info.subaccount],
+            indexer_events[info.subaccount],
+        ).calculate_account_summary()
+        _assert_summary_parity(summaries[info.subaccount], exact)
+
+
+def test_batch_margin_from_snapshots_computes_healths(accounts):
+    infos, _, events = accounts
+    snapshots = {
+        sub: {"1700000000": sub_events}
+        for sub, sub_events in events.items()
+        if sub_events
+    }
+    engine = BatchMarginEngine.from_snapshots(
+        IndexerAccountSnapshotsData.parse_obj({"snapshots": snapshots}).snapshots
+    )
+    result = engine.calculate()
+
+    for info in infos:
+        if info["subaccount"] not in snapshots:
+            continue
+        row = result.index(info["subaccount"])
+        for i, field in enumerate(
+            ("initial_health", "maintenance_health", "unweighted_health")
+        ):
+            expected = int(info["healths"][i]["health"]) / X18
+            assert getattr(result, field)[row] == pytest.approx(expected, rel=1e-9)
+
+
+def test_batch_margin_from_snapshots_isolated_events():
+    rng = random.Random(3)
+    subaccount = f"0x{1:064x}"
+    iso = _isolated(subaccount, 4, rng)
+    events = [
+        _event(
+            subaccount,
+            iso[f"{leg}_balance"],
+            iso[f"{leg}_product"],
+            leg == "base",
+            isolated=True,
+            isolated_product_id=4,
+        )
+        for leg in ("quote", "base")
+    ]
+    snapshots = IndexerAccountSnapshotsData.parse_obj(
+        {"snapshots": {subaccount: {"1": events}}}
+    ).snapshots
+    summary = BatchMarginEngine.from_snapshots(snapshots).calculate_account_summaries()[
+        subaccount
+    ]
+    exact = MarginManager(
+        SubaccountInfoData.parse_obj({**_subaccount(1, rng), "subaccount": subaccount}),
+        [IsolatedPosition.parse_obj(iso)],
+    ).calculate_account_summary()
+
+    assert summary.cross_positions == []
+    assert len(summary.isolated_positions) == 1
+    position, expected = summary.isolated_positions[0], exact.isolated_positions[0]
+    for field in (
+        "position_size",
+        "notional_value",
+        "net_margin",
+        "leverage",
+        "initial_health",
+        "maintenance_health",
+    ):
+        _assert_close(getattr(position, field), getattr(expected, field), field)
+    _assert_close(summary.portfolio_value, expected.net_margin, "portfolio_value")
+
+
+def test_batch_margin_from_client_single_indexer_call(accounts):
+    _, _, events = accounts
+    subaccounts = [sub for sub, sub_events in events.items() if sub_events]
+    client = MagicMock()
+    client.context.indexer_client.get_multi_subaccount_snapshots.return_value = (
+        IndexerAccountSnapshotsData.parse_obj(
+            {"snapshots": {sub: {"1700000000": events[sub]} for sub in subaccounts}}
+        )
+    )
+
+    engine = BatchMarginEngine.from_client(
+        client, subaccounts, snapshot_timestamp=1700000000
+    )
+
+    client.context.indexer_client.get_multi_subaccount_snapshots.assert_called_once()
+    get_snapshots = client.context.indexer_client.get_multi_subaccount_snapshots
+    params = get_snapshots.call_args[0][0]
+    assert params.subaccounts == subaccounts
+    assert params.timestamps == [1700000000]
+    assert engine.subaccounts == subaccounts
+    assert engine.amount.shape == (len(subaccounts), len(SPOT_IDS) + len(PERP_IDS))
@@ -1,11 +1,32 @@
 # 只导出实际存在的模块
-from .perps_auth import StandXAuth, LoginResponse, SignedData
-from .perp_http import StandXPerpHTTP, RegionResponse
-
-__all__ = [
-    "StandXAuth",
-    "LoginResponse",
-    "SignedData",
-    "StandXPerpHTTP",
-    "RegionResponse",
-]
+# 子模块在首次访问时才导入：同步策略进程不会加载 aiohttp（异步客户端 / WebSocket）
+import importlib
+
+_EXPORTS = {
+    "StandXAuth": "perps_auth",
+    "LoginResponse": "perps_auth",
+    "SignedData": "perps_auth",
+    "StandXPerpHTTP": "perp_http",
+    "RegionResponse": "perp_http",
+    "HTTPPoolConfig": "http_pool",
+    "LatencyRecorder": "http_pool",
+    "create_session": "http_pool",
+    "ServerClock": "clock_sync",
+    "AsyncStandXPerpHTTP": "async_perp_http",
+    "StandXPerpWS": "perp_ws",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,362 @@
+"""
+StandX Perps async HTTP API Client (aiohttp)
+"""
+from typing import Dict, Any, Optional, List
+import asyncio
+import json
+import inspect
+import time
+import uuid
+
+import aiohttp
+
+from .perp_http import RegionResponse
+from .http_pool import RETRY_STATUSES, HTTPPoolConfig, LatencyRecorder, Timeout
+from .clock_sync import ServerClock
+
+
+def _client_timeout(timeout: Timeout) -> aiohttp.ClientTimeout:
+    """Convert a requests-style timeout to aiohttp.ClientTimeout"""
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+    return aiohttp.ClientTimeout(total=timeout)
+
+
+class AsyncStandXPerpHTTP:
+    """StandX Perps async HTTP API Client"""
+
+    def __init__(
+        self,
+        base_url: str = "https://perps.standx.com",
+        geo_url: str = "https://geo.standx.com",
+        pool_config: Optional[HTTPPoolConfig] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+        clock_sync_interval: float = 60.0,
+        clock: Optional[ServerClock] = None,
+        rate_limiter: Optional[Any] = None
+    ):
+        """
+        Initialize StandX Perps async HTTP client.
+
+        The aiohttp session is created lazily inside the running event loop
+        unless one is passed in (e.g. shared by many accounts on one loop).
+
+        Args:
+            base_url: Base URL for perps API (default: https://perps.standx.com)
+            geo_url: Base URL for geo API (default: https://geo.standx.com)
+            pool_config: Connection pool / timeout / retry configuration
+            session: Existing aiohttp session to share between clients
+            clock_sync_interval: Seconds between background server-time syncs
+            clock: Existing ServerClock to share between clients; a shared
+                clock is refreshed by whoever calls start_clock_sync()
+            rate_limiter: Limiter shared between clients / processes
+                (e.g. ratelimit.RateLimiter); every attempt first awaits
+                rate_limiter.acquire_async(endpoint). Default: no limiting
+        """
+        self.base_url = base_url.rstrip('/')
+        self.geo_url = geo_url.rstrip('/')
+        self.pool_config = pool_config or HTTPPoolConfig()
+        self._session = session
+        self._owns_session = session is None
+        self.latency = LatencyRecorder()
+        self.clock = clock or ServerClock(lambda: None, sync_interval=clock_sync_interval)
+        self._owns_clock = clock is None
+        self._clock_task: Optional[asyncio.Task] = None
+        self._sync_task: Optional[asyncio.Task] = None
+        self.rate_limiter = rate_limiter
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_config.pool_maxsize,
+                force_close=not self.pool_config.keep_alive,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._owns_session = True
+        return self._session
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        url: str,
+        retries: Optional[int] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Send a request and record its latency.
+
+        Idempotent GETs are retried up to pool_config.max_retries times on
+        connection errors and 502/503/504; signed POSTs are never retried.
+        Each attempt takes a rate_limiter token first. retries overrides the
+        retry count (clock samples use 0).
+
+        Returns:
+            Parsed JSON body, or text if the body is not JSON
+
+        Raises:
+            ValueError: If the response status is not OK
+        """
+        timeout = _client_timeout(self.pool_config.timeout_for(endpoint))
+        if retries is None:
+            retries = self.pool_config.max_retries if method == "GET" else 0
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(endpoint)
+            start = time.perf_counter()
+            ok = False
+            try:
+                async with self.session.request(method, url, timeout=timeout, **kwargs) as response:
+                    text = await response.text()
+                    ok = response.status < 400
+                    status = response.status
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt >= retries:
+                    raise
+                status = None
+            finally:
+                self.latency.record(endpoint, (time.perf_counter() - start) * 1000, ok)
+
+            if status in RETRY_STATUSES or status is None:
+                if attempt < retries:
+                    await asyncio.sleep(self.pool_config.backoff_factor * (2 ** attempt))
+                    attempt += 1
+                    continue
+
+            if not ok:
+                raise ValueError(f"HTTP {status}: {text}")
+
+            try:
+                return json.loads(text)
+            except ValueError:
+                return text
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-endpoint latency counters"""
+        return self.latency.snapshot()
+
+    def get_clock_stats(self) -> Dict[str, Any]:
+        """Get server clock offset / drift / staleness metrics"""
+        return self.clock.get_stats()
+
+    async def close(self):
+        """Stop clock sync and close the session if owned"""
+        if self._clock_task is not None:
+            self._clock_task.cancel()
+            self._clock_task = None
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            self._sync_task = None
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def health_check(self) -> str:
+        """Health check endpoint"""
+        url = f"{self.base_url}/api/health"
+        result = await self._request("GET", "health", url)
+        return str(result).strip()
+
+    async def get_region(self, retries: Optional[int] = None) -> RegionResponse:
+        """Get region and server time"""
+        url = f"{self.geo_url}/v1/region"
+        data = await self._request("GET", "region", url, retries=retries)
+        return RegionResponse(data)
+
+    async def sync_clock(self, samples_per_sync: Optional[int] = None) -> bool:
+        """
+        Measure server-time offset via get_region and update the clock.
+
+        Samples are not retried: a retried round-trip includes the backoff
+        and is useless as a sample.
+        """
+        samples = []
+        for _ in range(max(1, samples_per_sync or self.clock.samples_per_sync)):
+            sent_at = time.time()
+            mono0 = time.monotonic()
+            try:
+                region = await self.get_region(retries=0)
+            except Exception as e:
+                self.clock.record_error(e)
+                continue
+            rtt = time.monotonic() - mono0
+            if region.system_time is not None:
+                samples.append(self.clock.make_sample(float(region.system_time), sent_at, rtt))
+        return self.clock.apply(samples)
+
+    async def _clock_loop(self):
+        # 冷启动只做了单样本同步，先补一次完整同步
+        while True:
+            await self.sync_clock()
+            await asyncio.sleep(self.clock.sync_interval)
+
+    async def _ensure_clock_synced(self):
+        """
+        Sync once if the clock was never synced.
+
+        The cold-start sync is a single sample (bounded by the region
+        timeout); the full multi-sample sync runs in the background task.
+        Concurrent callers (e.g. a gathered grid placement) await the same sync,
+        so none of them signs with the unsynced fallback while it is in flight.
+        """
+        if self.clock.is_synced:
+            return
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.get_running_loop().create_task(self.sync_clock(1))
+        await asyncio.shield(self._sync_task)
+
+    async def start_clock_sync(self):
+        """Sync once (if needed) and start the background clock sync task"""
+        await self._ensure_clock_synced()
+        if self._clock_task is None:
+            self._clock_task = asyncio.get_running_loop().create_task(self._clock_loop())
+
+    @staticmethod
+    async def _sign_request(auth: Any, payload: str, request_id: str, timestamp: int) -> Dict[str, str]:
+        """请求签名：auth 提供 sign_request_async（例如多进程签名服务）时优先使用"""
+        sign_async = getattr(auth, "sign_request_async", None)
+        if inspect.iscoroutinefunction(sign_async):
+            return await sign_async(payload, request_id, timestamp)
+        return auth.sign_request(payload, request_id, timestamp)
+
+    async def _get_sign_timestamp(self) -> int:
+        """
+        获取用于签名的时间戳（与 /v1/region 的 systemTime 同单位）
+
+        自有时钟：首次调用时同步一次服务器时间并启动后台同步任务；
+        共享时钟：由调用 start_clock_sync() 的一方负责刷新，这里只在从未同步时补一次。
+        """
+        if self._owns_clock:
+            await self.start_clock_sync()
+        else:
+            await self._ensure_clock_synced()
+        return self.clock.timestamp()
+
+    async def query_balance(self, token: str) -> Dict[str, Any]:
+        """Query user balances, see StandXPerpHTTP.query_balance"""
+        url = f"{self.base_url}/api/query_balance"
+        headers = {"Authorization": f"Bearer {token}"}
+        return await self._request("GET", "query_balance", url, headers=headers)
+
+    async def place_order(
+        self,
+        token: str,
+        symbol: str,
+        side: str,
+        order_type: str,
+        qty: str,
+        time_in_force: str,
+        reduce_only: bool,
+        price: Optional[str] = None,
+        cl_ord_id: Optional[str] = None,
+        margin_mode: Optional[str] = None,
+        leverage: Optional[int] = None,
+        session_id: Optional[str] = None,
+        auth: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """Create new order, see StandXPerpHTTP.place_order"""
+        url = f"{self.base_url}/api/new_order"
+        payload = {
+            "symbol": symbol,
+            "side": side,
+            "order_type": order_type,
+            "qty": qty,
+            "time_in_force": time_in_force,
+            "reduce_only": reduce_only
+        }
+
+        if price is not None:
+            payload["price"] = price
+        if cl_ord_id is not None:
+            payload["cl_ord_id"] = cl_ord_id
+        if margin_mode is not None:
+            payload["margin_mode"] = margin_mode
+        if leverage is not None:
+            payload["leverage"] = leverage
+
+        payload_str = json.dumps(payload)
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {token}"
+        }
+
+        if session_id:
+            headers["x-session-id"] = session_id
+
+        if not auth:
+            raise ValueError("StandXAuth instance is required for request signing")
+
+        request_id = str(uuid.uuid4())
+        timestamp = await self._get_sign_timestamp()
+        headers.update(await self._sign_request(auth, payload_str, request_id, timestamp))
+
+        return await self._request("POST", "new_order", url, headers=headers, data=payload_str)
+
+    async def query_positions(
+        self,
+        token: str,
+        symbol: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Query user positions, see StandXPerpHTTP.query_positions"""
+        url = f"{self.base_url}/api/query_positions"
+        headers = {"Authorization": f"Bearer {token}"}
+        params = {}
+        if symbol:
+            params["symbol"] = symbol
+        return await self._request("GET", "query_positions", url, headers=headers, params=params)
+
+    async def query_symbol_price(self, symbol: str) -> Dict[str, Any]:
+        """Query symbol price, see StandXPerpHTTP.query_symbol_price"""
+        url = f"{self.base_url}/api/query_symbol_price"
+        return await self._request("GET", "query_symbol_price", url, params={"symbol": symbol})
+
+    async def query_open_orders(
+        self,
+        token: str,
+        symbol: Optional[str] = None,
+        limit: int = 500
+    ) -> Dict[str, Any]:
+        """Query user all open orders, see StandXPerpHTTP.query_open_orders"""
+        url = f"{self.base_url}/api/query_open_orders"
+        headers = {"Authorization": f"Bearer {token}"}
+        params = {}
+        if symbol:
+            params["symbol"] = symbol
+        if limit:
+            params["limit"] = limit
+        return await self._request("GET", "query_open_orders", url, headers=headers, params=params)
+
+    async def cancel_orders(
+        self,
+        token: str,
+        order_id_list: Optional[List[int]] = None,
+        cl_ord_id_list: Optional[List[str]] = None,
+        auth: Optional[Any] = None
+    ) -> List[Any]:
+        """Cancel multiple orders, see StandXPerpHTTP.cancel_orders"""
+        if not order_id_list and not cl_ord_id_list:
+            raise ValueError("At least one of order_id_list or cl_ord_id_list is required")
+
+        url = f"{self.base_url}/api/cancel_orders"
+        payload = {}
+        if order_id_list:
+            payload["order_id_list"] = order_id_list
+        if cl_ord_id_list:
+            payload["cl_ord_id_list"] = cl_ord_id_list
+
+        payload_str = json.dumps(payload)
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {token}"
+        }
+
+        if not auth:
+            raise ValueError("StandXAuth instance is required for request signing")
+
+        request_id = str(uuid.uuid4())
+        timestamp = await self._get_sign_timestamp()
+        headers.update(await self._sign_request(auth, payload_str, request_id, timestamp))
+
+        return await self._request("POST", "cancel_orders", url, headers=headers, data=payload_str)
@@ -0,0 +1,274 @@
+"""
+StandX server clock synchronisation
+
+Measures the offset between the local clock and StandX server time in the
+background (NTP style: server time is compared against the midpoint of the
+request round-trip) and serves signing timestamps locally, so signed requests
+no longer need a geo round-trip each.
+"""
+import threading
+import time
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+
+class ClockSample:
+    """Single offset measurement"""
+    def __init__(self, offset: float, rtt: float, measured_at: float):
+        self.offset = offset
+        self.rtt = rtt
+        self.measured_at = measured_at
+
+
+class ServerClock:
+    """
+    Cached server-time offset refreshed by a background thread.
+
+    Timestamps are derived from the local monotonic clock anchored to wall
+    time at the last sync, plus the measured offset, so they are immune to
+    local wall-clock jumps between syncs.
+
+    The offset is kept in seconds; signing timestamps are served in the unit
+    the server reports (seconds or milliseconds), exactly like signing the
+    raw /v1/region systemTime.
+    """
+    def __init__(
+        self,
+        fetch_server_time: Callable[[], Optional[float]],
+        sync_interval: float = 60.0,
+        max_age: float = 300.0,
+        samples_per_sync: int = 3,
+        history_size: int = 8,
+    ):
+        """
+        Initialize ServerClock.
+
+        Args:
+            fetch_server_time: Callable returning server time in the server's
+                own unit (e.g. RegionResponse.system_time, seconds or
+                milliseconds), or None if unavailable
+            sync_interval: Seconds between background syncs
+            max_age: Offset older than this (seconds) is reported as stale
+            samples_per_sync: Round-trips per sync; the lowest-RTT sample wins
+            history_size: Number of accepted samples kept for drift metrics
+        """
+        self._fetch_server_time = fetch_server_time
+        self.sync_interval = sync_interval
+        self.max_age = max_age
+        self.samples_per_sync = max(1, samples_per_sync)
+        self.history_size = max(2, history_size)
+
+        self._lock = threading.Lock()
+        self._offset: Optional[float] = None
+        # server time units per second: 1 (seconds) or 1000 (milliseconds)
+        self._unit = 1.0
+        self._rtt: Optional[float] = None
+        self._wall_anchor = time.time()
+        self._mono_anchor = time.monotonic()
+        self._last_sync_mono: Optional[float] = None
+        self._history: List[ClockSample] = []
+        self._sync_count = 0
+        self._failure_count = 0
+        self._last_error: Optional[str] = None
+
+        self._stop_event = threading.Event()
+        self._start_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _unit_of(server_time: float) -> float:
+        # 毫秒时间戳（> 1e11）按每秒 1000 个单位换算
+        return 1000.0 if server_time > 1e11 else 1.0
+
+    def make_sample(self, server_time: float, sent_at: float, rtt: float) -> Tuple[float, float]:
+        """
+        Build an (offset, rtt) sample from one round-trip.
+
+        The unit of server_time is remembered so timestamp() signs in it.
+
+        Args:
+            server_time: Server time returned by the request (seconds or ms)
+            sent_at: Local wall time when the request was sent
+            rtt: Round-trip time in seconds
+
+        Returns:
+            (offset, rtt) in seconds
+        """
+        server_time = float(server_time)
+        unit = self._unit_of(server_time)
+        self._unit = unit
+        midpoint = sent_at + rtt / 2.0
+        return server_time / unit - midpoint, rtt
+
+    def _measure(self) -> Optional[Tuple[float, float]]:
+        """Take one (offset, rtt) measurement"""
+        t0 = time.time()
+        mono0 = time.monotonic()
+        server_time = self._fetch_server_time()
+        rtt = time.monotonic() - mono0
+        if server_time is None:
+            return None
+        return self.make_sample(server_time, t0, rtt)
+
+    def record_error(self, error: Exception):
+        self._last_error = f"{type(error).__name__}: {error}"
+
+    def sync(self, samples_per_sync: Optional[int] = None) -> bool:
+        """
+        Measure the offset now (blocking).
+
+        Args:
+            samples_per_sync: Round-trips for this sync only
+                (default: self.samples_per_sync)
+
+        Returns:
+            bool: True if at least one sample succeeded
+        """
+        samples = []
+        for _ in range(max(1, samples_per_sync or self.samples_per_sync)):
+            try:
+                sample = self._measure()
+            except Exception as e:
+                self.record_error(e)
+                continue
+            if sample is not None:
+                samples.append(sample)
+        return self.apply(samples)
+
+    def apply(self, samples: List[Tuple[float, float]]) -> bool:
+        """
+        Accept the lowest-RTT sample of one sync round.
+
+        Used directly by clients that measure asynchronously.
+
+        Returns:
+            bool: True if a sample was accepted
+        """
+        with self._lock:
+            if not samples:
+                self._failure_count += 1
+                return False
+
+            offset, rtt = min(samples, key=lambda sample: sample[1])
+            now_mono = time.monotonic()
+            self._wall_anchor = time.time()
+            self._mono_anchor = now_mono
+            self._offset = offset
+            self._rtt = rtt
+            self._last_sync_mono = now_mono
+            self._sync_count += 1
+            self._last_error = None
+            self._history.append(ClockSample(offset, rtt, now_mono))
+            if len(self._history) > self.history_size:
+                self._history.pop(0)
+            return True
+
+    def now(self) -> float:
+        """
+        Estimated server time in seconds (float).
+
+        Falls back to local wall time when no sync has succeeded yet.
+        """
+        with self._lock:
+            if self._offset is None:
+                return time.time()
+            return self._wall_anchor + (time.monotonic() - self._mono_anchor) + self._offset
+
+    def timestamp(self) -> int:
+        """
+        Signing timestamp in the server's unit (whole seconds or milliseconds,
+        as returned by /v1/region); local seconds before the first sync.
+        """
+        if self._offset is None:
+            return int(time.time())
+        return int(self.now() * self._unit)
+
+    @property
+    def is_synced(self) -> bool:
+        return self._offset is not None
+
+    @property
+    def is_stale(self) -> bool:
+        age = self.age()
+        return age is None or age > self.max_age
+
+    def age(self) -> Optional[float]:
+        """Seconds since the last successful sync, None if never synced"""
+        if self._last_sync_mono is None:
+            return None
+        return time.monotonic() - self._last_sync_mono
+
+    def drift(self) -> Optional[float]:
+        """
+        Offset drift rate in seconds per hour, estimated from the oldest and
+        newest samples in history. None until two samples exist.
+        """
+        with self._lock:
+            if len(self._history) < 2:
+                return None
+            first, last = self._history[0], self._history[-1]
+            elapsed = last.measured_at - first.measured_at
+            if elapsed <= 0:
+                return None
+            return (last.offset - first.offset) / elapsed * 3600.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get clock metrics.
+
+        Returns:
+            Dictionary with offset_ms, rtt_ms, age_s, stale, drift_s_per_hour,
+            sync_count, failure_count and last_error
+        """
+        age = self.age()
+        drift = self.drift()
+        return {
+            "offset_ms": round(self._offset * 1000, 3) if self._offset is not None else None,
+            "rtt_ms": round(self._rtt * 1000, 3) if self._rtt is not None else None,
+            "age_s": round(age, 3) if age is not None else None,
+            "stale": self.is_stale,
+            "drift_s_per_hour": round(drift, 6) if drift is not None else None,
+            "sync_count": self._sync_count,
+            "failure_count": self._failure_count,
+            "last_error": self._last_error,
+        }
+
+    def _run(self, first_delay: float):
+        delay = first_delay
+        while not self._stop_event.wait(delay):
+            self.sync()
+            delay = self.sync_interval
+
+    def start(self, initial_sync: bool = True, initial_samples: Optional[int] = None) -> 'ServerClock':
+        """
+        Start background syncing.
+
+        Args:
+            initial_sync: Perform one blocking sync before returning
+            initial_samples: Round-trips for the blocking sync (default:
+                samples_per_sync). With fewer, the background thread runs a
+                full sync right away instead of after sync_interval, so a
+                caller on the hot path only waits for one short attempt
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            first_delay = self.sync_interval
+            if initial_sync:
+                self.sync(initial_samples)
+                if initial_samples is not None and initial_samples < self.samples_per_sync:
+                    first_delay = 0.0
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(first_delay,), name="standx-clock-sync", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop background syncing"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
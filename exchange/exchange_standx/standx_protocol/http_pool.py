@@ -0,0 +1,167 @@
+"""
+StandX HTTP connection pool and per-endpoint latency statistics
+"""
+import threading
+from typing import Dict, Any, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+# 幂等请求遇到这些状态码时重试
+RETRY_STATUSES = (502, 503, 504)
+
+# 各接口默认超时（秒），未列出的接口使用 HTTPPoolConfig.default_timeout
+DEFAULT_ENDPOINT_TIMEOUTS: Dict[str, Timeout] = {
+    "region": 1.0,
+    "health": 3.0,
+    "query_symbol_price": 3.0,
+    "new_order": 5.0,
+    "cancel_orders": 5.0,
+}
+
+
+class HTTPPoolConfig:
+    """Connection pool configuration for StandXPerpHTTP"""
+    def __init__(
+        self,
+        pool_connections: int = 4,
+        pool_maxsize: int = 16,
+        keep_alive: bool = True,
+        default_timeout: Timeout = 10.0,
+        endpoint_timeouts: Optional[Dict[str, Timeout]] = None,
+        max_retries: int = 2,
+        backoff_factor: float = 0.1,
+        pool_block: bool = False,
+    ):
+        """
+        Initialize pool configuration.
+
+        Args:
+            pool_connections: Number of host pools to cache (one per host)
+            pool_maxsize: Max keep-alive connections kept per host
+            keep_alive: Reuse TCP/TLS connections between calls
+            default_timeout: Timeout for endpoints without an explicit entry,
+                either seconds or a (connect, read) tuple
+            endpoint_timeouts: Per-endpoint timeout overrides, keyed by endpoint
+                name (e.g. "new_order", "query_open_orders", "region")
+            max_retries: Retry budget per request; only applied to idempotent
+                methods (GET), signed POSTs are never retried automatically.
+                Retries are made by the clients, each attempt takes its own
+                rate-limiter token
+            backoff_factor: Exponential backoff factor between retries
+            pool_block: Block when the pool is exhausted instead of opening
+                extra throw-away connections
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.default_timeout = default_timeout
+        self.endpoint_timeouts = dict(DEFAULT_ENDPOINT_TIMEOUTS)
+        if endpoint_timeouts:
+            self.endpoint_timeouts.update(endpoint_timeouts)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.pool_block = pool_block
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> 'HTTPPoolConfig':
+        """Create config from a plain dict (e.g. the `http` section of config.yaml)"""
+        if not data:
+            return cls()
+        allowed = {
+            "pool_connections", "pool_maxsize", "keep_alive", "default_timeout",
+            "endpoint_timeouts", "max_retries", "backoff_factor", "pool_block",
+        }
+        return cls(**{k: v for k, v in data.items() if k in allowed})
+
+    def timeout_for(self, endpoint: str) -> Timeout:
+        """Return timeout for the given endpoint name"""
+        return self.endpoint_timeouts.get(endpoint, self.default_timeout)
+
+
+def create_session(config: Optional[HTTPPoolConfig] = None) -> requests.Session:
+    """
+    Create a requests.Session backed by a keep-alive connection pool.
+
+    The session can be shared by several StandXPerpHTTP instances (e.g. many
+    accounts in one process) so they all reuse the same TCP+TLS connections.
+    The session itself never retries: StandXPerpHTTP retries GETs per
+    config.max_retries so every attempt passes through its rate limiter.
+    """
+    config = config or HTTPPoolConfig()
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        max_retries=Retry(total=0, read=False, raise_on_status=False),
+        pool_block=config.pool_block,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive" if config.keep_alive else "close"
+    return session
+
+
+class EndpointStats:
+    """Latency counters for a single endpoint"""
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.min_ms: Optional[float] = None
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def record(self, elapsed_ms: float, ok: bool):
+        self.count += 1
+        if not ok:
+            self.errors += 1
+        self.total_ms += elapsed_ms
+        self.last_ms = elapsed_ms
+        if self.min_ms is None or elapsed_ms < self.min_ms:
+            self.min_ms = elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.avg_ms, 3),
+            "min_ms": round(self.min_ms, 3) if self.min_ms is not None else None,
+            "max_ms": round(self.max_ms, 3),
+            "last_ms": round(self.last_ms, 3),
+        }
+
+
+class LatencyRecorder:
+    """Thread-safe per-endpoint latency counters"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, EndpointStats] = {}
+
+    def record(self, endpoint: str, elapsed_ms: float, ok: bool = True):
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = self._stats[endpoint] = EndpointStats()
+            stats.record(elapsed_ms, ok)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return a copy of all counters as plain dicts"""
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._stats.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
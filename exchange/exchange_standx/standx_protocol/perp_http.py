@@ -7,6 +7,9 @@ import json
 import time
 import uuid
 
+from .http_pool import RETRY_STATUSES, HTTPPoolConfig, LatencyRecorder, create_session
+from .clock_sync import ServerClock
+
 
 class RegionResponse:
     """Region and server time response"""
@@ -18,16 +21,122 @@ class RegionResponse:
 class StandXPerpHTTP:
     """StandX Perps HTTP API Client"""
     
-    def __init__(self, base_url: str = "https://perps.standx.com", geo_url: str = "https://geo.standx.com"):
+    def __init__(
+        self,
+        base_url: str = "https://perps.standx.com",
+        geo_url: str = "https://geo.standx.com",
+        pool_config: Optional[HTTPPoolConfig] = None,
+        session: Optional[requests.Session] = None,
+        clock_sync_interval: float = 60.0,
+        clock: Optional[ServerClock] = None,
+        rate_limiter: Optional[Any] = None
+    ):
         """
         Initialize StandX Perps HTTP client.
         
         Args:
             base_url: Base URL for perps API (default: https://perps.standx.com)
             geo_url: Base URL for geo API (default: https://geo.standx.com)
+            pool_config: Connection pool / timeout / retry configuration
+            session: Existing pooled session to share between clients
+                (default: a new session built from pool_config)
+            clock_sync_interval: Seconds between background server-time syncs
+            clock: Existing ServerClock to share between clients
+                (default: a new clock syncing against get_region)
+            rate_limiter: Limiter shared between clients / processes
+                (e.g. ratelimit.RateLimiter); every request first waits
+                for rate_limiter.acquire(endpoint). Default: no limiting
         """
         self.base_url = base_url.rstrip('/')
         self.geo_url = geo_url.rstrip('/')
+        self.pool_config = pool_config or HTTPPoolConfig()
+        self.session = session or create_session(self.pool_config)
+        self.latency = LatencyRecorder()
+        self.clock = clock or ServerClock(self._fetch_server_time, sync_interval=clock_sync_interval)
+        self.rate_limiter = rate_limiter
+    
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        url: str,
+        retries: Optional[int] = None,
+        **kwargs
+    ) -> requests.Response:
+        """
+        Send a request through the pooled session and record its latency.
+        
+        Idempotent GETs are retried up to pool_config.max_retries times on
+        connection errors / timeouts and 502/503/504; signed POSTs are never
+        retried. Each attempt takes a rate_limiter token first.
+        
+        Args:
+            method: HTTP method ("GET" or "POST")
+            endpoint: Endpoint name used for timeouts and latency counters
+            url: Full request URL
+            retries: Override the retry count (e.g. 0 for clock samples,
+                where a retried round-trip is worthless)
+            **kwargs: Extra arguments passed to requests.Session.request
+            
+        Returns:
+            requests.Response
+            
+        Raises:
+            ValueError: If the response status is not OK
+        """
+        kwargs.setdefault("timeout", self.pool_config.timeout_for(endpoint))
+        if retries is None:
+            retries = self.pool_config.max_retries if method == "GET" else 0
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(endpoint)
+            start = time.perf_counter()
+            ok = False
+            response = None
+            try:
+                response = self.session.request(method, url, **kwargs)
+                ok = response.ok
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= retries:
+                    raise
+            finally:
+                self.latency.record(endpoint, (time.perf_counter() - start) * 1000, ok)
+            
+            if response is None or response.status_code in RETRY_STATUSES:
+                if attempt < retries:
+                    time.sleep(self.pool_config.backoff_factor * (2 ** attempt))
+                    attempt += 1
+                    continue
+            
+            if not ok:
+                raise ValueError(f"HTTP {response.status_code}: {response.text}")
+            
+            return response
+    
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-endpoint latency counters.
+        
+        Returns:
+            Dictionary keyed by endpoint name with count, errors,
+            avg_ms, min_ms, max_ms and last_ms
+        """
+        return self.latency.snapshot()
+    
+    def get_clock_stats(self) -> Dict[str, Any]:
+        """
+        Get server clock offset / drift / staleness metrics.
+        
+        Returns:
+            Dictionary from ServerClock.get_stats()
+        """
+        return self.clock.get_stats()
+    
+    def close(self):
+        """Stop clock sync and close pooled connections"""
+        self.clock.stop()
+        self.session.close()
     
     def health_check(self) -> str:
         """
@@ -40,17 +149,17 @@ class StandXPerpHTTP:
             ValueError: If request fails
         """
         url = f"{self.base_url}/api/health"
-        response = requests.get(url)
-        
-        if not response.ok:
-            raise ValueError(f"HTTP {response.status_code}: {response.text}")
+        response = self._request("GET", "health", url)
         
         return response.text.strip()
     
-    def get_region(self) -> RegionResponse:
+    def get_region(self, retries: Optional[int] = None) -> RegionResponse:
         """
         Get region and server time.
         
+        Args:
+            retries: Override the GET retry count (clock samples use 0)
+        
         Returns:
             RegionResponse object with systemTime and region
             
@@ -58,31 +167,34 @@ class StandXPerpHTTP:
             ValueError: If request fails
         """
         url = f"{self.geo_url}/v1/region"
-        # 增加超时时间，防止网络问题导致长时间阻塞
-        response = requests.get(url, timeout=1.0)
-        
-        if not response.ok:
-            raise ValueError(f"HTTP {response.status_code}: {response.text}")
+        # 超时见 HTTPPoolConfig（默认 1 秒），防止网络问题导致长时间阻塞
+        response = self._request("GET", "region", url, retries=retries)
         
         data = response.json()
         region = RegionResponse(data)
         return region
 
+    def _fetch_server_time(self) -> Optional[float]:
+        """
+        ServerClock 的取时回调：返回服务器时间（systemTime 原始单位），失败返回 None
+
+        不重试：重试后的往返时间包含退避等待，样本本身无效，直接交给下一次采样
+        """
+        region = self.get_region(retries=0)
+        if region.system_time is None:
+            return None
+        return float(region.system_time)
+    
     def _get_sign_timestamp(self) -> int:
         """
-        获取用于签名的时间戳（秒）
+        获取用于签名的时间戳（与 /v1/region 的 systemTime 同单位）
         
-        优先使用服务器时间；如果无法获取服务器时间，则回退到本地时间。
+        使用后台同步的服务器时间偏移（本地单调时钟 + 偏移），不再每次请求 geo 接口；
+        首次调用时只阻塞一次单样本同步（region 超时内），完整的多样本同步交给后台线程立即执行。
+        若从未同步成功，则回退到本地时间。
         """
-        try:
-            region = self.get_region()
-            if region.system_time is not None:
-                return int(region.system_time)
-        except Exception:
-            pass
-        
-        # 回退：使用本地时间（秒）
-        return int(time.time())
+        self.clock.start(initial_samples=1)
+        return self.clock.timestamp()
     
     def query_balance(
         self,
@@ -116,10 +228,7 @@ class StandXPerpHTTP:
             "Authorization": f"Bearer {token}"
         }
         
-        response = requests.get(url, headers=headers)
-        
-        if not response.ok:
-            raise ValueError(f"HTTP {response.status_code}: {response.text}")
+        response = self._request("GET", "query_balance", url, headers=headers)
         
         return response.json()
     
@@ -202,10 +311,7 @@ class StandXPerpHTTP:
         sign_headers = auth.sign_request(payload_str, request_id, timestamp)
         headers.update(sign_headers)
         
-        response = requests.post(url, headers=headers, data=payload_str)
-        
-        if not response.ok:
-            raise ValueError(f"HTTP {response.status_code}: {response.text}")
+        response = self._request("POST", "new_order", url, headers=headers, data=payload_str)
         
         return response.json()
     
@@ -246,10 +352,7 @@ class StandXPerpHTTP:
         if symbol:
             params["symbol"] = symbol
         
-        response = requests.get(url, headers=headers, params=params)
-        
-        if not response.ok:
-            raise ValueError(f"HTTP {response.status_code}: {response.text}")
+        response = self._request("GET", "query_positions", url, headers=headers, params=params)
         
         return response.json()
     
@@ -282,10 +385,7 @@ class StandXPerpHTTP:
         url = f"{self.base_url}/api/query_symbol_price"
         params = {"symbol": symbol}
         
-        response = requests.get(url, params=params)
-        
-        if not response.ok:
-            raise ValueError(f"HTTP {response.status_code}: {response.text}")
+        response = self._request("GET", "query_symbol_price", url, params=params)
         
         return response.json()
     
@@ -323,10 +423,7 @@ class StandXPerpHTTP:
         if limit:
             params["limit"] = limit
         
-        response = requests.get(url, headers=headers, params=params)
-        
-        if not response.ok:
-            raise ValueError(f"HTTP {response.status_code}: {response.text}")
+        response = self._request("GET", "query_open_orders", url, headers=headers, params=params)
         
         return response.json()
     
@@ -379,53 +476,6 @@ class StandXPerpHTTP:
         sign_headers = auth.sign_request(payload_str, request_id, timestamp)
         headers.update(sign_headers)
         
-        response = requests.post(url, headers=headers, data=payload_str)
-        
-        if not response.ok:
-            raise ValueError(f"HTTP {response.status_code}: {response.text}")
-        
-        return response.json()
-    
-    def query_positions(
-        self,
-        token: str,
-        symbol: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
-        """
-        Query user positions.
-        
-        Args:
-            token: Authentication token
-            symbol: Trading pair (optional, e.g., "BTC-USD")
-            
-        Returns:
-            List of position dictionaries with fields:
-            - id: Position ID
-            - symbol: Trading pair
-            - qty: Position quantity (positive for long, negative for short)
-            - entry_price: Entry price
-            - mark_price: Mark price
-            - upnl: Unrealized PnL
-            - leverage: Leverage
-            - margin_mode: Margin mode ("isolated" or "cross")
-            - status: Position status ("open" or "closed")
-            - and other fields...
-            
-        Raises:
-            ValueError: If request fails
-        """
-        url = f"{self.base_url}/api/query_positions"
-        headers = {
-            "Authorization": f"Bearer {token}"
-        }
-        
-        params = {}
-        if symbol:
-            params["symbol"] = symbol
-        
-        response = requests.get(url, headers=headers, params=params)
-        
-        if not response.ok:
-            raise ValueError(f"HTTP {response.status_code}: {response.text}")
+        response = self._request("POST", "cancel_orders", url, headers=headers, data=payload_str)
         
         return response.json()
@@ -0,0 +1,225 @@
+"""
+StandX Perps WebSocket stream client (aiohttp)
+
+Market channels (price / depth_book / public_trade) are subscribed per
+symbol; user channels (order / position / balance / trade) are enabled by
+authenticating with the JWT token from StandXAuth:
+
+    -> {"subscribe": {"channel": "price", "symbol": "BTC-USD"}}
+    -> {"auth": {"token": "<jwt>", "streams": [{"channel": "order"}, ...]}}
+    <- {"seq": 12, "channel": "order", "symbol": "BTC-USD", "data": {...}}
+
+The client reconnects with exponential backoff, sends WebSocket pings
+every `heartbeat` seconds, treats a connection with no traffic for
+`stale_timeout` seconds as dead, and replays auth + every subscription
+after each reconnect.
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+import asyncio
+import json
+import time
+
+import aiohttp
+
+
+DEFAULT_STREAM_URL = "wss://perps.standx.com/ws-stream/v1"
+USER_CHANNELS = ("order", "position", "balance", "trade")
+
+MessageCallback = Callable[[Dict[str, Any]], Union[None, Awaitable[None]]]
+
+
+class StandXPerpWS:
+    """StandX Perps WebSocket stream client"""
+
+    def __init__(
+        self,
+        url: str = DEFAULT_STREAM_URL,
+        heartbeat: float = 15.0,
+        stale_timeout: float = 30.0,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+        session: Optional[aiohttp.ClientSession] = None
+    ):
+        """
+        Initialize StandX WebSocket client.
+
+        Args:
+            url: Stream endpoint (default: wss://perps.standx.com/ws-stream/v1)
+            heartbeat: Seconds between WebSocket pings; the connection is
+                closed if a pong is not received in time
+            stale_timeout: Reconnect if no message arrives for this many seconds
+            reconnect_delay: Initial reconnect backoff in seconds
+            max_reconnect_delay: Maximum reconnect backoff in seconds
+            session: Existing aiohttp session to share (created lazily otherwise)
+        """
+        self.url = url
+        self.heartbeat = heartbeat
+        self.stale_timeout = stale_timeout
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._session = session
+        self._owns_session = session is None
+
+        self._subscriptions: List[Tuple[str, Optional[str]]] = []
+        self._auth: Optional[Dict[str, Any]] = None
+        self._callbacks: Dict[str, List[MessageCallback]] = {}
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._connected = asyncio.Event()
+
+        self.connect_count = 0
+        self.message_count = 0
+        self.last_message_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    # ---------- subscriptions ----------
+
+    def on(self, channel: str, callback: MessageCallback):
+        """
+        Register a callback for a channel ("*" receives every message).
+
+        Callbacks receive the decoded message dict and may be coroutines.
+        """
+        self._callbacks.setdefault(channel, []).append(callback)
+
+    async def subscribe(self, channel: str, symbol: Optional[str] = None):
+        """Subscribe to a market channel; replayed after every reconnect"""
+        key = (channel, symbol)
+        if key not in self._subscriptions:
+            self._subscriptions.append(key)
+        await self._send_if_connected(self._subscribe_message(channel, symbol))
+
+    async def authenticate(self, token: str, streams: Optional[List[str]] = None):
+        """Enable user channels with a JWT token; replayed after every reconnect"""
+        self._auth = {
+            "token": token,
+            "streams": [{"channel": c} for c in (streams or USER_CHANNELS)],
+        }
+        await self._send_if_connected({"auth": self._auth})
+
+    @staticmethod
+    def _subscribe_message(channel: str, symbol: Optional[str]) -> Dict[str, Any]:
+        params = {"channel": channel}
+        if symbol is not None:
+            params["symbol"] = symbol
+        return {"subscribe": params}
+
+    async def _send_if_connected(self, message: Dict[str, Any]):
+        ws = self._ws
+        if ws is not None and not ws.closed:
+            await ws.send_str(json.dumps(message))
+
+    # ---------- connection ----------
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+            self._owns_session = True
+        return self._session
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None and not self._ws.closed
+
+    async def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the stream is connected (and subscriptions were sent)"""
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _dispatch(self, message: Dict[str, Any]):
+        channel = message.get("channel")
+        for callback in self._callbacks.get(channel, []) + self._callbacks.get("*", []):
+            try:
+                result = callback(message)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                self.last_error = f"callback {channel}: {e}"
+
+    async def _session_once(self):
+        """Connect, replay auth / subscriptions and pump messages until the socket drops"""
+        async with self.session.ws_connect(self.url, heartbeat=self.heartbeat) as ws:
+            self._ws = ws
+            self.connect_count += 1
+            if self._auth is not None:
+                await ws.send_str(json.dumps({"auth": self._auth}))
+            for channel, symbol in self._subscriptions:
+                await ws.send_str(json.dumps(self._subscribe_message(channel, symbol)))
+            self._connected.set()
+
+            while not self._closing:
+                msg = await ws.receive(timeout=self.stale_timeout)
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    try:
+                        message = json.loads(msg.data)
+                    except ValueError:
+                        continue
+                    self.message_count += 1
+                    self.last_message_at = time.time()
+                    await self._dispatch(message)
+                elif msg.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSED,
+                                  aiohttp.WSMsgType.CLOSING, aiohttp.WSMsgType.ERROR):
+                    break
+
+    async def run(self):
+        """Run the stream until close() is called, reconnecting on any failure"""
+        delay = self.reconnect_delay
+        while not self._closing:
+            started = time.monotonic()
+            try:
+                await self._session_once()
+            except asyncio.CancelledError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+            finally:
+                self._ws = None
+                self._connected.clear()
+
+            if self._closing:
+                break
+            # a connection that stayed up for a while resets the backoff
+            if time.monotonic() - started > self.max_reconnect_delay:
+                delay = self.reconnect_delay
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def start(self) -> asyncio.Task:
+        """Start run() as a background task on the running loop"""
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._task = asyncio.get_running_loop().create_task(self.run())
+        return self._task
+
+    async def close(self):
+        """Stop the stream task and close the session if owned"""
+        self._closing = True
+        ws = self._ws
+        if ws is not None and not ws.closed:
+            await ws.close()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Connection / message counters"""
+        return {
+            "connected": self.connected,
+            "connect_count": self.connect_count,
+            "message_count": self.message_count,
+            "last_message_age": time.time() - self.last_message_at if self.last_message_at else None,
+            "subscriptions": len(self._subscriptions),
+            "authenticated": self._auth is not None,
+            "last_error": self.last_error,
+        }
@@ -44,12 +44,13 @@ class LoginResponse:
 class StandXAuth:
     """StandX Authentication Client"""
     
-    def __init__(self, private_key: Optional[bytes] = None):
+    def __init__(self, private_key: Optional[bytes] = None, base_url: str = "https://api.standx.com"):
         """
         Initialize StandXAuth instance.
         
         Args:
             private_key: Optional 32-byte private key. If None, generates a new key pair.
+            base_url: Base URL for auth API (default: https://api.standx.com)
         """
         if private_key:
             if len(private_key) != 32:
@@ -64,7 +65,7 @@ class StandXAuth:
             format=serialization.PublicFormat.Raw
         )
         self.request_id = base58.b58encode(self._public_key_bytes).decode('utf-8')
-        self.base_url = "https://api.standx.com"
+        self.base_url = base_url.rstrip('/')
     
     def authenticate(
         self,
@@ -233,6 +234,6 @@ class StandXAuth:
         )
     
     @classmethod
-    def from_private_key(cls, private_key: bytes) -> 'StandXAuth':
+    def from_private_key(cls, private_key: bytes, base_url: str = "https://api.standx.com") -> 'StandXAuth':
         """Create StandXAuth instance from private key bytes"""
-        return cls(private_key=private_key)
+        return cls(private_key=private_key, base_url=base_url)
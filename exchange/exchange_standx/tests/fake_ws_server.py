@@ -0,0 +1,76 @@
+"""本地 StandX WebSocket 假服务器（测试用）"""
+import asyncio
+import json
+
+from aiohttp import web
+
+
+class FakeStandXWSServer:
+    """
+    记录客户端发来的 auth / subscribe 消息，并可以向所有连接推送消息或主动断开
+
+    用法:
+        server = FakeStandXWSServer()
+        url = await server.start()
+        await server.push({"channel": "order", "data": {...}})
+        await server.drop_connections()
+        await server.stop()
+    """
+
+    def __init__(self):
+        self.received = []
+        self.connections = []
+        self.connect_count = 0
+        self._runner = None
+        self._new_connection = asyncio.Event()
+
+    async def _handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connect_count += 1
+        self.connections.append(ws)
+        self._new_connection.set()
+        try:
+            async for msg in ws:
+                self.received.append(json.loads(msg.data))
+        finally:
+            if ws in self.connections:
+                self.connections.remove(ws)
+        return ws
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get("/ws-stream/v1", self._handler)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/ws-stream/v1"
+
+    async def wait_connections(self, count: int, timeout: float = 5.0):
+        """等待累计连接数达到 count"""
+        async def wait():
+            while self.connect_count < count or not self.connections:
+                self._new_connection.clear()
+                await self._new_connection.wait()
+        await asyncio.wait_for(wait(), timeout)
+
+    async def wait_received(self, count: int, timeout: float = 5.0):
+        """等待累计收到 count 条客户端消息"""
+        async def wait():
+            while len(self.received) < count:
+                await asyncio.sleep(0.01)
+        await asyncio.wait_for(wait(), timeout)
+
+    async def push(self, message: dict):
+        for ws in list(self.connections):
+            await ws.send_str(json.dumps(message))
+
+    async def drop_connections(self):
+        for ws in list(self.connections):
+            await ws.close()
+
+    async def stop(self):
+        await self.drop_connections()
+        await self._runner.cleanup()
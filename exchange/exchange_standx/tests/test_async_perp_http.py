@@ -0,0 +1,207 @@
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from aiohttp import web
+
+from standx_protocol.async_perp_http import AsyncStandXPerpHTTP
+from standx_protocol.clock_sync import ServerClock
+from standx_protocol.http_pool import HTTPPoolConfig
+
+
+async def start_server(handlers):
+    app = web.Application()
+    for method, path, handler in handlers:
+        app.router.add_route(method, path, handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_signed_orders_run_concurrently():
+    async def scenario():
+        async def region(request):
+            return web.json_response({"systemTime": int(time.time()), "region": "jp"})
+
+        async def new_order(request):
+            await asyncio.sleep(0.1)
+            return web.json_response({"code": 0, "request_id": request.headers["x-request-id"]})
+
+        runner, url = await start_server([
+            ("GET", "/v1/region", region),
+            ("POST", "/api/new_order", new_order),
+        ])
+        auth = MagicMock()
+        auth.sign_request.side_effect = lambda payload, request_id, ts: {"x-request-id": request_id}
+        client = AsyncStandXPerpHTTP(base_url=url, geo_url=url)
+        try:
+            start = time.perf_counter()
+            results = await asyncio.gather(*(
+                client.place_order("token", "BTC-USD", "buy", "limit", "0.001", "gtc", False,
+                                   price=str(90000 + i), auth=auth)
+                for i in range(10)
+            ))
+            elapsed = time.perf_counter() - start
+        finally:
+            await client.close()
+            await runner.cleanup()
+        return results, elapsed, client
+
+    results, elapsed, client = asyncio.run(scenario())
+
+    assert all(result["code"] == 0 for result in results)
+    assert elapsed < 0.6
+    assert client.get_latency_stats()["new_order"]["count"] == 10
+    # 冷启动一次单样本同步（所有并发请求共享），后台任务随后补一次完整同步
+    assert client.get_clock_stats()["sync_count"] in (1, 2)
+
+
+def test_get_retries_and_post_errors():
+    calls = {"price": 0}
+    endpoints = []
+
+    class Limiter:
+        async def acquire_async(self, endpoint):
+            endpoints.append(endpoint)
+
+    async def scenario():
+        async def price(request):
+            calls["price"] += 1
+            if calls["price"] == 1:
+                return web.Response(status=503, text="busy")
+            return web.json_response({"symbol": "BTC-USD", "mark_price": "1"})
+
+        async def cancel(request):
+            return web.Response(status=400, text="bad")
+
+        runner, url = await start_server([
+            ("GET", "/api/query_symbol_price", price),
+            ("POST", "/api/cancel_orders", cancel),
+        ])
+        config = HTTPPoolConfig(max_retries=1, backoff_factor=0)
+        client = AsyncStandXPerpHTTP(base_url=url, geo_url=url, pool_config=config,
+                                     rate_limiter=Limiter())
+        try:
+            data = await client.query_symbol_price("BTC-USD")
+            with pytest.raises(ValueError, match="HTTP 400: bad"):
+                await client.cancel_orders("token", order_id_list=[1], auth=MagicMock(sign_request=lambda *a: {}))
+        finally:
+            await client.close()
+            await runner.cleanup()
+        return data
+
+    assert asyncio.run(scenario())["mark_price"] == "1"
+    assert calls["price"] == 2
+    # each retry attempt takes its own token (the signed POST also syncs the clock via region)
+    assert [e for e in endpoints if e != "region"] == [
+        "query_symbol_price", "query_symbol_price", "cancel_orders"
+    ]
+
+
+def test_async_sign_request_is_preferred():
+    class AsyncAuth:
+        def sign_request(self, payload, request_id, ts):
+            raise AssertionError("sync signing should not be used")
+
+        async def sign_request_async(self, payload, request_id, ts):
+            await asyncio.sleep(0)
+            return {"x-request-id": request_id, "x-request-signature": "pooled"}
+
+    async def scenario():
+        async def region(request):
+            return web.json_response({"systemTime": int(time.time()), "region": "jp"})
+
+        async def new_order(request):
+            return web.json_response({"code": 0, "signature": request.headers["x-request-signature"]})
+
+        runner, url = await start_server([
+            ("GET", "/v1/region", region),
+            ("POST", "/api/new_order", new_order),
+        ])
+        client = AsyncStandXPerpHTTP(base_url=url, geo_url=url)
+        try:
+            return await client.place_order("token", "BTC-USD", "buy", "limit", "0.001", "gtc", False,
+                                            price="90000", auth=AsyncAuth())
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    assert asyncio.run(scenario())["signature"] == "pooled"
+
+
+@pytest.mark.parametrize("shared_clock", [False, True])
+def test_concurrent_cold_start_signs_with_synced_clock(shared_clock):
+    timestamps = []
+
+    async def scenario():
+        async def region(request):
+            await asyncio.sleep(0.05)
+            return web.json_response({"systemTime": int(time.time() * 1000), "region": "jp"})
+
+        async def new_order(request):
+            return web.json_response({"code": 0})
+
+        runner, url = await start_server([
+            ("GET", "/v1/region", region),
+            ("POST", "/api/new_order", new_order),
+        ])
+        auth = MagicMock()
+        auth.sign_request.side_effect = lambda payload, request_id, ts: timestamps.append(ts) or {}
+        clock = ServerClock(lambda: None) if shared_clock else None
+        client = AsyncStandXPerpHTTP(base_url=url, geo_url=url, clock=clock)
+        try:
+            await asyncio.gather(*(
+                client.place_order("token", "BTC-USD", "buy", "limit", "0.001", "gtc", False,
+                                   price=str(90000 + i), auth=auth)
+                for i in range(5)
+            ))
+        finally:
+            await client.close()
+            await runner.cleanup()
+        return client
+
+    client = asyncio.run(scenario())
+
+    # 首次同步完成前到达的调用等待同一次同步，全部按 systemTime 的毫秒单位签名
+    assert len(timestamps) == 5
+    assert all(ts > 1e11 for ts in timestamps)
+    # 冷启动一次单样本同步（所有并发请求共享），后台任务随后补一次完整同步
+    assert client.get_clock_stats()["sync_count"] in (1, 2)
+
+
+def test_cold_start_sync_is_one_unretried_sample():
+    hits = {"region": 0}
+
+    async def scenario():
+        async def region(request):
+            hits["region"] += 1
+            return web.Response(status=503)
+
+        runner, url = await start_server([("GET", "/v1/region", region)])
+        client = AsyncStandXPerpHTTP(
+            base_url=url, geo_url=url, pool_config=HTTPPoolConfig(max_retries=2, backoff_factor=0.0)
+        )
+        client.clock.sync_interval = 3600.0
+        try:
+            before = int(time.time())
+            timestamp = await client._get_sign_timestamp()
+            cold_start_hits = hits["region"]
+            # 后台任务的完整同步同样不重试
+            for _ in range(100):
+                if client.get_clock_stats()["failure_count"] >= 2:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await client.close()
+            await runner.cleanup()
+        return before, timestamp, cold_start_hits, client
+
+    before, timestamp, cold_start_hits, client = asyncio.run(scenario())
+
+    assert cold_start_hits == 1
+    assert before <= timestamp <= int(time.time())
+    assert hits["region"] == 1 + client.clock.samples_per_sync
@@ -0,0 +1,121 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import requests
+
+from standx_protocol.clock_sync import ServerClock
+from standx_protocol.http_pool import HTTPPoolConfig
+from standx_protocol.perp_http import StandXPerpHTTP
+
+
+def test_offset_measured_from_rtt_midpoint():
+    clock = ServerClock(lambda: time.time() + 120.0, samples_per_sync=2)
+
+    assert not clock.is_synced
+    assert clock.sync()
+    assert clock.is_synced
+    assert abs(clock.now() - (time.time() + 120.0)) < 0.5
+    assert clock.timestamp() == int(clock.now())
+
+
+def test_millisecond_server_time_is_signed_in_milliseconds():
+    clock = ServerClock(lambda: (time.time() - 30.0) * 1000)
+    assert clock.timestamp() == int(time.time())
+    clock.sync()
+    assert abs(clock.get_stats()["offset_ms"] + 30_000) < 500
+    # signed exactly in the unit /v1/region reports, as int(systemTime) was
+    assert abs(clock.timestamp() - (time.time() - 30.0) * 1000) < 500
+
+
+def test_region_system_time_unit_is_kept():
+    now = time.time()
+    for unit in (1, 1000):
+        system_time = int(now * unit)
+        clock = ServerClock(lambda: system_time)
+        clock.sync()
+        # within one second of the server's value, in the server's unit
+        assert abs(clock.timestamp() - system_time) <= unit
+
+
+def test_failed_sync_falls_back_to_local_time():
+    def fetch():
+        raise ValueError("HTTP 503: unavailable")
+
+    clock = ServerClock(fetch, samples_per_sync=2)
+
+    assert not clock.sync()
+    assert abs(clock.now() - time.time()) < 0.1
+    stats = clock.get_stats()
+    assert stats["stale"]
+    assert stats["failure_count"] == 1
+    assert stats["last_error"] == "ValueError: HTTP 503: unavailable"
+
+
+def test_drift_and_staleness_metrics():
+    offsets = iter([0.0, 3.6])
+    clock = ServerClock(lambda: time.time() + next(offsets), samples_per_sync=1, max_age=60)
+
+    clock.sync()
+    assert clock.drift() is None
+    clock._history[0].measured_at -= 3600.0
+    clock.sync()
+
+    stats = clock.get_stats()
+    assert not stats["stale"]
+    assert stats["sync_count"] == 2
+    assert abs(stats["drift_s_per_hour"] - 3.6) < 0.1
+
+
+def test_signed_requests_do_not_hit_geo_each_time():
+    region = MagicMock(ok=True, status_code=200)
+    region.json.return_value = {"systemTime": int(time.time()), "region": "jp"}
+    order = MagicMock(ok=True, status_code=200)
+    order.json.return_value = {"code": 0}
+    session = MagicMock()
+    session.request.side_effect = lambda method, url, **kwargs: region if "region" in url else order
+    auth = MagicMock()
+    auth.sign_request.return_value = {}
+    client = StandXPerpHTTP(session=session)
+
+    for _ in range(5):
+        client.place_order("token", "BTC-USD", "buy", "limit", "0.001", "gtc", False, price="1", auth=auth)
+    # 冷启动单样本同步之后，后台线程立即补一次完整同步
+    deadline = time.monotonic() + 2.0
+    while client.get_clock_stats()["sync_count"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    client.close()
+
+    urls = [call.args[1] for call in session.request.call_args_list]
+    assert sum("region" in url for url in urls) == 1 + client.clock.samples_per_sync
+    assert sum("new_order" in url for url in urls) == 5
+
+
+def test_cold_start_sync_is_one_unretried_sample():
+    main_thread = threading.current_thread()
+    region_calls = []
+
+    def request(method, url, **kwargs):
+        if "region" in url:
+            region_calls.append(threading.current_thread() is main_thread)
+            raise requests.Timeout("geo unreachable")
+        raise AssertionError(url)
+
+    session = MagicMock()
+    session.request.side_effect = request
+    client = StandXPerpHTTP(session=session, pool_config=HTTPPoolConfig(max_retries=2, backoff_factor=0.0))
+    client.clock.sync_interval = 3600.0
+
+    before = int(time.time())
+    timestamp = client._get_sign_timestamp()
+    # 签名路径只等待一次不重试的采样，随后回退到本地时间
+    assert region_calls.count(True) == 1
+    assert before <= timestamp <= int(time.time())
+    assert not client.clock.is_synced
+
+    # 完整同步（同样不重试）由后台线程完成
+    deadline = time.monotonic() + 2.0
+    while client.get_clock_stats()["failure_count"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    client.close()
+    assert region_calls.count(False) == client.clock.samples_per_sync
@@ -0,0 +1,127 @@
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from standx_protocol.http_pool import HTTPPoolConfig, create_session
+from standx_protocol.perp_http import StandXPerpHTTP
+
+
+def mock_response(status_code: int = 200, json_data=None, text: str = "") -> MagicMock:
+    response = MagicMock()
+    response.status_code = status_code
+    response.ok = status_code < 400
+    response.json.return_value = json_data
+    response.text = text
+    return response
+
+
+def test_requests_share_pooled_session():
+    session = MagicMock()
+    session.request.return_value = mock_response(json_data={"mark_price": "1"})
+    client = StandXPerpHTTP(session=session)
+
+    client.query_symbol_price("BTC-USD")
+    client.query_balance("token")
+
+    assert session.request.call_count == 2
+    method, url = session.request.call_args_list[0].args
+    assert method == "GET"
+    assert url == "https://perps.standx.com/api/query_symbol_price"
+
+
+def test_endpoint_timeouts():
+    config = HTTPPoolConfig(
+        default_timeout=7.0, endpoint_timeouts={"query_open_orders": (1.0, 2.0)}
+    )
+    session = MagicMock()
+    session.request.return_value = mock_response(json_data={"result": []})
+    client = StandXPerpHTTP(pool_config=config, session=session)
+
+    client.query_open_orders("token", symbol="BTC-USD")
+    assert session.request.call_args.kwargs["timeout"] == (1.0, 2.0)
+
+    client.query_positions("token")
+    assert session.request.call_args.kwargs["timeout"] == 7.0
+
+    client.get_region()
+    assert session.request.call_args.kwargs["timeout"] == 1.0
+
+
+def test_latency_stats_recorded_per_endpoint():
+    session = MagicMock()
+    session.request.side_effect = [
+        mock_response(json_data={}),
+        mock_response(json_data={}),
+        mock_response(status_code=500, text="boom"),
+    ]
+    client = StandXPerpHTTP(session=session)
+
+    client.query_balance("token")
+    client.query_balance("token")
+    with pytest.raises(ValueError, match="HTTP 500: boom"):
+        client.query_symbol_price("BTC-USD")
+
+    stats = client.get_latency_stats()
+    assert stats["query_balance"]["count"] == 2
+    assert stats["query_balance"]["errors"] == 0
+    assert stats["query_symbol_price"]["count"] == 1
+    assert stats["query_symbol_price"]["errors"] == 1
+
+
+
+def test_rate_limiter_acquired_per_endpoint():
+    session = MagicMock()
+    session.request.return_value = mock_response(json_data={})
+    limiter = MagicMock()
+    client = StandXPerpHTTP(session=session, rate_limiter=limiter)
+
+    client.query_balance("token")
+    client.query_symbol_price("BTC-USD")
+
+    assert [call.args for call in limiter.acquire.call_args_list] == [
+        ("query_balance",),
+        ("query_symbol_price",),
+    ]
+
+def test_create_session_pool_config():
+    config = HTTPPoolConfig(pool_maxsize=32, max_retries=3, keep_alive=False)
+    session = create_session(config)
+
+    adapter = session.get_adapter("https://perps.standx.com")
+    assert isinstance(session, requests.Session)
+    assert adapter._pool_maxsize == 32
+    # retries are made by StandXPerpHTTP so that each attempt is rate limited
+    assert adapter.max_retries.total == 0
+    assert session.headers["Connection"] == "close"
+
+
+def test_get_retries_take_a_token_per_attempt_and_posts_are_not_retried():
+    session = MagicMock()
+    session.request.side_effect = [
+        mock_response(status_code=503, text="busy"),
+        requests.ConnectionError("reset"),
+        mock_response(json_data={"mark_price": "1"}),
+        mock_response(status_code=503, text="busy"),
+    ]
+    limiter = MagicMock()
+    config = HTTPPoolConfig(max_retries=2, backoff_factor=0)
+    client = StandXPerpHTTP(pool_config=config, session=session, rate_limiter=limiter)
+
+    assert client.query_symbol_price("BTC-USD")["mark_price"] == "1"
+    with pytest.raises(ValueError, match="HTTP 503: busy"):
+        client._request("POST", "cancel_orders", "https://perps.standx.com/api/cancel_orders")
+
+    assert [call.args for call in limiter.acquire.call_args_list] == [
+        ("query_symbol_price",),
+        ("query_symbol_price",),
+        ("query_symbol_price",),
+        ("cancel_orders",),
+    ]
+    assert client.get_latency_stats()["query_symbol_price"]["errors"] == 2
+
+
+def test_pool_config_from_dict_ignores_unknown_keys():
+    config = HTTPPoolConfig.from_dict({"pool_maxsize": 8, "unknown": 1})
+    assert config.pool_maxsize == 8
+    assert config.timeout_for("region") == 1.0
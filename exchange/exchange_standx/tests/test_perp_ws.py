@@ -0,0 +1,68 @@
+import asyncio
+
+from standx_protocol.perp_ws import StandXPerpWS
+from tests.fake_ws_server import FakeStandXWSServer
+
+
+def test_dispatch_and_resubscribe_after_reconnect():
+    async def scenario():
+        server = FakeStandXWSServer()
+        url = await server.start()
+        client = StandXPerpWS(url=url, reconnect_delay=0.05, heartbeat=5)
+        orders = []
+        client.on("order", orders.append)
+
+        async def on_price(message):
+            orders.append(("price", message["data"]["mark_price"]))
+        client.on("price", on_price)
+
+        await client.authenticate("jwt", streams=["order"])
+        await client.subscribe("price", "BTC-USD")
+        client.start()
+        try:
+            await server.wait_connections(1)
+            await server.wait_received(2)
+            await server.push({"channel": "order", "data": {"id": 1, "status": "filled"}})
+            await server.push({"channel": "price", "data": {"mark_price": "90000"}})
+            await asyncio.sleep(0.1)
+
+            await server.drop_connections()
+            await server.wait_connections(2)
+            await server.wait_received(4)
+            await server.push({"channel": "order", "data": {"id": 2, "status": "new"}})
+            await asyncio.sleep(0.1)
+        finally:
+            await client.close()
+            await server.stop()
+        return server, client, orders
+
+    server, client, orders = asyncio.run(scenario())
+
+    assert server.received[:2] == [
+        {"auth": {"token": "jwt", "streams": [{"channel": "order"}]}},
+        {"subscribe": {"channel": "price", "symbol": "BTC-USD"}},
+    ]
+    assert server.received[2:4] == server.received[:2]
+    assert orders[0]["data"]["id"] == 1
+    assert orders[1] == ("price", "90000")
+    assert orders[2]["data"]["id"] == 2
+    assert client.get_stats()["connect_count"] == 2
+
+
+def test_stale_connection_is_replaced():
+    async def scenario():
+        server = FakeStandXWSServer()
+        url = await server.start()
+        client = StandXPerpWS(url=url, stale_timeout=0.2, reconnect_delay=0.05)
+        await client.subscribe("price", "ETH-USD")
+        client.start()
+        try:
+            await server.wait_connections(2)
+        finally:
+            await client.close()
+            await server.stop()
+        return client
+
+    client = asyncio.run(scenario())
+    assert client.connect_count >= 2
+    assert "TimeoutError" in client.last_error
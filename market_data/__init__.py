@@ -0,0 +1,17 @@
+"""
+Market Data Module
+行情分发模块：每个交易对的价格 / ADX 只请求一次，快照分发给所有订阅的策略
+"""
+from market_data.snapshot import MarketSnapshot
+from market_data.service import MarketDataService, standx_ticker_fetcher, binance_adx_fetcher
+from market_data.publisher import MarketDataPublisher, MarketDataClient, DEFAULT_ADDRESS
+
+__all__ = [
+    "MarketSnapshot",
+    "MarketDataService",
+    "MarketDataPublisher",
+    "MarketDataClient",
+    "DEFAULT_ADDRESS",
+    "standx_ticker_fetcher",
+    "binance_adx_fetcher",
+]
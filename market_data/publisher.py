@@ -0,0 +1,311 @@
+"""
+Market Data Publisher
+本地 socket 行情分发（跨进程）
+
+一个发布进程运行 MarketDataService，通过 Unix socket（Windows 下为本机 TCP）
+把每次快照更新推送给各账户进程。默认 socket 位于当前用户的私有目录（/tmp/standx-<uid>，0700），
+socket 文件权限 0600，其他用户无法订阅或冒充发布进程。协议为逐行 JSON：
+
+    client -> server: {"op": "subscribe", "symbols": ["BTC-USD"]}
+    server -> client: {"symbol": "BTC-USD", "ticker": {...}, "price_time": ..., ...}
+
+运行发布进程:
+    python -m market_data.publisher --symbols BTC-USD
+"""
+import argparse
+import json
+import os
+import queue
+import socket
+import socketserver
+import stat
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from market_data.snapshot import MarketSnapshot
+from market_data.service import MarketDataService, standx_ticker_fetcher, binance_adx_fetcher
+
+
+if hasattr(socket, "AF_UNIX") and os.name != "nt":
+    # 每个用户一个私有目录（0700），同一用户的进程无论从哪个会话启动都能找到同一路径
+    RUNTIME_DIR = os.path.join(tempfile.gettempdir(), f"standx-{os.getuid()}")
+    DEFAULT_ADDRESS = f"unix:{os.path.join(RUNTIME_DIR, 'standx_market_data.sock')}"
+else:
+    RUNTIME_DIR = None
+    DEFAULT_ADDRESS = "tcp:127.0.0.1:18765"
+
+
+def parse_address(address: str) -> Tuple[str, object]:
+    """
+    解析地址字符串
+
+    Args:
+        address: "unix:/path/to.sock" 或 "tcp:host:port"
+
+    Returns:
+        (family, addr)：("unix", path) 或 ("tcp", (host, port))
+    """
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    if address.startswith("tcp:"):
+        host, port = address[len("tcp:"):].rsplit(":", 1)
+        return "tcp", (host, int(port))
+    raise ValueError(f"无效的行情地址: {address}")
+
+
+def prepare_socket_path(path: str):
+    """
+    绑定 Unix socket 前的准备：创建所在目录（0700）并删除残留的 socket 文件
+
+    默认运行时目录必须属于当前用户，否则拒绝绑定（防止其他用户预先创建同名目录劫持 socket）。
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    if not os.path.isdir(directory):
+        os.makedirs(directory, mode=0o700)
+    elif RUNTIME_DIR is not None and directory == os.path.abspath(RUNTIME_DIR):
+        info = os.lstat(directory)
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+            raise PermissionError(f"运行时目录不属于当前用户: {directory}")
+        if info.st_mode & 0o077:
+            os.chmod(directory, 0o700)
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+def restrict_socket(path: str):
+    """socket 文件仅当前用户可连接（0600）"""
+    os.chmod(path, 0o600)
+
+
+class _SubscriberHandler(socketserver.StreamRequestHandler):
+    """一个订阅连接：读取订阅请求，之后持续推送快照"""
+
+    def handle(self):
+        service: MarketDataService = self.server.service
+        try:
+            request = json.loads(self.rfile.readline() or b"{}")
+        except ValueError:
+            return
+        symbols = request.get("symbols") or []
+        if request.get("op") != "subscribe" or not symbols:
+            return
+
+        updates: "queue.Queue[MarketSnapshot]" = queue.Queue(maxsize=256)
+
+        def on_snapshot(snapshot: MarketSnapshot):
+            try:
+                updates.put_nowait(snapshot)
+            except queue.Full:
+                # 慢消费者：丢弃最旧的一条，只保证最新快照送达
+                try:
+                    updates.get_nowait()
+                except queue.Empty:
+                    pass
+                updates.put_nowait(snapshot)
+
+        for symbol in symbols:
+            service.subscribe(symbol, on_snapshot)
+        try:
+            while not self.server.stopping:
+                try:
+                    snapshot = updates.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+                self.wfile.write(json.dumps(snapshot.to_dict()).encode() + b"\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+        finally:
+            for symbol in symbols:
+                service.unsubscribe(symbol, on_snapshot)
+
+
+class MarketDataPublisher:
+    """把 MarketDataService 的快照发布到本地 socket"""
+
+    def __init__(self, service: MarketDataService, address: str = DEFAULT_ADDRESS):
+        self.service = service
+        self.address = address
+        family, addr = parse_address(address)
+        if family == "unix":
+            prepare_socket_path(addr)
+            server_cls = socketserver.ThreadingUnixStreamServer
+        else:
+            server_cls = socketserver.ThreadingTCPServer
+            server_cls.allow_reuse_address = True
+        self._family = family
+        self._addr = addr
+        self.server = server_cls(addr, _SubscriberHandler)
+        if family == "unix":
+            restrict_socket(addr)
+        self.server.daemon_threads = True
+        self.server.service = service
+        self.server.stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def bound_address(self) -> str:
+        """实际监听地址（tcp 端口为 0 时返回系统分配的端口）"""
+        if self._family == "unix":
+            return self.address
+        host, port = self.server.server_address[:2]
+        return f"tcp:{host}:{port}"
+
+    def start(self) -> 'MarketDataPublisher':
+        self._thread = threading.Thread(target=self.server.serve_forever, name="market-data-publisher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.stopping = True
+        self.server.shutdown()
+        self.server.server_close()
+        if self._family == "unix" and os.path.exists(self._addr):
+            os.unlink(self._addr)
+
+
+class MarketDataClient:
+    """
+    订阅本地行情发布进程
+
+    后台线程接收快照并只保留每个交易对的最新一份；断线后自动重连。
+    """
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, reconnect_interval: float = 1.0):
+        self.address = address
+        self.reconnect_interval = reconnect_interval
+        self._symbols = set()
+        self._lock = threading.Condition()
+        self._snapshots: Dict[str, MarketSnapshot] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._sock: Optional[socket.socket] = None
+        self._listeners = []
+        self.connected = False
+
+    def add_listener(self, callback):
+        """每收到一份快照调用 callback(snapshot)（在接收线程中执行，应尽快返回）"""
+        self._listeners.append(callback)
+
+    def subscribe(self, *symbols: str) -> 'MarketDataClient':
+        """订阅交易对并启动接收线程；已连接时新增交易对会触发重连以重新订阅"""
+        new_symbols = set(symbols) - self._symbols
+        self._symbols.update(symbols)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="market-data-client", daemon=True)
+            self._thread.start()
+        elif new_symbols:
+            self._disconnect()
+        return self
+
+    def get_snapshot(self, symbol: str, max_age: Optional[float] = None) -> Optional[MarketSnapshot]:
+        """获取最新快照；max_age 秒内无更新时返回 None（调用方应回退到直接请求）"""
+        with self._lock:
+            snapshot = self._snapshots.get(symbol)
+        if snapshot is None:
+            return None
+        if max_age is not None and not snapshot.is_fresh(max_age):
+            return None
+        return snapshot
+
+    def wait_snapshot(self, symbol: str, max_age: float, timeout: float) -> Optional[MarketSnapshot]:
+        """阻塞等待 max_age 内的新鲜快照，超时返回 None"""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while True:
+                snapshot = self._snapshots.get(symbol)
+                if snapshot is not None and snapshot.is_fresh(max_age):
+                    return snapshot
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._lock.wait(remaining)
+
+    def _connect(self) -> socket.socket:
+        family, addr = parse_address(self.address)
+        if family == "unix":
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.connect(addr)
+        request = {"op": "subscribe", "symbols": sorted(self._symbols)}
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        return sock
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self._sock = self._connect()
+                self.connected = True
+                with self._sock.makefile("rb") as reader:
+                    for line in reader:
+                        snapshot = MarketSnapshot.from_dict(json.loads(line))
+                        with self._lock:
+                            self._snapshots[snapshot.symbol] = snapshot
+                            self._lock.notify_all()
+                        for callback in list(self._listeners):
+                            try:
+                                callback(snapshot)
+                            except Exception:
+                                pass
+                        if self._stop_event.is_set():
+                            break
+            except (OSError, ValueError):
+                pass
+            finally:
+                self.connected = False
+                if self._sock is not None:
+                    self._sock.close()
+                    self._sock = None
+            self._stop_event.wait(self.reconnect_interval)
+
+    def _disconnect(self):
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def close(self):
+        self._stop_event.set()
+        self._disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地行情发布进程")
+    parser.add_argument("--symbols", type=str, default="BTC-USD", help="交易对，逗号分隔")
+    parser.add_argument("--address", type=str, default=DEFAULT_ADDRESS)
+    parser.add_argument("--base_url", type=str, default="https://perps.standx.com")
+    parser.add_argument("--price_interval", type=float, default=1.0)
+    parser.add_argument("--adx_interval", type=float, default=30.0)
+    parser.add_argument("--adx_resolution", type=str, default="5m")
+    parser.add_argument("--no_adx", action="store_true", help="不计算 ADX")
+    args = parser.parse_args()
+
+    service = MarketDataService(
+        get_ticker=standx_ticker_fetcher(args.base_url),
+        get_adx=None if args.no_adx else binance_adx_fetcher(args.adx_resolution),
+        price_interval=args.price_interval,
+        adx_interval=args.adx_interval,
+    )
+    for symbol in args.symbols.split(","):
+        service.subscribe(symbol.strip())
+    service.start()
+    publisher = MarketDataPublisher(service, args.address).start()
+    print(f"[MARKET-DATA] publishing {args.symbols} on {publisher.bound_address}")
+    try:
+        while True:
+            time.sleep(60)
+            print(f"[MARKET-DATA] {service.get_stats()}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        publisher.stop()
+        service.stop()
+
+
+if __name__ == "__main__":
+    main()
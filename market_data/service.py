@@ -0,0 +1,224 @@
+"""
+Market Data Service
+进程内行情分发服务
+
+每个交易对的价格和 ADX 只由后台线程请求一次，再把快照分发给所有订阅方，
+避免 N 个账户在同一交易对上发起 N 份相同的行情请求。
+"""
+import threading
+import time
+from typing import Dict, Any, Callable, List, Optional
+
+from market_data.snapshot import MarketSnapshot
+
+
+SnapshotCallback = Callable[[MarketSnapshot], None]
+
+
+def standx_ticker_fetcher(base_url: str = "https://perps.standx.com") -> Callable[[str], Dict[str, Any]]:
+    """
+    创建基于 StandX 公共行情接口的 ticker 获取函数（无需认证）
+
+    Returns:
+        get_ticker(symbol) -> 与 StandXAdapter.get_ticker 相同格式的字典
+    """
+    from exchange.exchange_standx.standx_protocol.perp_http import StandXPerpHTTP
+    from adapters.standx_adapter import parse_ticker
+
+    client = StandXPerpHTTP(base_url=base_url)
+
+    def get_ticker(symbol: str) -> Dict[str, Any]:
+        return parse_ticker(client.query_symbol_price(symbol), symbol)
+
+    return get_ticker
+
+
+def binance_adx_fetcher(resolution: str = "5m", period: int = 14) -> Callable[[str], Optional[float]]:
+    """创建基于 IndicatorTool 的 ADX 获取函数（延迟加载 risk 模块）"""
+    def get_adx(symbol: str) -> Optional[float]:
+        from risk import IndicatorTool
+        return IndicatorTool().get_adx(symbol, resolution, period=period)
+
+    return get_adx
+
+
+class MarketDataService:
+    """进程内行情分发服务"""
+
+    def __init__(
+        self,
+        get_ticker: Callable[[str], Dict[str, Any]],
+        get_adx: Optional[Callable[[str], Optional[float]]] = None,
+        price_interval: float = 1.0,
+        adx_interval: float = 30.0,
+    ):
+        """
+        初始化行情服务
+
+        Args:
+            get_ticker: 获取 ticker 的函数，返回格式同 BasePerpAdapter.get_ticker
+            get_adx: 获取 ADX 的函数（可选，None 表示不计算 ADX）
+            price_interval: 价格刷新间隔（秒）
+            adx_interval: ADX 刷新间隔（秒）
+        """
+        self._get_ticker = get_ticker
+        self._get_adx = get_adx
+        self.price_interval = price_interval
+        self.adx_interval = adx_interval
+
+        self._lock = threading.Condition()
+        self._snapshots: Dict[str, MarketSnapshot] = {}
+        self._subscribers: Dict[str, List[SnapshotCallback]] = {}
+        self._errors: Dict[str, str] = {}
+        self._fetch_counts = {"price": 0, "adx": 0}
+
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def subscribe(self, symbol: str, callback: Optional[SnapshotCallback] = None):
+        """
+        订阅交易对行情
+
+        Args:
+            symbol: 交易对符号
+            callback: 每次快照更新时调用（在服务线程中执行，应尽快返回）
+        """
+        with self._lock:
+            callbacks = self._subscribers.setdefault(symbol, [])
+            if callback is not None:
+                callbacks.append(callback)
+            snapshot = self._snapshots.get(symbol)
+        if callback is not None and snapshot is not None:
+            callback(snapshot)
+
+    def unsubscribe(self, symbol: str, callback: SnapshotCallback):
+        with self._lock:
+            callbacks = self._subscribers.get(symbol, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def symbols(self) -> List[str]:
+        with self._lock:
+            return list(self._subscribers)
+
+    def get_snapshot(self, symbol: str, max_age: Optional[float] = None) -> Optional[MarketSnapshot]:
+        """
+        获取最新快照
+
+        Args:
+            symbol: 交易对符号
+            max_age: 价格最大允许延迟（秒），超过则返回 None
+
+        Returns:
+            Optional[MarketSnapshot]: 快照，不存在或已过期时返回 None
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(symbol)
+        if snapshot is None:
+            return None
+        if max_age is not None and not snapshot.is_fresh(max_age):
+            return None
+        return snapshot
+
+    def wait_snapshot(self, symbol: str, max_age: float, timeout: float) -> Optional[MarketSnapshot]:
+        """阻塞等待 max_age 内的新鲜快照，超时返回 None"""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while True:
+                snapshot = self._snapshots.get(symbol)
+                if snapshot is not None and snapshot.is_fresh(max_age):
+                    return snapshot
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._lock.wait(remaining)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """行情请求次数、各交易对快照延迟和最近错误"""
+        now = time.time()
+        with self._lock:
+            return {
+                "fetch_counts": dict(self._fetch_counts),
+                "symbols": {
+                    symbol: {
+                        "seq": snap.seq,
+                        "price_age": snap.price_age(now),
+                        "adx_age": snap.adx_age(now),
+                        "subscribers": len(self._subscribers.get(symbol, [])),
+                    }
+                    for symbol, snap in self._snapshots.items()
+                },
+                "errors": dict(self._errors),
+            }
+
+    def _publish(self, symbol: str, **fields):
+        with self._lock:
+            previous = self._snapshots.get(symbol) or MarketSnapshot(symbol)
+            data = previous.to_dict()
+            data.update(fields)
+            data["seq"] = previous.seq + 1
+            snapshot = MarketSnapshot.from_dict(data)
+            self._snapshots[symbol] = snapshot
+            callbacks = list(self._subscribers.get(symbol, []))
+            self._lock.notify_all()
+        for callback in callbacks:
+            try:
+                callback(snapshot)
+            except Exception:
+                pass
+
+    def refresh_price(self, symbol: str) -> bool:
+        """立即刷新一次价格（后台线程调用，也可手动调用）"""
+        try:
+            ticker = self._get_ticker(symbol)
+        except Exception as e:
+            self._errors[symbol] = f"price: {e}"
+            return False
+        self._fetch_counts["price"] += 1
+        self._publish(symbol, ticker=ticker, price_time=time.time())
+        return True
+
+    def refresh_adx(self, symbol: str) -> bool:
+        """立即刷新一次 ADX"""
+        if self._get_adx is None:
+            return False
+        try:
+            adx = self._get_adx(symbol)
+        except Exception as e:
+            self._errors[symbol] = f"adx: {e}"
+            return False
+        self._fetch_counts["adx"] += 1
+        if adx is None:
+            return False
+        self._publish(symbol, adx=adx, adx_time=time.time())
+        return True
+
+    def _loop(self, refresh: Callable[[str], bool], interval: float):
+        while not self._stop_event.is_set():
+            started = time.monotonic()
+            for symbol in self.symbols():
+                refresh(symbol)
+            elapsed = time.monotonic() - started
+            self._stop_event.wait(max(0.0, interval - elapsed))
+
+    def start(self) -> 'MarketDataService':
+        """启动后台刷新线程（价格与 ADX 各一个线程，互不阻塞）"""
+        if self._threads:
+            return self
+        self._stop_event.clear()
+        loops = [("price", self.refresh_price, self.price_interval)]
+        if self._get_adx is not None:
+            loops.append(("adx", self.refresh_adx, self.adx_interval))
+        for name, refresh, interval in loops:
+            thread = threading.Thread(
+                target=self._loop, args=(refresh, interval), name=f"market-data-{name}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
@@ -0,0 +1,88 @@
+"""
+Market Data Snapshot
+行情快照（带新鲜度时间戳）
+"""
+import time
+from typing import Dict, Any, Optional
+
+
+class MarketSnapshot:
+    """
+    单个交易对的行情快照
+
+    时间戳使用 time.time()（秒），可跨进程比较；消费方通过 price_age() /
+    is_fresh() 拒绝过期数据。
+    """
+    def __init__(
+        self,
+        symbol: str,
+        ticker: Optional[Dict[str, Any]] = None,
+        price_time: Optional[float] = None,
+        adx: Optional[float] = None,
+        adx_time: Optional[float] = None,
+        seq: int = 0,
+    ):
+        self.symbol = symbol
+        self.ticker = ticker or {}
+        self.price_time = price_time
+        self.adx = adx
+        self.adx_time = adx_time
+        self.seq = seq
+
+    @property
+    def last_price(self) -> Optional[float]:
+        """策略使用的价格：优先 mark，其次 mid，最后 last"""
+        return (
+            self.ticker.get("mark_price")
+            or self.ticker.get("mid_price")
+            or self.ticker.get("last_price")
+        )
+
+    def price_age(self, now: Optional[float] = None) -> Optional[float]:
+        """价格数据距今秒数，没有价格时返回 None"""
+        if self.price_time is None:
+            return None
+        return (now or time.time()) - self.price_time
+
+    def adx_age(self, now: Optional[float] = None) -> Optional[float]:
+        """ADX 数据距今秒数，没有 ADX 时返回 None"""
+        if self.adx_time is None:
+            return None
+        return (now or time.time()) - self.adx_time
+
+    def is_fresh(self, max_age: float, now: Optional[float] = None) -> bool:
+        """价格是否在 max_age 秒内更新过"""
+        age = self.price_age(now)
+        return age is not None and age <= max_age and self.last_price is not None
+
+    def fresh_adx(self, max_age: float, now: Optional[float] = None) -> Optional[float]:
+        """返回 max_age 秒内的 ADX，过期或缺失时返回 None"""
+        age = self.adx_age(now)
+        if age is None or age > max_age:
+            return None
+        return self.adx
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            "symbol": self.symbol,
+            "ticker": self.ticker,
+            "price_time": self.price_time,
+            "adx": self.adx,
+            "adx_time": self.adx_time,
+            "seq": self.seq,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MarketSnapshot':
+        return cls(
+            symbol=data["symbol"],
+            ticker=data.get("ticker"),
+            price_time=data.get("price_time"),
+            adx=data.get("adx"),
+            adx_time=data.get("adx_time"),
+            seq=data.get("seq", 0),
+        )
+
+    def __repr__(self) -> str:
+        return f"<MarketSnapshot(symbol={self.symbol}, price={self.last_price}, adx={self.adx}, seq={self.seq})>"
@@ -0,0 +1,28 @@
+"""
+Rate Limit Module
+交易所接口限流：按接口权重计费的令牌桶，撤单 / 下单 / 查询三条优先级通道，
+可通过本地 socket broker 在多个进程间共享
+"""
+from ratelimit.limiter import (
+    LANES,
+    CANCEL,
+    ORDER,
+    QUERY,
+    RateLimiter,
+    RateLimitTimeout,
+    TokenBucket,
+    default_lane,
+)
+from ratelimit.factory import create_rate_limiter
+
+__all__ = [
+    "LANES",
+    "CANCEL",
+    "ORDER",
+    "QUERY",
+    "RateLimiter",
+    "RateLimitTimeout",
+    "TokenBucket",
+    "default_lane",
+    "create_rate_limiter",
+]
@@ -0,0 +1,357 @@
+"""
+Rate Limit Broker
+本地 socket 限流代理（跨进程共享令牌桶）
+
+多个账户进程共用一个出口 IP 时，各进程内的限流器互相看不到对方的请求。broker 进程持有令牌桶，
+各进程通过 Unix socket（Windows 下为本机 TCP）申请令牌；协议为逐行 JSON，每个连接一次只有一个
+未完成的申请：
+
+    client -> broker: {"op": "register", "name": "standx", "limits": {"rate": 20, "burst": 40, "reserve": {...}}}
+    broker -> client: {"ok": true}
+    client -> broker: {"op": "acquire", "lane": 0, "weight": 1, "timeout": 5}
+    broker -> client: {"ok": true, "waited": 0.012} / {"ok": false, "error": "..."}
+
+同名限流器由第一个注册的进程的 limits 创建；权重和优先级通道由客户端按自己的配置解析后随申请发送。
+broker 不可用时客户端回退到进程内限流，并每隔 reconnect_interval 秒重试连接。
+
+运行 broker:
+    python -m ratelimit.broker
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from market_data.publisher import RUNTIME_DIR, parse_address, prepare_socket_path, restrict_socket
+from ratelimit.limiter import RateLimiter, RateLimitTimeout
+
+
+if hasattr(socket, "AF_UNIX") and os.name != "nt":
+    DEFAULT_ADDRESS = f"unix:{os.path.join(RUNTIME_DIR, 'standx_rate_limit.sock')}"
+else:
+    DEFAULT_ADDRESS = "tcp:127.0.0.1:18766"
+
+logger = logging.getLogger(__name__)
+
+
+class _ClientHandler(socketserver.StreamRequestHandler):
+    """一个客户端连接：注册限流器后逐条处理令牌申请"""
+
+    def handle(self):
+        broker: RateLimitBroker = self.server.broker
+        limiter: Optional[RateLimiter] = None
+        try:
+            for line in self.rfile:
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    return
+                op = request.get("op")
+                if op == "register":
+                    limiter = broker.get_limiter(request["name"], request["limits"])
+                    response: Dict[str, Any] = {"ok": True}
+                elif op == "acquire" and limiter is not None:
+                    response = self._acquire(limiter, request)
+                elif op == "stats":
+                    response = {"ok": True, "stats": broker.get_stats()}
+                else:
+                    response = {"ok": False, "error": f"无效的请求: {op}"}
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+
+    @staticmethod
+    def _acquire(limiter: RateLimiter, request: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            waited = limiter.acquire(
+                request.get("endpoint", ""),
+                weight=request["weight"],
+                priority=request["lane"],
+                timeout=request.get("timeout"),
+            )
+            return {"ok": True, "waited": waited}
+        except (RateLimitTimeout, ValueError) as e:
+            return {"ok": False, "error": str(e)}
+
+
+class RateLimitBroker:
+    """在本地 socket 上提供共享令牌桶"""
+
+    def __init__(self, address: str = DEFAULT_ADDRESS):
+        self.address = address
+        family, addr = parse_address(address)
+        if family == "unix":
+            prepare_socket_path(addr)
+            server_cls = socketserver.ThreadingUnixStreamServer
+        else:
+            server_cls = socketserver.ThreadingTCPServer
+            server_cls.allow_reuse_address = True
+        self._family = family
+        self._addr = addr
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+        self.server = server_cls(addr, _ClientHandler, bind_and_activate=False)
+        # 每个并发申请一条连接，默认 listen 队列（5）在多账户同时启动时会溢出
+        self.server.request_queue_size = 128
+        try:
+            self.server.server_bind()
+            if family == "unix":
+                restrict_socket(addr)
+            self.server.server_activate()
+        except BaseException:
+            self.server.server_close()
+            raise
+        self.server.daemon_threads = True
+        self.server.broker = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def bound_address(self) -> str:
+        """实际监听地址（tcp 端口为 0 时返回系统分配的端口）"""
+        if self._family == "unix":
+            return self.address
+        host, port = self.server.server_address[:2]
+        return f"tcp:{host}:{port}"
+
+    def get_limiter(self, name: str, limits: Dict[str, Any]) -> RateLimiter:
+        """同名限流器只创建一次（以第一个注册的进程的 limits 为准）"""
+        with self._lock:
+            limiter = self._limiters.get(name)
+            if limiter is None:
+                limiter = self._limiters[name] = RateLimiter.from_limits(limits, name)
+            return limiter
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return [limiter.get_stats() for limiter in limiters]
+
+    def start(self) -> 'RateLimitBroker':
+        self._thread = threading.Thread(target=self.server.serve_forever, name="rate-limit-broker", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._family == "unix" and os.path.exists(self._addr):
+            os.unlink(self._addr)
+
+
+class RemoteRateLimiter:
+    """
+    通过 broker 申请令牌的限流器，接口与 RateLimiter 相同（acquire / acquire_async / get_stats）
+
+    同步调用每个线程复用一条连接，协程调用使用连接池（每个并发申请一条连接，
+    撤单不会排在同一连接上的查询后面）。broker 不可用时回退到 local（进程内限流）。
+
+    Args:
+        address: broker 地址
+        local: 进程内限流器，提供权重 / 通道配置、limits 以及 broker 不可用时的回退
+        reconnect_interval: broker 不可用后多久重试连接（秒）
+    """
+
+    def __init__(self, address: str, local: RateLimiter, reconnect_interval: float = 1.0):
+        self.address = address
+        self.local = local
+        self.name = local.name
+        self.timeout = local.timeout
+        self.reconnect_interval = reconnect_interval
+        self._thread_local = threading.local()
+        # 事件循环 -> 空闲连接（连接只能在创建它的循环中使用）
+        self._async_pools: Dict[
+            asyncio.AbstractEventLoop, List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]
+        ] = {}
+        self._down_until = 0.0
+        self.remote_calls = 0
+        self.fallback_calls = 0
+
+    def _register_line(self) -> bytes:
+        request = {"op": "register", "name": self.name, "limits": self.local.limits()}
+        return json.dumps(request).encode() + b"\n"
+
+    def _acquire_line(self, endpoint: str, lane: int, weight: float, timeout: Optional[float]) -> bytes:
+        request = {"op": "acquire", "endpoint": endpoint, "lane": lane, "weight": weight, "timeout": timeout}
+        return json.dumps(request).encode() + b"\n"
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _mark_down(self, error: Exception):
+        if self._available():
+            logger.warning("限流 broker %s 不可用，回退到进程内限流: %s", self.address, error)
+        self._down_until = time.monotonic() + self.reconnect_interval
+
+    @staticmethod
+    def _parse_response(line: bytes) -> float:
+        if not line:
+            raise ConnectionError("broker 关闭了连接")
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise RateLimitTimeout(response.get("error", "限流申请失败"))
+        return float(response.get("waited", 0.0))
+
+    # ---------------- 同步
+
+    def _connection(self):
+        conn = getattr(self._thread_local, "conn", None)
+        if conn is None:
+            family, addr = parse_address(self.address)
+            sock = socket.socket(socket.AF_UNIX if family == "unix" else socket.AF_INET, socket.SOCK_STREAM)
+            try:
+                sock.settimeout(5)
+                sock.connect(addr)
+                reader = sock.makefile("rb")
+                sock.sendall(self._register_line())
+                self._parse_response(reader.readline())
+            except Exception:
+                sock.close()
+                raise
+            conn = self._thread_local.conn = (sock, reader)
+        return conn
+
+    def _close_connection(self):
+        conn = getattr(self._thread_local, "conn", None)
+        self._thread_local.conn = None
+        if conn is not None:
+            conn[1].close()
+            conn[0].close()
+
+    def acquire(
+        self,
+        endpoint: str,
+        weight: Optional[float] = None,
+        priority: Any = None,
+        timeout: Optional[float] = None,
+    ) -> float:
+        """参数 / 返回值同 RateLimiter.acquire"""
+        if not self._available():
+            self.fallback_calls += 1
+            return self.local.acquire(endpoint, weight, priority, timeout)
+        lane, weight = self.local.resolve(endpoint, weight, priority)
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            sock, reader = self._connection()
+            sock.settimeout(None if timeout is None else timeout + 5)
+            sock.sendall(self._acquire_line(endpoint, lane, weight, timeout))
+            waited = self._parse_response(reader.readline())
+        except (OSError, ConnectionError, ValueError) as e:
+            self._close_connection()
+            self._mark_down(e)
+            self.fallback_calls += 1
+            return self.local.acquire(endpoint, weight, lane, timeout)
+        self.remote_calls += 1
+        return waited
+
+    # ---------------- 协程
+
+    async def _open_async(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        family, addr = parse_address(self.address)
+        if family == "unix":
+            reader, writer = await asyncio.wait_for(asyncio.open_unix_connection(addr), 5)
+        else:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(*addr), 5)
+        try:
+            writer.write(self._register_line())
+            self._parse_response(await asyncio.wait_for(reader.readline(), 5))
+        except BaseException:
+            writer.close()
+            raise
+        return reader, writer
+
+    async def acquire_async(
+        self,
+        endpoint: str,
+        weight: Optional[float] = None,
+        priority: Any = None,
+        timeout: Optional[float] = None,
+    ) -> float:
+        """参数 / 返回值同 RateLimiter.acquire_async"""
+        if not self._available():
+            self.fallback_calls += 1
+            return await self.local.acquire_async(endpoint, weight, priority, timeout)
+        lane, weight = self.local.resolve(endpoint, weight, priority)
+        timeout = self.timeout if timeout is None else timeout
+        pool = self._async_pools.setdefault(asyncio.get_running_loop(), [])
+        conn = None
+        try:
+            conn = pool.pop() if pool else await self._open_async()
+            reader, writer = conn
+            writer.write(self._acquire_line(endpoint, lane, weight, timeout))
+            line = await asyncio.wait_for(reader.readline(), None if timeout is None else timeout + 5)
+            waited = self._parse_response(line)
+        except RateLimitTimeout:
+            pool.append(conn)
+            conn = None
+            raise
+        except (OSError, ConnectionError, ValueError, asyncio.TimeoutError) as e:
+            error = e
+        else:
+            pool.append(conn)
+            conn = None
+            self.remote_calls += 1
+            return waited
+        finally:
+            # 出错或被取消（CancelledError）时连接上可能还有未读的响应：关闭，不放回连接池
+            if conn is not None:
+                conn[1].close()
+        self._mark_down(error)
+        self.fallback_calls += 1
+        return await self.local.acquire_async(endpoint, weight, lane, timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """本进程的远程 / 回退申请次数，以及回退用的进程内限流器统计"""
+        return {
+            "name": self.name,
+            "address": self.address,
+            "connected": self._available(),
+            "remote_calls": self.remote_calls,
+            "fallback_calls": self.fallback_calls,
+            "local": self.local.get_stats(),
+        }
+
+    def close(self):
+        self._close_connection()
+        for loop, pool in self._async_pools.items():
+            for _, writer in pool:
+                if not loop.is_closed():
+                    writer.close()
+                    continue
+                # 已关闭的循环（如 asyncio.run 返回后）无法再调度 close：直接断开连接，
+                # broker 端随之释放，文件描述符随 transport 回收
+                try:
+                    writer.get_extra_info("socket").shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        self._async_pools.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地限流 broker（多个进程共享令牌桶）")
+    parser.add_argument("--address", type=str, default=DEFAULT_ADDRESS)
+    parser.add_argument("--stats_interval", type=float, default=60, help="每隔 N 秒打印统计，0 表示不打印")
+    args = parser.parse_args()
+
+    broker = RateLimitBroker(args.address).start()
+    print(f"[RATE-LIMIT] broker listening on {broker.bound_address}", flush=True)
+    try:
+        while True:
+            time.sleep(args.stats_interval or 3600)
+            if args.stats_interval:
+                for stats in broker.get_stats():
+                    print(f"[RATE-LIMIT] {json.dumps(stats, ensure_ascii=False)}", flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        broker.stop()
+
+
+if __name__ == "__main__":
+    main()
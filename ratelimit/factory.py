@@ -0,0 +1,53 @@
+"""
+Rate Limiter Factory
+按配置创建限流器
+
+配置（交易所配置中的 rate_limit 段）:
+    enable: true
+    rate: 20                   # 每秒令牌数（权重）
+    burst: 40                  # 令牌桶容量，默认等于 rate
+    timeout: 5                 # 最长等待秒数，超时抛出 RateLimitTimeout；不填表示一直等待
+    weights: {query_open_orders: 2}
+    priorities: {query_positions: order}
+    reserve: {order: 0.1, query: 0.25}
+    address: ""                # 留空：进程内限流；"default" 或 "unix:/path" / "tcp:host:port"：
+                               # 通过 broker（python -m ratelimit.broker）在多个进程间共享
+"""
+from typing import Any, Dict, Optional
+
+from ratelimit.limiter import RateLimiter
+
+
+def create_rate_limiter(config: Optional[Dict[str, Any]], name: str = "default"):
+    """
+    按 rate_limit 配置创建限流器
+
+    Args:
+        config: rate_limit 配置段，None 或 enable 为 false 时不限流
+        name: 限流器名称（同一 broker 上同名的进程共享一个令牌桶）
+
+    Returns:
+        RateLimiter / RemoteRateLimiter，不限流时返回 None
+    """
+    if not config or not config.get("enable", False):
+        return None
+    local = RateLimiter(
+        rate=config["rate"],
+        burst=config.get("burst"),
+        weights=config.get("weights"),
+        priorities=config.get("priorities"),
+        reserve=config.get("reserve"),
+        timeout=config.get("timeout"),
+        name=config.get("name", name),
+    )
+    address = config.get("address")
+    if not address:
+        return local
+    # 只有共享限流时才加载 socket 客户端
+    from ratelimit.broker import DEFAULT_ADDRESS, RemoteRateLimiter
+
+    return RemoteRateLimiter(
+        DEFAULT_ADDRESS if address == "default" else address,
+        local,
+        reconnect_interval=float(config.get("reconnect_interval", 1.0)),
+    )
@@ -0,0 +1,287 @@
+"""
+Token Bucket Rate Limiter
+按接口权重计费的令牌桶限流（进程内，线程 / 协程安全）
+
+所有接口共用一个令牌桶（与交易所按 IP / 账户统计请求权重一致），每个接口按 weights 扣减令牌。
+请求分三条优先级通道：
+
+    cancel  撤单（名称包含 cancel 的接口）
+    order   下单（new_order / place_order / create_order / execute ...）
+    query   其余查询
+
+- 有更高优先级的请求在等待时，低优先级请求不会取走令牌（撤单抢占下单和查询）；
+- reserve 为每条通道必须留在桶里的令牌比例（相对 burst），例如 query 0.25 表示查询不能用掉
+  最后 25% 的令牌，保证突发时撤单 / 下单仍有余量。
+"""
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+LANES = ("cancel", "order", "query")
+CANCEL, ORDER, QUERY = range(len(LANES))
+
+# 各通道必须留在桶里的令牌比例（相对 burst）
+DEFAULT_RESERVE = {"cancel": 0.0, "order": 0.1, "query": 0.25}
+
+ORDER_ENDPOINTS = ("new_order", "place_order", "place_orders", "create_order", "execute", "place_market_order")
+
+# 有更高优先级请求在等待时，低优先级请求的重试间隔上限（秒）
+PREEMPT_POLL = 0.005
+
+
+class RateLimitTimeout(Exception):
+    """在 timeout 内没有取到令牌"""
+
+
+class TokenBucket:
+    """令牌桶：每秒补充 rate 个令牌，最多积累 burst 个"""
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def refill(self, now: float) -> float:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens
+
+    def acquire(self, now: float, weight: float = 1.0) -> bool:
+        """取 weight 个令牌，不足时返回 False（不扣减）"""
+        if self.refill(now) < weight:
+            return False
+        self.tokens -= weight
+        return True
+
+
+def default_lane(endpoint: str) -> int:
+    """按接口名归类优先级通道：撤单 > 下单 > 查询"""
+    name = endpoint.lower()
+    if "cancel" in name:
+        return CANCEL
+    if name in ORDER_ENDPOINTS:
+        return ORDER
+    return QUERY
+
+
+def lane_index(priority: Any) -> int:
+    """通道名（"cancel" / "order" / "query"）或序号 -> 序号"""
+    if isinstance(priority, int) and 0 <= priority < len(LANES):
+        return priority
+    if priority in LANES:
+        return LANES.index(priority)
+    raise ValueError(f"无效的限流优先级: {priority}，支持: {', '.join(LANES)}")
+
+
+class RateLimiter:
+    """
+    进程内限流器
+
+    Args:
+        rate: 每秒补充的令牌数（权重）
+        burst: 令牌桶容量，默认等于 rate
+        weights: {接口名: 权重}，未配置的接口权重为 1
+        priorities: {接口名: 通道名}，覆盖 default_lane 的归类
+        reserve: {通道名: 比例}，覆盖 DEFAULT_RESERVE
+        timeout: acquire 默认的最长等待秒数，None 表示一直等待
+        name: 限流器名称（统计 / 跨进程共享时区分交易所）
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        weights: Optional[Dict[str, float]] = None,
+        priorities: Optional[Dict[str, str]] = None,
+        reserve: Optional[Dict[str, float]] = None,
+        timeout: Optional[float] = None,
+        name: str = "default",
+    ):
+        if rate <= 0:
+            raise ValueError(f"限流速率必须大于 0: {rate}")
+        self.name = name
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else rate)
+        self.weights = {endpoint: float(weight) for endpoint, weight in (weights or {}).items()}
+        self.priorities = {endpoint: lane_index(lane) for endpoint, lane in (priorities or {}).items()}
+        reserve = {**DEFAULT_RESERVE, **(reserve or {})}
+        self.reserve = [float(reserve[lane]) * self.burst for lane in LANES]
+        self.timeout = timeout
+        self.bucket = TokenBucket(self.rate, self.burst, time.monotonic())
+        self._lock = threading.Lock()
+        self._waiting = [0] * len(LANES)
+        self._stats = [{"granted": 0, "waited": 0, "wait_ms": 0.0, "timeouts": 0} for _ in LANES]
+
+    @classmethod
+    def from_limits(cls, limits: Dict[str, Any], name: str = "default") -> "RateLimiter":
+        """按 limits() 的内容创建同样的桶（broker 端使用，权重 / 通道由客户端解析后随请求发送）"""
+        return cls(limits["rate"], limits.get("burst"), reserve=limits.get("reserve"), name=name)
+
+    def limits(self) -> Dict[str, Any]:
+        """速率 / 容量 / 预留比例（跨进程共享时发给 broker 创建同样的桶）"""
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "reserve": {lane: self.reserve[i] / self.burst for i, lane in enumerate(LANES)},
+        }
+
+    def resolve(self, endpoint: str, weight: Optional[float] = None, priority: Any = None) -> Tuple[int, float]:
+        """接口名 -> (通道序号, 权重)"""
+        lane = lane_index(priority) if priority is not None else self.priorities.get(endpoint)
+        if lane is None:
+            lane = default_lane(endpoint)
+        if weight is None:
+            weight = self.weights.get(endpoint, 1.0)
+        if weight + self.reserve[lane] > self.burst:
+            raise ValueError(f"接口 {endpoint} 权重 {weight} 超过 {LANES[lane]} 通道可用容量")
+        return lane, weight
+
+    def _take(self, lane: int, weight: float) -> float:
+        """尝试取令牌（需持有锁）：成功返回 0，否则返回建议等待秒数"""
+        if any(self._waiting[:lane]):
+            return min(PREEMPT_POLL, weight / self.rate)
+        need = weight + self.reserve[lane]
+        tokens = self.bucket.refill(time.monotonic())
+        if tokens < need:
+            return (need - tokens) / self.rate
+        self.bucket.tokens -= weight
+        return 0.0
+
+    def try_acquire(self, endpoint: str, weight: Optional[float] = None, priority: Any = None) -> float:
+        """
+        不等待地取令牌
+
+        Returns:
+            0 表示已取到；否则为建议的等待秒数（未扣减）
+        """
+        lane, weight = self.resolve(endpoint, weight, priority)
+        with self._lock:
+            wait = self._take(lane, weight)
+            if not wait:
+                self._stats[lane]["granted"] += 1
+        return wait
+
+    def _begin(self, lane: int, weight: float) -> float:
+        with self._lock:
+            wait = self._take(lane, weight)
+            if wait:
+                self._waiting[lane] += 1
+            else:
+                self._stats[lane]["granted"] += 1
+        return wait
+
+    def _retry(self, lane: int, weight: float, started: float) -> float:
+        """等待后重试：成功返回 0（并结束等待），否则返回建议等待秒数"""
+        with self._lock:
+            wait = self._take(lane, weight)
+            if not wait:
+                stats = self._stats[lane]
+                self._waiting[lane] -= 1
+                stats["granted"] += 1
+                stats["waited"] += 1
+                stats["wait_ms"] += (time.monotonic() - started) * 1000
+        return wait
+
+    def _check_deadline(self, lane: int, weight: float, wait: float, deadline: Optional[float]):
+        """预计超过 deadline 才能取到令牌时结束等待并抛出 RateLimitTimeout"""
+        if deadline is None or time.monotonic() + wait <= deadline:
+            return
+        with self._lock:
+            self._waiting[lane] -= 1
+            self._stats[lane]["timeouts"] += 1
+        raise RateLimitTimeout(f"{self.name} 限流等待超时: {LANES[lane]} 通道，权重 {weight}")
+
+    def _abort(self, lane: int):
+        with self._lock:
+            self._waiting[lane] -= 1
+
+    def _deadline(self, started: float, timeout: Optional[float]) -> Optional[float]:
+        timeout = self.timeout if timeout is None else timeout
+        return None if timeout is None else started + timeout
+
+    def acquire(
+        self,
+        endpoint: str,
+        weight: Optional[float] = None,
+        priority: Any = None,
+        timeout: Optional[float] = None,
+    ) -> float:
+        """
+        取令牌，不足时阻塞等待
+
+        Args:
+            endpoint: 接口名
+            weight: 权重（默认按 weights 配置）
+            priority: 通道（默认按接口名归类）
+            timeout: 最长等待秒数（默认使用构造参数 timeout）
+
+        Returns:
+            等待的秒数
+
+        Raises:
+            RateLimitTimeout: 预计在 timeout 内取不到令牌
+        """
+        lane, weight = self.resolve(endpoint, weight, priority)
+        wait = self._begin(lane, weight)
+        if not wait:
+            return 0.0
+        started = time.monotonic()
+        deadline = self._deadline(started, timeout)
+        try:
+            while wait:
+                self._check_deadline(lane, weight, wait, deadline)
+                time.sleep(wait)
+                wait = self._retry(lane, weight, started)
+        except RateLimitTimeout:
+            raise
+        except BaseException:
+            self._abort(lane)
+            raise
+        return time.monotonic() - started
+
+    async def acquire_async(
+        self,
+        endpoint: str,
+        weight: Optional[float] = None,
+        priority: Any = None,
+        timeout: Optional[float] = None,
+    ) -> float:
+        """acquire 的协程版本（等待时让出事件循环），参数同 acquire"""
+        # asyncio 导入较慢，同步进程（standx_mm_new.py）不需要，只在协程调用时导入
+        import asyncio
+
+        lane, weight = self.resolve(endpoint, weight, priority)
+        wait = self._begin(lane, weight)
+        if not wait:
+            return 0.0
+        started = time.monotonic()
+        deadline = self._deadline(started, timeout)
+        try:
+            while wait:
+                self._check_deadline(lane, weight, wait, deadline)
+                await asyncio.sleep(wait)
+                wait = self._retry(lane, weight, started)
+        except RateLimitTimeout:
+            raise
+        except BaseException:
+            self._abort(lane)
+            raise
+        return time.monotonic() - started
+
+    def get_stats(self) -> Dict[str, Any]:
+        """令牌余量和各通道的放行 / 等待 / 超时次数"""
+        with self._lock:
+            tokens = self.bucket.refill(time.monotonic())
+            lanes: Dict[str, Dict[str, Any]] = {}
+            for i, lane in enumerate(LANES):
+                stats = dict(self._stats[i])
+                stats["avg_wait_ms"] = round(stats["wait_ms"] / stats["waited"], 3) if stats["waited"] else 0.0
+                stats["wait_ms"] = round(stats["wait_ms"], 3)
+                stats["waiting"] = self._waiting[i]
+                lanes[lane] = stats
+        return {"name": self.name, "rate": self.rate, "burst": self.burst, "tokens": round(tokens, 3), "lanes": lanes}
+
+    def close(self):
+        """与 RemoteRateLimiter 接口一致（进程内限流器没有需要释放的资源）"""
@@ -1,7 +1,37 @@
 """
 Risk Management Module
 风险控制模块
+
+导出的类 / 函数在首次访问时才导入（numpy / requests），未启用风控的策略进程不承担这部分导入耗时。
 """
-from risk.indicators import IndicatorTool
+import importlib
+
+_EXPORTS = {
+    "IndicatorTool": "risk.indicators",
+    "get_engine": "risk.indicators",
+    "get_store": "risk.indicators",
+    "set_store": "risk.indicators",
+    "KlineStore": "risk.kline_cache",
+    "KlineWindow": "risk.kline_cache",
+    "BinanceKlineSource": "risk.kline_cache",
+    "FileKlineSource": "risk.kline_cache",
+    "IndicatorEngine": "risk.streaming",
+    "IndicatorState": "risk.streaming",
+    "StreamingADX": "risk.streaming",
+    "StreamingRSI": "risk.streaming",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["IndicatorTool"]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
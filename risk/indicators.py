@@ -2,15 +2,101 @@
 Technical Indicators Tool
 技术指标工具类
 """
+import threading
 import requests
-import pandas as pd
-import talib
-from typing import Optional
+import numpy as np
+from typing import Dict, Optional
+
+from risk.kline_cache import KlineStore
+from risk.streaming import IndicatorEngine
+
+
+# 计算指标使用的 K 线数量（首次预热 / 断档重建）
+HISTORY_LIMIT = 100
+
+# 按周期共享的指标引擎：IndicatorTool 通常每个周期临时创建，状态需要跨实例保留
+_ENGINES: Dict[int, IndicatorEngine] = {}
+_SHARED_LOCK = threading.Lock()
+_STORE: Optional[KlineStore] = None
+
+
+def get_engine(period: int = 14) -> IndicatorEngine:
+    """获取指定周期的共享指标引擎"""
+    with _SHARED_LOCK:
+        engine = _ENGINES.get(period)
+        if engine is None:
+            engine = _ENGINES[period] = IndicatorEngine(adx_period=period, rsi_period=period)
+        return engine
+
+
+def get_store() -> KlineStore:
+    """获取共享 K 线缓存（默认币安数据源，不落盘）"""
+    global _STORE
+    with _SHARED_LOCK:
+        if _STORE is None:
+            _STORE = KlineStore()
+        return _STORE
+
+
+def set_store(store: KlineStore):
+    """替换共享 K 线缓存（例如开启磁盘持久化或使用本地文件源）"""
+    global _STORE
+    with _SHARED_LOCK:
+        _STORE = store
 
 
 class IndicatorTool:
     """技术指标工具类"""
-    
+
+    def __init__(self, engine_factory=get_engine, store: Optional[KlineStore] = None):
+        """
+        Args:
+            engine_factory: period -> IndicatorEngine，默认使用进程内共享引擎
+            store: K 线缓存，默认使用进程内共享缓存
+        """
+        self._engine_factory = engine_factory
+        self._store = store
+
+    @property
+    def store(self) -> KlineStore:
+        return self._store or get_store()
+
+    def refresh(self, symbol: str, resolution: str, period: int = 14) -> Optional[IndicatorEngine]:
+        """
+        增量刷新指标状态
+
+        K 线由 KlineStore 增量缓存；指标引擎只提交上次之后新收盘的 K 线（O(1)），
+        未收盘 K 线只参与临时值计算。与上次状态没有重叠时用整段窗口重新预热。
+
+        Returns:
+            Optional[IndicatorEngine]: 刷新后的引擎，获取K线失败返回 None
+        """
+        engine = self._engine_factory(period)
+        try:
+            window = self.store.get(symbol, resolution, HISTORY_LIMIT)
+        except requests.exceptions.RequestException as e:
+            print(f"指标: 无法连接币安API - {type(e).__name__}")
+            return None
+        except ValueError as e:
+            print(f"指标: 币安API返回错误 - {e}")
+            return None
+
+        if not len(window):
+            print("指标: 币安API返回空数据")
+            return None
+
+        open_times, highs, lows, closes = window.arrays()
+        forming = window.forming is not None
+        last = engine.last_open_time(symbol, resolution)
+        start = int(np.searchsorted(open_times, last)) if last is not None else 0
+        if not engine.ingest(
+            symbol, resolution,
+            open_times[start:], highs[start:], lows[start:], closes[start:],
+            last_is_forming=forming
+        ):
+            engine.ingest(symbol, resolution, open_times, highs, lows, closes, last_is_forming=forming)
+        return engine
+
     def get_adx(
         self,
         symbol: str,
@@ -19,59 +105,44 @@ class IndicatorTool:
     ) -> Optional[float]:
         """
         获取 ADX 指标（使用币安数据）
-        
+
         Args:
             symbol: 交易对符号 (e.g., "BTC-USD" 转换为 "BTCUSDT")
             resolution: 时间周期 (e.g., "1m", "5m", "15m", "1h", "4h", "1d", "1w", "1M")
             period: ADX 计算周期，默认 14
-            
+
         Returns:
             Optional[float]: ADX 值，如果计算失败返回 None
         """
         try:
-            # 转换交易对格式：BTC-USD -> BTCUSDT
-            binance_symbol = symbol.replace("-", "").replace("USD", "USDT")
-            
-            # 从币安获取K线数据
-            url = f"https://api.binance.com/api/v3/klines"
-            params = {
-                "symbol": binance_symbol,
-                "interval": resolution,
-                "limit": 100
-            }
-            
-            try:
-                response = requests.get(url, params=params, timeout=5)
-            except requests.exceptions.RequestException as e:
-                print(f"ADX指标: 无法连接币安API - {type(e).__name__}")
+            engine = self.refresh(symbol, resolution, period)
+            if engine is None:
                 return None
-            
-            if not response.ok:
-                print(f"ADX指标: 币安API返回错误 - HTTP {response.status_code}")
-                return None
-            
-            data = response.json()
-            if not data:
-                print(f"ADX指标: 币安API返回空数据")
+            return engine.get_adx(symbol, resolution)
+        except Exception:
+            return None
+
+    def get_rsi(
+        self,
+        symbol: str,
+        resolution: str,
+        period: int = 14
+    ) -> Optional[float]:
+        """
+        获取 RSI 指标（使用币安数据）
+
+        Args:
+            symbol: 交易对符号 (e.g., "BTC-USD" 转换为 "BTCUSDT")
+            resolution: 时间周期
+            period: RSI 计算周期，默认 14
+
+        Returns:
+            Optional[float]: RSI 值，如果计算失败返回 None
+        """
+        try:
+            engine = self.refresh(symbol, resolution, period)
+            if engine is None:
                 return None
-            
-            # 转换为 DataFrame
-            df = pd.DataFrame(data, columns=[
-                'open_time', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-                'taker_buy_quote', 'ignore'
-            ])
-            
-            # 转换为数值类型
-            df['high'] = pd.to_numeric(df['high'])
-            df['low'] = pd.to_numeric(df['low'])
-            df['close'] = pd.to_numeric(df['close'])
-            
-            # 计算 ADX
-            adx = talib.ADX(df['high'], df['low'], df['close'], timeperiod=period)
-            
-            # 返回最新的 ADX 值
-            return float(adx.iloc[-1]) if not pd.isna(adx.iloc[-1]) else None
-            
+            return engine.get_rsi(symbol, resolution)
         except Exception:
             return None
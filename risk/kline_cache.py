@@ -0,0 +1,389 @@
+"""
+Kline Cache
+K 线缓存
+
+按 (symbol, interval) 保存已收盘 K 线的环形缓冲区：
+- 已收盘 K 线只增量拉取（startTime = 最后一根已收盘 K 线之后）
+- 未收盘 K 线按短 TTL 刷新，未到 K 线收盘边界时不重复拉取历史
+- 可持久化到磁盘，重启后不必重新下载历史
+- 数据源可替换为本地文件（离线测试 / 回放）
+
+K 线行格式与币安 /api/v3/klines 相同：
+    [open_time, open, high, low, close, volume, close_time, ...]
+"""
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import requests
+
+
+# 缓冲区列
+OPEN_TIME, OPEN, HIGH, LOW, CLOSE, VOLUME, CLOSE_TIME = range(7)
+_COLUMNS = 7
+
+_INTERVAL_UNITS_MS = {"m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+
+
+def interval_to_ms(interval: str) -> Optional[int]:
+    """
+    K 线周期转毫秒
+
+    Returns:
+        Optional[int]: 毫秒数；月线等不定长周期返回 None
+    """
+    unit = interval[-1:]
+    if unit not in _INTERVAL_UNITS_MS:
+        return None
+    try:
+        return int(interval[:-1]) * _INTERVAL_UNITS_MS[unit]
+    except ValueError:
+        return None
+
+
+def _rows_to_array(rows: List[List[Any]]) -> np.ndarray:
+    """币安 K 线行 -> float64 数组（open_time 等毫秒时间戳在 float64 中精确表示）"""
+    if not rows:
+        return np.empty((0, _COLUMNS), dtype=float)
+    return np.array([row[:_COLUMNS] for row in rows], dtype=float)
+
+
+def _array_to_rows(data: np.ndarray) -> List[List[Any]]:
+    return [
+        [int(row[OPEN_TIME]), *(float(v) for v in row[OPEN:CLOSE_TIME]), int(row[CLOSE_TIME])]
+        for row in data
+    ]
+
+
+class BinanceKlineSource:
+    """币安公共 K 线接口"""
+
+    def __init__(self, base_url: str = "https://api.binance.com", timeout: float = 5.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    @staticmethod
+    def to_binance_symbol(symbol: str) -> str:
+        # 转换交易对格式：BTC-USD -> BTCUSDT
+        return symbol.replace("-", "").replace("USD", "USDT")
+
+    def fetch(
+        self,
+        symbol: str,
+        interval: str,
+        limit: int,
+        start_time: Optional[int] = None
+    ) -> List[List[Any]]:
+        """
+        拉取 K 线
+
+        Args:
+            symbol: 交易对符号 (e.g., "BTC-USD")
+            interval: K 线周期 (e.g., "5m")
+            limit: 最多返回根数
+            start_time: 起始开盘时间（毫秒），None 表示最近 limit 根
+
+        Raises:
+            ValueError: HTTP 状态错误
+        """
+        params = {
+            "symbol": self.to_binance_symbol(symbol),
+            "interval": interval,
+            "limit": limit
+        }
+        if start_time is not None:
+            params["startTime"] = int(start_time)
+        response = self.session.get(f"{self.base_url}/api/v3/klines", params=params, timeout=self.timeout)
+        if not response.ok:
+            raise ValueError(f"HTTP {response.status_code}: {response.text}")
+        return response.json()
+
+
+class FileKlineSource:
+    """
+    本地文件 K 线源（离线测试 / 回放）
+
+    文件为 {directory}/{symbol}_{interval}.json，内容是币安格式的 K 线行列表；
+    KlineStore 的持久化文件格式相同，缓存目录可直接作为文件源使用。
+    """
+
+    def __init__(self, directory: str, clock: Optional[Callable[[], float]] = None):
+        """
+        Args:
+            directory: K 线文件目录
+            clock: 回放时钟（秒），指定后只返回开盘时间不晚于当前时间的 K 线
+        """
+        self.directory = directory
+        self.clock = clock
+
+    def path_for(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.directory, f"{symbol}_{interval}.json")
+
+    def fetch(
+        self,
+        symbol: str,
+        interval: str,
+        limit: int,
+        start_time: Optional[int] = None
+    ) -> List[List[Any]]:
+        path = self.path_for(symbol, interval)
+        if not os.path.exists(path):
+            return []
+        with open(path, "r", encoding="utf-8") as f:
+            rows = json.load(f)
+        if self.clock is not None:
+            now_ms = self.clock() * 1000
+            rows = [row for row in rows if int(row[OPEN_TIME]) <= now_ms]
+        if start_time is not None:
+            rows = [row for row in rows if int(row[OPEN_TIME]) >= start_time]
+            return rows[:limit]
+        return rows[-limit:]
+
+
+class CandleRing:
+    """固定容量的 K 线环形缓冲区（只保存已收盘 K 线）"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = np.empty((capacity, _COLUMNS), dtype=float)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_open_time(self) -> Optional[int]:
+        if not self._size:
+            return None
+        return int(self._data[(self._start + self._size - 1) % self.capacity, OPEN_TIME])
+
+    def extend(self, rows: np.ndarray) -> int:
+        """追加 K 线（跳过开盘时间不晚于最后一根的行），返回实际追加根数"""
+        last = self.last_open_time
+        if last is not None:
+            rows = rows[rows[:, OPEN_TIME] > last]
+        if len(rows) > self.capacity:
+            rows = rows[-self.capacity:]
+        for row in rows:
+            if self._size < self.capacity:
+                self._data[(self._start + self._size) % self.capacity] = row
+                self._size += 1
+            else:
+                self._data[self._start] = row
+                self._start = (self._start + 1) % self.capacity
+        return len(rows)
+
+    def view(self, limit: Optional[int] = None) -> np.ndarray:
+        """按时间顺序返回最近 limit 根（副本）"""
+        count = self._size if limit is None else min(limit, self._size)
+        first = self._start + self._size - count
+        idx = np.arange(first, first + count) % self.capacity
+        return self._data[idx]
+
+    def clear(self):
+        self._start = 0
+        self._size = 0
+
+
+class KlineWindow:
+    """一次查询结果：已收盘 K 线 + 当前未收盘 K 线"""
+
+    def __init__(self, closed: np.ndarray, forming: Optional[np.ndarray]):
+        self.closed = closed
+        self.forming = forming
+
+    def __len__(self) -> int:
+        return len(self.closed) + (1 if self.forming is not None else 0)
+
+    def column(self, col: int, include_forming: bool = True) -> np.ndarray:
+        values = self.closed[:, col]
+        if include_forming and self.forming is not None:
+            values = np.append(values, self.forming[col])
+        return values
+
+    def arrays(self, include_forming: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(open_times, highs, lows, closes)，从旧到新"""
+        return (
+            self.column(OPEN_TIME, include_forming).astype(np.int64),
+            self.column(HIGH, include_forming),
+            self.column(LOW, include_forming),
+            self.column(CLOSE, include_forming),
+        )
+
+
+class _Series:
+    """单个 (symbol, interval) 的缓存"""
+
+    def __init__(self, capacity: int):
+        self.ring = CandleRing(capacity)
+        self.forming: Optional[np.ndarray] = None
+        self.fetched_at = float("-inf")
+        # 已按多大的 limit 回补过历史（数据源历史不足时避免每次重复回补）
+        self.backfill_limit = 0
+        self.lock = threading.Lock()
+        self.loaded = False
+
+
+class KlineStore:
+    """K 线缓存"""
+
+    def __init__(
+        self,
+        source=None,
+        capacity: int = 500,
+        forming_ttl: float = 5.0,
+        cache_dir: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+        max_fetch: int = 1000
+    ):
+        """
+        初始化 K 线缓存
+
+        Args:
+            source: K 线源，需实现 fetch(symbol, interval, limit, start_time)，默认币安
+            capacity: 每个 (symbol, interval) 保存的已收盘 K 线上限
+            forming_ttl: 未收盘 K 线刷新间隔（秒）
+            cache_dir: 持久化目录，None 表示不落盘
+            clock: 当前时间（秒），离线回放时可替换
+            max_fetch: 单次请求最大根数（币安上限 1000）
+        """
+        self.source = source or BinanceKlineSource()
+        self.capacity = capacity
+        self.forming_ttl = forming_ttl
+        self.cache_dir = cache_dir
+        self.clock = clock
+        self.max_fetch = max_fetch
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._lock = threading.Lock()
+        self.fetch_count = 0
+
+    def _get_series(self, symbol: str, interval: str) -> _Series:
+        key = (symbol, interval)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(self.capacity)
+            return series
+
+    def _cache_path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.cache_dir, f"{symbol}_{interval}.json")
+
+    def _load(self, series: _Series, symbol: str, interval: str):
+        series.loaded = True
+        if not self.cache_dir:
+            return
+        path = self._cache_path(symbol, interval)
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                series.ring.extend(_rows_to_array(json.load(f)))
+        except (OSError, ValueError):
+            series.ring.clear()
+
+    def _save(self, series: _Series, symbol: str, interval: str):
+        if not self.cache_dir:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._cache_path(symbol, interval)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(_array_to_rows(series.ring.view()), f)
+        os.replace(tmp_path, path)
+
+    def _fetch(self, symbol: str, interval: str, limit: int, start_time: Optional[int]) -> np.ndarray:
+        self.fetch_count += 1
+        rows = self.source.fetch(symbol, interval, min(limit, self.max_fetch), start_time)
+        return _rows_to_array(rows)
+
+    def _ingest(self, series: _Series, rows: np.ndarray, now: float) -> int:
+        """拆分已收盘 / 未收盘 K 线并写入缓存，返回新增已收盘根数"""
+        series.fetched_at = now
+        if not len(rows):
+            return 0
+        is_closed = rows[:, CLOSE_TIME] < now * 1000
+        added = series.ring.extend(rows[is_closed])
+        forming = rows[~is_closed]
+        if len(forming):
+            series.forming = forming[-1].copy()
+        elif series.forming is not None and series.forming[OPEN_TIME] <= (series.ring.last_open_time or -1):
+            series.forming = None
+        return added
+
+    def get(self, symbol: str, interval: str, limit: int = 100) -> KlineWindow:
+        """
+        获取最近 limit 根已收盘 K 线及当前未收盘 K 线
+
+        - 缓存不足 limit 根：拉取最近 limit 根
+        - 已到下一根 K 线收盘边界：从最后一根已收盘 K 线之后增量拉取
+        - 未到边界：只在未收盘 K 线超过 TTL 时刷新这一根
+
+        Raises:
+            Exception: 数据源请求失败
+        """
+        series = self._get_series(symbol, interval)
+        interval_ms = interval_to_ms(interval)
+        with series.lock:
+            if not series.loaded:
+                self._load(series, symbol, interval)
+
+            now = self.clock()
+            now_ms = now * 1000
+            last = series.ring.last_open_time
+            if last is not None and interval_ms is not None and now_ms - last > self.max_fetch * interval_ms:
+                # 缓存落后太多（长时间停机），直接丢弃重新拉取
+                series.ring.clear()
+                series.backfill_limit = 0
+                last = None
+
+            fetch_stale = now - series.fetched_at >= self.forming_ttl
+            backfill = len(series.ring) < min(limit, self.capacity) and limit > series.backfill_limit
+            if last is None or backfill:
+                series.backfill_limit = limit
+                rows = self._fetch(symbol, interval, limit + 1, None)
+                if last is not None and len(rows):
+                    if rows[0, OPEN_TIME] > last + (interval_ms or 0):
+                        # 与缓存之间有缺口，丢弃旧缓存
+                        series.ring.clear()
+                    else:
+                        # 与缓存重叠：以拉取结果为准重建缓冲区（extend 只追加比最后一根更新的行，
+                        # 否则比缓存更早的历史永远补不进来），只保留比拉取结果更早的缓存行
+                        cached = series.ring.view()
+                        series.ring.clear()
+                        series.ring.extend(cached[cached[:, OPEN_TIME] < rows[0, OPEN_TIME]])
+                added = self._ingest(series, rows, now)
+            elif interval_ms is not None and now_ms >= last + 2 * interval_ms:
+                # 最后一根已收盘 K 线之后至少又收盘了一根：增量拉取
+                added = self._ingest(series, self._fetch(symbol, interval, self.max_fetch, last + interval_ms), now)
+            elif fetch_stale:
+                # 未到收盘边界（或周期不定长）：只刷新未收盘 K 线
+                start = last + (interval_ms or 1)
+                count = 1 if interval_ms is not None else self.max_fetch
+                added = self._ingest(series, self._fetch(symbol, interval, count, start), now)
+            else:
+                added = 0
+
+            if added:
+                self._save(series, symbol, interval)
+
+            forming = series.forming
+            if forming is not None and forming[CLOSE_TIME] < now_ms:
+                # 缓存中的未收盘 K 线已过收盘时间但尚未确认，不再作为未收盘 K 线返回
+                forming = None
+            return KlineWindow(series.ring.view(limit), None if forming is None else forming.copy())
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            series = dict(self._series)
+        return {
+            "fetch_count": self.fetch_count,
+            "series": {
+                f"{symbol}_{interval}": {"closed": len(s.ring), "last_open_time": s.ring.last_open_time}
+                for (symbol, interval), s in series.items()
+            },
+        }
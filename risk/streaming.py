@@ -0,0 +1,416 @@
+"""
+Streaming Indicators
+流式技术指标（Wilder 平滑）
+
+按 (symbol, timeframe) 保存 ADX / RSI 的 Wilder 平滑状态：
+- 首次使用时用 NumPy 向量化预热整段历史 K 线
+- 之后每根新 K 线 O(1) 更新，不再重复计算整段序列
+- peek() 用未收盘 K 线计算临时值，不改变已提交状态
+
+计算口径与 TA-Lib 的 ADX / RSI 一致（无 unstable period）。
+"""
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# 线性递推分块长度：块内累乘系数不低于 ((p-1)/p)^128，period >= 2 时不会溢出
+_CHUNK = 128
+# 与 TA-Lib 的 TA_IS_ZERO 相同的零值判断
+_EPSILON = 1e-14
+
+
+def _is_zero(value: float) -> bool:
+    return -_EPSILON < value < _EPSILON
+
+
+def _linear_recurrence(coef: np.ndarray, offset: np.ndarray, y0: float) -> np.ndarray:
+    """
+    向量化求解 y[n] = coef[n] * y[n-1] + offset[n]
+
+    分块使用闭式解 y[n] = P[n] * (y0 + sum(offset[k] / P[k]))，P 为 coef 的累乘。
+
+    Returns:
+        np.ndarray: y[0..n-1]（不含 y0）
+    """
+    out = np.empty(len(offset), dtype=float)
+    for start in range(0, len(offset), _CHUNK):
+        stop = start + _CHUNK
+        prod = np.cumprod(coef[start:stop])
+        out[start:stop] = prod * (y0 + np.cumsum(offset[start:stop] / prod))
+        y0 = out[stop - 1] if stop <= len(offset) else out[-1]
+    return out
+
+
+def _check_period(period: int):
+    if period < 2:
+        raise ValueError(f"指标周期必须 >= 2: {period}")
+
+
+class StreamingRSI:
+    """流式 RSI（Wilder 平滑）"""
+
+    def __init__(self, period: int = 14):
+        _check_period(period)
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.prev_close: Optional[float] = None
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.value: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.value is not None
+
+    def _rsi(self, avg_gain: float, avg_loss: float) -> float:
+        total = avg_gain + avg_loss
+        return 100.0 * (avg_gain / total) if not _is_zero(total) else 0.0
+
+    def _next(self, close: float) -> Tuple[float, float, Optional[float]]:
+        """计算加入一根 K 线后的 (avg_gain, avg_loss, rsi)，不修改状态"""
+        p = self.period
+        delta = close - self.prev_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        if self.count < p:
+            # 初始阶段：avg_gain / avg_loss 暂存累加和
+            avg_gain = self.avg_gain + gain
+            avg_loss = self.avg_loss + loss
+            if self.count + 1 < p:
+                return avg_gain, avg_loss, None
+            avg_gain /= p
+            avg_loss /= p
+        else:
+            avg_gain = (self.avg_gain * (p - 1) + gain) / p
+            avg_loss = (self.avg_loss * (p - 1) + loss) / p
+        return avg_gain, avg_loss, self._rsi(avg_gain, avg_loss)
+
+    def update(self, close: float) -> Optional[float]:
+        """提交一根已收盘 K 线，返回最新 RSI（数据不足时为 None）"""
+        close = float(close)
+        if self.prev_close is not None:
+            self.avg_gain, self.avg_loss, self.value = self._next(close)
+            self.count += 1
+        self.prev_close = close
+        return self.value
+
+    def peek(self, close: float) -> Optional[float]:
+        """用未收盘 K 线计算临时 RSI，不修改状态"""
+        if self.prev_close is None:
+            return None
+        return self._next(float(close))[2]
+
+    def warmup(self, closes: Sequence[float]) -> Optional[float]:
+        """用一段历史收盘价（从旧到新）向量化初始化状态"""
+        self.reset()
+        closes = np.asarray(closes, dtype=float)
+        p = self.period
+        if len(closes) <= p:
+            for close in closes:
+                self.update(close)
+            return self.value
+
+        deltas = np.diff(closes)
+        gains = np.where(deltas > 0, deltas, 0.0)
+        losses = np.where(deltas < 0, -deltas, 0.0)
+        avg_gain = gains[:p].sum() / p
+        avg_loss = losses[:p].sum() / p
+        rest = len(deltas) - p
+        if rest > 0:
+            coef = np.full(rest, (p - 1) / p)
+            avg_gain = _linear_recurrence(coef, gains[p:] / p, avg_gain)[-1]
+            avg_loss = _linear_recurrence(coef, losses[p:] / p, avg_loss)[-1]
+
+        self.count = len(deltas)
+        self.prev_close = float(closes[-1])
+        self.avg_gain = float(avg_gain)
+        self.avg_loss = float(avg_loss)
+        self.value = self._rsi(self.avg_gain, self.avg_loss)
+        return self.value
+
+
+class StreamingADX:
+    """流式 ADX（Wilder 平滑）"""
+
+    def __init__(self, period: int = 14):
+        _check_period(period)
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.prev: Optional[Tuple[float, float, float]] = None
+        self.tr = 0.0
+        self.plus_dm = 0.0
+        self.minus_dm = 0.0
+        self.sum_dx = 0.0
+        self.value: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.value is not None
+
+    @staticmethod
+    def _dx(tr: float, plus_dm: float, minus_dm: float) -> Optional[float]:
+        if _is_zero(tr):
+            return None
+        plus_di = 100.0 * plus_dm / tr
+        minus_di = 100.0 * minus_dm / tr
+        di_sum = plus_di + minus_di
+        if _is_zero(di_sum):
+            return None
+        return 100.0 * abs(plus_di - minus_di) / di_sum
+
+    def _next(self, high: float, low: float, close: float) -> tuple:
+        """计算加入一根 K 线后的 (tr, plus_dm, minus_dm, sum_dx, adx)，不修改状态"""
+        p = self.period
+        prev_high, prev_low, prev_close = self.prev
+        up = high - prev_high
+        down = prev_low - low
+        plus_dm = up if up > 0 and up > down else 0.0
+        minus_dm = down if down > 0 and down > up else 0.0
+        tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+        n = self.count + 1
+        if n < p:
+            return self.tr + tr, self.plus_dm + plus_dm, self.minus_dm + minus_dm, 0.0, None
+
+        a = 1.0 - 1.0 / p
+        tr = self.tr * a + tr
+        plus_dm = self.plus_dm * a + plus_dm
+        minus_dm = self.minus_dm * a + minus_dm
+        dx = self._dx(tr, plus_dm, minus_dm)
+        if n < 2 * p:
+            sum_dx = self.sum_dx + (dx or 0.0)
+            adx = sum_dx / p if n == 2 * p - 1 else None
+            return tr, plus_dm, minus_dm, sum_dx, adx
+
+        adx = self.value if dx is None else (self.value * (p - 1) + dx) / p
+        return tr, plus_dm, minus_dm, self.sum_dx, adx
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        """提交一根已收盘 K 线，返回最新 ADX（数据不足时为 None）"""
+        high, low, close = float(high), float(low), float(close)
+        if self.prev is not None:
+            self.tr, self.plus_dm, self.minus_dm, self.sum_dx, self.value = self._next(high, low, close)
+            self.count += 1
+        self.prev = (high, low, close)
+        return self.value
+
+    def peek(self, high: float, low: float, close: float) -> Optional[float]:
+        """用未收盘 K 线计算临时 ADX，不修改状态"""
+        if self.prev is None:
+            return None
+        return self._next(float(high), float(low), float(close))[4]
+
+    def warmup(
+        self,
+        highs: Sequence[float],
+        lows: Sequence[float],
+        closes: Sequence[float]
+    ) -> Optional[float]:
+        """用一段历史 K 线（从旧到新）向量化初始化状态"""
+        self.reset()
+        highs = np.asarray(highs, dtype=float)
+        lows = np.asarray(lows, dtype=float)
+        closes = np.asarray(closes, dtype=float)
+        p = self.period
+        n = len(closes)
+        if n < 2 * p:
+            for high, low, close in zip(highs, lows, closes):
+                self.update(high, low, close)
+            return self.value
+
+        up = highs[1:] - highs[:-1]
+        down = lows[:-1] - lows[1:]
+        plus_dm = np.where((up > 0) & (up > down), up, 0.0)
+        minus_dm = np.where((down > 0) & (down > up), down, 0.0)
+        prev_close = closes[:-1]
+        tr = np.maximum.reduce([
+            highs[1:] - lows[1:],
+            np.abs(highs[1:] - prev_close),
+            np.abs(lows[1:] - prev_close),
+        ])
+
+        # 前 p-1 根累加，之后 Wilder 平滑（TA-Lib 口径：s = s * (1 - 1/p) + x）
+        head = p - 1
+        coef = np.full(len(tr) - head, 1.0 - 1.0 / p)
+        s_tr = _linear_recurrence(coef, tr[head:], tr[:head].sum())
+        s_plus = _linear_recurrence(coef, plus_dm[head:], plus_dm[:head].sum())
+        s_minus = _linear_recurrence(coef, minus_dm[head:], minus_dm[:head].sum())
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            plus_di = 100.0 * s_plus / s_tr
+            minus_di = 100.0 * s_minus / s_tr
+            di_sum = plus_di + minus_di
+            dx = 100.0 * np.abs(plus_di - minus_di) / di_sum
+        valid = (np.abs(s_tr) >= _EPSILON) & (np.abs(di_sum) >= _EPSILON)
+        dx = np.where(valid, dx, 0.0)
+
+        # 前 p 个 DX 取平均得到首个 ADX，之后 Wilder 平滑（DX 无效时保持不变）
+        sum_dx = float(dx[:p].sum())
+        adx = sum_dx / p
+        if len(dx) > p:
+            tail_valid = valid[p:]
+            adx_coef = np.where(tail_valid, (p - 1) / p, 1.0)
+            adx = _linear_recurrence(adx_coef, dx[p:] / p, adx)[-1]
+
+        self.count = n - 1
+        self.prev = (float(highs[-1]), float(lows[-1]), float(closes[-1]))
+        self.tr = float(s_tr[-1])
+        self.plus_dm = float(s_plus[-1])
+        self.minus_dm = float(s_minus[-1])
+        self.sum_dx = sum_dx
+        self.value = float(adx)
+        return self.value
+
+
+class IndicatorState:
+    """单个 (symbol, timeframe) 的指标状态"""
+
+    def __init__(self, adx_period: int = 14, rsi_period: int = 14):
+        self.adx = StreamingADX(adx_period)
+        self.rsi = StreamingRSI(rsi_period)
+        self.last_open_time: Optional[int] = None
+        self.forming: Optional[Tuple[float, float, float]] = None
+
+    def reset(self):
+        self.adx.reset()
+        self.rsi.reset()
+        self.last_open_time = None
+        self.forming = None
+
+    def warmup(
+        self,
+        open_times: Sequence[int],
+        highs: Sequence[float],
+        lows: Sequence[float],
+        closes: Sequence[float]
+    ):
+        """用已收盘 K 线（从旧到新）重建状态"""
+        self.reset()
+        if len(open_times) == 0:
+            return
+        self.adx.warmup(highs, lows, closes)
+        self.rsi.warmup(closes)
+        self.last_open_time = int(open_times[-1])
+
+    def update(self, open_time: int, high: float, low: float, close: float) -> bool:
+        """提交一根已收盘 K 线；open_time 不晚于已提交 K 线时忽略并返回 False"""
+        open_time = int(open_time)
+        if self.last_open_time is not None and open_time <= self.last_open_time:
+            return False
+        self.adx.update(high, low, close)
+        self.rsi.update(close)
+        self.last_open_time = open_time
+        return True
+
+    def get_adx(self) -> Optional[float]:
+        """ADX 值（有未收盘 K 线时包含该 K 线）"""
+        if self.forming is not None:
+            return self.adx.peek(*self.forming)
+        return self.adx.value
+
+    def get_rsi(self) -> Optional[float]:
+        """RSI 值（有未收盘 K 线时包含该 K 线）"""
+        if self.forming is not None:
+            return self.rsi.peek(self.forming[2])
+        return self.rsi.value
+
+
+class IndicatorEngine:
+    """
+    流式指标引擎
+
+    按 (symbol, timeframe) 保存指标状态，线程安全；
+    ingest() 接收任意一段 K 线，自动区分首次预热、增量更新和断档重建。
+    """
+
+    def __init__(self, adx_period: int = 14, rsi_period: int = 14):
+        self.adx_period = adx_period
+        self.rsi_period = rsi_period
+        self._states: Dict[Tuple[str, str], IndicatorState] = {}
+        self._lock = threading.Lock()
+
+    def get_state(self, symbol: str, timeframe: str) -> IndicatorState:
+        key = (symbol, timeframe)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = IndicatorState(self.adx_period, self.rsi_period)
+        return state
+
+    def needs_warmup(self, symbol: str, timeframe: str) -> bool:
+        """状态为空时需要拉取完整历史 K 线"""
+        with self._lock:
+            state = self._states.get((symbol, timeframe))
+            return state is None or state.last_open_time is None
+
+    def ingest(
+        self,
+        symbol: str,
+        timeframe: str,
+        open_times: Sequence[int],
+        highs: Sequence[float],
+        lows: Sequence[float],
+        closes: Sequence[float],
+        last_is_forming: bool = True
+    ) -> bool:
+        """
+        写入一段 K 线（从旧到新）
+
+        Args:
+            open_times: K 线开盘时间
+            highs / lows / closes: 最高价 / 最低价 / 收盘价
+            last_is_forming: 最后一根是否为未收盘 K 线（只用于临时值，不提交）
+
+        Returns:
+            bool: False 表示本段与已有状态没有重叠（可能断档），状态已清空，
+                调用方应拉取完整历史后重新写入
+        """
+        count = len(open_times)
+        closed = count - 1 if last_is_forming and count else count
+        with self._lock:
+            state = self.get_state(symbol, timeframe)
+            if state.last_open_time is None:
+                state.warmup(open_times[:closed], highs[:closed], lows[:closed], closes[:closed])
+            else:
+                if closed and int(open_times[0]) > state.last_open_time:
+                    # 本段与已提交 K 线没有重叠，无法确认中间没有缺失
+                    state.reset()
+                    return False
+                for i in range(closed):
+                    state.update(open_times[i], highs[i], lows[i], closes[i])
+            state.forming = (
+                (float(highs[-1]), float(lows[-1]), float(closes[-1]))
+                if last_is_forming and count else None
+            )
+            return True
+
+    def last_open_time(self, symbol: str, timeframe: str) -> Optional[int]:
+        """最后一根已提交 K 线的开盘时间"""
+        with self._lock:
+            state = self._states.get((symbol, timeframe))
+            return state.last_open_time if state is not None else None
+
+    def get_adx(self, symbol: str, timeframe: str) -> Optional[float]:
+        with self._lock:
+            state = self._states.get((symbol, timeframe))
+            return state.get_adx() if state is not None else None
+
+    def get_rsi(self, symbol: str, timeframe: str) -> Optional[float]:
+        with self._lock:
+            state = self._states.get((symbol, timeframe))
+            return state.get_rsi() if state is not None else None
+
+    def reset(self, symbol: Optional[str] = None, timeframe: Optional[str] = None):
+        """清空指定（或全部）状态"""
+        with self._lock:
+            if symbol is None:
+                self._states.clear()
+            else:
+                self._states.pop((symbol, timeframe), None)
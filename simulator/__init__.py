@@ -0,0 +1,19 @@
+"""
+Exchange Simulator
+本地 StandX 交易所模拟器：不访问 perps.standx.com 即可对适配器 / 策略做端到端压测
+
+    python -m simulator --port 8080 --latency lognormal:20,0.5 --error_rate 0.01 --rate_limit 20
+"""
+from simulator.faults import LatencyModel, ErrorRule, RateLimitRule, RateLimiter, TokenBucket, FaultConfig
+from simulator.standx_server import StandXSimulator, SimRequestError
+
+__all__ = [
+    "LatencyModel",
+    "ErrorRule",
+    "RateLimitRule",
+    "RateLimiter",
+    "TokenBucket",
+    "FaultConfig",
+    "StandXSimulator",
+    "SimRequestError",
+]
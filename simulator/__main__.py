@@ -0,0 +1,92 @@
+"""
+模拟器命令行
+
+用法:
+    # 默认配置（BTC-USD 随机游走，无延迟 / 故障 / 限流）
+    python -m simulator --port 8080
+
+    # 配置文件 + 命令行覆盖默认延迟 / 错误率 / 限流
+    python -m simulator -c simulator/standx_sim.yaml --port 8080 \\
+        --latency lognormal:20,0.5 --error_rate 0.01 --rate_limit 20 --rate_burst 40
+
+策略 / 适配器配置中把 base_url / auth_url / geo_url 都指向 http://127.0.0.1:8080 即可使用模拟器。
+"""
+import argparse
+import asyncio
+import json
+
+import yaml
+
+from simulator.standx_server import StandXSimulator
+
+
+def build_config(args) -> dict:
+    config = {}
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+    faults = config.setdefault("faults", {})
+    if args.latency is not None:
+        faults.setdefault("latency", {})["default"] = args.latency
+    if args.error_rate is not None or args.timeout_rate is not None:
+        default = dict((faults.setdefault("errors", {}).get("default")) or {})
+        if args.error_rate is not None:
+            default["rate"] = args.error_rate
+        if args.timeout_rate is not None:
+            default["timeout_rate"] = args.timeout_rate
+        faults["errors"]["default"] = default
+    if args.reject_rate is not None:
+        new_order = dict((faults.setdefault("errors", {}).get("new_order")) or {})
+        new_order["reject_rate"] = args.reject_rate
+        faults["errors"]["new_order"] = new_order
+    if args.rate_limit is not None:
+        faults.setdefault("rate_limits", {})["default"] = (
+            {"rate": args.rate_limit, "burst": args.rate_burst or args.rate_limit} if args.rate_limit > 0 else None
+        )
+    if args.seed is not None:
+        config["seed"] = args.seed
+    if args.no_verify:
+        config["verify_signatures"] = False
+    return config
+
+
+async def serve(config: dict, host: str, port: int, stats_interval: float):
+    simulator = StandXSimulator(config)
+    url = await simulator.start(host, port)
+    print(f"[SIM] listening on {url}", flush=True)
+    print(f"[SIM] faults {json.dumps(simulator.faults.describe(), ensure_ascii=False)}", flush=True)
+    try:
+        while True:
+            await asyncio.sleep(stats_interval or 3600)
+            if stats_interval:
+                stats = simulator.get_stats()
+                stats.pop("endpoints")
+                print(f"[SIM] {json.dumps(stats, ensure_ascii=False)}", flush=True)
+    finally:
+        await simulator.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地 StandX 交易所模拟器")
+    parser.add_argument("-c", "--config", type=str, help="模拟器配置文件（见 simulator/standx_sim.yaml）")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=str, help="默认延迟分布，如 lognormal:20,0.5")
+    parser.add_argument("--error_rate", type=float, help="默认 HTTP 错误注入概率")
+    parser.add_argument("--timeout_rate", type=float, help="默认挂起（超时）注入概率")
+    parser.add_argument("--reject_rate", type=float, help="下单业务拒绝概率")
+    parser.add_argument("--rate_limit", type=float, help="默认每账户每秒请求数，0 表示不限")
+    parser.add_argument("--rate_burst", type=float, help="默认限流突发容量")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--no_verify", action="store_true", help="不校验请求签名")
+    parser.add_argument("--stats_interval", type=float, default=0, help="每隔 N 秒打印统计，0 表示不打印")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(build_config(args), args.host, args.port, args.stats_interval))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
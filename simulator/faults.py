@@ -0,0 +1,225 @@
+"""
+Fault Models
+模拟器的延迟分布 / 错误注入 / 限流
+
+三者都按接口名配置（new_order / cancel_orders / query_open_orders ...），
+"default" 为未单独配置的接口的默认值。
+
+延迟分布写法（毫秒）:
+    fixed:5              固定 5ms
+    uniform:2,10         2 ~ 10ms 均匀分布
+    normal:20,5          均值 20ms、标准差 5ms（小于 0 截断为 0）
+    lognormal:20,0.5     中位数 20ms、对数标准差 0.5（长尾）
+    exponential:10       均值 10ms
+    0 / none             无延迟
+"""
+import math
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+from ratelimit.limiter import TokenBucket
+
+DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+
+class LatencyModel:
+    """单个接口的延迟分布"""
+
+    def __init__(self, kind: str = "fixed", *params: float):
+        if kind not in DISTRIBUTIONS:
+            raise ValueError(f"不支持的延迟分布: {kind}，支持: {', '.join(DISTRIBUTIONS)}")
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exponential": 1}[kind]
+        if len(params) != expected:
+            raise ValueError(f"延迟分布 {kind} 需要 {expected} 个参数，实际 {len(params)} 个")
+        self.kind = kind
+        self.params = params
+
+    @classmethod
+    def parse(cls, spec: Any) -> "LatencyModel":
+        """
+        解析延迟配置："lognormal:20,0.5" / 数字（固定毫秒）/ None（无延迟）
+
+        Raises:
+            ValueError: 格式错误或分布不支持
+        """
+        if spec is None or spec == "none":
+            return cls("fixed", 0.0)
+        if isinstance(spec, (int, float)):
+            return cls("fixed", float(spec))
+        kind, _, args = str(spec).partition(":")
+        kind = kind.strip()
+        if not args:
+            return cls("fixed", float(kind))
+        try:
+            params = [float(value) for value in args.split(",")]
+        except ValueError:
+            raise ValueError(f"无效的延迟配置: {spec}")
+        return cls(kind, *params)
+
+    def sample(self, rng: random.Random) -> float:
+        """采样一次延迟（秒）"""
+        p = self.params
+        if self.kind == "fixed":
+            ms = p[0]
+        elif self.kind == "uniform":
+            ms = rng.uniform(p[0], p[1])
+        elif self.kind == "normal":
+            ms = rng.gauss(p[0], p[1])
+        elif self.kind == "lognormal":
+            ms = p[0] * math.exp(rng.gauss(0.0, p[1])) if p[0] > 0 else 0.0
+        else:
+            ms = rng.expovariate(1.0 / p[0]) if p[0] > 0 else 0.0
+        return max(ms, 0.0) / 1000
+
+    def __repr__(self) -> str:
+        return f"{self.kind}:{','.join(f'{value:g}' for value in self.params)}"
+
+
+class ErrorRule:
+    """
+    单个接口的错误注入规则
+
+    Args:
+        rate: 返回 HTTP 错误的概率（状态码从 status 中随机选取）
+        status: 注入的 HTTP 状态码列表，默认 [500, 502, 503]
+        timeout_rate: 挂起不响应的概率（挂起 timeout_seconds 秒后返回 504，用于测试客户端超时）
+        timeout_seconds: 挂起时长
+        reject_rate: 业务拒绝的概率（HTTP 200，code != 0，只对 new_order 生效）
+    """
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        status: Optional[List[int]] = None,
+        timeout_rate: float = 0.0,
+        timeout_seconds: float = 30.0,
+        reject_rate: float = 0.0,
+    ):
+        self.rate = float(rate)
+        self.status = [int(code) for code in status] if status else [500, 502, 503]
+        self.timeout_rate = float(timeout_rate)
+        self.timeout_seconds = float(timeout_seconds)
+        self.reject_rate = float(reject_rate)
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "ErrorRule":
+        if isinstance(data, ErrorRule):
+            return data
+        if isinstance(data, (int, float)):
+            return cls(rate=data)
+        return cls(**(data or {}))
+
+    def draw(self, rng: random.Random) -> Optional[Tuple[str, Any]]:
+        """
+        抽取本次请求的故障
+
+        Returns:
+            None 表示正常处理；("status", 状态码) / ("timeout", 秒数) / ("reject", None)
+        """
+        roll = rng.random()
+        if roll < self.timeout_rate:
+            return "timeout", self.timeout_seconds
+        roll -= self.timeout_rate
+        if roll < self.rate:
+            return "status", rng.choice(self.status)
+        roll -= self.rate
+        if roll < self.reject_rate:
+            return "reject", None
+        return None
+
+
+class RateLimitRule:
+    """
+    单个接口的限流规则
+
+    Args:
+        rate: 每秒请求数
+        burst: 突发容量，默认等于 rate
+        scope: "account"（按登录账户计数；单独配置给未登录接口时按客户端 IP）/ "ip" / "global"
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None, scope: str = "account"):
+        if scope not in ("account", "ip", "global"):
+            raise ValueError(f"不支持的限流范围: {scope}")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else rate)
+        self.scope = scope
+
+    @classmethod
+    def from_dict(cls, data: Any) -> Optional["RateLimitRule"]:
+        if data is None or isinstance(data, RateLimitRule):
+            return data
+        if isinstance(data, (int, float)):
+            return cls(rate=data) if data > 0 else None
+        return cls(**data)
+
+
+class RateLimiter:
+    """按 (接口, 范围键) 维护令牌桶"""
+
+    def __init__(self, rules: Dict[str, Optional[RateLimitRule]]):
+        self.rules = rules
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+
+    def allow(self, endpoint: str, account: Optional[str], ip: str, now: float) -> bool:
+        name = endpoint if endpoint in self.rules else "default"
+        rule = self.rules.get(name)
+        if rule is None:
+            return True
+        if rule.scope == "global":
+            key = ""
+        elif rule.scope == "account" and account is not None:
+            key = account
+        elif rule.scope == "account" and name == "default":
+            # 未登录接口（prepare-signin / login / 行情）不受按账户的默认限流约束，需要时单独配置
+            return True
+        else:
+            key = ip
+        # 未单独配置的接口共用 default 桶（与按账户总请求数限流的交易所行为一致）
+        bucket = self._buckets.get((name, key))
+        if bucket is None:
+            bucket = self._buckets[(name, key)] = TokenBucket(rule.rate, rule.burst, now)
+        return bucket.acquire(now)
+
+
+class FaultConfig:
+    """
+    模拟器故障配置
+
+    配置格式（与 simulator/standx_sim.yaml 中的 faults 段相同）:
+        latency: {default: "lognormal:20,0.5", new_order: "lognormal:40,0.6"}
+        errors: {default: {rate: 0.001}, new_order: {rate: 0.01, reject_rate: 0.01}}
+        rate_limits: {default: {rate: 20, burst: 40}, new_order: {rate: 10}}
+    """
+
+    def __init__(
+        self,
+        latency: Optional[Dict[str, Any]] = None,
+        errors: Optional[Dict[str, Any]] = None,
+        rate_limits: Optional[Dict[str, Any]] = None,
+    ):
+        latency = dict(latency or {})
+        latency.setdefault("default", None)
+        self.latency = {name: LatencyModel.parse(spec) for name, spec in latency.items()}
+        errors = dict(errors or {})
+        errors.setdefault("default", None)
+        self.errors = {name: ErrorRule.from_dict(rule) for name, rule in errors.items()}
+        self.rate_limits = {name: RateLimitRule.from_dict(rule) for name, rule in (rate_limits or {}).items()}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "FaultConfig":
+        data = data or {}
+        return cls(data.get("latency"), data.get("errors"), data.get("rate_limits"))
+
+    def latency_for(self, endpoint: str) -> LatencyModel:
+        return self.latency.get(endpoint, self.latency["default"])
+
+    def errors_for(self, endpoint: str) -> ErrorRule:
+        return self.errors.get(endpoint, self.errors["default"])
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "latency": {name: repr(model) for name, model in self.latency.items()},
+            "errors": {name: dict(vars(rule)) for name, rule in self.errors.items()},
+            "rate_limits": {name: dict(vars(rule)) if rule else None for name, rule in self.rate_limits.items()},
+        }
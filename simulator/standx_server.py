@@ -0,0 +1,724 @@
+"""
+StandX Exchange Simulator
+本地 StandX 交易所模拟器（压测用）
+
+实现 StandXAuth / StandXPerpHTTP 使用的 REST 接口，三个域名（api / geo / perps）由同一个服务提供：
+    POST /v1/offchain/prepare-signin    POST /v1/offchain/login     GET /v1/region
+    GET  /api/health                    POST /api/new_order         POST /api/cancel_orders
+    GET  /api/query_open_orders         GET  /api/query_positions   GET  /api/query_balance
+    GET  /api/query_symbol_price
+以及管理接口：
+    GET  /sim/stats        请求数 / 注入的故障 / 订单 / 成交统计
+    POST /sim/reset_stats  清空统计
+    POST /sim/faults       替换故障配置（格式见 FaultConfig）
+    POST /sim/price        {"symbol": ..., "price": ...} 直接设置价格（撮合穿过的挂单）
+
+撮合与持仓记账复用 backtest.matching.MatchingEngine（每个账户每个交易对一个引擎），
+价格按随机游走（或循环回放 K 线）每 tick_interval 秒更新一次。
+登录不校验钱包签名（verify_wallet 为 true 时校验 bsc 的 EIP-191 签名），
+下单 / 撤单校验 ed25519 请求签名（与 prepare-signin 时的 requestId 公钥对应）。
+
+所有状态只在事件循环线程内修改，不需要加锁；单进程可支撑数百个账户的策略循环。
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import random
+import secrets
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import base58
+from aiohttp import web
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+from adapters.base_adapter import SymbolPrecision, NEAREST, FLOOR
+from backtest.matching import BUY, SELL, MatchingEngine, SimOrder
+from simulator.faults import FaultConfig, RateLimiter
+
+DEFAULT_SYMBOLS = {
+    "BTC-USD": {"price": 90000, "tick_size": "0.01", "lot_size": "0.0001"},
+}
+
+_ORDER_STATUS = {"open": "new", "filled": "filled", "cancelled": "cancelled"}
+
+
+def _iso(ms: int) -> str:
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.") + f"{ms % 1000:03d}Z"
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class SimRequestError(Exception):
+    """业务错误：返回 HTTP status 和 {"code": status, "message": ...}"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class SimOrderRecord(SimOrder):
+    """模拟器订单：撮合字段 + 查询接口需要的字段"""
+    __slots__ = ("symbol", "order_type", "time_in_force", "updated_at")
+
+
+class SimSymbol:
+    """
+    模拟交易对（价格过程）
+
+    配置:
+        price: 初始价格
+        tick_size / lot_size: 精度
+        volatility: 每次更新的相对波动（正态分布标准差），默认 0.0002
+        tick_interval: 价格更新间隔（秒），默认 0.5
+        volume: 每次更新的成交量（币数量），用于消耗挂单前的排队量，默认 1
+        spread_ticks: 盘口买一 / 卖一距离（tick），默认 1
+        klines: K 线文件（可选），提供时循环回放收盘价而不是随机游走
+    """
+
+    def __init__(self, symbol: str, config: Dict[str, Any], rng: random.Random):
+        self.symbol = symbol
+        self.precision = SymbolPrecision(
+            str(config.get("tick_size", "0.01")), str(config.get("lot_size", "0.0001")), symbol
+        )
+        self.volatility = float(config.get("volatility", 0.0002))
+        self.tick_interval = float(config.get("tick_interval", 0.5))
+        self.volume_lots = self.precision.size_to_lots(str(config.get("volume", 1)), FLOOR)
+        self.spread_ticks = int(config.get("spread_ticks", 1))
+        self.rng = rng
+        self.replay: Optional[List[str]] = None
+        self.replay_index = 0
+        if config.get("klines"):
+            from backtest.data import load_klines, CLOSE
+
+            self.replay = [str(row[CLOSE]) for row in load_klines(config["klines"])]
+        price = config.get("price") if self.replay is None else self.replay[0]
+        if price is None:
+            raise ValueError(f"交易对 {symbol} 需要配置 price 或 klines")
+        self.ticks = self.precision.price_to_ticks(str(price), NEAREST)
+        self.updated_at = _now_ms()
+
+    def step(self) -> int:
+        """推进一次价格，返回新价格（tick）"""
+        if self.replay is not None:
+            self.replay_index = (self.replay_index + 1) % len(self.replay)
+            ticks = self.precision.price_to_ticks(self.replay[self.replay_index], NEAREST)
+        else:
+            ticks = round(self.ticks * (1 + self.rng.gauss(0.0, self.volatility)))
+        return max(ticks, 1)
+
+    def price(self, ticks: Optional[int] = None) -> str:
+        return str(self.precision.ticks_to_price(self.ticks if ticks is None else ticks))
+
+
+class SimAccount:
+    """登录账户：每个交易对一个撮合引擎"""
+
+    def __init__(self, address: str, chain: str, public_key: Any, initial_balance: int, leverage: int):
+        self.address = address
+        self.chain = chain
+        # ed25519 请求签名公钥（prepare-signin 的 requestId）
+        self.public_key = public_key
+        self.initial_balance = initial_balance
+        self.leverage = leverage
+        self.engines: Dict[str, MatchingEngine] = {}
+        # 未完成订单：订单ID -> 订单 / 客户端订单ID -> 订单
+        self.live: Dict[str, SimOrderRecord] = {}
+        self.by_client: Dict[str, SimOrderRecord] = {}
+
+    def purge(self):
+        """移除已成交 / 已撤销的订单"""
+        for order_id in [order_id for order_id, order in self.live.items() if order.status != "open"]:
+            order = self.live.pop(order_id)
+            if order.client_order_id is not None:
+                self.by_client.pop(order.client_order_id, None)
+
+
+class StandXSimulator:
+    """
+    StandX 交易所模拟器
+
+    用法:
+        simulator = StandXSimulator(config)
+        url = await simulator.start("127.0.0.1", 8080)
+        ...
+        await simulator.stop()
+
+    配置（见 simulator/standx_sim.yaml）:
+        symbols: {symbol: SimSymbol 配置}
+        initial_balance: 每个新账户的初始余额（默认 10000）
+        leverage: 账户杠杆（默认 10），用于计算保证金和可用余额
+        queue_size: 新挂单前面的排队量（币数量，默认 0）
+        maker_fee / taker_fee: 手续费率（默认 0 / 0.0005）
+        max_open_orders: 每个账户最多挂单数（默认 1200）
+        verify_signatures: 校验下单 / 撤单的 ed25519 请求签名（默认 true）
+        sign_window: 请求签名时间戳允许的误差（秒，默认 60）
+        verify_wallet: 登录时校验钱包签名（默认 false，仅支持 bsc）
+        token_ttl: 登录 token 有效期上限（秒），默认使用客户端的 expiresSeconds
+        faults: 延迟 / 错误注入 / 限流，见 FaultConfig
+        seed: 随机种子（价格 / 延迟 / 故障）
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.config = config
+        self.rng = random.Random(config.get("seed"))
+        self.symbols = {
+            symbol: SimSymbol(symbol, symbol_config or {}, self.rng)
+            for symbol, symbol_config in (config.get("symbols") or DEFAULT_SYMBOLS).items()
+        }
+        self.initial_balance = int(config.get("initial_balance", 10000))
+        self.leverage = int(config.get("leverage", 10))
+        self.queue_size = str(config.get("queue_size", 0))
+        self.maker_fee = float(config.get("maker_fee", 0.0))
+        self.taker_fee = float(config.get("taker_fee", 0.0005))
+        self.max_open_orders = int(config.get("max_open_orders", 1200))
+        self.verify_signatures = bool(config.get("verify_signatures", True))
+        self.sign_window = float(config.get("sign_window", 60))
+        self.verify_wallet = bool(config.get("verify_wallet", False))
+        self.token_ttl = config.get("token_ttl")
+        self.set_faults(config.get("faults"))
+
+        self.accounts: Dict[str, SimAccount] = {}
+        self.tokens: Dict[str, tuple] = {}
+        self._pending_signin: Dict[str, tuple] = {}
+        self._jwt_secret = secrets.token_bytes(32)
+        self._next_order_id = 1
+        self.stats: Dict[str, Counter] = {}
+        self.totals: Counter = Counter()
+        self.started_at = time.time()
+        self._runner: Optional[web.AppRunner] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def set_faults(self, faults: Optional[Dict[str, Any]]):
+        self.faults = FaultConfig.from_dict(faults)
+        self.limiter = RateLimiter(self.faults.rate_limits)
+
+    # ---------------- 服务
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        route = app.router
+        route.add_post("/v1/offchain/prepare-signin", self._wrap("prepare_signin", self._prepare_signin, auth=False))
+        route.add_post("/v1/offchain/login", self._wrap("login", self._login, auth=False))
+        route.add_get("/v1/region", self._wrap("region", self._region, auth=False))
+        route.add_get("/api/health", self._health)
+        route.add_post("/api/new_order", self._wrap("new_order", self._new_order, signed=True))
+        route.add_post("/api/cancel_orders", self._wrap("cancel_orders", self._cancel_orders, signed=True))
+        route.add_get("/api/query_open_orders", self._wrap("query_open_orders", self._query_open_orders))
+        route.add_get("/api/query_positions", self._wrap("query_positions", self._query_positions))
+        route.add_get("/api/query_balance", self._wrap("query_balance", self._query_balance))
+        route.add_get(
+            "/api/query_symbol_price", self._wrap("query_symbol_price", self._query_symbol_price, auth=False)
+        )
+        route.add_get("/sim/stats", self._sim_stats)
+        route.add_post("/sim/reset_stats", self._sim_reset_stats)
+        route.add_post("/sim/faults", self._sim_faults)
+        route.add_post("/sim/price", self._sim_price)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """启动服务和价格更新任务，返回基础 URL"""
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port, backlog=1024)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.started_at = time.time()
+        self._tasks = [asyncio.ensure_future(self._price_loop(symbol)) for symbol in self.symbols.values()]
+        return f"http://{host}:{port}"
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _wrap(self, endpoint: str, handler, auth: bool = True, signed: bool = False):
+        """注入延迟 / 限流 / 错误，校验 token 和请求签名，统一错误响应"""
+        counters = self.stats.setdefault(endpoint, Counter())
+
+        async def wrapped(request: web.Request) -> web.StreamResponse:
+            counters["requests"] += 1
+            delay = self.faults.latency_for(endpoint).sample(self.rng)
+            counters["latency_ms"] += delay * 1000
+            if delay:
+                await asyncio.sleep(delay)
+
+            account = None
+            token = request.headers.get("Authorization", "")[len("Bearer "):]
+            if auth:
+                entry = self.tokens.get(token)
+                if entry is None or entry[1] < time.time():
+                    counters["unauthorized"] += 1
+                    return web.json_response({"code": 401, "message": "invalid token"}, status=401)
+                account = entry[0]
+            if not self.limiter.allow(endpoint, account.address if account else None, request.remote or "",
+                                      time.monotonic()):
+                counters["rate_limited"] += 1
+                return web.json_response({"code": 429, "message": "too many requests"}, status=429)
+
+            fault = self.faults.errors_for(endpoint).draw(self.rng)
+            if fault is not None:
+                kind, value = fault
+                if kind == "timeout":
+                    counters["timeouts"] += 1
+                    await asyncio.sleep(value)
+                    return web.json_response({"code": 504, "message": "gateway timeout"}, status=504)
+                if kind == "status":
+                    counters["errors"] += 1
+                    return web.json_response({"code": value, "message": "simulated error"}, status=value)
+                if endpoint == "new_order":
+                    counters["rejected"] += 1
+                    return web.json_response({"code": 400, "message": "simulated reject", "request_id": ""})
+
+            try:
+                body = await request.text() if request.method == "POST" else ""
+                if signed and self.verify_signatures:
+                    self._verify_request(request, body, account)
+                result = handler(request, body, account)
+            except SimRequestError as e:
+                counters["bad_request"] += 1
+                return web.json_response({"code": e.status, "message": e.message}, status=e.status)
+            counters["ok"] += 1
+            return web.json_response(result)
+
+        return wrapped
+
+    def _parse_body(self, body: str) -> Dict[str, Any]:
+        try:
+            data = json.loads(body or "{}")
+        except ValueError:
+            raise SimRequestError(400, "invalid json body")
+        if not isinstance(data, dict):
+            raise SimRequestError(400, "invalid json body")
+        return data
+
+    # ---------------- 认证
+
+    def _jwt(self, payload: Dict[str, Any]) -> str:
+        header = _b64url(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+        body = _b64url(json.dumps(payload, separators=(",", ":")).encode())
+        signature = hmac.new(self._jwt_secret, f"{header}.{body}".encode(), hashlib.sha256).digest()
+        return f"{header}.{body}.{_b64url(signature)}"
+
+    def _read_jwt(self, token: str) -> Dict[str, Any]:
+        parts = token.split(".")
+        if len(parts) != 3:
+            raise SimRequestError(400, "invalid signedData")
+        expected = hmac.new(self._jwt_secret, f"{parts[0]}.{parts[1]}".encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(_b64url(expected), parts[2]):
+            raise SimRequestError(400, "invalid signedData")
+        return json.loads(base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4)))
+
+    def _prepare_signin(self, request: web.Request, body: str, account) -> Dict[str, Any]:
+        data = self._parse_body(body)
+        address = data.get("address")
+        request_id = data.get("requestId")
+        if not address or not request_id:
+            raise SimRequestError(400, "address and requestId are required")
+        chain = request.query.get("chain", "bsc")
+        now = int(time.time())
+        nonce = secrets.token_hex(16)
+        message = (
+            f"standx-sim wants you to sign in with your account:\n{address}\n\n"
+            f"Sign in to StandX Simulator\n\nURI: {request.host}\nVersion: 1\nChain ID: {chain}\n"
+            f"Nonce: {nonce}\nIssued At: {_iso(now * 1000)}\nRequest ID: {request_id}"
+        )
+        self._pending_signin[nonce] = (address, chain, request_id, now + 300)
+        signed_data = self._jwt({
+            "domain": "standx-sim",
+            "uri": request.host,
+            "statement": "Sign in to StandX Simulator",
+            "version": "1",
+            "chainId": chain,
+            "nonce": nonce,
+            "address": address,
+            "requestId": request_id,
+            "issuedAt": _iso(now * 1000),
+            "message": message,
+            "exp": now + 300,
+            "iat": now,
+        })
+        return {"success": True, "signedData": signed_data}
+
+    def _login(self, request: web.Request, body: str, account) -> Dict[str, Any]:
+        data = self._parse_body(body)
+        payload = self._read_jwt(data.get("signedData") or "")
+        pending = self._pending_signin.pop(payload.get("nonce"), None)
+        if pending is None or pending[3] < time.time():
+            raise SimRequestError(400, "signedData expired or already used")
+        address, chain, request_id, _ = pending
+        if self.verify_wallet:
+            self._verify_wallet(chain, address, payload["message"], data.get("signature") or "")
+
+        public_key = None
+        if self.verify_signatures:
+            try:
+                public_key = ed25519.Ed25519PublicKey.from_public_bytes(base58.b58decode(request_id))
+            except ValueError:
+                raise SimRequestError(400, "invalid requestId")
+
+        key = address.lower()
+        account = self.accounts.get(key)
+        if account is None:
+            account = self.accounts[key] = SimAccount(
+                address, chain, public_key, self.initial_balance, self.leverage
+            )
+            self.totals["accounts"] += 1
+        else:
+            # 重新登录会更换请求签名密钥
+            account.public_key = public_key
+        ttl = int(data.get("expiresSeconds") or 604800)
+        if self.token_ttl is not None:
+            ttl = min(ttl, int(self.token_ttl))
+        token = secrets.token_urlsafe(32)
+        self.tokens[token] = (account, time.time() + ttl)
+        return {"token": token, "address": address, "alias": None, "chain": chain, "perpsAlpha": True}
+
+    def _verify_wallet(self, chain: str, address: str, message: str, signature: str):
+        if chain != "bsc":
+            raise SimRequestError(400, f"wallet signature verification not supported for chain {chain}")
+        from eth_keys import keys
+        from eth_utils import keccak
+
+        try:
+            raw = bytes.fromhex(signature[2:] if signature.startswith("0x") else signature)
+            data = message.encode("utf-8")
+            message_hash = keccak(b"\x19Ethereum Signed Message:\n" + str(len(data)).encode() + data)
+            r, s, v = int.from_bytes(raw[:32], "big"), int.from_bytes(raw[32:64], "big"), raw[64]
+            recovered = keys.Signature(vrs=(v - 27 if v >= 27 else v, r, s)).recover_public_key_from_msg_hash(
+                message_hash
+            ).to_checksum_address()
+        except Exception:
+            raise SimRequestError(400, "invalid wallet signature")
+        if recovered.lower() != address.lower():
+            raise SimRequestError(400, "wallet signature does not match address")
+
+    def _verify_request(self, request: web.Request, body: str, account: SimAccount):
+        headers = request.headers
+        try:
+            timestamp = int(headers["x-request-timestamp"])
+            message = f"{headers['x-request-sign-version']},{headers['x-request-id']},{timestamp},{body}"
+            signature = base64.b64decode(headers["x-request-signature"])
+        except (KeyError, ValueError):
+            raise SimRequestError(400, "missing or malformed request signature headers")
+        # 签名时间戳与 /v1/region 的 systemTime 同为毫秒；客户端从未对时成功时回退到本地秒级时间
+        signed_at = timestamp / 1000.0 if timestamp > 1e11 else timestamp
+        if abs(time.time() - signed_at) > self.sign_window:
+            raise SimRequestError(400, "request timestamp out of window")
+        try:
+            account.public_key.verify(signature, message.encode("utf-8"))
+        except (InvalidSignature, AttributeError):
+            raise SimRequestError(400, "invalid request signature")
+
+    # ---------------- 行情
+
+    def _region(self, request: web.Request, body: str, account) -> Dict[str, Any]:
+        return {"systemTime": _now_ms(), "region": "sim"}
+
+    async def _health(self, request: web.Request) -> web.Response:
+        return web.Response(text="OK")
+
+    def _get_symbol(self, symbol: Optional[str]) -> SimSymbol:
+        sim_symbol = self.symbols.get(symbol or "")
+        if sim_symbol is None:
+            raise SimRequestError(400, f"unknown symbol: {symbol}")
+        return sim_symbol
+
+    def _query_symbol_price(self, request: web.Request, body: str, account) -> Dict[str, Any]:
+        sim_symbol = self._get_symbol(request.query.get("symbol"))
+        price = sim_symbol.price()
+        base, _, quote = sim_symbol.symbol.partition("-")
+        return {
+            "base": base,
+            "quote": quote,
+            "symbol": sim_symbol.symbol,
+            "index_price": price,
+            "mark_price": price,
+            "last_price": price,
+            "mid_price": price,
+            "spread_bid": sim_symbol.price(sim_symbol.ticks - sim_symbol.spread_ticks),
+            "spread_ask": sim_symbol.price(sim_symbol.ticks + sim_symbol.spread_ticks),
+            "time": _iso(sim_symbol.updated_at),
+        }
+
+    async def _price_loop(self, sim_symbol: SimSymbol):
+        while True:
+            await asyncio.sleep(sim_symbol.tick_interval)
+            self.move_price(sim_symbol.symbol, sim_symbol.step())
+
+    def move_price(self, symbol: str, ticks: int):
+        """价格从当前值走到 ticks，撮合所有账户在该区间内的挂单"""
+        sim_symbol = self.symbols[symbol]
+        previous = sim_symbol.ticks
+        sim_symbol.ticks = ticks
+        sim_symbol.updated_at = now = _now_ms()
+        low, high = min(previous, ticks), max(previous, ticks)
+        for account in self.accounts.values():
+            engine = account.engines.get(symbol)
+            if engine is None:
+                continue
+            engine.on_trade(low, high, ticks, sim_symbol.volume_lots, now)
+            self._drain_fills(engine, now)
+
+    def _drain_fills(self, engine: MatchingEngine, now: int):
+        if not engine.fills:
+            return
+        self.totals["fills"] += len(engine.fills)
+        for fill in engine.fills:
+            order = engine.orders.get(fill.order_id)
+            if order is not None:
+                order.updated_at = now
+        engine.fills.clear()
+
+    # ---------------- 交易
+
+    def _engine(self, account: SimAccount, sim_symbol: SimSymbol) -> MatchingEngine:
+        engine = account.engines.get(sim_symbol.symbol)
+        if engine is None:
+            precision = sim_symbol.precision
+            engine = account.engines[sim_symbol.symbol] = MatchingEngine(
+                precision, queue_lots=precision.size_to_lots(self.queue_size, FLOOR)
+            )
+            engine.last_ticks = sim_symbol.ticks
+        return engine
+
+    def _new_order(self, request: web.Request, body: str, account: SimAccount) -> Dict[str, Any]:
+        data = self._parse_body(body)
+        sim_symbol = self._get_symbol(data.get("symbol"))
+        precision = sim_symbol.precision
+        side = data.get("side")
+        order_type = data.get("order_type")
+        time_in_force = data.get("time_in_force", "gtc")
+        if side not in ("buy", "sell"):
+            raise SimRequestError(400, f"invalid side: {side}")
+        if order_type not in ("limit", "market"):
+            raise SimRequestError(400, f"invalid order_type: {order_type}")
+        try:
+            lots = precision.size_to_lots(str(data.get("qty")))
+            price_ticks = precision.price_to_ticks(str(data["price"])) if order_type == "limit" else None
+        except (KeyError, ValueError) as e:
+            raise SimRequestError(400, f"invalid qty / price: {e}")
+        if lots <= 0 or (price_ticks is not None and price_ticks <= 0):
+            raise SimRequestError(400, "qty and price must be positive")
+        cl_ord_id = data.get("cl_ord_id")
+        if cl_ord_id is not None and cl_ord_id in account.by_client:
+            raise SimRequestError(400, f"duplicate cl_ord_id: {cl_ord_id}")
+        if len(account.live) >= self.max_open_orders:
+            account.purge()
+            if len(account.live) >= self.max_open_orders:
+                raise SimRequestError(400, "too many open orders")
+        reduce_only = bool(data.get("reduce_only", False))
+        engine = self._engine(account, sim_symbol)
+        if not reduce_only:
+            required = engine.units_to_quote(lots * (price_ticks or engine.last_ticks)) / account.leverage
+            if required > self._balance(account)["cross_available"]:
+                raise SimRequestError(400, "insufficient balance")
+
+        now = _now_ms()
+        order = SimOrderRecord(
+            str(self._next_order_id),
+            BUY if side == "buy" else SELL,
+            price_ticks,
+            lots,
+            reduce_only=reduce_only,
+            client_order_id=cl_ord_id,
+            created_at=now,
+        )
+        self._next_order_id += 1
+        order.symbol = sim_symbol.symbol
+        order.order_type = order_type
+        order.time_in_force = time_in_force
+        order.updated_at = now
+        engine.add_order(order, now)
+        if order.status == "open" and time_in_force in ("ioc", "fok"):
+            engine.cancel_order(order.order_id)
+        self._drain_fills(engine, now)
+        self.totals["orders"] += 1
+        if order.status == "open":
+            account.live[order.order_id] = order
+            if cl_ord_id is not None:
+                account.by_client[cl_ord_id] = order
+        return {"code": 0, "message": "success", "request_id": request.headers.get("x-request-id") or str(uuid.uuid4())}
+
+    def _cancel_orders(self, request: web.Request, body: str, account: SimAccount) -> List[Any]:
+        data = self._parse_body(body)
+        if not data.get("order_id_list") and not data.get("cl_ord_id_list"):
+            raise SimRequestError(400, "order_id_list or cl_ord_id_list is required")
+        orders = [account.live.get(str(order_id)) for order_id in data.get("order_id_list") or []]
+        orders += [account.by_client.get(cl_ord_id) for cl_ord_id in data.get("cl_ord_id_list") or []]
+        for order in orders:
+            if order is None:
+                continue
+            if account.engines[order.symbol].cancel_order(order.order_id):
+                order.updated_at = _now_ms()
+                self.totals["cancels"] += 1
+        account.purge()
+        return []
+
+    def _order_dict(self, order: SimOrderRecord, precision: SymbolPrecision, leverage: int) -> Dict[str, Any]:
+        return {
+            "id": int(order.order_id),
+            "symbol": order.symbol,
+            "side": "buy" if order.side == BUY else "sell",
+            "order_type": order.order_type,
+            "qty": str(precision.lots_to_size(order.lots)),
+            "fill_qty": str(precision.lots_to_size(order.filled_lots)),
+            "price": str(precision.ticks_to_price(order.price_ticks)) if order.price_ticks is not None else None,
+            "status": "partially_filled" if order.status == "open" and order.filled_lots else _ORDER_STATUS[order.status],
+            "time_in_force": order.time_in_force,
+            "reduce_only": order.reduce_only,
+            "cl_ord_id": order.client_order_id,
+            "margin_mode": "cross",
+            "leverage": str(leverage),
+            "created_at": _iso(order.created_at),
+            "updated_at": _iso(order.updated_at),
+        }
+
+    def _query_open_orders(self, request: web.Request, body: str, account: SimAccount) -> Dict[str, Any]:
+        symbol = request.query.get("symbol")
+        limit = min(int(request.query.get("limit", 500)), 1200)
+        account.purge()
+        orders = [
+            order for order in account.live.values() if symbol is None or order.symbol == symbol
+        ]
+        result = [
+            self._order_dict(order, self.symbols[order.symbol].precision, account.leverage)
+            for order in orders[:limit]
+        ]
+        return {"page_size": limit, "result": result, "total": len(orders)}
+
+    def _query_positions(self, request: web.Request, body: str, account: SimAccount) -> List[Dict[str, Any]]:
+        symbol = request.query.get("symbol")
+        positions = []
+        for name, engine in account.engines.items():
+            if engine.position == 0 or (symbol and symbol != name):
+                continue
+            precision = engine.precision
+            qty = precision.lots_to_size(engine.position)
+            entry_price = precision.ticks_to_price(engine.entry_cost) / engine.position
+            mark_price = precision.ticks_to_price(engine.last_ticks)
+            positions.append({
+                "id": abs(hash((account.address, name))) % 10 ** 9,
+                "symbol": name,
+                "qty": str(qty),
+                "entry_price": str(entry_price.quantize(precision.tick_size)),
+                "mark_price": str(mark_price),
+                "upnl": str(engine.units_to_quote(engine.position * engine.last_ticks - engine.entry_cost)),
+                "leverage": str(account.leverage),
+                "margin_mode": "cross",
+                "status": "open",
+            })
+        return positions
+
+    def _balance(self, account: SimAccount) -> Dict[str, float]:
+        realized = upnl = margin = locked = fees = 0.0
+        for engine in account.engines.values():
+            to_quote = engine.units_to_quote
+            upnl += to_quote(engine.position * engine.last_ticks - engine.entry_cost)
+            realized += to_quote(engine.cash + engine.entry_cost)
+            fees += to_quote(engine.maker_notional) * self.maker_fee + to_quote(engine.taker_notional) * self.taker_fee
+            margin += to_quote(abs(engine.position) * engine.last_ticks) / account.leverage
+            locked += to_quote(sum(
+                order.remaining_lots * order.price_ticks for order in engine.orders.values() if not order.reduce_only
+            )) / account.leverage
+        balance = account.initial_balance + realized - fees
+        return {
+            "balance": balance,
+            "upnl": upnl,
+            "cross_balance": balance,
+            "cross_margin": margin,
+            "cross_upnl": upnl,
+            "locked": locked,
+            "cross_available": balance - margin - locked + upnl,
+            "equity": balance + upnl,
+            "realized": realized,
+            "fees": fees,
+        }
+
+    def _query_balance(self, request: web.Request, body: str, account: SimAccount) -> Dict[str, Any]:
+        balance = self._balance(account)
+        return {
+            "isolated_balance": "0",
+            "isolated_upnl": "0",
+            "cross_balance": f"{balance['cross_balance']:.6f}",
+            "cross_margin": f"{balance['cross_margin']:.6f}",
+            "cross_upnl": f"{balance['cross_upnl']:.6f}",
+            "locked": f"{balance['locked']:.6f}",
+            "cross_available": f"{balance['cross_available']:.6f}",
+            "balance": f"{balance['balance']:.6f}",
+            "upnl": f"{balance['upnl']:.6f}",
+            "equity": f"{balance['equity']:.6f}",
+            "pnl_freeze": f"{balance['realized'] - balance['fees']:.6f}",
+        }
+
+    # ---------------- 管理接口
+
+    def get_stats(self) -> Dict[str, Any]:
+        """模拟器统计：每个接口的请求 / 故障计数和平均注入延迟，以及账户 / 订单 / 成交总数"""
+        elapsed = max(time.time() - self.started_at, 1e-9)
+        endpoints = {}
+        for name, counters in self.stats.items():
+            if not counters["requests"]:
+                continue
+            endpoints[name] = {
+                **{key: value for key, value in counters.items() if key != "latency_ms"},
+                "avg_injected_ms": round(counters["latency_ms"] / counters["requests"], 3),
+                "rps": round(counters["requests"] / elapsed, 2),
+            }
+        requests = sum(counters["requests"] for counters in self.stats.values())
+        return {
+            "uptime": round(elapsed, 3),
+            "requests": requests,
+            "rps": round(requests / elapsed, 2),
+            "open_orders": sum(len(account.live) for account in self.accounts.values()),
+            **self.totals,
+            "prices": {symbol: sim_symbol.price() for symbol, sim_symbol in self.symbols.items()},
+            "endpoints": endpoints,
+        }
+
+    async def _sim_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.get_stats())
+
+    async def _sim_reset_stats(self, request: web.Request) -> web.Response:
+        for counters in self.stats.values():
+            counters.clear()
+        self.totals = Counter(accounts=len(self.accounts))
+        self.started_at = time.time()
+        return web.json_response({"ok": True})
+
+    async def _sim_faults(self, request: web.Request) -> web.Response:
+        try:
+            self.set_faults(await request.json())
+        except (ValueError, TypeError) as e:
+            return web.json_response({"code": 400, "message": str(e)}, status=400)
+        return web.json_response(self.faults.describe())
+
+    async def _sim_price(self, request: web.Request) -> web.Response:
+        try:
+            data = await request.json()
+            sim_symbol = self._get_symbol(data.get("symbol"))
+            ticks = sim_symbol.precision.price_to_ticks(str(data["price"]), NEAREST)
+        except SimRequestError as e:
+            return web.json_response({"code": e.status, "message": e.message}, status=e.status)
+        except (KeyError, ValueError) as e:
+            return web.json_response({"code": 400, "message": f"invalid price: {e}"}, status=400)
+        self.move_price(sim_symbol.symbol, ticks)
+        return web.json_response({"symbol": sim_symbol.symbol, "price": sim_symbol.price()})
@@ -0,0 +1,258 @@
+"""
+Event Scheduler
+事件驱动的策略调度器
+
+替代固定 sleep_interval 轮询：只有在"有事发生"时才执行策略周期。
+
+触发源：
+- price: 价格相对上次周期的变动超过阈值
+- fill:  成交推送
+- stale: 挂单到达过期时间（set_deadline）
+- timer: 距上次周期超过 max_interval（兜底）
+
+连续事件在 coalesce 秒内合并为一次周期；两次周期至少间隔 min_interval 秒；
+每个账户一个令牌桶（RateBudget）限制周期频率，预算不足时推迟而不是丢弃。
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+
+PRICE = "price"
+FILL = "fill"
+STALE = "stale"
+TIMER = "timer"
+
+
+class RateBudget:
+    """令牌桶：每秒补充 rate 个令牌，最多累积 burst 个"""
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self._tokens = burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, cost: float = 1.0) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= cost:
+                self._tokens -= cost
+                return True
+            return False
+
+    def time_until(self, cost: float = 1.0) -> float:
+        """距离可以获取 cost 个令牌的秒数"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= cost:
+                return 0.0
+            return (cost - self._tokens) / self.rate if self.rate > 0 else float("inf")
+
+
+class EventScheduler:
+    """事件驱动的策略调度器（线程安全，事件可以来自任意线程）"""
+
+    def __init__(
+        self,
+        max_interval: float = 60.0,
+        price_threshold: Optional[float] = None,
+        coalesce: float = 0.2,
+        min_interval: float = 0.5,
+        budget: Optional[RateBudget] = None,
+        cycle_cost: float = 1.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        初始化调度器
+
+        Args:
+            max_interval: 无事件时的兜底周期（秒）
+            price_threshold: 价格变动触发阈值（绝对值），None 表示不按价格触发
+            coalesce: 首个事件到达后再等待的合并窗口（秒）
+            min_interval: 两次周期的最小间隔（秒）
+            budget: 周期令牌桶（可选）
+            cycle_cost: 每个周期消耗的令牌数
+            clock: 单调时钟（测试时可替换）
+        """
+        self.max_interval = max_interval
+        self.price_threshold = price_threshold
+        self.coalesce = coalesce
+        self.min_interval = min_interval
+        self.budget = budget
+        self.cycle_cost = cycle_cost
+        self.clock = clock
+
+        self._cond = threading.Condition()
+        self._reasons: Set[str] = set()
+        self._first_event_at: Optional[float] = None
+        self._deadline: Optional[float] = None
+        self._last_cycle_at: Optional[float] = None
+        self._reference_price: Optional[float] = None
+        self._last_price: Optional[float] = None
+        self._pollers: List[threading.Thread] = []
+        self._stop_event = threading.Event()
+
+        self.cycle_count = 0
+        self.event_counts: Dict[str, int] = {}
+        self.trigger_counts: Dict[str, int] = {}
+
+    # ---------- 事件输入 ----------
+
+    def notify(self, reason: str):
+        """记录一个触发事件"""
+        with self._cond:
+            self.event_counts[reason] = self.event_counts.get(reason, 0) + 1
+            if not self._reasons:
+                self._first_event_at = self.clock()
+            self._reasons.add(reason)
+            self._cond.notify_all()
+
+    def on_price(self, price: Optional[float]):
+        """价格更新；相对上次周期的参考价变动达到阈值时触发"""
+        if price is None:
+            return
+        price = float(price)
+        with self._cond:
+            self._last_price = price
+            reference = self._reference_price
+        if self.price_threshold is None or reference is None:
+            return
+        if abs(price - reference) >= self.price_threshold:
+            self.notify(PRICE)
+
+    def on_fill(self, payload: Any = None):
+        self.notify(FILL)
+
+    def set_deadline(self, seconds: Optional[float]):
+        """seconds 秒后触发 stale 事件（只保留最早的一个），None 表示清除"""
+        with self._cond:
+            if seconds is None:
+                self._deadline = None
+            else:
+                deadline = self.clock() + max(0.0, seconds)
+                if self._deadline is None or deadline < self._deadline:
+                    self._deadline = deadline
+            self._cond.notify_all()
+
+    def add_poller(self, fetch_price: Callable[[], Optional[float]], interval: float):
+        """后台轮询价格（没有推送 / 共享行情时使用，只请求价格接口）"""
+        def loop():
+            while not self._stop_event.is_set():
+                try:
+                    self.on_price(fetch_price())
+                except Exception:
+                    pass
+                self._stop_event.wait(interval)
+
+        thread = threading.Thread(target=loop, name="scheduler-price-poller", daemon=True)
+        thread.start()
+        self._pollers.append(thread)
+
+    # ---------- 调度 ----------
+
+    def _due(self, now: float) -> Optional[float]:
+        """返回下一次应执行周期的时刻（调用方持有锁）"""
+        candidates = []
+        if self._last_cycle_at is None:
+            return now
+        candidates.append(self._last_cycle_at + self.max_interval)
+        if self._deadline is not None:
+            candidates.append(self._deadline)
+        if self._reasons:
+            candidates.append(self._first_event_at + self.coalesce)
+        due = min(candidates)
+        return max(due, self._last_cycle_at + self.min_interval)
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """
+        阻塞直到应执行下一个周期
+
+        Returns:
+            Set[str]: 本次周期的触发原因；stop() 或超时时返回空集合
+        """
+        give_up = None if timeout is None else self.clock() + timeout
+        with self._cond:
+            while not self._stop_event.is_set():
+                now = self.clock()
+                due = self._due(now)
+                if due <= now and self.budget is not None:
+                    wait_budget = self.budget.time_until(self.cycle_cost)
+                    if wait_budget > 0:
+                        due = now + wait_budget
+                if due <= now:
+                    break
+                if give_up is not None and now >= give_up:
+                    return set()
+                wake_at = due if give_up is None else min(due, give_up)
+                self._cond.wait(wake_at - now)
+            else:
+                return set()
+
+            now = self.clock()
+            reasons = set(self._reasons)
+            if self._last_cycle_at is None or now >= self._last_cycle_at + self.max_interval:
+                reasons.add(TIMER)
+            if self._deadline is not None and now >= self._deadline:
+                reasons.add(STALE)
+                self._deadline = None
+            self._reasons.clear()
+            self._first_event_at = None
+
+        if self.budget is not None:
+            self.budget.try_acquire(self.cycle_cost)
+        for reason in reasons:
+            self.trigger_counts[reason] = self.trigger_counts.get(reason, 0) + 1
+        return reasons
+
+    def mark_cycle(self, price: Optional[float] = None):
+        """周期执行完毕：记录时间和本周期使用的参考价"""
+        with self._cond:
+            self._last_cycle_at = self.clock()
+            if price is not None:
+                self._reference_price = float(price)
+            elif self._last_price is not None:
+                self._reference_price = self._last_price
+            self.cycle_count += 1
+
+    def run(self, cycle: Callable[[Set[str]], Optional[float]], on_error: Optional[Callable[[Exception], None]] = None):
+        """
+        循环执行 cycle(reasons) 直到 stop()
+
+        Args:
+            cycle: 策略周期，返回本周期使用的价格（作为价格触发的参考价）
+            on_error: 周期异常回调；异常不会中断调度
+        """
+        while not self._stop_event.is_set():
+            reasons = self.wait()
+            if not reasons:
+                continue
+            price = None
+            try:
+                price = cycle(reasons)
+            except Exception as e:
+                if on_error is not None:
+                    on_error(e)
+            finally:
+                self.mark_cycle(price)
+
+    def stop(self):
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "cycles": self.cycle_count,
+            "events": dict(self.event_counts),
+            "triggers": dict(self.trigger_counts),
+            "reference_price": self._reference_price,
+            "last_price": self._last_price,
+        }
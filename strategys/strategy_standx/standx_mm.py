@@ -15,7 +15,7 @@ project_root = os.path.dirname(os.path.dirname(current_dir))
 sys.path.insert(0, project_root)
 
 from adapters import create_adapter
-from risk import IndicatorTool
+import risk  # 风控指标按需加载（未启用风控时不导入 numpy）
 
 # 全局配置变量
 STANDX_CONFIG = None
@@ -405,7 +405,7 @@ def run_strategy_cycle(adapter):
     default_spread = GRID_CONFIG['price_spread']
     
     if RISK_CONFIG.get('enable', False):
-        indicator_tool = IndicatorTool()
+        indicator_tool = risk.IndicatorTool()
         adx = indicator_tool.get_adx(SYMBOL, "5m", period=14)
         adx_threshold = RISK_CONFIG.get('adx_threshold', 25)
         adx_max = RISK_CONFIG.get('adx_max', 60)
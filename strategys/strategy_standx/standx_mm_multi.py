@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+StandX 多账户策略入口 - 单进程运行 N 个账户
+
+替代 RunScripts/run_prod*.sh / *.ps1 为每个账户单独启动一个 Python 进程的方式：
+- 从 paisheng_batch_encrypted.py 生成的 private_keys.enc 一次性解密全部账户私钥
+- 每个账户的策略循环作为共享事件循环上的一个 task 运行，共用一个 aiohttp 连接池
+  和一份服务器对时
+- 同一交易对的行情（ticker / ADX）由进程内 MarketDataService 统一请求，快照分发给所有账户
+- 单个账户异常只会让该账户退避重启，不影响其他账户
+- 可选 --processes N 将账户分片到 N 个进程（每个进程一个事件循环）
+
+使用示例:
+    python standx_mm_multi.py --key_prefix account_hp --accounts 5-10
+    python standx_mm_multi.py --key_prefix account_hp --accounts 1-60 --processes 4
+"""
+import sys
+import os
+import asyncio
+import argparse
+import getpass
+import logging
+import multiprocessing
+import time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+from cryptography.fernet import Fernet
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, project_root)
+sys.path.insert(0, current_dir)
+
+from adapters import create_async_adapter
+from adapters.signing_service import SigningService
+from exchange.exchange_standx.standx_protocol.async_perp_http import AsyncStandXPerpHTTP
+from exchange.exchange_standx.standx_protocol.clock_sync import ServerClock
+from exchange.exchange_standx.standx_protocol.http_pool import HTTPPoolConfig
+from standx_mm_new import (
+    load_config,
+    generate_grid_arrays,
+    calculate_maker_cancel_orders,
+    calculate_place_orders,
+    calculate_dynamic_price_spread,
+    order_ref,
+    grid_price,
+    split_order_refs,
+    MAX_POSITION_SIZE,
+    MAX_POSITION_AGE,
+    REDUCE_INTERVAL,
+)
+from paisheng_batch_encrypted import password_to_fernet_key, ENCRYPTED_OUTPUT_FILE
+from market_data import MarketDataService, MarketSnapshot, standx_ticker_fetcher, binance_adx_fetcher
+from ratelimit import create_rate_limiter
+
+
+def parse_accounts(key_prefix: str, spec: str) -> List[str]:
+    """
+    解析账户参数（与 run_prod.sh 一致）
+
+    Args:
+        key_prefix: 账户名前缀，如 "account_hp"
+        spec: "5-10" / "5,7,9" / "1-3,8"
+
+    Returns:
+        List[str]: 账户名列表，如 ["account_hp5", "account_hp6", ...]
+    """
+    names = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            a, b = part.split("-", 1)
+            names.extend(f"{key_prefix}{i}" for i in range(int(a), int(b) + 1))
+        else:
+            names.append(f"{key_prefix}{part}")
+    # 去重并保持顺序
+    return list(dict.fromkeys(names))
+
+
+def load_private_keys(enc_file: str, password: str) -> Dict[str, str]:
+    """
+    解密 private_keys.enc，返回 {账户名: 私钥}
+
+    文件格式见 paisheng_batch_encrypted.py：每行 "name:0xprivatekey"。
+    """
+    fernet = Fernet(password_to_fernet_key(password))
+    with open(enc_file, "rb") as f:
+        decrypted = fernet.decrypt(f.read()).decode()
+
+    keys = {}
+    for line in decrypted.splitlines():
+        if ":" not in line:
+            continue
+        name, pk = line.split(":", 1)
+        keys[name.strip()] = pk.strip()
+    return keys
+
+
+class AccountRunner:
+    """单个账户的策略循环（每个账户独立的持仓状态，互不影响）"""
+    def __init__(
+        self,
+        account_id: str,
+        adapter,
+        config: Dict[str, Any],
+        market_data: MarketDataService,
+        logger: logging.Logger,
+    ):
+        self.account_id = account_id
+        self.adapter = adapter
+        self.symbol = config["symbol"]
+        self.grid_config = config["grid"]
+        self.risk_config = config.get("risk", {})
+        self.market_data_config = config.get("market_data", {})
+        self.market_data = market_data
+        self.stream_config = config["exchange"].get("stream") or {}
+        self.logger = logger
+        self.position_state = {"open_time": None, "last_reduce_time": None}
+        self.cycles = 0
+        self.errors = 0
+
+    async def get_pending_orders_arrays(self):
+        """异步版 get_pending_orders_arrays（读取适配器本地订单簿）"""
+        open_orders = await self.adapter.get_cached_open_orders(symbol=self.symbol)
+        long_price_to_ids: Dict[int, List[Any]] = {}
+        short_price_to_ids: Dict[int, List[Any]] = {}
+        for order in open_orders:
+            if order.status not in ["pending", "open", "partially_filled"] or order.raw_price is None:
+                continue
+            ref = order_ref(order)
+            if ref is None:
+                continue
+            price = grid_price(order)
+            if order.side in ["buy", "long"]:
+                long_price_to_ids.setdefault(price, []).append(ref)
+            elif order.side in ["sell", "short"]:
+                short_price_to_ids.setdefault(price, []).append(ref)
+        return (
+            sorted(long_price_to_ids), sorted(short_price_to_ids),
+            long_price_to_ids, short_price_to_ids,
+        )
+
+    async def place_maker_close_orders(self, position, last_price, price_step, price_spread, close_ratio):
+        """异步版 place_maker_close_orders（价格来自共享行情）"""
+        close_size = (abs(position.size) * Decimal(str(close_ratio))).quantize(Decimal("0.0001"))
+        if close_size <= Decimal("0"):
+            return
+
+        if position.side in ["long", "buy"]:
+            close_price = last_price + price_spread + price_step
+            close_side = "sell"
+        else:
+            close_price = last_price - price_spread - price_step
+            close_side = "buy"
+
+        try:
+            await self.adapter.place_order(
+                symbol=self.symbol,
+                side=close_side,
+                order_type="limit",
+                quantity=close_size,
+                price=Decimal(str(int(close_price))),
+                time_in_force="gtc",
+                reduce_only=True
+            )
+            self.logger.info("[MAKER-CLOSE] side=%s, price=%d, size=%s", close_side, int(close_price), close_size)
+        except Exception:
+            pass
+
+    async def get_snapshot(self) -> MarketSnapshot:
+        """读取共享行情快照；过期时最多等待一个刷新周期，仍无新鲜数据则本周期失败"""
+        max_age = self.market_data_config.get("max_age", 3)
+        snapshot = self.market_data.get_snapshot(self.symbol, max_age=max_age)
+        if snapshot is None:
+            snapshot = await asyncio.to_thread(self.market_data.wait_snapshot, self.symbol, max_age, max_age)
+        if snapshot is None:
+            raise Exception(f"行情快照过期: {self.symbol}")
+        return snapshot
+
+    async def run_cycle(self):
+        """一个策略周期，逻辑与 standx_mm_new.run_strategy_cycle 一致，下单/撤单并发提交"""
+        price_step = self.grid_config["price_step"]
+        snapshot = await self.get_snapshot()
+        last_price = snapshot.last_price
+
+        default_spread = self.grid_config["price_spread"]
+        if self.risk_config.get("enable", False):
+            adx = snapshot.fresh_adx(self.market_data_config.get("adx_max_age", 120))
+            price_spread = calculate_dynamic_price_spread(
+                adx, last_price, default_spread, self.risk_config.get("adx_threshold", 25)
+            )
+        else:
+            price_spread = default_spread
+
+        self.logger.info(
+            "[PRICE] price_spread=%d, last_price=%.2f, symbol=%s",
+            int(price_spread), float(last_price), self.symbol
+        )
+
+        long_grid, short_grid = generate_grid_arrays(
+            last_price, price_step, self.grid_config["grid_count"], price_spread
+        )
+        long_pending, short_pending, long_price_to_ids, short_price_to_ids = await self.get_pending_orders_arrays()
+
+        cancel_long, cancel_short = calculate_maker_cancel_orders(
+            long_pending, short_pending, last_price, price_spread, price_step
+        )
+        cancel_refs = [ref for p in cancel_long for ref in long_price_to_ids.get(p, [])]
+        cancel_refs += [ref for p in cancel_short for ref in short_price_to_ids.get(p, [])]
+        cancel_ids, cancel_cl_ids = split_order_refs(cancel_refs)
+
+        place_long, place_short = calculate_place_orders(long_grid, short_grid, long_pending, short_pending)
+        quantity = Decimal(str(self.grid_config.get("order_quantity", 0.0001)))
+        orders = [
+            {"symbol": self.symbol, "side": side, "order_type": "limit", "quantity": quantity,
+             "price": Decimal(str(price)), "time_in_force": "gtc", "reduce_only": False}
+            for side, prices in (("buy", place_long), ("sell", place_short))
+            for price in prices
+        ]
+
+        calls = []
+        if cancel_ids or cancel_cl_ids:
+            calls.append(lambda: self.adapter.cancel_orders_by_ids(
+                order_id_list=cancel_ids or None, cl_ord_id_list=cancel_cl_ids or None
+            ))
+        calls.extend(lambda params=params: self.adapter.place_order(**params) for params in orders)
+        if calls:
+            await self.adapter.gather_bounded(calls)
+
+        await self.manage_position(last_price, price_spread)
+
+    async def manage_position(self, last_price, price_spread):
+        """持仓风控：规模失控 / 持仓过久时挂 maker 单减仓"""
+        try:
+            position = await self.adapter.get_position(self.symbol)
+        except Exception:
+            return
+
+        now = time.time()
+        state = self.position_state
+        if not position or position.size == Decimal("0"):
+            state["open_time"] = None
+            state["last_reduce_time"] = None
+            return
+
+        if state["open_time"] is None:
+            state["open_time"] = now
+        position_age = now - state["open_time"]
+        price_step = self.grid_config["price_step"]
+
+        if abs(position.size) > MAX_POSITION_SIZE:
+            await self.place_maker_close_orders(position, last_price, price_step, price_spread, 0.5)
+        elif position_age > MAX_POSITION_AGE:
+            if state["last_reduce_time"] is None or now - state["last_reduce_time"] > REDUCE_INTERVAL:
+                await self.place_maker_close_orders(position, last_price, price_step, price_spread, 0.3)
+                state["last_reduce_time"] = now
+
+    async def run(self, stop_event: asyncio.Event, max_backoff: float = 60.0):
+        """账户主循环：连接失败或周期异常时指数退避，异常不会传播到其他账户"""
+        sleep_interval = self.grid_config.get("sleep_interval", 60)
+        backoff = sleep_interval
+        connected = False
+        while not stop_event.is_set():
+            try:
+                if not connected:
+                    await self.adapter.connect()
+                    connected = True
+                    self.logger.info("[BOOT] account_id=%s connected", self.account_id)
+                    if self.stream_config.get("enable", False):
+                        await self.adapter.start_stream()
+                await self.run_cycle()
+                self.cycles += 1
+                backoff = sleep_interval
+                delay = sleep_interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                self.logger.error("[CYCLE-ERROR] %s", e)
+                delay = backoff
+                backoff = min(backoff * 2, max_backoff)
+            await self.wait_next_cycle(stop_event, delay)
+
+    async def wait_next_cycle(self, stop_event: asyncio.Event, delay: float):
+        """等待下一周期：到时、停止，或（启用推送时）收到成交 / 持仓推送"""
+        waiters = [asyncio.ensure_future(stop_event.wait())]
+        if getattr(self.adapter, "stream", None) is not None:
+            waiters.append(asyncio.ensure_future(self.adapter.wait_stream_event(delay)))
+        try:
+            done, _ = await asyncio.wait(waiters, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        if len(waiters) > 1 and waiters[1] in done and not stop_event.is_set():
+            # 合并短时间内的连续推送
+            await asyncio.sleep(self.stream_config.get("min_interval", 0.5))
+
+
+def make_account_logger(account_id: str, log_dir: str) -> logging.Logger:
+    """每个账户一个日志文件：logs/{account_id}.log（与单账户脚本一致）"""
+    logger = logging.getLogger(f"standx.{account_id}")
+    if not logger.handlers:
+        os.makedirs(log_dir, exist_ok=True)
+        handler = logging.FileHandler(os.path.join(log_dir, f"{account_id}.log"), encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+async def run_accounts(
+    accounts: Dict[str, str],
+    config: Dict[str, Any],
+    log_dir: str = "logs",
+    stop_event: Optional[asyncio.Event] = None,
+) -> List[AccountRunner]:
+    """
+    在当前事件循环上运行一组账户
+
+    Args:
+        accounts: {账户名: 私钥}
+        config: 策略配置（config.yaml 内容，私钥字段会被逐账户覆盖）
+        log_dir: 日志目录
+        stop_event: 外部停止信号（可选，压测时按时长停止），默认一直运行
+
+    Returns:
+        List[AccountRunner]: 各账户的运行器（周期数 / 错误数等统计）
+    """
+    exchange_config = config["exchange"]
+    pool_config = HTTPPoolConfig.from_dict(exchange_config.get("http"))
+    connector = aiohttp.TCPConnector(
+        limit=max(pool_config.pool_maxsize, len(accounts) * 2),
+        force_close=not pool_config.keep_alive,
+    )
+    session = aiohttp.ClientSession(connector=connector)
+    clock = ServerClock(lambda: None)
+    # 所有账户共用一个令牌桶（同一出口 IP）；配置 address 时再与其他进程共享
+    rate_limiter = create_rate_limiter(exchange_config.get("rate_limit"), "standx")
+    base_url = exchange_config.get("base_url", "https://perps.standx.com")
+    clock_client = AsyncStandXPerpHTTP(
+        base_url=base_url,
+        geo_url=exchange_config.get("geo_url", "https://geo.standx.com"),
+        pool_config=pool_config,
+        session=session,
+        clock=clock,
+        rate_limiter=rate_limiter,
+    )
+    risk_enabled = config.get("risk", {}).get("enable", False)
+    market_data = MarketDataService(
+        get_ticker=standx_ticker_fetcher(base_url),
+        get_adx=binance_adx_fetcher("5m") if risk_enabled else None,
+    )
+    market_data.subscribe(config["symbol"])
+    stop_event = stop_event or asyncio.Event()
+
+    signing_config = exchange_config.get("signing_pool") or {}
+    signing_service = SigningService(signing_config.get("workers")) if signing_config.get("enable", False) else None
+
+    runners = []
+    for account_id, private_key in accounts.items():
+        adapter = create_async_adapter({
+            **exchange_config,
+            "private_key": private_key,
+            "http_session": session,
+            "server_clock": clock,
+            "signing_service": signing_service,
+            "account_id": account_id,
+            "rate_limiter": rate_limiter,
+        })
+        runners.append(AccountRunner(
+            account_id, adapter, config, market_data, make_account_logger(account_id, log_dir)
+        ))
+
+    try:
+        market_data.start()
+        if signing_service is not None:
+            await signing_service.start()
+        await clock_client.start_clock_sync()
+        await asyncio.gather(*(runner.run(stop_event) for runner in runners), return_exceptions=True)
+    finally:
+        stop_event.set()
+        await asyncio.gather(*(runner.adapter.close() for runner in runners), return_exceptions=True)
+        market_data.stop()
+        await clock_client.close()
+        await session.close()
+        if signing_service is not None:
+            for stats in signing_service.get_stats():
+                print(f"[SIGNER] {stats}")
+            await asyncio.to_thread(signing_service.close)
+        if rate_limiter is not None:
+            print(f"[RATE-LIMIT] {rate_limiter.get_stats()}")
+            rate_limiter.close()
+    return runners
+
+
+def _run_shard(accounts: Dict[str, str], config: Dict[str, Any], log_dir: str):
+    try:
+        asyncio.run(run_accounts(accounts, config, log_dir))
+    except KeyboardInterrupt:
+        pass
+
+
+def shard_accounts(accounts: Dict[str, str], shards: int) -> List[Dict[str, str]]:
+    """按轮询方式把账户分成 shards 份"""
+    result: List[Dict[str, str]] = [{} for _ in range(max(1, shards))]
+    for i, (name, pk) in enumerate(accounts.items()):
+        result[i % len(result)][name] = pk
+    return [shard for shard in result if shard]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='StandX 多账户策略脚本（单进程）')
+    parser.add_argument('-c', '--config', type=str, default='config.yaml', help='指定配置文件路径（默认: config.yaml）')
+    parser.add_argument("--key_prefix", type=str, required=True, help="账户名前缀，如 account_hp")
+    parser.add_argument("--accounts", type=str, required=True, help="账户编号，如 5-10 或 5,7,9")
+    parser.add_argument("--enc_file", type=str, default=ENCRYPTED_OUTPUT_FILE, help="加密私钥文件")
+    parser.add_argument("--processes", type=int, default=1, help="进程数，>1 时按账户分片到多个进程")
+    parser.add_argument("--log_dir", type=str, default="logs")
+    parser.add_argument("--price_spread", type=int)
+    parser.add_argument("--price_step", type=int)
+    parser.add_argument("--grid_count", type=int)
+    parser.add_argument("--order_quantity", type=float)
+    parser.add_argument("--sleep_interval", type=int)
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    for key in ("price_spread", "price_step", "grid_count", "order_quantity", "sleep_interval"):
+        value = getattr(args, key)
+        if value is not None:
+            config["grid"][key] = value
+
+    password = os.environ.get("STANDX_VAULT_PASSWORD") or getpass.getpass("Enter private key vault password: ")
+    all_keys = load_private_keys(args.enc_file, password)
+    del password
+
+    names = parse_accounts(args.key_prefix, args.accounts)
+    missing = [name for name in names if name not in all_keys]
+    if missing:
+        print(f"Private key not found: {', '.join(missing)}")
+    accounts = {name: all_keys[name] for name in names if name in all_keys}
+    del all_keys
+    if not accounts:
+        print(f"No accounts resolved from '{args.accounts}'")
+        sys.exit(1)
+
+    print(f"[BOOT] accounts={len(accounts)} processes={args.processes}")
+
+    if args.processes <= 1:
+        _run_shard(accounts, config, args.log_dir)
+        return
+
+    processes = []
+    for shard in shard_accounts(accounts, args.processes):
+        proc = multiprocessing.Process(target=_run_shard, args=(shard, config, args.log_dir), daemon=False)
+        proc.start()
+        processes.append(proc)
+    try:
+        for proc in processes:
+            proc.join()
+    except KeyboardInterrupt:
+        for proc in processes:
+            proc.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -16,7 +16,10 @@ project_root = os.path.dirname(os.path.dirname(current_dir))
 sys.path.insert(0, project_root)
 
 from adapters import create_adapter
-from risk import IndicatorTool
+from adapters.base_adapter import SymbolPrecision, FLOOR
+import risk  # 风控指标按需加载（未启用风控时不导入 numpy）
+from market_data import MarketDataClient, DEFAULT_ADDRESS
+from strategys.scheduler import EventScheduler, RateBudget
 
 # 全局配置变量
 STANDX_CONFIG = None
@@ -24,6 +27,9 @@ SYMBOL = None
 GRID_CONFIG = None
 RISK_CONFIG = None
 CANCEL_STALE_ORDERS_CONFIG = None
+MARKET_DATA_CONFIG = None
+MARKET_DATA_CLIENT = None
+SCHEDULER_CONFIG = None
 account_id = None
 
 # 来源chatgpt对话
@@ -63,13 +69,56 @@ def load_config(config_file="config.yaml"):
 
 def initialize_config(config):
     """初始化全局配置变量"""
-    global STANDX_CONFIG, SYMBOL, GRID_CONFIG, RISK_CONFIG, CANCEL_STALE_ORDERS_CONFIG
+    global STANDX_CONFIG, SYMBOL, GRID_CONFIG, RISK_CONFIG, CANCEL_STALE_ORDERS_CONFIG, MARKET_DATA_CONFIG
+    global SCHEDULER_CONFIG
 
     STANDX_CONFIG = config['exchange']
     SYMBOL = config['symbol']
     GRID_CONFIG = config['grid']
     RISK_CONFIG = config.get('risk', {})
     CANCEL_STALE_ORDERS_CONFIG = config.get('cancel_stale_orders', {})
+    MARKET_DATA_CONFIG = config.get('market_data', {})
+    SCHEDULER_CONFIG = config.get('scheduler', {})
+
+
+def init_market_data_client():
+    """启用共享行情时，订阅本地行情发布进程（python -m market_data.publisher）"""
+    global MARKET_DATA_CLIENT
+    if MARKET_DATA_CONFIG.get('enable', False):
+        address = MARKET_DATA_CONFIG.get('address') or DEFAULT_ADDRESS
+        MARKET_DATA_CLIENT = MarketDataClient(address).subscribe(SYMBOL)
+
+
+def get_market_inputs(adapter):
+    """获取本周期的价格和 ADX
+    
+    优先使用共享行情快照（超过 max_age 秒未更新视为过期），过期或未启用时回退到直接请求。
+    
+    Returns:
+        (last_price, adx): adx 在风控关闭时为 None
+    """
+    snapshot = None
+    if MARKET_DATA_CLIENT is not None:
+        snapshot = MARKET_DATA_CLIENT.get_snapshot(SYMBOL, max_age=MARKET_DATA_CONFIG.get('max_age', 3))
+    
+    if snapshot is not None:
+        last_price = snapshot.last_price
+    else:
+        price_info = adapter.get_ticker(SYMBOL)
+        last_price = (
+            price_info.get('mark_price')
+            or price_info.get('mid_price')
+            or price_info.get('last_price')
+        )
+    
+    adx = None
+    if RISK_CONFIG.get('enable', False):
+        if snapshot is not None:
+            adx = snapshot.fresh_adx(MARKET_DATA_CONFIG.get('adx_max_age', 120))
+        if adx is None:
+            adx = risk.IndicatorTool().get_adx(SYMBOL, "5m", period=14)
+    
+    return last_price, adx
 
 
 def generate_grid_arrays(current_price, price_step, grid_count, price_spread):
@@ -116,50 +165,83 @@ def generate_grid_arrays(current_price, price_step, grid_count, price_spread):
     return long_grid, short_grid
 
 
+# 网格价格为整数，挂单价格按 1 为 tick 向下取整（与 int(float(price)) 一致，但不经过 float）
+GRID_PRECISION = SymbolPrecision(tick_size=1)
+
+
+def grid_price(order):
+    """订单价格 -> 网格整数价格（直接从接口返回的原始价格字符串计算）"""
+    return GRID_PRECISION.price_to_ticks(order.raw_price, FLOOR)
+
+
+def order_ref(order):
+    """订单引用：有交易所订单ID时为 int 订单ID，否则为客户端订单ID（本地刚下的单）"""
+    try:
+        return int(order.order_id)
+    except (ValueError, TypeError):
+        return order.client_order_id
+
+
+def split_order_refs(refs):
+    """订单引用列表 -> (订单ID列表, 客户端订单ID列表)"""
+    order_ids = [ref for ref in refs if isinstance(ref, int)]
+    cl_ord_ids = [ref for ref in refs if isinstance(ref, str)]
+    return order_ids, cl_ord_ids
+
+
+def cancel_order_refs(adapter, refs):
+    """按订单引用批量撤单"""
+    order_ids, cl_ord_ids = split_order_refs(refs)
+    if not order_ids and not cl_ord_ids:
+        return
+    if hasattr(adapter, 'cancel_orders_by_ids'):
+        adapter.cancel_orders_by_ids(order_id_list=order_ids or None, cl_ord_id_list=cl_ord_ids or None)
+    else:
+        # 如果适配器没有批量撤单方法，逐个撤单
+        for order_id in order_ids:
+            try:
+                adapter.cancel_order(order_id=str(order_id))
+            except:
+                pass
+        for cl_ord_id in cl_ord_ids:
+            try:
+                adapter.cancel_order(client_order_id=cl_ord_id)
+            except:
+                pass
+
+
 def get_pending_orders_arrays(adapter, symbol):
-    """获取当前账号未成交订单数组，按做多和做空分类，同时返回价格到订单ID的映射
+    """获取当前账号未成交订单数组，按做多和做空分类，同时返回价格到订单引用的映射
+    
+    订单来自适配器的本地订单簿（get_cached_open_orders），只在需要对账时才请求 REST 快照。
     
     Returns:
         (long_prices, short_prices, long_price_to_ids, short_price_to_ids):
         - long_prices: 做多价格数组
         - short_prices: 做空价格数组
-        - long_price_to_ids: 做多价格到订单ID列表的字典映射
-        - short_price_to_ids: 做空价格到订单ID列表的字典映射
+        - long_price_to_ids: 做多价格到订单引用列表的字典映射（见 order_ref）
+        - short_price_to_ids: 做空价格到订单引用列表的字典映射
     """
     try:
-        open_orders = adapter.get_open_orders(symbol=symbol)
+        open_orders = adapter.get_cached_open_orders(symbol=symbol)
         
-        # 做多订单：side 为 "buy" 或 "long"
-        long_prices = []
-        long_price_to_ids = {}  # 价格 -> 订单ID列表
-        # 做空订单：side 为 "sell" 或 "short"
-        short_prices = []
-        short_price_to_ids = {}  # 价格 -> 订单ID列表
+        long_price_to_ids = {}  # 价格 -> 订单引用列表
+        short_price_to_ids = {}
         
         for order in open_orders:
             # 只处理未成交的订单（状态为 pending, open, partially_filled）
-            if order.status in ["pending", "open", "partially_filled"]:
-                if order.price is not None:
-                    price = int(float(order.price))
-                    try:
-                        order_id = int(order.order_id)
-                    except (ValueError, TypeError):
-                        continue  # 跳过无效的订单ID
-                    
-                    if order.side in ["buy", "long"]:
-                        if price not in long_prices:
-                            long_prices.append(price)
-                        if price not in long_price_to_ids:
-                            long_price_to_ids[price] = []
-                        long_price_to_ids[price].append(order_id)
-                    elif order.side in ["sell", "short"]:
-                        if price not in short_prices:
-                            short_prices.append(price)
-                        if price not in short_price_to_ids:
-                            short_price_to_ids[price] = []
-                        short_price_to_ids[price].append(order_id)
+            if order.status not in ["pending", "open", "partially_filled"] or order.raw_price is None:
+                continue
+            ref = order_ref(order)
+            if ref is None:
+                continue  # 跳过无效的订单ID
+            price = grid_price(order)
+            if order.side in ["buy", "long"]:
+                long_price_to_ids.setdefault(price, []).append(ref)
+            elif order.side in ["sell", "short"]:
+                short_price_to_ids.setdefault(price, []).append(ref)
         
-        return sorted(long_prices), sorted(short_prices), long_price_to_ids, short_price_to_ids
+        return sorted(long_price_to_ids), sorted(short_price_to_ids), long_price_to_ids, short_price_to_ids
     except NotImplementedError:
         # 如果适配器未实现，返回空数组
         return [], [], {}, {}
@@ -177,30 +259,26 @@ def cancel_stale_order_ids(adapter, symbol, stale_seconds=5, cancel_probability=
         cancel_probability: 取消概率（0-1之间），默认0.5（50%）
     """
     try:
-        open_orders = adapter.get_open_orders(symbol=symbol)
-        stale_order_ids = []
+        open_orders = adapter.get_cached_open_orders(symbol=symbol)
+        stale_refs = []
         current_time = int(time.time() * 1000)  # 当前时间（毫秒）
         
         for order in open_orders:
             # 只处理未成交的订单
-            if order.status in ["pending", "open", "partially_filled"]:
-                if order.created_at:
-                    # 计算未成交时间（毫秒）
-                    elapsed_time = current_time - order.created_at
-                    if elapsed_time > stale_seconds * 1000:  # 转换为毫秒
-                        # 根据概率决定是否取消
-                        if random.random() < cancel_probability:
-                            try:
-                                order_id = int(order.order_id)
-                                stale_order_ids.append(order_id)
-                            except (ValueError, TypeError):
-                                pass
+            if order.status in ["pending", "open", "partially_filled"] and order.created_at:
+                # 计算未成交时间（毫秒）
+                elapsed_time = current_time - order.created_at
+                if elapsed_time > stale_seconds * 1000:  # 转换为毫秒
+                    # 根据概率决定是否取消
+                    if random.random() < cancel_probability:
+                        ref = order_ref(order)
+                        if ref is not None:
+                            stale_refs.append(ref)
         
         # 如果有需要取消的订单，执行批量撤单
-        if stale_order_ids:
+        if stale_refs:
             try:
-                if hasattr(adapter, 'cancel_orders_by_ids'):
-                    adapter.cancel_orders_by_ids(order_id_list=stale_order_ids)
+                cancel_order_refs(adapter, stale_refs)
             except:
                 pass
     except Exception:
@@ -213,36 +291,28 @@ def cancel_orders_by_prices(cancel_long, cancel_short, long_price_to_ids, short_
     Args:
         cancel_long: 需要撤单的做多价格列表
         cancel_short: 需要撤单的做空价格列表
-        long_price_to_ids: 做多价格到订单ID列表的字典映射
-        short_price_to_ids: 做空价格到订单ID列表的字典映射
+        long_price_to_ids: 做多价格到订单引用列表的字典映射
+        short_price_to_ids: 做空价格到订单引用列表的字典映射
         adapter: 适配器实例
     """
     if not cancel_long and not cancel_short:
         return
     
-    # 根据价格映射获取订单ID
-    all_order_ids = []
+    # 根据价格映射获取订单引用
+    all_refs = []
     for price in cancel_long:
         if price in long_price_to_ids:
-            all_order_ids.extend(long_price_to_ids[price])
+            all_refs.extend(long_price_to_ids[price])
     for price in cancel_short:
         if price in short_price_to_ids:
-            all_order_ids.extend(short_price_to_ids[price])
+            all_refs.extend(short_price_to_ids[price])
     
-    if not all_order_ids:
+    if not all_refs:
         return
     
     # 批量撤单
     try:
-        if hasattr(adapter, 'cancel_orders_by_ids'):
-            adapter.cancel_orders_by_ids(order_id_list=all_order_ids)
-        else:
-            # 如果适配器没有批量撤单方法，逐个撤单
-            for order_id in all_order_ids:
-                try:
-                    adapter.cancel_order(order_id=str(order_id))
-                except:
-                    pass
+        cancel_order_refs(adapter, all_refs)
     except:
         pass
 
@@ -481,13 +551,8 @@ def run_strategy_cycle(adapter):
     目标：最大化 Maker Points
     """
 
-    # ========= 1. 获取价格（优先 mark / mid） =========
-    price_info = adapter.get_ticker(SYMBOL)
-    last_price = (
-        price_info.get('mark_price')
-        or price_info.get('mid_price')
-        or price_info.get('last_price')
-    )
+    # ========= 1. 获取价格（优先 mark / mid，启用共享行情时优先用快照） =========
+    last_price, adx = get_market_inputs(adapter)
 
     # print(f"[PRICE] {SYMBOL}: {last_price:.2f}")
 
@@ -495,8 +560,6 @@ def run_strategy_cycle(adapter):
     default_spread = GRID_CONFIG['price_spread']
 
     if RISK_CONFIG.get('enable', False):
-        indicator_tool = IndicatorTool()
-        adx = indicator_tool.get_adx(SYMBOL, "5m", period=14)
         adx_threshold = RISK_CONFIG.get('adx_threshold', 25)
         price_spread = calculate_dynamic_price_spread(
             adx, last_price, default_spread, adx_threshold
@@ -631,6 +694,86 @@ def run_strategy_cycle(adapter):
     except Exception:
         pass
 
+    return last_price
+
+
+def next_stale_deadline(adapter, stale_seconds):
+    """
+    距离下一笔挂单超过 stale_seconds 的秒数（读取本地订单簿），没有挂单返回 None
+
+    已超时但本轮按 cancel_probability 保留下来的挂单不参与计算（否则截止时间为负，调度器会以
+    min_interval 连续触发完整周期），改为 stale_seconds 后再参与一次随机撤单
+    """
+    now = time.time()
+    deadlines = [
+        order.created_at / 1000 + stale_seconds - now
+        for order in adapter.get_cached_open_orders(symbol=SYMBOL)
+        if order.created_at
+    ]
+    pending = [deadline for deadline in deadlines if deadline > 0]
+    if len(pending) < len(deadlines):
+        pending.append(stale_seconds)
+    return min(pending) if pending else None
+
+
+def create_scheduler(adapter):
+    """按 scheduler 配置创建事件调度器，并接入成交 / 价格事件源"""
+    rate = SCHEDULER_CONFIG.get('rate_limit', 2)
+    scheduler = EventScheduler(
+        max_interval=SCHEDULER_CONFIG.get('max_interval', GRID_CONFIG.get('sleep_interval', 60)),
+        price_threshold=SCHEDULER_CONFIG.get('price_move') or GRID_CONFIG['price_step'],
+        coalesce=SCHEDULER_CONFIG.get('coalesce', 0.2),
+        min_interval=SCHEDULER_CONFIG.get('min_interval', 0.5),
+        budget=RateBudget(rate, SCHEDULER_CONFIG.get('rate_burst', rate * 2)) if rate else None,
+    )
+
+    if adapter.stream_handler is not None:
+        def on_stream_event(event, payload):
+            if event in ("fill", "position"):
+                scheduler.on_fill(payload)
+            elif event == "price":
+                scheduler.on_price(payload)
+        adapter.stream_handler.add_listener(on_stream_event)
+    if MARKET_DATA_CLIENT is not None:
+        MARKET_DATA_CLIENT.add_listener(
+            lambda snapshot: scheduler.on_price(snapshot.last_price) if snapshot.symbol == SYMBOL else None
+        )
+    elif adapter.stream_handler is None and SCHEDULER_CONFIG.get('price_poll_interval'):
+        def fetch_price():
+            price_info = adapter.get_ticker(SYMBOL)
+            return price_info.get('mark_price') or price_info.get('mid_price') or price_info.get('last_price')
+        scheduler.add_poller(fetch_price, SCHEDULER_CONFIG['price_poll_interval'])
+    return scheduler
+
+
+def run_event_driven(adapter):
+    """事件驱动主循环：价格变动 / 成交 / 挂单过期 / 兜底定时触发策略周期"""
+    scheduler = create_scheduler(adapter)
+    stale_enabled = CANCEL_STALE_ORDERS_CONFIG.get('enable', False)
+    stale_seconds = CANCEL_STALE_ORDERS_CONFIG.get('stale_seconds', 5)
+
+    def cycle(reasons):
+        logging.info("[CYCLE] triggers=%s", ",".join(sorted(reasons)))
+        if stale_enabled and "stale" in reasons:
+            cancel_stale_order_ids(
+                adapter, SYMBOL, stale_seconds,
+                CANCEL_STALE_ORDERS_CONFIG.get('cancel_probability', 0.5)
+            )
+        last_price = run_strategy_cycle(adapter)
+        if stale_enabled:
+            scheduler.set_deadline(next_stale_deadline(adapter, stale_seconds))
+        return last_price
+
+    def on_error(e):
+        print(f"weiweiwei proc cycle error: {e}")
+
+    try:
+        scheduler.run(cycle, on_error=on_error)
+    except KeyboardInterrupt:
+        print("\n\n weiweiwei the proc stop")
+    finally:
+        scheduler.stop()
+
 
 
 def main():
@@ -676,6 +819,7 @@ def main():
         config["grid"]["sleep_interval"] = args.sleep_interval
         
         initialize_config(config)
+        init_market_data_client()
         
     except FileNotFoundError as e:
         print(f"youryour error: {e}")
@@ -688,14 +832,27 @@ def main():
         adapter = create_adapter(STANDX_CONFIG)
         adapter.connect()
         
+        stream_config = STANDX_CONFIG.get('stream') or {}
+        if stream_config.get('enable', False):
+            adapter.start_stream([SYMBOL])
+        
         print("begin begin la~~~~~~~~~~~~~")
         
+        if SCHEDULER_CONFIG.get('enable', False):
+            run_event_driven(adapter)
+            return None
+        
         sleep_interval = GRID_CONFIG.get('sleep_interval', 60)
         
         while True:
             try:
                 run_strategy_cycle(adapter)
-                time.sleep(sleep_interval)
+                if adapter.stream is not None:
+                    # 成交 / 持仓推送会提前唤醒，短暂等待以合并连续推送
+                    if adapter.wait_stream_event(sleep_interval):
+                        time.sleep(stream_config.get('min_interval', 0.5))
+                else:
+                    time.sleep(sleep_interval)
             except KeyboardInterrupt:
                 print("\n\n weiweiwei the proc stop")
                 break
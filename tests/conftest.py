@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 顶层包（adapters / risk / ratelimit / backtest ...）从项目根目录导入，与各脚本的做法一致
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
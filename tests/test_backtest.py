@@ -0,0 +1,172 @@
+import math
+import os
+
+import pytest
+import yaml
+
+from adapters.base_adapter import SymbolPrecision
+from backtest import MarketReplay, MatchingEngine, SimOrder, param_grid, run_backtest, sweep
+from backtest.matching import BUY, SELL
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+T0 = 1_700_000_000_000
+
+
+@pytest.fixture
+def engine():
+    # 1 tick = 0.01，1 lot = 0.001：成交额单位 tick*lot = 0.00001
+    engine = MatchingEngine(SymbolPrecision("0.01", "0.001"), queue_lots=5)
+    engine.on_trade(100, 100, 100, 0, T0)
+    return engine
+
+
+def _limit(order_id, side, price, lots, reduce_only=False):
+    return SimOrder(order_id, side, price, lots, reduce_only=reduce_only)
+
+
+def test_touch_consumes_queue_ahead_before_filling(engine):
+    order = engine.add_order(_limit("b1", BUY, 99, 3), T0)
+    assert order.queue_ahead == 5
+
+    # 只触及挂单价：成交量先消耗前面的排队量
+    engine.on_trade(99, 100, 99, 4, T0 + 1)
+    assert (order.queue_ahead, order.filled_lots, order.status) == (1, 0, "open")
+
+    engine.on_trade(99, 100, 99, 3, T0 + 2)
+    assert (order.queue_ahead, order.filled_lots, order.status) == (0, 2, "open")
+
+    engine.on_trade(99, 100, 99, 5, T0 + 3)
+    assert (order.filled_lots, order.status) == (3, "filled")
+    assert engine.open_orders() == []
+    assert engine.bids == {}
+    assert [(f.lots, f.price_ticks, f.maker) for f in engine.fills] == [(2, 99, True), (1, 99, True)]
+
+
+def test_own_orders_at_one_level_queue_in_time_order(engine):
+    engine.queue_lots = 1
+    first = engine.add_order(_limit("b1", BUY, 99, 2), T0)
+    second = engine.add_order(_limit("b2", BUY, 99, 2), T0)
+
+    # 4 lot：1 消耗外部排队，2 成交给 b1，剩余 1 成交给 b2（其排队量已被前面的成交覆盖）
+    engine.on_trade(99, 100, 99, 4, T0 + 1)
+    assert (first.filled_lots, first.status) == (2, "filled")
+    assert (second.filled_lots, second.queue_ahead) == (1, 0)
+    assert [o.order_id for o in engine.bids[99]] == ["b2"]
+
+
+def test_trade_through_fills_whole_order_regardless_of_queue(engine):
+    bid = engine.add_order(_limit("b1", BUY, 99, 7), T0)
+    ask = engine.add_order(_limit("a1", SELL, 102, 4), T0)
+
+    # 成交量为 0 也整单成交：价格穿过挂单价说明该档位已被吃完
+    engine.on_trade(98, 100, 98, 0, T0 + 1)
+    assert (bid.filled_lots, bid.status) == (7, "filled")
+    assert ask.status == "open"
+
+    engine.on_trade(98, 103, 103, 0, T0 + 2)
+    assert (ask.filled_lots, ask.status) == (4, "filled")
+    assert [(f.side, f.price_ticks, f.lots) for f in engine.fills] == [(BUY, 99, 7), (SELL, 102, 4)]
+    assert engine.position == 3
+
+
+def test_marketable_orders_fill_as_taker_at_last_price(engine):
+    order = engine.add_order(_limit("b1", BUY, 105, 2), T0)
+    market = engine.add_order(SimOrder("m1", SELL, None, 5), T0)
+
+    assert (order.status, market.status) == ("filled", "filled")
+    assert [(f.price_ticks, f.maker) for f in engine.fills] == [(100, False), (100, False)]
+    assert engine.taker_fills == 2 and engine.maker_fills == 0
+    assert engine.taker_notional == 700
+    assert engine.position == -3
+
+
+def test_position_and_pnl_in_integer_units(engine):
+    engine.add_order(_limit("b1", BUY, 99, 3), T0)
+    engine.on_trade(98, 100, 98, 0, T0 + 1)
+    assert (engine.position, engine.cash, engine.entry_cost) == (3, -297, 297)
+
+    engine.add_order(_limit("a1", SELL, 105, 2), T0 + 2)
+    engine.on_trade(98, 106, 103, 0, T0 + 3)
+    # 平掉 2/3：开仓成本按比例扣减
+    assert (engine.position, engine.cash, engine.entry_cost) == (1, -87, 99)
+    assert engine.pnl_units() == -87 + 103
+    assert engine.pnl_units(110) == 23
+    assert engine.units_to_quote(engine.pnl_units()) == pytest.approx(16 * 0.00001)
+
+    # 反手：卖 3，平多 1 后开空 2，开仓成本按成交价重置
+    engine.add_order(_limit("a2", SELL, 103, 3), T0 + 4)
+    assert (engine.position, engine.entry_cost) == (-2, -206)
+    assert engine.max_position == 3
+    assert engine.pnl_units() == -87 + 309 - 2 * 103
+
+
+def test_reduce_only_never_opens_or_flips(engine):
+    assert engine.add_order(_limit("r1", SELL, 101, 2, reduce_only=True), T0).status == "cancelled"
+
+    engine.add_order(SimOrder("m1", BUY, None, 1), T0)
+    order = engine.add_order(_limit("r2", SELL, 101, 3, reduce_only=True), T0)
+    engine.on_trade(100, 102, 102, 0, T0 + 1)
+    assert (order.filled_lots, order.status) == (1, "cancelled")
+    assert engine.position == 0
+
+
+def test_add_order_requires_a_price(engine):
+    fresh = MatchingEngine(SymbolPrecision("0.01", "0.001"))
+    with pytest.raises(ValueError):
+        fresh.add_order(_limit("b1", BUY, 99, 1), T0)
+    assert engine.cancel_order("missing") is False
+
+
+@pytest.fixture
+def config():
+    with open(os.path.join(ROOT, "strategys", "strategy_standx", "config.yaml"), encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    config["risk"]["enable"] = False
+    return config
+
+
+@pytest.fixture
+def market():
+    rows = [[T0 + i * 1000, f"{95000 + 300 * math.sin(i / 40):.2f}", 0.5] for i in range(600)]
+    return MarketReplay.from_ticks("BTC-USD", rows)
+
+
+def test_backtest_is_deterministic(config, market):
+    def metrics(result):
+        # 去掉耗时相关的字段
+        return {k: v for k, v in result.to_dict().items() if k not in ("seconds", "cycles_per_sec")}
+
+    first = run_backtest(config, market, cycle_interval=5)
+    second = run_backtest(config, market, cycle_interval=5)
+    assert metrics(first) == metrics(second)
+    assert first.errors == 0
+    assert first.cycles == 120
+    assert first.fills > 0
+
+
+def test_cycle_errors_fail_the_run_instead_of_being_ranked(config, market, monkeypatch):
+    from strategys.strategy_standx import standx_mm_new as strategy
+
+    calls = {"n": 0}
+    original = strategy.run_strategy_cycle
+
+    def flaky_cycle(adapter):
+        calls["n"] += 1
+        if calls["n"] % 10 == 0:
+            raise KeyError("grid")
+        return original(adapter)
+
+    monkeypatch.setattr(strategy, "run_strategy_cycle", flaky_cycle)
+
+    with pytest.raises(RuntimeError, match="KeyError"):
+        run_backtest(config, market, cycle_interval=5)
+
+    # 容忍少量异常时照常返回，并报告异常次数
+    calls["n"] = 0
+    result = run_backtest(config, market, cycle_interval=5, max_errors=20)
+    assert result.errors == 12
+
+    # 参数扫描中失败的组合带 error 字段，不带 pnl
+    calls["n"] = 0
+    results = sweep(config, market, param_grid(price_step=[10, 20]), processes=1, cycle_interval=5)
+    assert all("error" in r and "pnl" not in r for r in results)
@@ -0,0 +1,129 @@
+from decimal import Decimal
+
+import pytest
+
+from adapters.base_adapter import (
+    CEIL, FLOOR, NEAREST, Balance, Order, Position, SymbolPrecision,
+    from_units, parse_fixed, to_units,
+)
+from adapters.order_cache import OpenOrderCache
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("65000.55", (6500055, 2)),
+    (" -12.30 ", (-1230, 2)),
+    ("+5", (5, 0)),
+    ("-.5", (-5, 1)),
+    ("5.", (5, 0)),
+    ("1e3", (1000, 0)),
+    ("1E-4", (1, 4)),
+    (42, (42, 0)),
+    (Decimal("-0.0100"), (-100, 4)),
+    (0.1, (1, 1)),
+])
+def test_parse_fixed(value, expected):
+    assert parse_fixed(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "  ", None, ".", "+.", "+-5", "-+5", "--5", "abc", "nan", "inf", "1.2.3"])
+def test_parse_fixed_rejects_invalid_input(value):
+    with pytest.raises(ValueError):
+        parse_fixed(value)
+
+
+@pytest.mark.parametrize("value, unit, rounding, expected", [
+    ("65000.5", (1, 1), FLOOR, 650005),
+    ("65000.55", (1, 1), FLOOR, 650005),
+    ("65000.55", (1, 1), CEIL, 650006),
+    ("65000.55", (1, 1), NEAREST, 650006),
+    ("65000.54", (1, 1), NEAREST, 650005),
+    ("0.0123", (1, 4), FLOOR, 123),
+    ("1", (5, 1), FLOOR, 2),
+    ("1.2", (5, 1), NEAREST, 2),
+    ("1.3", (5, 1), CEIL, 3),
+])
+def test_to_units_rounding(value, unit, rounding, expected):
+    assert to_units(value, unit, rounding) == expected
+
+
+def test_to_units_exact_rejects_off_grid_values():
+    assert to_units("65000.50", (1, 1)) == 650005
+    with pytest.raises(ValueError):
+        to_units("65000.55", (1, 1))
+    with pytest.raises(ValueError):
+        to_units("1.2", (5, 1))
+
+
+@pytest.mark.parametrize("tick_size, lot_size, prices, sizes", [
+    ("0.1", "0.0001", ["65000.5", "0.1", "-3.2", "100"], ["0.0123", "1", "0.0001"]),
+    ("0.5", "0.001", ["65000.5", "65001", "0.5"], ["0.001", "2.5"]),
+    (0.01, 0.1, ["1.23", "99999.99"], ["0.3", "12.7"]),
+    ("25", "1000", ["100", "65025"], ["3000"]),
+])
+def test_symbol_precision_round_trips(tick_size, lot_size, prices, sizes):
+    precision = SymbolPrecision(tick_size, lot_size, symbol="BTC-USD")
+    for price in prices:
+        ticks = precision.price_to_ticks(price)
+        assert precision.ticks_to_price(ticks) == Decimal(price)
+        assert precision.price_to_ticks(precision.ticks_to_price(ticks)) == ticks
+        assert precision.price_to_ticks(Decimal(price)) == ticks
+    for size in sizes:
+        lots = precision.size_to_lots(size)
+        assert precision.lots_to_size(lots) == Decimal(size)
+        assert precision.size_to_lots(precision.lots_to_size(lots)) == lots
+
+
+def test_symbol_precision_rejects_non_positive_steps():
+    with pytest.raises(ValueError):
+        SymbolPrecision("0")
+    with pytest.raises(ValueError):
+        SymbolPrecision("0.1", "-1")
+    with pytest.raises(ValueError):
+        SymbolPrecision("")
+
+
+def test_from_units_is_lossless():
+    assert from_units(650005, (1, 1)) == Decimal("65000.5")
+    assert from_units(3, (5, 1)) == Decimal("1.5")
+    assert from_units(-123, (1, 4)) == Decimal("-0.0123")
+
+
+def test_order_ticks_and_lots_from_raw_strings():
+    precision = SymbolPrecision("0.1", "0.0001", symbol="BTC-USD")
+    order = Order("1", "BTC-USD", "buy", "limit", quantity="0.0123", price="65000.5",
+                  filled_quantity="0.0003", precision=precision)
+    assert order.price_ticks == 650005
+    assert order.quantity_lots == 123
+    assert order.filled_lots == 3
+    # 读取整数表示不触发 Decimal 转换
+    assert type(order.raw_price) is str
+    assert order.price == Decimal("65000.5")
+
+
+@pytest.mark.parametrize("bad", ["", "+-5", "abc", float("nan"), object()])
+def test_decimal_fields_validate_on_construction(bad):
+    with pytest.raises(ValueError):
+        Order("1", "BTC-USD", "buy", "limit", quantity="1", price=bad)
+    with pytest.raises(ValueError):
+        Position("BTC-USD", bad, "long", "1", "1", "0")
+    with pytest.raises(ValueError):
+        Balance("1", bad, "1", "0")
+
+
+def test_order_cache_levels_use_fixed_point_price():
+    cache = OpenOrderCache()
+    cache.on_placed(Order("1", "BTC-USD", "buy", "limit", quantity="1", price="65000.50"))
+    cache.on_placed(Order("2", "BTC-USD", "buy", "limit", quantity="1", price="65000.5"))
+    cache.on_placed(Order("3", "BTC-USD", "buy", "limit", quantity="1", price=Decimal("65000.500")))
+    cache.on_placed(Order("4", "BTC-USD", "buy", "limit", quantity="1", price="65000.55"))
+
+    levels = cache.price_levels("BTC-USD", "buy")
+    assert {price: sorted(o.order_id for o in orders) for price, orders in levels.items()} == {
+        Decimal("65000.5"): ["1", "2", "3"],
+        Decimal("65000.55"): ["4"],
+    }
+    # 建索引不转换 Decimal
+    assert cache.get(order_id="1").raw_price == "65000.50"
+
+    cache.on_cancelled(order_ids=["1", "2", "3"])
+    assert list(cache.price_levels("BTC-USD", "buy")) == [Decimal("65000.55")]
@@ -0,0 +1,122 @@
+import json
+
+import numpy as np
+import pytest
+
+from risk.kline_cache import CLOSE, CLOSE_TIME, OPEN_TIME, FileKlineSource, KlineStore
+
+SYMBOL = "BTC-USD"
+INTERVAL = "5m"
+INTERVAL_MS = 300_000
+T0 = 1_700_000_100_000 // INTERVAL_MS * INTERVAL_MS
+
+
+def _candle(i: int, close: float = None) -> list:
+    open_time = T0 + i * INTERVAL_MS
+    price = 100.0 + i if close is None else close
+    return [open_time, price, price + 1, price - 1, price, 10.0, open_time + INTERVAL_MS - 1]
+
+
+class RecordingSource(FileKlineSource):
+    """记录每次请求的 (limit, start_time)"""
+
+    def __init__(self, directory, clock):
+        super().__init__(str(directory), clock)
+        self.calls = []
+
+    def fetch(self, symbol, interval, limit, start_time=None):
+        self.calls.append((limit, start_time))
+        return super().fetch(symbol, interval, limit, start_time)
+
+
+@pytest.fixture
+def now():
+    # 第 150 根 K 线开盘后 10 秒
+    return [(T0 + 150 * INTERVAL_MS) / 1000 + 10]
+
+
+@pytest.fixture
+def source(tmp_path, now):
+    directory = tmp_path / "source"
+    directory.mkdir()
+    source = RecordingSource(directory, lambda: now[0])
+    _write(source, [_candle(i) for i in range(300)])
+    return source
+
+
+def _write(source, rows):
+    with open(source.path_for(SYMBOL, INTERVAL), "w", encoding="utf-8") as f:
+        json.dump(rows, f)
+
+
+def _open_indexes(window) -> list:
+    return [int((t - T0) // INTERVAL_MS) for t in window.closed[:, OPEN_TIME]]
+
+
+def test_delta_fetch_after_the_last_closed_candle(source, now):
+    store = KlineStore(source, clock=lambda: now[0])
+
+    window = store.get(SYMBOL, INTERVAL, limit=100)
+    assert _open_indexes(window) == list(range(50, 150))
+    assert window.forming[OPEN_TIME] == T0 + 150 * INTERVAL_MS
+    assert source.calls == [(101, None)]
+
+    # 又收盘了两根：只从最后一根已收盘 K 线之后拉取
+    now[0] += 2 * INTERVAL_MS / 1000
+    window = store.get(SYMBOL, INTERVAL, limit=100)
+    assert source.calls[1:] == [(store.max_fetch, T0 + 150 * INTERVAL_MS)]
+    assert _open_indexes(window) == list(range(52, 152))
+    assert window.forming[OPEN_TIME] == T0 + 152 * INTERVAL_MS
+    assert np.all(window.closed[:, CLOSE_TIME] < now[0] * 1000)
+
+
+def test_forming_candle_is_refreshed_after_ttl(source, now):
+    store = KlineStore(source, forming_ttl=5.0, clock=lambda: now[0])
+    store.get(SYMBOL, INTERVAL, limit=100)
+    rows = [_candle(i) for i in range(300)]
+    rows[150] = _candle(150, close=999.0)
+    _write(source, rows)
+
+    # TTL 内不请求，返回缓存的未收盘 K 线
+    now[0] += 1
+    window = store.get(SYMBOL, INTERVAL, limit=100)
+    assert len(source.calls) == 1
+    assert window.forming[CLOSE] == 250.0
+
+    # 超过 TTL 只刷新未收盘的一根
+    now[0] += 5
+    window = store.get(SYMBOL, INTERVAL, limit=100)
+    assert source.calls[1:] == [(1, T0 + 150 * INTERVAL_MS)]
+    assert window.forming[CLOSE] == 999.0
+    assert _open_indexes(window) == list(range(50, 150))
+
+
+def test_persisted_cache_is_reloaded(source, now, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    first = KlineStore(source, cache_dir=cache_dir, clock=lambda: now[0]).get(SYMBOL, INTERVAL, limit=100)
+
+    # 重启：已收盘 K 线从磁盘读取，只请求未收盘的一根
+    source.calls.clear()
+    store = KlineStore(source, cache_dir=cache_dir, clock=lambda: now[0])
+    window = store.get(SYMBOL, INTERVAL, limit=100)
+
+    assert source.calls == [(1, T0 + 150 * INTERVAL_MS)]
+    np.testing.assert_array_equal(window.closed, first.closed)
+    np.testing.assert_array_equal(window.forming, first.forming)
+
+
+def test_short_persisted_cache_is_backfilled_with_older_history(source, now, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    KlineStore(source, cache_dir=cache_dir, clock=lambda: now[0]).get(SYMBOL, INTERVAL, limit=20)
+
+    # 持久化缓存只有 20 根，需要更长的窗口：一次请求回补更早的历史
+    source.calls.clear()
+    store = KlineStore(source, cache_dir=cache_dir, clock=lambda: now[0])
+    window = store.get(SYMBOL, INTERVAL, limit=100)
+
+    assert source.calls == [(101, None)]
+    assert _open_indexes(window) == list(range(50, 150))
+
+    # 回补后的缓存同样落盘
+    reloaded = KlineStore(source, cache_dir=cache_dir, clock=lambda: now[0]).get(SYMBOL, INTERVAL, limit=100)
+    assert _open_indexes(reloaded) == list(range(50, 150))
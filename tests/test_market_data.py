@@ -0,0 +1,153 @@
+import os
+import stat
+import time
+
+import pytest
+
+from market_data import publisher as publisher_module
+from market_data import MarketDataClient, MarketDataPublisher, MarketDataService, MarketSnapshot
+
+pytestmark = pytest.mark.skipif(publisher_module.RUNTIME_DIR is None, reason="需要 Unix socket")
+
+SYMBOL = "BTC-USD"
+
+
+class TickerSource:
+    """按调用次数递增的 ticker"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, symbol):
+        self.calls += 1
+        return {"symbol": symbol, "mark_price": 65000.0 + self.calls}
+
+
+@pytest.fixture
+def address(tmp_path):
+    return f"unix:{tmp_path / 'run' / 'md.sock'}"
+
+
+@pytest.fixture
+def service():
+    service = MarketDataService(get_ticker=TickerSource(), price_interval=0.05)
+    service.subscribe(SYMBOL)
+    yield service
+    service.stop()
+
+
+@pytest.fixture
+def publisher(service, address):
+    publisher = MarketDataPublisher(service, address).start()
+    yield publisher
+    publisher.stop()
+
+
+@pytest.fixture
+def client(publisher):
+    client = MarketDataClient(publisher.bound_address, reconnect_interval=0.05)
+    yield client
+    client.close()
+
+
+def _mode(path) -> int:
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_default_address_is_in_per_user_runtime_dir():
+    family, path = publisher_module.parse_address(publisher_module.DEFAULT_ADDRESS)
+    assert family == "unix"
+    assert os.path.dirname(path) == publisher_module.RUNTIME_DIR
+    assert publisher_module.RUNTIME_DIR.endswith(f"standx-{os.getuid()}")
+
+
+def test_socket_is_private_and_removed_on_stop(publisher, address):
+    path = publisher_module.parse_address(address)[1]
+    assert stat.S_ISSOCK(os.stat(path).st_mode)
+    assert _mode(path) == 0o600
+    assert _mode(os.path.dirname(path)) == 0o700
+
+    publisher.stop()
+    assert not os.path.exists(path)
+
+
+def test_runtime_dir_permissions_are_enforced(monkeypatch, tmp_path):
+    runtime_dir = tmp_path / "standx-runtime"
+    runtime_dir.mkdir(mode=0o777)
+    os.chmod(runtime_dir, 0o777)
+    monkeypatch.setattr(publisher_module, "RUNTIME_DIR", str(runtime_dir))
+    stale_socket = runtime_dir / "md.sock"
+    stale_socket.write_text("")
+
+    publisher_module.prepare_socket_path(str(stale_socket))
+
+    assert _mode(runtime_dir) == 0o700
+    assert not stale_socket.exists()
+
+    if os.getuid() == 0:
+        os.chown(runtime_dir, 4242, -1)
+        with pytest.raises(PermissionError):
+            publisher_module.prepare_socket_path(str(stale_socket))
+
+
+def test_client_receives_fresh_snapshots(service, client):
+    received = []
+    client.add_listener(received.append)
+    client.subscribe(SYMBOL)
+    service.start()
+
+    snapshot = client.wait_snapshot(SYMBOL, max_age=1.0, timeout=2.0)
+    assert snapshot is not None
+    assert snapshot.is_fresh(1.0)
+    assert snapshot.last_price > 65000.0
+
+    # 后续快照持续推送，序号递增
+    first_seq = snapshot.seq
+    deadline = time.monotonic() + 2.0
+    while client.get_snapshot(SYMBOL).seq <= first_seq and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert client.get_snapshot(SYMBOL).seq > first_seq
+    assert received and all(s.symbol == SYMBOL for s in received)
+
+
+def test_stale_snapshots_are_rejected(service, client):
+    # 不启动后台刷新：只发布一次价格，之后数据逐渐过期
+    client.subscribe(SYMBOL)
+    deadline = time.monotonic() + 2.0
+    while not client.connected and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert service.refresh_price(SYMBOL)
+    assert client.wait_snapshot(SYMBOL, max_age=1.0, timeout=2.0) is not None
+
+    time.sleep(0.15)
+    assert client.get_snapshot(SYMBOL, max_age=0.1) is None
+    assert client.wait_snapshot(SYMBOL, max_age=0.1, timeout=0.1) is None
+    assert service.get_snapshot(SYMBOL, max_age=0.1) is None
+    # 不限制延迟时仍返回最后一份快照，由调用方决定是否回退
+    assert client.get_snapshot(SYMBOL) is not None
+
+
+def test_snapshot_freshness_rules():
+    now = 1_000_000.0
+    snapshot = MarketSnapshot(SYMBOL, {"mark_price": 65000.0}, price_time=now - 2, adx=25.0, adx_time=now - 40)
+
+    assert snapshot.is_fresh(3.0, now=now)
+    assert not snapshot.is_fresh(1.0, now=now)
+    assert snapshot.fresh_adx(60.0, now=now) == 25.0
+    assert snapshot.fresh_adx(30.0, now=now) is None
+    # 没有价格的快照永远不新鲜
+    assert not MarketSnapshot(SYMBOL, {}, price_time=now).is_fresh(10.0, now=now)
+    assert not MarketSnapshot(SYMBOL).is_fresh(10.0, now=now)
+
+    restored = MarketSnapshot.from_dict(snapshot.to_dict())
+    assert restored.to_dict() == snapshot.to_dict()
+
+
+def test_subscribing_new_symbol_resubscribes(service, client):
+    service.subscribe("ETH-USD")
+    client.subscribe(SYMBOL)
+    service.start()
+    assert client.wait_snapshot(SYMBOL, max_age=1.0, timeout=2.0) is not None
+
+    client.subscribe("ETH-USD")
+    assert client.wait_snapshot("ETH-USD", max_age=1.0, timeout=3.0) is not None
@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import os
+
+import pytest
+import yaml
+
+from market_data import MarketDataService
+from strategys.strategy_standx import standx_mm_multi
+from strategys.strategy_standx.standx_mm_multi import AccountRunner, parse_accounts, run_accounts, shard_accounts
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SYMBOL = "BTC-USD"
+
+
+class FakeAdapter:
+    """AsyncStandXAdapter 的最小替身：记录下单 / 撤单，可让连接或周期失败"""
+
+    def __init__(self, account_id="a", fail_connect=0):
+        self.account_id = account_id
+        self.fail_connect = fail_connect
+        self.connects = 0
+        self.placed = []
+        self.closed = False
+
+    async def connect(self):
+        self.connects += 1
+        if self.connects <= self.fail_connect:
+            raise ConnectionError("connect failed")
+
+    async def get_cached_open_orders(self, symbol=None):
+        return []
+
+    async def place_order(self, **params):
+        self.placed.append(params)
+
+    async def cancel_orders_by_ids(self, order_id_list=None, cl_ord_id_list=None):
+        pass
+
+    async def gather_bounded(self, calls):
+        return await asyncio.gather(*(call() for call in calls))
+
+    async def get_position(self, symbol):
+        return None
+
+    async def close(self):
+        self.closed = True
+
+
+class CountingTicker:
+    def __init__(self, price=95000.0):
+        self.price = price
+        self.calls = 0
+
+    def __call__(self, symbol):
+        self.calls += 1
+        return {"symbol": symbol, "mark_price": self.price}
+
+
+@pytest.fixture
+def config():
+    with open(os.path.join(ROOT, "strategys", "strategy_standx", "config.yaml"), encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    config["risk"]["enable"] = False
+    config["grid"]["sleep_interval"] = 1
+    config["market_data"]["max_age"] = 0.2
+    return config
+
+
+@pytest.fixture
+def market_data():
+    service = MarketDataService(get_ticker=CountingTicker())
+    service.subscribe(SYMBOL)
+    yield service
+    service.stop()
+
+
+def make_runner(config, market_data, adapter=None, account_id="a"):
+    return AccountRunner(
+        account_id, adapter or FakeAdapter(account_id), config, market_data, logging.getLogger(f"test.{account_id}")
+    )
+
+
+def record_waits(runner, stop_event, cycles):
+    """替换 wait_next_cycle：记录每次等待的时长，不实际等待，满 cycles 次后停止"""
+    delays = []
+
+    async def wait_next_cycle(stop, delay):
+        delays.append(delay)
+        if len(delays) >= cycles:
+            stop_event.set()
+        await asyncio.sleep(0)
+
+    runner.wait_next_cycle = wait_next_cycle
+    return delays
+
+
+def test_parse_accounts():
+    assert parse_accounts("hp", "1-3,8, 2,") == ["hp1", "hp2", "hp3", "hp8"]
+    assert parse_accounts("hp", "5") == ["hp5"]
+
+
+def test_shard_accounts_round_robin():
+    accounts = {f"hp{i}": f"pk{i}" for i in range(7)}
+    shards = shard_accounts(accounts, 3)
+    assert [list(shard) for shard in shards] == [["hp0", "hp3", "hp6"], ["hp1", "hp4"], ["hp2", "hp5"]]
+    assert {name: pk for shard in shards for name, pk in shard.items()} == accounts
+
+    # 分片数多于账户时不产生空分片；分片数 <= 0 时视为 1
+    assert shard_accounts({"hp1": "pk1"}, 4) == [{"hp1": "pk1"}]
+    assert shard_accounts(accounts, 0) == [accounts]
+    assert shard_accounts({}, 2) == []
+
+
+def test_cycle_uses_shared_snapshot(config, market_data):
+    assert market_data.refresh_price(SYMBOL)
+    runners = [make_runner(config, market_data, account_id=name) for name in ("a", "b", "c")]
+
+    async def scenario():
+        await asyncio.gather(*(runner.run_cycle() for runner in runners))
+
+    asyncio.run(scenario())
+
+    # 三个账户共用一次行情请求
+    assert market_data.get_stats()["fetch_counts"]["price"] == 1
+    for runner in runners:
+        sides = {order["side"] for order in runner.adapter.placed}
+        assert sides == {"buy", "sell"}
+        assert all(order["symbol"] == SYMBOL for order in runner.adapter.placed)
+    assert runners[0].adapter.placed == runners[1].adapter.placed
+
+
+def test_cycle_fails_on_stale_snapshot(config, market_data):
+    runner = make_runner(config, market_data)
+    with pytest.raises(Exception, match="行情快照过期"):
+        asyncio.run(runner.run_cycle())
+    assert runner.adapter.placed == []
+
+
+def test_failed_cycles_back_off_and_reset_after_success(config, market_data):
+    market_data.refresh_price(SYMBOL)
+    runner = make_runner(config, market_data)
+    outcomes = iter([False, False, False, False, True, False])
+    original = runner.run_cycle
+
+    async def run_cycle():
+        if not next(outcomes):
+            raise RuntimeError("cycle failed")
+        await original()
+
+    runner.run_cycle = run_cycle
+    stop_event = asyncio.Event()
+    delays = record_waits(runner, stop_event, 6)
+
+    asyncio.run(runner.run(stop_event, max_backoff=4.0))
+
+    # sleep_interval=1：失败时 1 -> 2 -> 4 -> 4（封顶），成功后恢复为 sleep_interval
+    assert delays == [1, 2, 4, 4, 1, 1]
+    assert (runner.cycles, runner.errors) == (1, 5)
+
+
+def test_connect_failure_is_retried(config, market_data):
+    market_data.refresh_price(SYMBOL)
+    runner = make_runner(config, market_data, adapter=FakeAdapter(fail_connect=2))
+    stop_event = asyncio.Event()
+    delays = record_waits(runner, stop_event, 4)
+
+    asyncio.run(runner.run(stop_event, max_backoff=60.0))
+
+    assert runner.adapter.connects == 3
+    assert delays == [1, 2, 1, 1]
+    assert (runner.cycles, runner.errors) == (2, 2)
+
+
+def test_failing_account_does_not_stop_others(config, market_data):
+    market_data.refresh_price(SYMBOL)
+    broken = make_runner(config, market_data, adapter=FakeAdapter("broken", fail_connect=10 ** 6), account_id="broken")
+    healthy = make_runner(config, market_data, account_id="healthy")
+    stop_event = asyncio.Event()
+    record_waits(broken, stop_event, 10 ** 6)
+    record_waits(healthy, stop_event, 3)
+
+    async def scenario():
+        await asyncio.wait_for(asyncio.gather(broken.run(stop_event), healthy.run(stop_event)), timeout=5)
+
+    asyncio.run(scenario())
+
+    assert healthy.cycles == 3
+    assert healthy.errors == 0
+    assert broken.cycles == 0
+    assert broken.errors >= 3
+
+
+@pytest.fixture
+def account_loggers():
+    """run_accounts 为每个账户挂文件日志；测试结束后移除，避免影响后续测试"""
+    names = ["hp1", "hp2", "hp3"]
+    yield names
+    for name in names:
+        logger = logging.getLogger(f"standx.{name}")
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+            handler.close()
+
+
+class FakeClockClient:
+    def __init__(self, **kwargs):
+        pass
+
+    async def start_clock_sync(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+def test_run_accounts_isolates_failures_and_shares_market_data(config, monkeypatch, tmp_path, account_loggers):
+    ticker = CountingTicker()
+    adapters = {}
+
+    def create_adapter(adapter_config):
+        account_id = adapter_config["account_id"]
+        adapter = adapters[account_id] = FakeAdapter(account_id, fail_connect=10 ** 6 if account_id == "hp2" else 0)
+        return adapter
+
+    monkeypatch.setattr(standx_mm_multi, "create_async_adapter", create_adapter)
+    monkeypatch.setattr(standx_mm_multi, "standx_ticker_fetcher", lambda base_url: ticker)
+    monkeypatch.setattr(standx_mm_multi, "AsyncStandXPerpHTTP", FakeClockClient)
+    config["grid"]["sleep_interval"] = 0.05
+    config["market_data"]["max_age"] = 3
+
+    async def scenario():
+        stop_event = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.5, stop_event.set)
+        accounts = {name: f"pk-{name}" for name in account_loggers}
+        return await run_accounts(accounts, config, str(tmp_path), stop_event)
+
+    runners = asyncio.run(asyncio.wait_for(scenario(), timeout=10))
+
+    by_id = {runner.account_id: runner for runner in runners}
+    assert len({id(runner.market_data) for runner in runners}) == 1
+    assert by_id["hp1"].cycles > 0 and by_id["hp3"].cycles > 0
+    assert by_id["hp1"].errors == by_id["hp3"].errors == 0
+    assert by_id["hp2"].cycles == 0 and by_id["hp2"].errors > 0
+    # 行情请求次数与账户数无关（后台线程按 price_interval 刷新）
+    assert ticker.calls <= 2
+    assert all(adapter.closed for adapter in adapters.values())
+    assert {path.name for path in tmp_path.iterdir()} == {"hp1.log", "hp2.log", "hp3.log"}
@@ -0,0 +1,212 @@
+import time
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from adapters.base_adapter import Order, SymbolPrecision
+from adapters.nado_adapter import (
+    CANCEL_AND_PLACE,
+    CANCEL_ORDERS,
+    PLACE_ORDER,
+    PLACE_ORDERS,
+    NadoAdapter,
+    diff_grid,
+    plan_requote,
+)
+
+SYMBOL = "BTC-PERP"
+PRECISION = SymbolPrecision("0.01", "0.001", symbol=SYMBOL)
+
+
+def _order(
+    order_id: str, side: str, price: str, quantity: str, filled: str = "0"
+) -> Order:
+    return Order(
+        order_id=order_id,
+        symbol=SYMBOL,
+        side=side,
+        order_type="limit",
+        quantity=Decimal(quantity),
+        price=Decimal(price),
+        filled_quantity=Decimal(filled),
+        status="open",
+        time_in_force="gtc",
+    )
+
+
+def _target(side: str, price: str, quantity: str) -> dict:
+    return {"side": side, "price": Decimal(price), "quantity": Decimal(quantity)}
+
+
+@pytest.fixture
+def mock_post() -> MagicMock:
+    with patch.object(requests.Session, "post") as mock_post:
+        yield mock_post
+
+
+@pytest.fixture
+def adapter() -> NadoAdapter:
+    adapter = NadoAdapter(
+        {
+            "exchange_name": "nado",
+            "private_key": "0x45917429615b8a68cd372c96f63092f3d672a0bc60202b188670354b89c43ae3",
+            "engine_url": "http://example.com",
+            "order_sync_interval": 3600,
+        }
+    )
+    adapter.client.endpoint_addr = "0x2279B7A0a67DB372996a5FaB50D91eAA73d2eBe6"
+    adapter.client.chain_id = 1337
+    adapter.markets = {
+        SYMBOL: {
+            "product_id": 2,
+            "price_increment_x18": 10**16,
+            "size_increment": 10**15,
+            "min_size": 10**15,
+        }
+    }
+    adapter.set_symbol_precision(SYMBOL, "0.01", "0.001")
+    return adapter
+
+
+def _execute_responses(mock_post: MagicMock, place_errors: dict = {}) -> list[str]:
+    """Answer execute requests by type and record the request types sent."""
+    sent = []
+
+    def respond(url, json=None, **kwargs):
+        kind = next(iter(json))
+        sent.append(kind)
+        data = None
+        if kind in ("place_order", "cancel_and_place"):
+            data = {"digest": f"0x{len(sent):064x}"}
+        elif kind == "place_orders":
+            orders = json[kind]["orders"]
+            data = {
+                "place_orders": [
+                    (
+                        {"digest": None, "error": place_errors[i]}
+                        if i in place_errors
+                        else {"digest": f"0x{len(sent) * 100 + i:064x}", "error": None}
+                    )
+                    for i in range(len(orders))
+                ]
+            }
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {"status": "success", "data": data}
+        return response
+
+    mock_post.side_effect = respond
+    return sent
+
+
+def test_diff_grid_snaps_targets_to_the_market_increments():
+    open_orders = [
+        _order("0x1", "buy", "100.12", "0.5"),
+        _order("0x2", "sell", "100.50", "0.5"),
+    ]
+    # off-tick / off-lot targets that round down to the resting orders
+    targets = [_target("long", "100.123", "0.5004"), _target("short", "100.509", "0.5")]
+
+    to_cancel, to_place, kept = diff_grid(open_orders, targets, PRECISION)
+    assert (to_cancel, to_place, kept) == ([], [], open_orders)
+
+    # without the increments every off-tick level would be re-placed
+    to_cancel, to_place, kept = diff_grid(open_orders, targets)
+    assert (to_cancel, to_place, kept) == (open_orders, targets, [])
+
+
+def test_diff_grid_remaining_quantity_and_duplicate_levels():
+    open_orders = [
+        _order("0x1", "buy", "100", "1", filled="0.4"),
+        _order("0x2", "buy", "99", "1"),
+        _order("0x3", "buy", "99", "1"),
+    ]
+    targets = [
+        _target("buy", "100", "0.6"),
+        _target("buy", "99", "1"),
+        _target("buy", "98", "1"),
+    ]
+
+    to_cancel, to_place, kept = diff_grid(open_orders, targets, PRECISION)
+
+    assert [o.order_id for o in kept] == ["0x1", "0x2"]
+    assert [o.order_id for o in to_cancel] == ["0x3"]
+    assert to_place == [targets[2]]
+
+
+def test_plan_requote_uses_fewest_requests():
+    assert plan_requote(["0x1", "0x2"], []) == [(CANCEL_ORDERS, ["0x1", "0x2"], [])]
+    assert plan_requote([], ["a"]) == [(PLACE_ORDER, [], ["a"])]
+    assert plan_requote([], []) == []
+    assert plan_requote(["0x1"], ["a", "b", "c"]) == [
+        (CANCEL_AND_PLACE, ["0x1"], ["a"]),
+        (PLACE_ORDERS, [], ["b", "c"]),
+    ]
+    assert plan_requote(["0x1"], ["a", "b", "c", "d", "e"], max_batch_orders=2) == [
+        (CANCEL_AND_PLACE, ["0x1"], ["a"]),
+        (PLACE_ORDERS, [], ["b", "c"]),
+        (PLACE_ORDERS, [], ["d", "e"]),
+    ]
+
+
+def test_cancel_and_place_orders(adapter: NadoAdapter, mock_post: MagicMock):
+    sent = _execute_responses(mock_post, place_errors={0: "price out of range"})
+    old = _order("0x" + "ab" * 32, "buy", "100", "1")
+    adapter.order_cache.on_placed(old)
+
+    result = adapter.cancel_and_place_orders(
+        SYMBOL,
+        [old.order_id],
+        [
+            _target("buy", "99.999", "1"),
+            _target("buy", "98", "1"),
+            _target("sell", "101", "1"),
+        ],
+    )
+
+    assert sent == ["cancel_and_place", "place_orders"]
+    assert result["requests"] == 2
+    assert result["cancelled"] == [old.order_id]
+    # prices are rounded down to the market increment before signing
+    assert [o.price for o in result["placed"]] == [Decimal("99.99"), Decimal("101")]
+    assert [f["order"].price for f in result["failed"]] == [Decimal("98")]
+
+    cached = adapter.order_cache.get_open_orders(SYMBOL)
+    assert sorted(o.order_id for o in cached) == sorted(
+        o.order_id for o in result["placed"]
+    )
+    assert mock_post.call_args_list[0].kwargs["json"]["cancel_and_place"]["cancel_tx"][
+        "digests"
+    ] == [old.order_id]
+
+
+def test_requote_grid_keeps_off_tick_levels(adapter: NadoAdapter, mock_post: MagicMock):
+    sent = _execute_responses(mock_post)
+    resting = [
+        _order("0x" + "01" * 32, "buy", "100.12", "0.5"),
+        _order("0x" + "02" * 32, "buy", "100.02", "0.5"),
+        _order("0x" + "03" * 32, "sell", "100.50", "0.5"),
+    ]
+    adapter.order_cache.reconcile(resting, time.time(), symbol=SYMBOL)
+    targets = [
+        _target("buy", "100.123", "0.5"),
+        _target("buy", "100.025", "0.5"),
+        _target("sell", "100.509", "0.5"),
+    ]
+
+    result = adapter.requote_grid(SYMBOL, targets)
+
+    assert sent == []
+    assert result["requests"] == 0
+    assert result["kept"] == resting
+
+    # one level moves: a single cancel_and_place request
+    targets[1] = _target("buy", "99.923", "0.5")
+    result = adapter.requote_grid(SYMBOL, targets)
+
+    assert sent == ["cancel_and_place"]
+    assert result["cancelled"] == [resting[1].order_id]
+    assert [o.price for o in result["placed"]] == [Decimal("99.92")]
+    assert len(adapter.order_cache.get_open_orders(SYMBOL)) == 3
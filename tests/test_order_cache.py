@@ -0,0 +1,135 @@
+import time
+from decimal import Decimal
+
+from adapters.base_adapter import Order
+from adapters.order_cache import OpenOrderCache
+
+SYMBOL = "BTC-USD"
+
+
+def _order(order_id=None, client_order_id=None, price="65000.5", side="buy",
+           status="open", symbol=SYMBOL) -> Order:
+    return Order(
+        order_id=order_id,
+        symbol=symbol,
+        side=side,
+        order_type="limit",
+        quantity="0.01",
+        price=price,
+        status=status,
+        time_in_force="gtc",
+        client_order_id=client_order_id,
+    )
+
+
+def test_order_placed_just_before_snapshot_survives_reconcile():
+    cache = OpenOrderCache(grace_period=3.0)
+    cache.on_placed(_order(client_order_id="cid-1"))
+
+    # 快照在下单之后发出，但交易所尚未把新单放进快照
+    diff = cache.reconcile([], started_at=time.time())
+
+    assert diff == {"added": 0, "removed": 0, "updated": 0}
+    assert cache.get(client_order_id="cid-1") is not None
+
+
+def test_snapshot_fills_in_exchange_order_id_for_local_placement():
+    cache = OpenOrderCache(grace_period=3.0)
+    cache.on_placed(_order(client_order_id="cid-1"))
+
+    diff = cache.reconcile([_order("1001", "cid-1")], started_at=time.time())
+
+    assert diff == {"added": 0, "removed": 0, "updated": 1}
+    assert cache.get(order_id="1001").client_order_id == "cid-1"
+    assert len(cache) == 1
+
+
+def test_cancel_in_flight_is_not_resurrected_by_snapshot():
+    cache = OpenOrderCache(grace_period=3.0)
+    started_at = time.time()
+    cache.reconcile([_order("1001", "cid-1"), _order("1002", "cid-2", price="65001")], started_at)
+
+    assert cache.on_cancelled(order_ids=["1001"]) == 1
+    assert cache.on_cancelled(client_order_ids=["cid-2"]) == 1
+    # 快照在撤单生效前发出，仍包含两笔已撤订单
+    diff = cache.reconcile([_order("1001", "cid-1"), _order("1002", "cid-2", price="65001")], time.time())
+
+    assert diff["added"] == 0
+    assert cache.get(order_id="1001") is None
+    assert cache.get(order_id="1002") is None
+    assert len(cache) == 0
+
+
+def test_cancelled_marker_expires_after_grace_period():
+    cache = OpenOrderCache(grace_period=3.0)
+    cache.reconcile([_order("1001")], time.time())
+    cache.on_cancelled(order_ids=["1001"])
+
+    # 保护期过后快照里仍有该单，说明撤单未生效，应重新加入
+    diff = cache.reconcile([_order("1001")], started_at=time.time() + 10)
+
+    assert diff["added"] == 1
+    assert cache.get(order_id="1001") is not None
+
+
+def test_orders_missing_from_snapshot_are_removed():
+    cache = OpenOrderCache(grace_period=3.0)
+    cache.reconcile([_order("1001"), _order("1002", price="65001")], time.time())
+    cache.on_placed(_order(client_order_id="cid-3", price="65002"))
+
+    # 下单早于 started_at - grace_period，快照中缺失即视为已成交 / 已撤
+    diff = cache.reconcile([_order("1002", price="65001")], started_at=time.time() + 10)
+
+    assert diff == {"added": 0, "removed": 2, "updated": 1}
+    assert cache.get(order_id="1001") is None
+    assert cache.get(client_order_id="cid-3") is None
+    assert [o.order_id for o in cache.get_open_orders()] == ["1002"]
+
+
+def test_symbol_scoped_snapshot_keeps_other_symbols():
+    cache = OpenOrderCache(grace_period=0.0)
+    cache.reconcile([_order("1001"), _order("2001", symbol="ETH-USD", price="3000")], time.time())
+
+    diff = cache.reconcile([], started_at=time.time(), symbol=SYMBOL)
+
+    assert diff["removed"] == 1
+    assert [o.order_id for o in cache.get_open_orders()] == ["2001"]
+
+
+def test_version_based_updates():
+    cache = OpenOrderCache(grace_period=0.0)
+    first = _order("1001")
+    diff = cache.reconcile([first], time.time(), versions={"1001": "v1"})
+    assert diff == {"added": 1, "removed": 0, "updated": 0}
+    assert cache.version("1001") == "v1"
+
+    # 版本未变且复用同一对象：不计为更新
+    diff = cache.reconcile([first], time.time(), versions={"1001": "v1"})
+    assert diff == {"added": 0, "removed": 0, "updated": 0}
+
+    # 版本变化：替换为新解析的订单
+    second = _order("1001", price="65000.6")
+    diff = cache.reconcile([second], time.time(), versions={"1001": "v2"})
+    assert diff == {"added": 0, "removed": 0, "updated": 1}
+    assert cache.version("1001") == "v2"
+    assert cache.get(order_id="1001") is second
+    assert list(cache.price_levels(SYMBOL, "buy")) == [Decimal("65000.6")]
+
+
+def test_apply_updates_levels_and_removes_filled_orders():
+    cache = OpenOrderCache()
+    cache.on_placed(_order("1001", "cid-1"))
+    cache.on_placed(_order("1002", "cid-2"))
+    cache.on_placed(_order("1003", "cid-3", side="sell", price="65010"))
+
+    levels = cache.price_levels(SYMBOL, "buy")
+    assert list(levels) == [Decimal("65000.5")]
+    assert {o.order_id for o in levels[Decimal("65000.5")]} == {"1001", "1002"}
+
+    cache.apply(_order("1001", "cid-1", status="partially_filled"))
+    cache.apply(_order("1002", "cid-2", status="filled"))
+
+    assert cache.get(client_order_id="cid-2") is None
+    assert [o.order_id for o in cache.price_levels(SYMBOL, "buy")[Decimal("65000.5")]] == ["1001"]
+    assert cache.get(order_id="1001").status == "partially_filled"
+    assert len(cache) == 2
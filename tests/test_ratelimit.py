@@ -0,0 +1,182 @@
+import asyncio
+import os
+import socket
+import stat
+import threading
+import time
+
+import pytest
+
+from ratelimit import RateLimiter, RateLimitTimeout, create_rate_limiter
+from ratelimit.broker import RateLimitBroker, RemoteRateLimiter
+
+NO_RESERVE = {"order": 0.0, "query": 0.0}
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "条件未在超时前满足"
+        time.sleep(0.005)
+
+
+def _free_address() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"tcp:127.0.0.1:{sock.getsockname()[1]}"
+
+
+@pytest.fixture
+def broker():
+    broker = RateLimitBroker("tcp:127.0.0.1:0").start()
+    yield broker
+    broker.stop()
+
+
+def test_waiting_cancel_preempts_queries():
+    limiter = RateLimiter(rate=10, burst=10, weights={"cancel_orders": 8}, reserve=NO_RESERVE)
+    limiter.acquire("query_balance", weight=7)
+    cancel = threading.Thread(target=limiter.acquire, args=("cancel_orders",))
+    cancel.start()
+    _wait_for(lambda: limiter.get_stats()["lanes"]["cancel"]["waiting"] == 1)
+
+    # 桶里还有约 3 个令牌，但撤单在等待：查询不能取走令牌
+    assert limiter.get_stats()["tokens"] >= 3
+    assert limiter.try_acquire("query_balance") > 0
+    assert limiter.try_acquire("new_order") > 0
+
+    cancel.join(2)
+    stats = limiter.get_stats()["lanes"]
+    assert stats["cancel"]["granted"] == 1 and stats["cancel"]["waited"] == 1
+    assert stats["query"]["granted"] == 1
+
+
+def test_lane_reserve_keeps_tokens_for_orders_and_cancels():
+    # query 不能用掉最后 25%，order 不能用掉最后 10%
+    limiter = RateLimiter(rate=0.01, burst=10)
+
+    granted = 0
+    while not limiter.try_acquire("query_balance"):
+        granted += 1
+    assert granted == 7
+    # 剩 3 个：下单可以用到只剩 1 个，撤单可以用完
+    assert limiter.try_acquire("new_order") == 0
+    assert limiter.try_acquire("new_order") == 0
+    assert limiter.try_acquire("new_order") > 0
+    assert limiter.try_acquire("cancel_orders") == 0
+    assert limiter.try_acquire("cancel_orders") > 0
+
+
+def test_resolve_uses_configured_weights_and_priorities():
+    limiter = RateLimiter(rate=10, weights={"query_open_orders": 2}, priorities={"query_positions": "order"})
+
+    assert limiter.resolve("query_open_orders") == (2, 2.0)
+    assert limiter.resolve("query_positions") == (1, 1.0)
+    assert limiter.resolve("cancel_orders") == (0, 1.0)
+    with pytest.raises(ValueError):
+        limiter.resolve("query_balance", weight=10)
+
+
+def test_timeout_raises_without_waiting():
+    limiter = RateLimiter(rate=1, burst=1, reserve=NO_RESERVE, timeout=0.1)
+    limiter.acquire("query_balance")
+
+    started = time.monotonic()
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire("query_balance")
+    with pytest.raises(RateLimitTimeout):
+        asyncio.run(limiter.acquire_async("query_balance"))
+    # 预计等待超过 timeout 时立即放弃，不睡到超时
+    assert time.monotonic() - started < 0.1
+
+    stats = limiter.get_stats()["lanes"]["query"]
+    assert stats["timeouts"] == 2
+    assert stats["waiting"] == 0
+
+
+def test_acquire_async_waits_for_refill():
+    limiter = RateLimiter(rate=20, burst=1, reserve=NO_RESERVE)
+
+    async def acquire_all():
+        return await asyncio.gather(*(limiter.acquire_async("query_balance") for _ in range(3)))
+
+    waited = asyncio.run(acquire_all())
+    assert waited[0] == 0.0
+    assert max(waited) >= 0.09
+
+
+def test_remote_limiter_shares_the_broker_bucket(broker):
+    local = RateLimiter(rate=0.01, burst=2, reserve=NO_RESERVE, timeout=0.1, name="standx")
+    first = RemoteRateLimiter(broker.bound_address, local)
+    second = RemoteRateLimiter(broker.bound_address, RateLimiter(rate=0.01, burst=2, reserve=NO_RESERVE,
+                                                                   timeout=0.1, name="standx"))
+    try:
+        first.acquire("query_balance")
+        asyncio.run(second.acquire_async("query_balance"))
+        # 两个客户端共用 broker 上的一个桶：令牌已用完
+        with pytest.raises(RateLimitTimeout):
+            first.acquire("query_balance")
+    finally:
+        first.close()
+        second.close()
+
+    assert (first.remote_calls, second.remote_calls) == (1, 1)
+    assert first.fallback_calls == second.fallback_calls == 0
+    # 本地桶没有被使用
+    assert local.get_stats()["lanes"]["query"]["granted"] == 0
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="需要 Unix socket")
+def test_unix_broker_socket_is_private(tmp_path):
+    path = tmp_path / "run" / "rl.sock"
+    broker = RateLimitBroker(f"unix:{path}").start()
+    remote = RemoteRateLimiter(broker.bound_address, RateLimiter(rate=10, burst=2, reserve=NO_RESERVE, timeout=1))
+    try:
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        assert stat.S_IMODE(os.stat(path.parent).st_mode) == 0o700
+        remote.acquire("query_balance")
+        assert remote.remote_calls == 1
+    finally:
+        remote.close()
+        broker.stop()
+
+
+def test_remote_limiter_falls_back_when_broker_is_down():
+    limiter = create_rate_limiter(
+        {"enable": True, "rate": 100, "address": _free_address(), "reconnect_interval": 60}, "standx"
+    )
+    try:
+        limiter.acquire("query_balance")
+        asyncio.run(limiter.acquire_async("query_balance"))
+        limiter.acquire("new_order")
+    finally:
+        limiter.close()
+
+    assert isinstance(limiter, RemoteRateLimiter)
+    assert limiter.remote_calls == 0
+    assert limiter.fallback_calls == 3
+    assert limiter.get_stats()["connected"] is False
+    assert limiter.local.get_stats()["lanes"]["query"]["granted"] == 2
+
+
+def test_cancelled_async_acquire_closes_its_connection(broker):
+    remote = RemoteRateLimiter(broker.bound_address, RateLimiter(rate=4, burst=5, reserve=NO_RESERVE, timeout=10))
+
+    async def scenario():
+        for _ in range(5):
+            await remote.acquire_async("query_balance")
+        pool = remote._async_pools[asyncio.get_running_loop()]
+        assert len(pool) == 1
+        _, writer = pool[0]
+        # broker 在等待令牌时被取消：连接上的响应未读，不能放回连接池
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(remote.acquire_async("query_balance"), 0.1)
+        assert pool == []
+        assert writer.is_closing()
+        await remote.acquire_async("query_balance")
+        assert len(pool) == 1
+
+    asyncio.run(scenario())
+    # asyncio.run 返回后循环已关闭，close() 不能再调度 writer.close()
+    remote.close()
+    assert remote.remote_calls == 6
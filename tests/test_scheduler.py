@@ -0,0 +1,219 @@
+import time
+
+import pytest
+
+from adapters.base_adapter import Order
+from strategys.scheduler import FILL, PRICE, STALE, TIMER, EventScheduler, RateBudget
+from strategys.strategy_standx import standx_mm_new
+
+SYMBOL = "BTC-USD"
+
+
+class FakeClock:
+    """手动推进的单调时钟"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def poll(scheduler: EventScheduler) -> set:
+    """不阻塞地检查当前时刻是否应执行周期；应执行时同 run() 一样记录周期"""
+    reasons = scheduler.wait(timeout=0)
+    if reasons:
+        scheduler.mark_cycle()
+    return reasons
+
+
+def make_scheduler(clock, **kwargs) -> EventScheduler:
+    kwargs.setdefault("max_interval", 60.0)
+    kwargs.setdefault("coalesce", 0.2)
+    kwargs.setdefault("min_interval", 0.5)
+    scheduler = EventScheduler(clock=clock, **kwargs)
+    # 首个周期无条件执行（TIMER）
+    assert poll(scheduler) == {TIMER}
+    return scheduler
+
+
+def test_burst_of_events_is_coalesced_into_one_cycle(clock):
+    scheduler = make_scheduler(clock)
+    clock.advance(5)
+
+    for _ in range(10):
+        scheduler.on_fill()
+        clock.advance(0.01)
+    assert poll(scheduler) == set()
+
+    clock.advance(0.2)
+    assert poll(scheduler) == {FILL}
+    assert poll(scheduler) == set()
+    assert scheduler.cycle_count == 2
+    assert scheduler.event_counts == {FILL: 10}
+    assert scheduler.trigger_counts == {TIMER: 1, FILL: 1}
+
+
+def test_coalesce_window_starts_at_first_event(clock):
+    scheduler = make_scheduler(clock)
+    clock.advance(5)
+    scheduler.on_fill()
+    clock.advance(0.15)
+    scheduler.notify(PRICE)
+    clock.advance(0.1)
+
+    # 窗口从第一个事件算起，后续事件不延长
+    assert poll(scheduler) == {FILL, PRICE}
+
+
+def test_min_interval_between_cycles(clock):
+    scheduler = make_scheduler(clock, coalesce=0.0, min_interval=2.0)
+    scheduler.on_fill()
+    clock.advance(1.9)
+    assert poll(scheduler) == set()
+
+    clock.advance(0.1)
+    assert poll(scheduler) == {FILL}
+
+
+def test_price_trigger_uses_reference_from_last_cycle(clock):
+    scheduler = EventScheduler(price_threshold=10.0, coalesce=0.0, min_interval=0.0, clock=clock)
+    scheduler.on_price(100.0)
+    assert poll(scheduler) == {TIMER}
+    assert scheduler.get_stats()["reference_price"] == 100.0
+
+    clock.advance(1)
+    scheduler.on_price(109.0)
+    assert poll(scheduler) == set()
+    scheduler.on_price(90.0)
+    assert poll(scheduler) == {PRICE}
+    assert scheduler.get_stats()["reference_price"] == 90.0
+
+
+def test_timer_fires_after_max_interval(clock):
+    scheduler = make_scheduler(clock, max_interval=30.0)
+    clock.advance(29.9)
+    assert poll(scheduler) == set()
+    clock.advance(0.1)
+    assert poll(scheduler) == {TIMER}
+
+
+def test_rate_budget_refill_and_burst(clock):
+    budget = RateBudget(rate=2.0, burst=3.0, clock=clock)
+    assert [budget.try_acquire() for _ in range(4)] == [True, True, True, False]
+    assert budget.time_until() == pytest.approx(0.5)
+
+    clock.advance(0.5)
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+
+    clock.advance(100)
+    assert budget.time_until(3.0) == 0.0
+    assert budget.time_until(4.0) == pytest.approx(0.5)
+
+    assert RateBudget(rate=0.0, burst=0.0, clock=clock).time_until() == float("inf")
+
+
+def test_rate_budget_defers_cycles_instead_of_dropping_events(clock):
+    budget = RateBudget(rate=1.0, burst=2.0, clock=clock)
+    scheduler = EventScheduler(coalesce=0.0, min_interval=0.0, budget=budget, clock=clock)
+    assert poll(scheduler) == {TIMER}
+
+    scheduler.on_fill()
+    assert poll(scheduler) == {FILL}
+
+    scheduler.on_fill()
+    assert poll(scheduler) == set()
+    clock.advance(0.5)
+    assert poll(scheduler) == set()
+    clock.advance(0.5)
+    # 预算恢复后推迟的事件仍然触发
+    assert poll(scheduler) == {FILL}
+    assert scheduler.cycle_count == 3
+
+
+def test_stale_deadline_fires_once_and_keeps_earliest(clock):
+    scheduler = make_scheduler(clock)
+    scheduler.set_deadline(10.0)
+    scheduler.set_deadline(20.0)
+    clock.advance(9.9)
+    assert poll(scheduler) == set()
+
+    clock.advance(0.1)
+    assert poll(scheduler) == {STALE}
+    clock.advance(5)
+    assert poll(scheduler) == set()
+
+    scheduler.set_deadline(3.0)
+    scheduler.set_deadline(None)
+    clock.advance(5)
+    assert poll(scheduler) == set()
+
+
+def test_past_deadline_is_still_bounded_by_min_interval(clock):
+    scheduler = make_scheduler(clock, min_interval=0.5)
+    scheduler.set_deadline(-5.0)
+    assert poll(scheduler) == set()
+    clock.advance(0.5)
+    assert poll(scheduler) == {STALE}
+
+
+class CachedOrdersAdapter:
+    def __init__(self, orders):
+        self.orders = orders
+        self.cancelled = []
+
+    def get_cached_open_orders(self, symbol=None):
+        return [o for o in self.orders if symbol is None or o.symbol == symbol]
+
+    def cancel_orders_by_ids(self, order_id_list=None, cl_ord_id_list=None):
+        self.cancelled.extend(order_id_list or [])
+        self.cancelled.extend(cl_ord_id_list or [])
+
+
+def _order(order_id: str, age: float) -> Order:
+    return Order(
+        order_id=order_id, symbol=SYMBOL, side="buy", order_type="limit",
+        quantity="0.001", price="65000", status="open",
+        created_at=int((time.time() - age) * 1000),
+    )
+
+
+def test_next_stale_deadline(monkeypatch):
+    monkeypatch.setattr(standx_mm_new, "SYMBOL", SYMBOL)
+    assert standx_mm_new.next_stale_deadline(CachedOrdersAdapter([]), 5) is None
+
+    adapter = CachedOrdersAdapter([_order("1", age=1), _order("2", age=3)])
+    assert standx_mm_new.next_stale_deadline(adapter, 5) == pytest.approx(2, abs=0.1)
+
+
+def test_orders_kept_by_random_cancel_do_not_refire_stale_immediately(monkeypatch, clock):
+    monkeypatch.setattr(standx_mm_new, "SYMBOL", SYMBOL)
+    # 随机撤单全部落空：已超时的挂单全部保留
+    monkeypatch.setattr(standx_mm_new.random, "random", lambda: 0.99)
+    adapter = CachedOrdersAdapter([_order("1", age=8), _order("2", age=6)])
+    scheduler = make_scheduler(clock, max_interval=60.0, min_interval=0.5)
+
+    standx_mm_new.cancel_stale_order_ids(adapter, SYMBOL, stale_seconds=5, cancel_probability=0.5)
+    assert adapter.cancelled == []
+
+    deadline = standx_mm_new.next_stale_deadline(adapter, 5)
+    assert deadline == pytest.approx(5)
+    scheduler.set_deadline(deadline)
+
+    # 不应在 min_interval 后就重新触发完整周期
+    for _ in range(9):
+        clock.advance(0.5)
+        assert poll(scheduler) == set()
+    clock.advance(0.5)
+    assert poll(scheduler) == {STALE}
+    assert scheduler.cycle_count == 2
+
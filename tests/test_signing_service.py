@@ -0,0 +1,156 @@
+import asyncio
+import copy
+import os
+import signal
+import sys
+
+import pytest
+
+from adapters.signing_service import (
+    ED25519,
+    SECP256K1,
+    SigningService,
+    StandXPooledAuth,
+    sign_grvt_orders,
+)
+from exchange.exchange_standx.standx_protocol.perps_auth import StandXAuth
+
+# GRVT SDK 以顶层包 pysdk 形式导入
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "exchange", "exchange_grvt", "src"))
+
+from pysdk.grvt_order_signer import GrvtOrderSigner  # noqa: E402
+from pysdk.grvt_raw_env import GrvtEnv  # noqa: E402
+from pysdk.grvt_raw_types import (  # noqa: E402
+    Instrument,
+    InstrumentSettlementPeriod,
+    Kind,
+    Order,
+    OrderLeg,
+    OrderMetadata,
+    Signature,
+    TimeInForce,
+)
+
+PRIVATE_KEY = bytes(range(32))
+GRVT_PRIVATE_KEY = "f7934647276a6e1fa0af3f4467b4b8ddaf45d25a7368fa1a295eef49a446819d"
+GRVT_INSTRUMENTS = {
+    "BTC_USDT_Perp": Instrument(
+        instrument="BTC_USDT_Perp",
+        instrument_hash="0x030501",
+        base="BTC",
+        quote="USDT",
+        kind=Kind.PERPETUAL,
+        venues=[],
+        settlement_period=InstrumentSettlementPeriod.DAILY,
+        tick_size="0.00000001",
+        min_size="0.00000001",
+        create_time="123",
+        base_decimals=9,
+        quote_decimals=9,
+        max_position_size="1000000",
+    )
+}
+
+
+def _grvt_order(size: str, limit_price: str) -> Order:
+    return Order(
+        metadata=OrderMetadata(client_order_id="1", create_time="1730800479321350000"),
+        sub_account_id="8289849667772468",
+        time_in_force=TimeInForce.GOOD_TILL_TIME,
+        post_only=False,
+        is_market=False,
+        reduce_only=False,
+        legs=[OrderLeg(instrument="BTC_USDT_Perp", size=size, limit_price=limit_price, is_buying_asset=False)],
+        signature=Signature(signer="", r="", s="", v=0, expiration=1730800479321350000, nonce=828700936),
+    )
+
+
+@pytest.fixture(scope="module")
+def service():
+    service = SigningService(workers=1)
+    yield service
+    service.close()
+
+
+def test_pooled_request_signatures_match_local_auth(service):
+    auth = StandXAuth(PRIVATE_KEY)
+    pooled = StandXPooledAuth(auth, service, "standx-1")
+    requests = [(f'{{"price":"{90000 + i}"}}', f"req-{i}", 1730800479 + i) for i in range(5)]
+
+    async def sign_all():
+        return await asyncio.gather(*(pooled.sign_request_async(*request) for request in requests))
+
+    batches = service.get_stats()[0]["batches"]
+    headers = asyncio.run(sign_all())
+
+    assert headers == [auth.sign_request(*request) for request in requests]
+    # gather 内的逐条签名合并为一个批次
+    assert service.get_stats()[0]["batches"] == batches + 1
+
+
+def test_sign_many_and_sign_match_local_key(service):
+    auth = StandXAuth(PRIVATE_KEY)
+    service.register("standx-2", ED25519, PRIVATE_KEY)
+    messages = [f"v1,req-{i},1730800479,{{}}".encode() for i in range(3)]
+    expected = [auth._private_key.sign(message) for message in messages]
+
+    async def sign_all():
+        batch = await service.sign_many("standx-2", messages)
+        single = await service.sign("standx-2", messages[0])
+        return batch, single
+
+    batch, single = asyncio.run(sign_all())
+
+    assert batch == expected
+    assert single == expected[0]
+    assert service.sign_many_sync("standx-2", messages) == expected
+    # 私钥只随第一个批次发送到 worker
+    assert "standx-2" in service._accounts["standx-2"].worker.loaded
+
+
+def test_reregistered_key_is_resent(service):
+    other_key = bytes(range(1, 33))
+    service.register("standx-3", ED25519, PRIVATE_KEY)
+    service.sign_many_sync("standx-3", [b"first"])
+    service.register("standx-3", ED25519, other_key)
+
+    signature = service.sign_many_sync("standx-3", [b"second"])
+
+    assert signature == [StandXAuth(other_key)._private_key.sign(b"second")]
+
+
+def test_killed_worker_is_restarted(service):
+    key = StandXAuth(PRIVATE_KEY)._private_key
+    service.register("standx-4", ED25519, PRIVATE_KEY)
+    service.sign_many_sync("standx-4", [b"before"])
+    worker = service._accounts["standx-4"].worker
+    restarts = worker.restarts
+
+    # worker 进程被杀（OOM / 信号）：重建进程池、重新发送私钥后重试该批次
+    os.kill(worker.pid, signal.SIGTERM)
+    assert asyncio.run(service.sign_many("standx-4", [b"async"])) == [key.sign(b"async")]
+    os.kill(worker.pid, signal.SIGTERM)
+    assert service.sign_many_sync("standx-4", [b"sync"]) == [key.sign(b"sync")]
+
+    assert worker.restarts == restarts + 2
+    assert service.get_stats()[0]["restarts"] == worker.restarts
+
+
+def test_pooled_grvt_signatures_match_local_signer():
+    signer = GrvtOrderSigner(GRVT_PRIVATE_KEY, env=GrvtEnv.TESTNET, instruments=GRVT_INSTRUMENTS)
+    orders = [_grvt_order(f"1.{i:03d}", f"{68900 + i}.5") for i in range(5)]
+    expected = signer.sign_many(copy.deepcopy(orders))
+
+    service = SigningService(workers=1)
+    service.register("grvt-1", SECP256K1, GRVT_PRIVATE_KEY)
+    try:
+        signed = asyncio.run(sign_grvt_orders(service, "grvt-1", signer, orders))
+        digest = signer.order_digest(orders[0])
+        single = asyncio.run(service.sign("grvt-1", digest))
+    finally:
+        service.close()
+
+    assert [order.signature for order in signed] == [order.signature for order in expected]
+    assert single == bytes.fromhex(
+        expected[0].signature.r[2:] + expected[0].signature.s[2:]
+    ) + bytes([expected[0].signature.v])
@@ -0,0 +1,272 @@
+import asyncio
+import json
+import time
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from exchange.exchange_standx.standx_protocol.perps_auth import StandXAuth
+from simulator import ErrorRule, FaultConfig, RateLimiter, RateLimitRule, StandXSimulator
+
+SYMBOL = "BTC-USD"
+ADDRESS = "0x00000000000000000000000000000000000000aa"
+ORDER = {"symbol": SYMBOL, "side": "buy", "order_type": "limit", "qty": "0.001", "price": "80000",
+         "time_in_force": "gtc", "reduce_only": False}
+
+
+class SimSession:
+    """模拟器 + 测试客户端：登录一个账户，按 SDK 的格式签名下单 / 撤单请求"""
+
+    def __init__(self, client: TestClient, simulator: StandXSimulator):
+        self.client = client
+        self.simulator = simulator
+        self.auth = StandXAuth()
+        self.token = None
+
+    async def login(self, address: str = ADDRESS):
+        response = await self.client.post(
+            "/v1/offchain/prepare-signin?chain=bsc", json={"address": address, "requestId": self.auth.request_id}
+        )
+        signed_data = (await response.json())["signedData"]
+        response = await self.client.post(
+            "/v1/offchain/login?chain=bsc", json={"signature": "0x", "signedData": signed_data, "expiresSeconds": 600}
+        )
+        self.token = (await response.json())["token"]
+        return self
+
+    async def signed_post(self, path: str, payload: dict, auth: StandXAuth = None, timestamp: int = None):
+        body = json.dumps(payload)
+        headers = {"Authorization": f"Bearer {self.token}", "Content-Type": "application/json"}
+        headers.update((auth or self.auth).sign_request(body, "req-1", timestamp or int(time.time() * 1000)))
+        response = await self.client.post(path, data=body, headers=headers)
+        return response.status, await response.json()
+
+    async def get(self, path: str, **params):
+        response = await self.client.get(path, params=params, headers={"Authorization": f"Bearer {self.token}"})
+        return response.status, await response.json()
+
+
+def run_sim(scenario, **config):
+    """在独立事件循环中启动模拟器（不启动价格游走任务），执行 scenario(session)"""
+    config.setdefault("seed", 7)
+    simulator = StandXSimulator(config)
+
+    async def main():
+        client = TestClient(TestServer(simulator.make_app()))
+        await client.start_server()
+        try:
+            return await scenario(await SimSession(client, simulator).login())
+        finally:
+            await client.close()
+
+    return asyncio.run(main())
+
+
+# ---------------- ed25519 请求签名
+
+
+def test_signed_order_is_accepted():
+    async def scenario(session):
+        status, body = await session.signed_post("/api/new_order", ORDER)
+        _, orders = await session.get("/api/query_open_orders", symbol=SYMBOL)
+        return status, body, orders
+
+    status, body, orders = run_sim(scenario)
+    assert (status, body["code"]) == (200, 0)
+    assert [o["price"] for o in orders["result"]] == ["80000.00"]
+
+
+@pytest.mark.parametrize("case", ["wrong_key", "tampered_body", "missing_headers", "stale_timestamp"])
+def test_bad_request_signature_is_rejected(case):
+    async def scenario(session):
+        if case == "wrong_key":
+            return await session.signed_post("/api/new_order", ORDER, auth=StandXAuth())
+        if case == "stale_timestamp":
+            return await session.signed_post("/api/new_order", ORDER, timestamp=int((time.time() - 120) * 1000))
+        if case == "missing_headers":
+            response = await session.client.post(
+                "/api/new_order", json=ORDER, headers={"Authorization": f"Bearer {session.token}"}
+            )
+            return response.status, await response.json()
+        # 签名对应的 body 与实际发送的不一致
+        body = json.dumps(ORDER)
+        headers = {"Authorization": f"Bearer {session.token}", "Content-Type": "application/json"}
+        headers.update(session.auth.sign_request(body, "req-1", int(time.time() * 1000)))
+        response = await session.client.post("/api/new_order", data=body.replace("0.001", "0.002"), headers=headers)
+        return response.status, await response.json()
+
+    status, body = run_sim(scenario)
+    assert status == 400
+    assert "signature" in body["message"] or "timestamp" in body["message"]
+
+
+def test_relogin_rotates_request_signing_key():
+    async def scenario(session):
+        old_auth = session.auth
+        session.auth = StandXAuth()
+        await session.login()
+        return (
+            await session.signed_post("/api/new_order", ORDER, auth=old_auth),
+            await session.signed_post("/api/new_order", ORDER),
+        )
+
+    (old_status, _), (new_status, body) = run_sim(scenario)
+    assert old_status == 400
+    assert (new_status, body["code"]) == (200, 0)
+
+
+def test_signature_check_can_be_disabled():
+    async def scenario(session):
+        return await session.signed_post("/api/new_order", ORDER, auth=StandXAuth())
+
+    status, body = run_sim(scenario, verify_signatures=False)
+    assert (status, body["code"]) == (200, 0)
+
+
+def test_unauthenticated_requests_are_rejected():
+    async def scenario(session):
+        session.token = "bogus"
+        return await session.get("/api/query_balance")
+
+    assert run_sim(scenario)[0] == 401
+
+
+# ---------------- 故障注入
+
+
+def test_injected_http_errors():
+    async def scenario(session):
+        results = [await session.get("/api/query_balance") for _ in range(3)]
+        return results, session.simulator.get_stats()["endpoints"]["query_balance"]
+
+    results, stats = run_sim(scenario, faults={"errors": {"query_balance": {"rate": 1.0, "status": [503]}}})
+    assert [status for status, _ in results] == [503, 503, 503]
+    assert all(body["code"] == 503 for _, body in results)
+    assert (stats["errors"], stats.get("ok", 0)) == (3, 0)
+
+
+def test_injected_hang_returns_504_after_timeout():
+    async def scenario(session):
+        started = time.monotonic()
+        status, _ = await session.get("/api/query_positions")
+        return status, time.monotonic() - started, session.simulator.get_stats()["endpoints"]["query_positions"]
+
+    status, elapsed, stats = run_sim(
+        scenario, faults={"errors": {"query_positions": {"timeout_rate": 1.0, "timeout_seconds": 0.2}}}
+    )
+    assert status == 504
+    assert elapsed >= 0.2
+    assert stats["timeouts"] == 1
+
+
+def test_injected_reject_does_not_place_the_order():
+    async def scenario(session):
+        status, body = await session.signed_post("/api/new_order", ORDER)
+        _, orders = await session.get("/api/query_open_orders", symbol=SYMBOL)
+        return status, body, orders["total"], session.simulator.get_stats()["endpoints"]["new_order"]
+
+    status, body, total, stats = run_sim(scenario, faults={"errors": {"new_order": {"reject_rate": 1.0}}})
+    # 业务拒绝：HTTP 200，code != 0
+    assert status == 200
+    assert body["code"] != 0
+    assert total == 0
+    assert stats["rejected"] == 1
+
+
+def test_reject_only_applies_to_new_order():
+    async def scenario(session):
+        return await session.get("/api/query_balance")
+
+    status, body = run_sim(scenario, faults={"errors": {"default": {"reject_rate": 1.0}}})
+    assert status == 200
+    assert "balance" in body
+
+
+def test_error_rule_draw_order():
+    rule = ErrorRule(rate=0.2, status=[502], timeout_rate=0.1, timeout_seconds=5, reject_rate=0.3)
+    rolls = iter([0.05, 0.15, 0.35, 0.9])
+
+    class FixedRng:
+        def random(self):
+            return next(rolls)
+
+        def choice(self, values):
+            return values[0]
+
+    rng = FixedRng()
+    assert [rule.draw(rng) for _ in range(4)] == [("timeout", 5.0), ("status", 502), ("reject", None), None]
+    assert ErrorRule.from_dict(0.5).rate == 0.5
+
+
+def test_faults_can_be_replaced_at_runtime():
+    async def scenario(session):
+        before = await session.get("/api/query_balance")
+        response = await session.client.post("/sim/faults", json={"errors": {"default": {"rate": 1.0, "status": [500]}}})
+        assert response.status == 200
+        after = await session.get("/api/query_balance")
+        invalid = await session.client.post("/sim/faults", json={"rate_limits": {"default": {"rate": 1, "scope": "x"}}})
+        return before[0], after[0], invalid.status
+
+    assert run_sim(scenario) == (200, 500, 400)
+
+
+# ---------------- 限流
+
+
+def test_account_scope_limits_each_account_separately():
+    limiter = RateLimiter(FaultConfig.from_dict({"rate_limits": {"new_order": {"rate": 1, "burst": 2}}}).rate_limits)
+    now = 100.0
+    assert [limiter.allow("new_order", "a", "1.1.1.1", now) for _ in range(3)] == [True, True, False]
+    # 同一 IP 的另一个账户有自己的桶
+    assert limiter.allow("new_order", "b", "1.1.1.1", now)
+    # 令牌按 rate 恢复
+    assert limiter.allow("new_order", "a", "1.1.1.1", now + 1.0)
+    assert not limiter.allow("new_order", "a", "1.1.1.1", now + 1.0)
+
+
+def test_ip_and_global_scopes():
+    limiter = RateLimiter({
+        "login": RateLimitRule(1, scope="ip"),
+        "query_symbol_price": RateLimitRule(2, scope="global"),
+    })
+    now = 100.0
+    assert limiter.allow("login", None, "1.1.1.1", now)
+    assert not limiter.allow("login", "a", "1.1.1.1", now)
+    assert limiter.allow("login", None, "2.2.2.2", now)
+
+    assert limiter.allow("query_symbol_price", "a", "1.1.1.1", now)
+    assert limiter.allow("query_symbol_price", "b", "2.2.2.2", now)
+    assert not limiter.allow("query_symbol_price", "c", "3.3.3.3", now)
+
+
+def test_default_rule_is_shared_and_skips_unauthenticated_endpoints():
+    limiter = RateLimiter({"default": RateLimitRule(2)})
+    now = 100.0
+    # 未单独配置的接口共用 default 桶
+    assert limiter.allow("query_balance", "a", "1.1.1.1", now)
+    assert limiter.allow("query_positions", "a", "1.1.1.1", now)
+    assert not limiter.allow("query_open_orders", "a", "1.1.1.1", now)
+    # 未登录请求不受按账户的默认限流约束
+    assert all(limiter.allow("query_symbol_price", None, "1.1.1.1", now) for _ in range(10))
+
+
+def test_invalid_rate_limit_scope():
+    with pytest.raises(ValueError):
+        RateLimitRule(1, scope="region")
+
+
+def test_server_returns_429_per_account():
+    async def scenario(session):
+        first = [(await session.get("/api/query_balance"))[0] for _ in range(3)]
+        other = await SimSession(session.client, session.simulator).login("0x00000000000000000000000000000000000000bb")
+        second = (await other.get("/api/query_balance"))[0]
+        # 行情接口不需要登录，不受按账户的默认限流约束
+        prices = [(await session.client.get("/api/query_symbol_price", params={"symbol": SYMBOL})).status
+                  for _ in range(5)]
+        return first, second, prices, session.simulator.get_stats()["endpoints"]["query_balance"]
+
+    first, second, prices, stats = run_sim(scenario, faults={"rate_limits": {"default": {"rate": 0.001, "burst": 2}}})
+    assert first == [200, 200, 429]
+    assert second == 200
+    assert prices == [200] * 5
+    assert stats["rate_limited"] == 1
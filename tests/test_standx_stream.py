@@ -0,0 +1,173 @@
+import asyncio
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from adapters.async_standx_adapter import AsyncStandXAdapter
+from adapters.base_adapter import SymbolPrecision
+from adapters.standx_adapter import StandXAdapter
+from adapters.standx_stream import StandXStreamHandler
+
+SYMBOL = "BTC-USD"
+CONFIG = {
+    "exchange_name": "standx",
+    "private_key": "0x45917429615b8a68cd372c96f63092f3d672a0bc60202b188670354b89c43ae3",
+    "chain": "bsc",
+}
+
+
+class FakeWS:
+    """StandXPerpWS 的最小替身：记录回调，可模拟断线 / 重连"""
+
+    def __init__(self):
+        self.callbacks = {}
+        self.connected = True
+        self.connect_count = 1
+
+    def on(self, channel, callback):
+        self.callbacks.setdefault(channel, []).append(callback)
+
+    def push(self, channel, data):
+        for callback in self.callbacks.get(channel, []):
+            callback({"channel": channel, "data": data})
+
+    def reconnect(self):
+        self.connect_count += 1
+
+
+def _order_data(order_id, status="new", fill_qty="0", price="65000.5", cl_ord_id=None):
+    return {
+        "id": order_id, "symbol": SYMBOL, "side": "buy", "order_type": "limit",
+        "qty": "0.01", "fill_qty": fill_qty, "price": price, "status": status,
+        "time_in_force": "gtc", "cl_ord_id": cl_ord_id,
+        "created_at": "2026-01-01T00:00:00Z", "updated_at": "2026-01-01T00:00:01Z",
+    }
+
+
+def _position_data(qty="0.002"):
+    return {
+        "symbol": SYMBOL, "qty": qty, "status": "open", "entry_price": "65000",
+        "mark_price": "65100", "upnl": "0.2", "leverage": "10", "margin_mode": "cross",
+    }
+
+
+BALANCE_DATA = {"balance": "1000", "cross_available": "900", "equity": "1000.2", "upnl": "0.2", "cross_margin": "100"}
+
+
+@pytest.fixture
+def adapter():
+    adapter = StandXAdapter(dict(CONFIG))
+    adapter.token = "token"
+    adapter.symbol_precision = {SYMBOL: SymbolPrecision("0.1", "0.001", symbol=SYMBOL)}
+    adapter.http_client = MagicMock()
+    adapter.http_client.query_positions.return_value = [_position_data("-0.005")]
+    adapter.http_client.query_balance.return_value = {"balance": "5", "cross_available": "5", "equity": "5", "upnl": "0"}
+    return adapter
+
+
+@pytest.fixture
+def ws(adapter):
+    ws = FakeWS()
+    adapter.stream_handler = StandXStreamHandler(adapter.order_cache, adapter.symbol_precision)
+    adapter.stream_handler.add_listener(adapter._on_stream_event)
+    adapter.stream_handler.attach(ws)
+    return ws
+
+
+def test_order_pushes_update_open_order_cache(adapter, ws):
+    cache = adapter.order_cache
+    events = []
+    adapter.stream_handler.add_listener(lambda event, payload: events.append((event, payload.order_id)))
+
+    ws.push("order", _order_data("1001", cl_ord_id="cid-1"))
+    ws.push("order", [_order_data("1002"), _order_data("1003", price="65001")])
+    assert {o.order_id for o in cache.get_open_orders(SYMBOL)} == {"1001", "1002", "1003"}
+    assert cache.get(order_id="1001").price_ticks == 650005
+    assert cache.version("1001") is not None
+
+    ws.push("order", _order_data("1001", status="partially_filled", fill_qty="0.004", cl_ord_id="cid-1"))
+    order = cache.get(client_order_id="cid-1")
+    assert order.status == "partially_filled"
+    assert order.filled_quantity == Decimal("0.004")
+
+    # 完全成交 / 撤单后从本地订单簿移除，价格档位同步清理
+    ws.push("order", _order_data("1001", status="filled", fill_qty="0.01", cl_ord_id="cid-1"))
+    ws.push("order", _order_data("1003", status="cancelled", price="65001"))
+    assert cache.get(client_order_id="cid-1") is None
+    assert cache.get(order_id="1003") is None
+    assert [o.order_id for o in cache.get_open_orders(SYMBOL)] == ["1002"]
+    assert list(cache.price_levels(SYMBOL, "buy")) == [Decimal("65000.5")]
+
+    assert [e for e in events if e[0] == "fill"] == [("fill", "1001"), ("fill", "1001")]
+    assert adapter.stream_handler.fill_count == 2
+    # 成交唤醒同步策略循环
+    assert adapter.wait_stream_event(0)
+    # 订单推送不需要 REST
+    adapter.http_client.query_open_orders.assert_not_called()
+
+
+def test_position_and_balance_come_from_stream_with_rest_fallback(adapter, ws):
+    # 尚未收到推送：回退到 REST
+    position = adapter.get_position(SYMBOL)
+    assert (position.side, position.size) == ("short", Decimal("0.005"))
+    assert adapter.get_balance().total_balance == Decimal("5")
+    assert adapter.http_client.query_positions.call_count == 1
+    assert adapter.http_client.query_balance.call_count == 1
+
+    ws.push("position", _position_data("0.002"))
+    ws.push("balance", BALANCE_DATA)
+    position = adapter.get_position(SYMBOL)
+    assert (position.side, position.size) == ("long", Decimal("0.002"))
+    assert adapter.get_balance().available_balance == Decimal("900")
+
+    # 平仓推送：直接返回无持仓，不再请求 REST
+    ws.push("position", _position_data("0"))
+    assert adapter.get_position(SYMBOL) is None
+    assert adapter.http_client.query_positions.call_count == 1
+    assert adapter.http_client.query_balance.call_count == 1
+
+
+def test_snapshots_are_dropped_after_reconnect(adapter, ws):
+    ws.push("position", _position_data("0.002"))
+    ws.push("balance", BALANCE_DATA)
+    assert adapter.get_position(SYMBOL).size == Decimal("0.002")
+
+    # 断线期间可能漏掉推送
+    ws.connected = False
+    assert adapter.get_position(SYMBOL).size == Decimal("0.005")
+    ws.connected = True
+    ws.reconnect()
+    assert adapter.get_position(SYMBOL).side == "short"
+    assert adapter.get_balance().total_balance == Decimal("5")
+    assert adapter.http_client.query_positions.call_count == 2
+
+    # 新连接上的推送重新生效
+    ws.push("position", _position_data("0.003"))
+    assert adapter.get_position(SYMBOL).size == Decimal("0.003")
+    assert adapter.http_client.query_positions.call_count == 2
+
+
+def test_async_adapter_uses_stream_snapshots():
+    adapter = AsyncStandXAdapter(dict(CONFIG))
+    adapter.token = "token"
+    adapter.http_client = MagicMock()
+    adapter.http_client.query_positions = AsyncMock(return_value=[_position_data("-0.005")])
+    adapter.http_client.query_balance = AsyncMock(return_value=BALANCE_DATA)
+    ws = FakeWS()
+    adapter.stream_handler = StandXStreamHandler(adapter.order_cache)
+    adapter.stream_handler.attach(ws)
+
+    async def scenario():
+        before = await adapter.get_position(SYMBOL)
+        ws.push("position", _position_data("0.002"))
+        ws.push("balance", {**BALANCE_DATA, "balance": "1234"})
+        return before, await adapter.get_position(SYMBOL), await adapter.get_balance()
+
+    before, after, balance = asyncio.run(scenario())
+
+    assert before.side == "short"
+    assert (after.side, after.size) == ("long", Decimal("0.002"))
+    assert balance.total_balance == Decimal("1234")
+    assert adapter.http_client.query_positions.await_count == 1
+    adapter.http_client.query_balance.assert_not_awaited()
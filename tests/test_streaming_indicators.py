@@ -0,0 +1,147 @@
+import numpy as np
+import pytest
+
+from risk.streaming import IndicatorEngine, StreamingADX, StreamingRSI
+
+PERIOD = 14
+
+
+@pytest.fixture(scope="module")
+def candles():
+    rng = np.random.default_rng(7)
+    closes = 100000 + np.cumsum(rng.normal(0, 50, 400))
+    highs = closes + rng.uniform(0, 40, len(closes))
+    lows = closes - rng.uniform(0, 40, len(closes))
+    # 一段横盘：TR / DM / 涨跌幅均为 0 的 K 线
+    highs[200:230] = lows[200:230] = closes[200:230] = closes[199]
+    return highs, lows, closes
+
+
+def _reference_rsi(closes, p=PERIOD):
+    """逐根计算的 Wilder RSI（TA-Lib 口径），返回每根 K 线的值（不足时 None）"""
+    values = [None] * len(closes)
+    avg_gain = avg_loss = 0.0
+    for i in range(1, len(closes)):
+        delta = closes[i] - closes[i - 1]
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        if i <= p:
+            avg_gain += gain / p
+            avg_loss += loss / p
+            if i < p:
+                continue
+        else:
+            avg_gain = (avg_gain * (p - 1) + gain) / p
+            avg_loss = (avg_loss * (p - 1) + loss) / p
+        total = avg_gain + avg_loss
+        values[i] = 100.0 * avg_gain / total if abs(total) >= 1e-14 else 0.0
+    return values
+
+
+def _reference_adx(highs, lows, closes, p=PERIOD):
+    """逐根计算的 Wilder ADX（TA-Lib 口径），返回每根 K 线的值（不足时 None）"""
+    values = [None] * len(closes)
+    s_tr = s_plus = s_minus = 0.0
+    dxs = []
+    adx = None
+    for i in range(1, len(closes)):
+        up, down = highs[i] - highs[i - 1], lows[i - 1] - lows[i]
+        plus_dm = up if up > 0 and up > down else 0.0
+        minus_dm = down if down > 0 and down > up else 0.0
+        tr = max(highs[i] - lows[i], abs(highs[i] - closes[i - 1]), abs(lows[i] - closes[i - 1]))
+        if i < p:
+            s_tr, s_plus, s_minus = s_tr + tr, s_plus + plus_dm, s_minus + minus_dm
+            continue
+        s_tr = s_tr - s_tr / p + tr
+        s_plus = s_plus - s_plus / p + plus_dm
+        s_minus = s_minus - s_minus / p + minus_dm
+        dx = None
+        if abs(s_tr) >= 1e-14:
+            plus_di, minus_di = 100.0 * s_plus / s_tr, 100.0 * s_minus / s_tr
+            if abs(plus_di + minus_di) >= 1e-14:
+                dx = 100.0 * abs(plus_di - minus_di) / (plus_di + minus_di)
+        if len(dxs) < p:
+            dxs.append(dx or 0.0)
+            if len(dxs) == p:
+                adx = sum(dxs) / p
+        elif dx is not None:
+            adx = (adx * (p - 1) + dx) / p
+        values[i] = adx
+    return values
+
+
+def test_warmup_matches_reference(candles):
+    highs, lows, closes = candles
+
+    assert StreamingRSI(PERIOD).warmup(closes) == pytest.approx(_reference_rsi(closes)[-1], rel=1e-9)
+    assert StreamingADX(PERIOD).warmup(highs, lows, closes) == pytest.approx(
+        _reference_adx(highs, lows, closes)[-1], rel=1e-9
+    )
+
+
+def test_warmup_matches_talib(candles):
+    talib = pytest.importorskip("talib")
+    highs, lows, closes = candles
+
+    assert StreamingRSI(PERIOD).warmup(closes) == pytest.approx(talib.RSI(closes, PERIOD)[-1], rel=1e-9)
+    assert StreamingADX(PERIOD).warmup(highs, lows, closes) == pytest.approx(
+        talib.ADX(highs, lows, closes, PERIOD)[-1], rel=1e-9
+    )
+
+
+@pytest.mark.parametrize("warm", [0, 5, 2 * PERIOD, 150])
+def test_incremental_updates_match_reference(candles, warm):
+    highs, lows, closes = candles
+    rsi_ref = _reference_rsi(closes)
+    adx_ref = _reference_adx(highs, lows, closes)
+    rsi, adx = StreamingRSI(PERIOD), StreamingADX(PERIOD)
+    rsi.warmup(closes[:warm])
+    adx.warmup(highs[:warm], lows[:warm], closes[:warm])
+
+    for i in range(warm, len(closes)):
+        rsi.update(closes[i])
+        adx.update(highs[i], lows[i], closes[i])
+        assert rsi.value == pytest.approx(rsi_ref[i], rel=1e-9)
+        assert adx.value == pytest.approx(adx_ref[i], rel=1e-9)
+
+
+def test_peek_uses_forming_candle_without_committing(candles):
+    highs, lows, closes = candles
+    rsi, adx = StreamingRSI(PERIOD), StreamingADX(PERIOD)
+    rsi.warmup(closes[:-1])
+    adx.warmup(highs[:-1], lows[:-1], closes[:-1])
+    committed = (rsi.value, adx.value)
+
+    assert rsi.peek(closes[-1]) == pytest.approx(_reference_rsi(closes)[-1], rel=1e-9)
+    assert adx.peek(highs[-1], lows[-1], closes[-1]) == pytest.approx(
+        _reference_adx(highs, lows, closes)[-1], rel=1e-9
+    )
+    assert (rsi.value, adx.value) == committed
+    assert rsi.peek(closes[-1] + 500) != rsi.peek(closes[-1])
+
+
+def test_engine_warmup_increments_and_gaps(candles):
+    highs, lows, closes = candles
+    open_times = np.arange(len(closes)) * 60_000
+    engine = IndicatorEngine(PERIOD, PERIOD)
+    assert engine.needs_warmup("BTC-USD", "1m")
+
+    # 首次写入：最后一根为未收盘 K 线，只用于临时值
+    assert engine.ingest("BTC-USD", "1m", open_times[:301], highs[:301], lows[:301], closes[:301])
+    assert engine.last_open_time("BTC-USD", "1m") == open_times[299]
+    assert engine.get_rsi("BTC-USD", "1m") == pytest.approx(_reference_rsi(closes[:301])[-1], rel=1e-9)
+    assert engine.get_adx("BTC-USD", "1m") == pytest.approx(
+        _reference_adx(highs[:301], lows[:301], closes[:301])[-1], rel=1e-9
+    )
+
+    # 与已提交 K 线重叠的一段：只提交新的 K 线
+    segment = slice(290, 351)
+    assert engine.ingest("BTC-USD", "1m", open_times[segment], highs[segment], lows[segment], closes[segment])
+    assert engine.last_open_time("BTC-USD", "1m") == open_times[349]
+    assert engine.get_adx("BTC-USD", "1m") == pytest.approx(
+        _reference_adx(highs[:351], lows[:351], closes[:351])[-1], rel=1e-9
+    )
+
+    # 断档：状态清空，调用方需要重新预热
+    segment = slice(380, 400)
+    assert not engine.ingest("BTC-USD", "1m", open_times[segment], highs[segment], lows[segment], closes[segment])
+    assert engine.needs_warmup("BTC-USD", "1m")